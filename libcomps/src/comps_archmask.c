@@ -0,0 +1,89 @@
+/* libcomps - C alternative to yum.comps library
+ * Copyright (C) 2013 Jindrich Luza
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * any later version.
+ *
+ * This program is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to  Free Software
+ * Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301,
+ * USA
+ */
+
+#include "comps_archmask.h"
+
+#include <string.h>
+
+void comps_archmap_init(COMPS_ArchMap *map) {
+    map->len = 0;
+}
+
+void comps_archmap_clear(COMPS_ArchMap *map) {
+    unsigned int x;
+    for (x = 0; x < map->len; x++)
+        COMPS_OBJECT_DESTROY(map->arches[x]);
+    map->len = 0;
+}
+
+static int __comps_archmap_find(const COMPS_ArchMap *map, COMPS_Str *arch,
+                                unsigned int hash) {
+    unsigned int x;
+    for (x = 0; x < map->len; x++) {
+        if (map->hashes[x] == hash
+            && (map->arches[x] == arch
+                || strcmp(map->arches[x]->val, arch->val) == 0))
+            return x;
+    }
+    return -1;
+}
+
+signed char comps_archmap_add(COMPS_ArchMap *map, COMPS_ObjList *arches,
+                              COMPS_ArchMask *mask) {
+    COMPS_ObjListIt *it;
+    COMPS_Str *arch;
+    unsigned int hash, len = map->len;
+    int pos;
+
+    *mask = 0;
+    for (it = arches ? arches->first : NULL; it != NULL; it = it->next) {
+        arch = (COMPS_Str*)it->comps_obj;
+        hash = comps_object_hash((COMPS_Object*)arch);
+        if ((pos = __comps_archmap_find(map, arch, hash)) == -1) {
+            if (map->len == COMPS_ARCHMAP_SIZE) {
+                while (map->len > len)
+                    COMPS_OBJECT_DESTROY(map->arches[--map->len]);
+                return -1;
+            }
+            pos = map->len++;
+            map->arches[pos] = (COMPS_Str*)comps_object_incref(
+                                                    (COMPS_Object*)arch);
+            map->hashes[pos] = hash;
+        }
+        *mask |= (COMPS_ArchMask)1 << pos;
+    }
+    return 0;
+}
+
+COMPS_ArchMask comps_archmap_mask(const COMPS_ArchMap *map,
+                                  COMPS_ObjList *arches) {
+    COMPS_ObjListIt *it;
+    COMPS_ArchMask mask = 0;
+    COMPS_Str *arch;
+    int pos;
+
+    for (it = arches ? arches->first : NULL; it != NULL; it = it->next) {
+        arch = (COMPS_Str*)it->comps_obj;
+        pos = __comps_archmap_find(map, arch,
+                                   comps_object_hash((COMPS_Object*)arch));
+        if (pos != -1)
+            mask |= (COMPS_ArchMask)1 << pos;
+    }
+    return mask;
+}
@@ -0,0 +1,72 @@
+/* libcomps - C alternative to yum.comps library
+ * Copyright (C) 2013 Jindrich Luza
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * any later version.
+ *
+ * This program is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to  Free Software
+ * Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301,
+ * USA
+ */
+
+#ifndef COMPS_ARCHMASK_H
+#define COMPS_ARCHMASK_H
+
+#include "comps_obj.h"
+#include "comps_objlist.h"
+
+/** \file comps_archmask.h
+ * \brief Arch names mapped to bits
+ *
+ * Arches of filters are registered in COMPS_ArchMap once and every arches
+ * list of filtered object is then turned into bitmask. Intersection of
+ * arches lists is tested by single AND of their masks.
+ */
+
+/** maximal number of distinct arches in one map */
+#define COMPS_ARCHMAP_SIZE 64
+
+typedef unsigned long long COMPS_ArchMask;
+
+/** mask intersecting every other mask */
+#define COMPS_ARCHMASK_ALL (~(COMPS_ArchMask)0)
+
+typedef struct {
+    COMPS_Str *arches[COMPS_ARCHMAP_SIZE];
+    /**< registered arches, arch at position x is mapped to bit x */
+    unsigned int hashes[COMPS_ARCHMAP_SIZE]; /**< hashes of arches */
+    unsigned int len; /**< number of registered arches */
+} COMPS_ArchMap;
+
+/** initialize empty map */
+void comps_archmap_init(COMPS_ArchMap *map);
+
+/** release registered arches. Map is left empty */
+void comps_archmap_clear(COMPS_ArchMap *map);
+
+/** register all arches of list and compute their mask
+ * @param map COMPS_ArchMap
+ * @param arches COMPS_ObjList of COMPS_Str arches
+ * @param mask computed mask of arches
+ * @return 0 on success, -1 if map has no room for all arches. Map is left
+ * unchanged then
+ */
+signed char comps_archmap_add(COMPS_ArchMap *map, COMPS_ObjList *arches,
+                              COMPS_ArchMask *mask);
+
+/** return mask of arches. Arches not registered in map don't set any bit
+ * @param map COMPS_ArchMap
+ * @param arches COMPS_ObjList of COMPS_Str arches
+ */
+COMPS_ArchMask comps_archmap_mask(const COMPS_ArchMap *map,
+                                  COMPS_ObjList *arches);
+
+#endif
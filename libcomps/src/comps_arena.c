@@ -0,0 +1,121 @@
+/* libcomps - C alternative to yum.comps library
+ * Copyright (C) 2013 Jindrich Luza
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * any later version.
+ *
+ * This program is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to  Free Software
+ * Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301,
+ * USA
+ */
+
+#include "comps_arena.h"
+
+/* align to size of two pointers, same as malloc does */
+#define ARENA_ALIGN(size) (((size) + 2 * sizeof(void*) - 1) &\
+                           ~(2 * sizeof(void*) - 1))
+
+struct COMPS_ArenaBlock {
+    COMPS_ArenaBlock *next;
+    size_t size;
+    size_t used;
+    void *data;
+};
+
+static __thread COMPS_Arena *__comps_arena_current = NULL;
+
+static COMPS_ArenaBlock* __comps_arena_block_create(size_t size) {
+    COMPS_ArenaBlock *block;
+    size_t head = ARENA_ALIGN(sizeof(COMPS_ArenaBlock));
+
+    block = malloc(head + size);
+    if (!block) {
+        raise(SIGABRT);
+        return NULL;
+    }
+    block->next = NULL;
+    block->size = size;
+    block->used = 0;
+    block->data = (char*)block + head;
+    return block;
+}
+
+COMPS_Arena* comps_arena_create(size_t block_size) {
+    COMPS_Arena *arena;
+
+    arena = malloc(sizeof(*arena));
+    if (!arena) {
+        raise(SIGABRT);
+        return NULL;
+    }
+    arena->blocks = NULL;
+    arena->block_size = ARENA_ALIGN(block_size);
+    arena->ref_count = 1;
+    return arena;
+}
+
+void comps_arena_destroy(COMPS_Arena *arena) {
+    COMPS_ArenaBlock *block, *next;
+
+    if (!arena)
+        return;
+    /* objects of arena could be shared by documents used in other threads */
+    if (__sync_sub_and_fetch(&arena->ref_count, 1))
+        return;
+    for (block = arena->blocks; block != NULL; block = next) {
+        next = block->next;
+        free(block);
+    }
+    free(arena);
+}
+
+COMPS_Arena* comps_arena_incref(COMPS_Arena *arena) {
+    if (arena)
+        __sync_fetch_and_add(&arena->ref_count, 1);
+    return arena;
+}
+
+void* comps_arena_alloc(COMPS_Arena *arena, size_t size) {
+    COMPS_ArenaBlock *block;
+    void *ret;
+
+    size = ARENA_ALIGN(size);
+    block = arena->blocks;
+    if (!block || block->size - block->used < size) {
+        if (size > arena->block_size / 4) {
+            /* big allocation gets its own block, so rest of current block
+             * isn't wasted */
+            block = __comps_arena_block_create(size);
+            if (arena->blocks) {
+                block->next = arena->blocks->next;
+                arena->blocks->next = block;
+            } else
+                arena->blocks = block;
+        } else {
+            block = __comps_arena_block_create(arena->block_size);
+            block->next = arena->blocks;
+            arena->blocks = block;
+        }
+    }
+    ret = (char*)block->data + block->used;
+    block->used += size;
+    return ret;
+}
+
+COMPS_Arena* comps_arena_current() {
+    return __comps_arena_current;
+}
+
+COMPS_Arena* comps_arena_set_current(COMPS_Arena *arena) {
+    COMPS_Arena *prev = __comps_arena_current;
+    __comps_arena_current = arena;
+    return prev;
+}
@@ -0,0 +1,84 @@
+/* libcomps - C alternative to yum.comps library
+ * Copyright (C) 2013 Jindrich Luza
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * any later version.
+ *
+ * This program is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to  Free Software
+ * Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301,
+ * USA
+ */
+
+#ifndef COMPS_ARENA_H
+#define COMPS_ARENA_H
+
+#include <stdlib.h>
+#include <string.h>
+#include <signal.h>
+
+/*! \file comps_arena.h
+ * \brief COMPS memory region allocator
+ *
+ * Arena serves allocations from big blocks and releases all of them at once.
+ * COMPS_Object derivates created while arena is current
+ * (@see comps_arena_set_current) are allocated from arena together with
+ * their reference counters and string values. Every such object holds
+ * reference to the arena, so arena memory lives as long as the last object
+ * allocated from it. Object which outlives its document pins whole arena.
+ * Copy of the object made outside of arena is allocated regularly.
+ * */
+
+/** default size of arena block */
+#define COMPS_ARENA_BLOCK_SIZE 65536
+
+typedef struct COMPS_ArenaBlock COMPS_ArenaBlock;
+
+/** Memory region structure
+ */
+typedef struct COMPS_Arena {
+    COMPS_ArenaBlock *blocks; /**< allocated blocks, current one first */
+    size_t block_size; /**< size of regular block */
+    size_t ref_count; /**< number of arena references. Arena is freed
+                           when this falls to zero */
+} COMPS_Arena;
+
+/** arena constructor. Returned arena has one reference owned by caller
+ * @param block_size size of blocks allocated for arena
+ */
+COMPS_Arena* comps_arena_create(size_t block_size);
+
+/** Drop arena reference. Free arena and all memory allocated from it
+ * if it was the last reference
+ */
+void comps_arena_destroy(COMPS_Arena *arena);
+
+/** Add reference to arena
+ */
+COMPS_Arena* comps_arena_incref(COMPS_Arena *arena);
+
+/** Allocate memory from arena. Returned memory is aligned for any type
+ * and can't be freed separately
+ * @param arena arena
+ * @param size size of requested memory
+ */
+void* comps_arena_alloc(COMPS_Arena *arena, size_t size);
+
+/** Return arena which objects are allocated from in current thread or NULL
+ */
+COMPS_Arena* comps_arena_current();
+
+/** Set arena which objects will be allocated from in current thread
+ * @param arena arena or NULL for regular allocation
+ * @return previously current arena, which should be restored afterwards
+ */
+COMPS_Arena* comps_arena_set_current(COMPS_Arena *arena);
+
+#endif //COMPS_ARENA_H
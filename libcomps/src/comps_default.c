@@ -5,7 +5,9 @@ COMPS_DefaultsOptions COMPS_DDefaultsOptions = {
     .default_biarchonly = false,
     .default_uservisible = true,
     .default_default = false,
-    .default_pkgtype = COMPS_PACKAGE_MANDATORY
+    .default_pkgtype = COMPS_PACKAGE_MANDATORY,
+    .skip_sections = 0,
+    .arena = false
 };
 
 char* comps_default_doctype_name = "comps";
@@ -5,11 +5,31 @@
 
 #include "comps_obj.h"
 
+/** Top-level sections of comps document
+ * @see COMPS_DefaultsOptions
+ */
+typedef enum {
+    COMPS_SECTION_GROUPS = 1 << 0,
+    COMPS_SECTION_CATEGORIES = 1 << 1,
+    COMPS_SECTION_ENVIRONMENTS = 1 << 2,
+    COMPS_SECTION_LANGPACKS = 1 << 3,
+    COMPS_SECTION_BLACKLIST = 1 << 4,
+    COMPS_SECTION_WHITEOUT = 1 << 5,
+    COMPS_SECTION_ALL = (1 << 6) - 1
+} COMPS_Section;
+
 typedef struct COMPS_DefaultsOptions {
     bool default_uservisible;
     bool default_biarchonly;
     bool default_default;
     int default_pkgtype;
+    int skip_sections;
+    /**< COMPS_Section flags of sections which aren't materialized by parser.
+     * Skipped sections are consumed by expat without creating any objects
+     * or log entries */
+    bool arena;
+    /**< allocate parsed document from arena, which is released at once
+     * instead of object by object. @see comps_arena.h */
 } COMPS_DefaultsOptions;
 
 extern COMPS_DefaultsOptions COMPS_DDefaultsOptions;
@@ -17,6 +17,9 @@
  * USA
  */
 
+/* recursive pthread mutexes */
+#define _POSIX_C_SOURCE 200809L
+
 #include "comps_doc.h"
 #include "comps_set.h"
 //#include "comps_types.h"
@@ -28,9 +31,32 @@
 static signed char comps_doc_xml(COMPS_Doc *doc, xmlTextWriterPtr writer,
                                  COMPS_XMLOptions *xml_options,
                                  COMPS_DefaultsOptions *def_options);
+static void __comps_doc_closures_destroy(COMPS_DocClosureCache *cache);
+
+static void __comps_doc_lock_init(COMPS_Doc *doc) {
+    pthread_mutexattr_t attr;
+
+    pthread_mutexattr_init(&attr);
+    pthread_mutexattr_settype(&attr, PTHREAD_MUTEX_RECURSIVE);
+    pthread_mutex_init(&doc->lock, &attr);
+    pthread_mutexattr_destroy(&attr);
+}
+
+void comps_doc_lock(COMPS_Doc *doc) {
+    pthread_mutex_lock(&doc->lock);
+}
+
+void comps_doc_unlock(COMPS_Doc *doc) {
+    pthread_mutex_unlock(&doc->lock);
+}
 
 void comps_doc_create(COMPS_Doc* doc, COMPS_Object **args) {
-    doc->objects = COMPS_OBJECT_CREATE(COMPS_ObjDict, NULL);
+    doc->groups = NULL;
+    doc->categories = NULL;
+    doc->environments = NULL;
+    doc->langpacks = NULL;
+    doc->blacklist = NULL;
+    doc->whiteout = NULL;
     doc->log = COMPS_OBJECT_CREATE(COMPS_Log, NULL);
     //doc->log = comps_log_create(0);
     if (args && args[0]->obj_info == &COMPS_Str_ObjInfo) {
@@ -42,6 +68,15 @@ void comps_doc_create(COMPS_Doc* doc, COMPS_Object **args) {
     doc->doctype_sysid = comps_str(comps_default_doctype_sysid);
     doc->doctype_pubid = comps_str(comps_default_doctype_pubid);
     doc->lang = NULL;
+    doc->groups_index = NULL;
+    doc->categories_index = NULL;
+    doc->envs_index = NULL;
+    doc->groups_name_index = NULL;
+    doc->categories_name_index = NULL;
+    doc->envs_name_index = NULL;
+    doc->packages_index = NULL;
+    doc->closures = NULL;
+    __comps_doc_lock_init(doc);
 }
 COMPS_CREATE_u(doc, COMPS_Doc)
 
@@ -50,18 +85,50 @@ void comps_doc_copy(COMPS_Doc *doc_dst, COMPS_Doc *doc_src) {
     doc_dst->doctype_name = (COMPS_Str*) COMPS_OBJECT_COPY(doc_src->doctype_name);
     doc_dst->doctype_sysid = (COMPS_Str*) COMPS_OBJECT_COPY(doc_src->doctype_sysid);
     doc_dst->doctype_pubid = (COMPS_Str*) COMPS_OBJECT_COPY(doc_src->doctype_pubid);
-    doc_dst->objects = (COMPS_ObjDict*) COMPS_OBJECT_COPY(doc_src->objects);
+    doc_dst->groups = (COMPS_ObjList*) COMPS_OBJECT_COPY(doc_src->groups);
+    doc_dst->categories = (COMPS_ObjList*) COMPS_OBJECT_COPY(doc_src->categories);
+    doc_dst->environments = (COMPS_ObjList*)
+                            COMPS_OBJECT_COPY(doc_src->environments);
+    doc_dst->langpacks = (COMPS_ObjDict*) COMPS_OBJECT_COPY(doc_src->langpacks);
+    doc_dst->blacklist = (COMPS_ObjMDict*) COMPS_OBJECT_COPY(doc_src->blacklist);
+    doc_dst->whiteout = (COMPS_ObjMDict*) COMPS_OBJECT_COPY(doc_src->whiteout);
+    doc_dst->log = COMPS_OBJECT_CREATE(COMPS_Log, NULL);
+    doc_dst->lang = (COMPS_Str*) COMPS_OBJECT_COPY(doc_src->lang);
+    doc_dst->groups_index = NULL;
+    doc_dst->categories_index = NULL;
+    doc_dst->envs_index = NULL;
+    doc_dst->groups_name_index = NULL;
+    doc_dst->categories_name_index = NULL;
+    doc_dst->envs_name_index = NULL;
+    doc_dst->packages_index = NULL;
+    doc_dst->closures = NULL;
+    __comps_doc_lock_init(doc_dst);
 }
 COMPS_COPY_u(doc, COMPS_Doc)
 
 void comps_doc_destroy(COMPS_Doc *doc) {
     if (doc != NULL) {
         COMPS_OBJECT_DESTROY(doc->log);
-        COMPS_OBJECT_DESTROY(doc->objects);
+        COMPS_OBJECT_DESTROY(doc->groups);
+        COMPS_OBJECT_DESTROY(doc->categories);
+        COMPS_OBJECT_DESTROY(doc->environments);
+        COMPS_OBJECT_DESTROY(doc->langpacks);
+        COMPS_OBJECT_DESTROY(doc->blacklist);
+        COMPS_OBJECT_DESTROY(doc->whiteout);
         COMPS_OBJECT_DESTROY(doc->encoding);
         COMPS_OBJECT_DESTROY(doc->doctype_name);
         COMPS_OBJECT_DESTROY(doc->doctype_sysid);
         COMPS_OBJECT_DESTROY(doc->doctype_pubid);
+        COMPS_OBJECT_DESTROY(doc->lang);
+        comps_doc_idindex_destroy(doc->groups_index);
+        comps_doc_idindex_destroy(doc->categories_index);
+        comps_doc_idindex_destroy(doc->envs_index);
+        comps_doc_idindex_destroy(doc->groups_name_index);
+        comps_doc_idindex_destroy(doc->categories_name_index);
+        comps_doc_idindex_destroy(doc->envs_name_index);
+        comps_doc_pkgindex_destroy(doc->packages_index);
+        __comps_doc_closures_destroy(doc->closures);
+        pthread_mutex_destroy(&doc->lock);
     }
 }
 COMPS_DESTROY_u(doc, COMPS_Doc)
@@ -210,8 +277,6 @@ signed char comps2xml_f(COMPS_Doc * doc, char *filename, char stdoutredirect,
 
     xmlFreeTextWriter(writer);
     xmlFreeDoc(xmldoc);
-    xmlCleanupParser();
-    xmlMemoryDump();
     return genret;
 }
 
@@ -256,130 +321,150 @@ char* comps2xml_str(COMPS_Doc *doc, COMPS_XMLOptions *xml_options,
     ret =  malloc(sizeof(char) * (strlen(xmlstr)+1));
     if (ret == NULL) {
         xmlBufferFree(xmlbuff);
-        xmlCleanupParser();
-        xmlMemoryDump();
         return NULL;
     } else {
         memcpy(ret, xmlstr, sizeof(char)*(strlen(xmlstr)+1));
     }
     xmlBufferFree(xmlbuff);
-
-    xmlCleanupParser();
-    xmlMemoryDump();
     return ret;
 }
 
-COMPS_Doc* comps_doc_union(COMPS_Doc *c1, COMPS_Doc *c2) {
+#define COMPS_DOC_UNION_OBJS(LIST, OBJTYPE, IDCMPF, IDHASHF, UNIONF, ADDF)\
+    comps_set_init_hashed(set, NULL, NULL, NULL, &IDCMPF, &IDHASHF);\
+    for (x = 0; x < count; x++) {\
+        for (it = docs[x]->LIST ? docs[x]->LIST->first : NULL; it != NULL;\
+             it = it->next) {\
+            tmpdata = comps_set_data_at(set, it->comps_obj);\
+            if (!tmpdata) {\
+                comps_set_add(set, comps_object_copy(it->comps_obj));\
+            } else if (x) {\
+                /* unioned object is moved to the end as with two documents */\
+                comps_set_remove(set, tmpdata);\
+                comps_set_add(set, UNIONF((OBJTYPE*)tmpdata,\
+                                          (OBJTYPE*)it->comps_obj));\
+                COMPS_OBJECT_DESTROY(tmpdata);\
+            }\
+        }\
+    }\
+    for (hsit = set->data->first; hsit != NULL; hsit = hsit->next) {\
+        ADDF(res, hsit->data);\
+    }\
+    comps_set_clear(set);
+
+COMPS_Doc* comps_doc_union_many(COMPS_Doc **docs, unsigned int count) {
     COMPS_ObjListIt *it;
     COMPS_Set *set;
     COMPS_Doc *res;
-    COMPS_DocGroup *tmpgroup;
-    COMPS_DocCategory *tmpcat;
-    COMPS_DocEnv *tmpenv;
     COMPS_HSListItem *hsit;
-    COMPS_ObjList *groups = comps_doc_groups(c1);
-    COMPS_ObjList *categories = comps_doc_categories(c1);
-    COMPS_ObjList *envs = comps_doc_environments(c1);
-    COMPS_ObjDict *langpacks, *d1, *d2;
-
+    COMPS_ObjDict *langpacks = NULL;
     void *tmpdata;
-    res = COMPS_OBJECT_CREATE(COMPS_Doc, (COMPS_Object*[]){(COMPS_Object*)
-                                                           c1->encoding});
+    unsigned int x;
 
+    if (!count)
+        return NULL;
+    res = COMPS_OBJECT_CREATE(COMPS_Doc, (COMPS_Object*[]){(COMPS_Object*)
+                                                           docs[0]->encoding});
     set = comps_set_create();
-    comps_set_init(set, NULL, NULL, NULL, &__comps_docgroup_idcmp);
-
-    for (it = groups ? groups->first : NULL; it != NULL; it = it->next) {
-        comps_set_add(set, comps_object_copy(it->comps_obj));
-    }
-    COMPS_OBJECT_DESTROY(groups);
-    groups = comps_doc_groups(c2);
-    for (it = groups ? groups->first : NULL; it != NULL; it = it->next) {
-        if (comps_set_in(set, it->comps_obj)) {
-            tmpgroup = comps_docgroup_union(
-                                (COMPS_DocGroup*)comps_set_data_at(set,
-                                                               it->comps_obj),
-                                (COMPS_DocGroup*)it->comps_obj);
-            tmpdata = comps_set_data_at(set, it->comps_obj);
-            comps_set_remove(set, it->comps_obj);
-            COMPS_OBJECT_DESTROY(tmpdata);
-            comps_set_add(set, tmpgroup);
-        } else {
-            comps_set_add(set, comps_object_copy(it->comps_obj));
-        }
-    }
-    COMPS_OBJECT_DESTROY(groups);
-    for (hsit = set->data->first; hsit != NULL; hsit = hsit->next) {
-        comps_doc_add_group(res, hsit->data);
-    }
-    comps_set_clear(set);
-
-    comps_set_init(set, NULL, NULL, NULL, &__comps_doccategory_idcmp);
-    for (it = categories ? categories->first : NULL; it != NULL; it = it->next) {
-        comps_set_add(set, comps_object_copy(it->comps_obj));
-    }
-    COMPS_OBJECT_DESTROY(categories);
-    categories = comps_doc_categories(c2);
-    for (it = categories ? categories->first : NULL; it != NULL; it = it->next) {
-        if (comps_set_in(set, it->comps_obj)) {
-            tmpcat = comps_doccategory_union(
-                                (COMPS_DocCategory*)comps_set_data_at(set,
-                                                                it->comps_obj),
-                                (COMPS_DocCategory*)it->comps_obj);
-            tmpdata = comps_set_data_at(set, it->comps_obj);
-            comps_set_remove(set, it->comps_obj);
-            COMPS_OBJECT_DESTROY(tmpdata);
-            comps_set_add(set, tmpcat);
-        } else {
-            comps_set_add(set, comps_object_copy(it->comps_obj));
-        }
-    }
-    COMPS_OBJECT_DESTROY(categories);
-    for (hsit = set->data->first; hsit != NULL; hsit = hsit->next) {
-        comps_doc_add_category(res, hsit->data);
-    }
-    comps_set_clear(set);
-
-    comps_set_init(set, NULL, NULL, NULL, &__comps_docenv_idcmp);
-    if (envs) {
-        for (it = envs->first; it != NULL; it = it->next) {
-            comps_set_add(set, comps_object_copy(it->comps_obj));
-        }
-    }
-    COMPS_OBJECT_DESTROY(envs);
-    envs = comps_doc_environments(c2);
-    if (envs) {
-        for (it = envs->first; it != NULL; it = it->next) {
-            if (comps_set_in(set, it->comps_obj)) {
-                tmpenv = comps_docenv_union(
-                                    (COMPS_DocEnv*)comps_set_data_at(set,
-                                                              it->comps_obj),
-                                    (COMPS_DocEnv*)it->comps_obj);
-                tmpdata = comps_set_data_at(set, it->comps_obj);
-                comps_set_remove(set, it->comps_obj);
-                comps_object_destroy((COMPS_Object*)tmpdata);
-                comps_set_add(set, tmpenv);
-            } else {
-                comps_set_add(set, comps_object_copy(it->comps_obj));
-            }
-        }
-    }
-    COMPS_OBJECT_DESTROY(envs);
-    for (hsit = set->data->first; hsit != NULL; hsit = hsit->next) {
-        comps_doc_add_environment(res, hsit->data);
-    }
+    COMPS_DOC_UNION_OBJS(groups, COMPS_DocGroup, __comps_docgroup_idcmp,
+                         __comps_docgroup_idhash, comps_docgroup_union,
+                         comps_doc_add_group)
+    COMPS_DOC_UNION_OBJS(categories, COMPS_DocCategory,
+                         __comps_doccategory_idcmp, __comps_doccategory_idhash,
+                         comps_doccategory_union, comps_doc_add_category)
+    COMPS_DOC_UNION_OBJS(environments, COMPS_DocEnv, __comps_docenv_idcmp,
+                         __comps_docenv_idhash, comps_docenv_union,
+                         comps_doc_add_environment)
     comps_set_destroy(&set);
 
-    d1 = comps_doc_langpacks(c1);
-    d2 = comps_doc_langpacks(c2);
-    langpacks = comps_objdict_union(d1,d2);
-    COMPS_OBJECT_DESTROY(d1);
-    COMPS_OBJECT_DESTROY(d2);
+    for (x = 0; x < count; x++) {
+        if (!docs[x]->langpacks)
+            continue;
+        if (!langpacks)
+            langpacks = (COMPS_ObjDict*)comps_object_copy(
+                                        (COMPS_Object*)docs[x]->langpacks);
+        else
+            comps_objrtree_unite((COMPS_ObjRTree*)langpacks,
+                                 (COMPS_ObjRTree*)docs[x]->langpacks);
+    }
+    if (!langpacks)
+        langpacks = COMPS_OBJECT_CREATE(COMPS_ObjDict, NULL);
     comps_doc_set_langpacks(res, langpacks);
     COMPS_OBJECT_DESTROY(langpacks);
     return res;
 }
 
+COMPS_Doc* comps_doc_union(COMPS_Doc *c1, COMPS_Doc *c2) {
+    return comps_doc_union_many((COMPS_Doc*[]){c1, c2}, 2);
+}
+
+static char __comps_doc_merged(COMPS_Object *obj, void *merged) {
+    return comps_set_data_at((COMPS_Set*)merged, obj) == obj;
+}
+
+/* objects of dst unioned with src ones are collected in merged set, results
+ * and new objects in pending set. dst list is modified only after all
+ * lookups are done, so id index of dst stays valid */
+#define COMPS_DOC_MERGE_OBJS(LIST, OBJTYPE, BYIDF, IDCMPF, IDHASHF, UNIONF,\
+                             ADDF)\
+    comps_set_init_hashed(pending, NULL, NULL, NULL, &IDCMPF, &IDHASHF);\
+    comps_set_init_hashed(merged, NULL, NULL, &comps_object_destroy_v,\
+                          &IDCMPF, &IDHASHF);\
+    for (it = src->LIST ? src->LIST->first : NULL; it != NULL;\
+         it = it->next) {\
+        id = ((OBJTYPE*)it->comps_obj)->id;\
+        if ((tmpdata = comps_set_data_at(pending, it->comps_obj)) != NULL) {\
+            comps_set_remove(pending, tmpdata);\
+            comps_set_add(pending, UNIONF((OBJTYPE*)tmpdata,\
+                                          (OBJTYPE*)it->comps_obj));\
+            COMPS_OBJECT_DESTROY(tmpdata);\
+        } else if (id && (tmpdata = BYIDF(dst, id->val)) != NULL) {\
+            comps_set_add(merged, tmpdata);\
+            comps_set_add(pending, UNIONF((OBJTYPE*)tmpdata,\
+                                          (OBJTYPE*)it->comps_obj));\
+        } else {\
+            comps_set_add(pending, comps_object_copy(it->comps_obj));\
+        }\
+    }\
+    if (merged->count)\
+        comps_objlist_remove_if(dst->LIST, &__comps_doc_merged, merged);\
+    for (hsit = pending->data->first; hsit != NULL; hsit = hsit->next) {\
+        ADDF(dst, hsit->data);\
+    }\
+    comps_set_clear(pending);\
+    comps_set_clear(merged);
+
+void comps_doc_merge_into(COMPS_Doc *dst, COMPS_Doc *src) {
+    COMPS_ObjListIt *it;
+    COMPS_Set *pending, *merged;
+    COMPS_HSListItem *hsit;
+    COMPS_Str *id;
+    void *tmpdata;
+
+    pending = comps_set_create();
+    merged = comps_set_create();
+    COMPS_DOC_MERGE_OBJS(groups, COMPS_DocGroup, comps_doc_group_by_id,
+                         __comps_docgroup_idcmp, __comps_docgroup_idhash,
+                         comps_docgroup_union, comps_doc_add_group)
+    COMPS_DOC_MERGE_OBJS(categories, COMPS_DocCategory,
+                         comps_doc_category_by_id, __comps_doccategory_idcmp,
+                         __comps_doccategory_idhash, comps_doccategory_union,
+                         comps_doc_add_category)
+    COMPS_DOC_MERGE_OBJS(environments, COMPS_DocEnv,
+                         comps_doc_environment_by_id, __comps_docenv_idcmp,
+                         __comps_docenv_idhash, comps_docenv_union,
+                         comps_doc_add_environment)
+    comps_set_destroy(&pending);
+    comps_set_destroy(&merged);
+
+    /* union of langpacks with itself doesn't change them */
+    if (src->langpacks && src != dst) {
+        if (!dst->langpacks)
+            dst->langpacks = COMPS_OBJECT_CREATE(COMPS_ObjDict, NULL);
+        comps_objrtree_unite((COMPS_ObjRTree*)dst->langpacks,
+                             (COMPS_ObjRTree*)src->langpacks);
+    }
+}
+
 /**
  * Make intersection of two existing COMPS_Doc objects. Result intersection is
  * completly new COMPS_Doc object (deep copy of those two).
@@ -407,7 +492,8 @@ COMPS_Doc* comps_doc_intersect(COMPS_Doc *c1, COMPS_Doc *c2) {
                                          {(COMPS_Object*)c1->encoding});
 
     set = comps_set_create();
-    comps_set_init(set, NULL, NULL, NULL, &__comps_docgroup_idcmp);
+    comps_set_init_hashed(set, NULL, NULL, NULL, &__comps_docgroup_idcmp,
+                               &__comps_docgroup_idhash);
 
     for (it = groups->first; it != NULL; it = it->next) {
         comps_set_add(set, it->comps_obj);
@@ -425,7 +511,8 @@ COMPS_Doc* comps_doc_intersect(COMPS_Doc *c1, COMPS_Doc *c2) {
     }
     comps_set_clear(set);
 
-    comps_set_init(set, NULL, NULL, NULL, &__comps_doccategory_idcmp);
+    comps_set_init_hashed(set, NULL, NULL, NULL, &__comps_doccategory_idcmp,
+                               &__comps_doccategory_idhash);
     for (it = categories->first; it != NULL; it = it->next) {
         comps_set_add(set, it->comps_obj);
     }
@@ -442,7 +529,8 @@ COMPS_Doc* comps_doc_intersect(COMPS_Doc *c1, COMPS_Doc *c2) {
     }
     comps_set_clear(set);
 
-    comps_set_init(set, NULL, NULL, NULL, &__comps_docenv_idcmp);
+    comps_set_init_hashed(set, NULL, NULL, NULL, &__comps_docenv_idcmp,
+                               &__comps_docenv_idhash);
     for (it = envs->first; it != NULL; it = it->next) {
         comps_set_add(set, it->comps_obj);
     }
@@ -464,175 +552,951 @@ COMPS_Doc* comps_doc_intersect(COMPS_Doc *c1, COMPS_Doc *c2) {
     return res;
 }
 
-COMPS_ObjList* comps_doc_get_groups(COMPS_Doc *doc, char *id, char *name,
-                                    char *desc, char *lang, int flags) {
+
+COMPS_DocIdIndex* comps_doc_idindex_create(size_t id_offset) {
+    COMPS_DocIdIndex *index;
+    index = malloc(sizeof(COMPS_DocIdIndex));
+    if (!index) return NULL;
+    index->id_offset = id_offset;
+    index->list = NULL;
+    index->list_rev = 0;
+    comps_idrev_watch_init(&index->watch);
+    index->id_rev = 0;
+    index->table = NULL;
+    index->items = NULL;
+    index->table_size = 0;
+    return index;
+}
+
+static void __comps_doc_idindex_clear(COMPS_DocIdIndex *index) {
+    free(index->table);
+    free(index->items);
+    index->table = NULL;
+    index->items = NULL;
+    index->table_size = 0;
+    COMPS_OBJECT_DESTROY(index->list);
+    index->list = NULL;
+    comps_idrev_watch_clear(&index->watch);
+}
+
+void comps_doc_idindex_destroy(COMPS_DocIdIndex *index) {
+    if (!index) return;
+    __comps_doc_idindex_clear(index);
+    comps_idrev_watch_destroy(&index->watch);
+    free(index);
+}
+
+/* revision member of indexed object */
+static COMPS_IdRev** __comps_doc_idrev(COMPS_Object *obj) {
+    if (obj->obj_info == &COMPS_DocGroup_ObjInfo)
+        return &((COMPS_DocGroup*)obj)->id_rev;
+    if (obj->obj_info == &COMPS_DocCategory_ObjInfo)
+        return &((COMPS_DocCategory*)obj)->id_rev;
+    if (obj->obj_info == &COMPS_DocEnv_ObjInfo)
+        return &((COMPS_DocEnv*)obj)->id_rev;
+    if (obj->obj_info == &COMPS_DocGroupId_ObjInfo)
+        return &((COMPS_DocGroupId*)obj)->id_rev;
+    if (obj->obj_info == &COMPS_DocGroupPackage_ObjInfo)
+        return &((COMPS_DocGroupPackage*)obj)->id_rev;
+    return NULL;
+}
+
+static void __comps_doc_idrev_watch(COMPS_IdRevWatch *watch,
+                                    COMPS_Object *obj) {
+    COMPS_IdRev **rev = __comps_doc_idrev(obj);
+    /* changes of unknown objects can't be detected, index is never
+     * considered up to date then */
+    if (rev)
+        comps_idrev_watch_add(watch, rev);
+    else
+        watch->failed = 1;
+}
+
+static COMPS_Str* __comps_doc_idindex_objid(COMPS_DocIdIndex *index,
+                                            COMPS_Object *obj) {
+    return *(COMPS_Str**)((char*)obj + index->id_offset);
+}
+
+static void __comps_doc_idindex_build(COMPS_DocIdIndex *index,
+                                      COMPS_ObjList *list) {
     COMPS_ObjListIt *it;
-    COMPS_ObjList *ret;
-    unsigned int matched, matched_max;
-    matched_max = 0;
-    COMPS_ObjList *groups = comps_doc_groups(doc);
-    COMPS_Str *objid, *objname, *objdesc, *tmp_prop;
-    objid = comps_str(id);
-    objname = comps_str(name);
-    objdesc = comps_str(desc);
+    COMPS_DocIdIndexItem *item;
+    COMPS_Str *id;
+    unsigned int i, size;
+
+    __comps_doc_idindex_clear(index);
+    for (size = 16; size < list->len + list->len / 2; size <<= 1);
+    index->table = calloc(size, sizeof(COMPS_DocIdIndexItem*));
+    index->items = malloc(sizeof(COMPS_DocIdIndexItem) * (list->len + 1));
+    if (!index->table || !index->items) {
+        __comps_doc_idindex_clear(index);
+        return;
+    }
+    index->table_size = size;
+    for (it = list->first, i = 0; it != NULL; it = it->next, i++) {
+        index->items[i].obj = it->comps_obj;
+        id = __comps_doc_idindex_objid(index, it->comps_obj);
+        index->items[i].hash = (id) ? comps_object_hash((COMPS_Object*)id)
+                                  : 0;
+        __comps_doc_idrev_watch(&index->watch, it->comps_obj);
+    }
+    /* insert backwards, so buckets keep objects in list order and lookup
+     * finds first matching object as linear search does */
+    for (; i > 0; i--) {
+        item = &index->items[i - 1];
+        item->next = index->table[item->hash & (size - 1)];
+        index->table[item->hash & (size - 1)] = item;
+    }
+    index->list = (COMPS_ObjList*)comps_object_incref((COMPS_Object*)list);
+    index->list_rev = list->rev;
+    index->id_rev = comps_idrev_watch_rev(&index->watch);
+}
+
+static COMPS_DocIdIndexItem* __comps_doc_idindex_find(
+                                                COMPS_DocIdIndex *index,
+                                                COMPS_DocIdIndexItem *item,
+                                                unsigned int hash,
+                                                const char *id) {
+    COMPS_Str *objid;
+
+    for (; item != NULL; item = item->next) {
+        if (item->hash != hash)
+            continue;
+        objid = __comps_doc_idindex_objid(index, item->obj);
+        if (objid && objid->val && strcmp(objid->val, id) == 0)
+            return item;
+    }
+    return NULL;
+}
+
+/* return first item with id, following ones are returned by
+ * __comps_doc_idindex_next in list order */
+static COMPS_DocIdIndexItem* __comps_doc_idindex_lookup(
+                                                COMPS_DocIdIndex *index,
+                                                COMPS_ObjList *list,
+                                                const char *id) {
+    unsigned int hash;
+
+    if (!index || !list || !id) return NULL;
+    if (index->list != list || index->list_rev != list->rev
+        || !comps_idrev_watch_check(&index->watch, index->id_rev)) {
+        __comps_doc_idindex_build(index, list);
+    }
+    if (!index->table) return NULL;
+
+    hash = comps_str_hash(id);
+    return __comps_doc_idindex_find(index,
+                                index->table[hash & (index->table_size - 1)],
+                                hash, id);
+}
+
+static COMPS_DocIdIndexItem* __comps_doc_idindex_next(
+                                                COMPS_DocIdIndex *index,
+                                                COMPS_DocIdIndexItem *item,
+                                                const char *id) {
+    return __comps_doc_idindex_find(index, item->next, item->hash, id);
+}
+
+COMPS_Object* comps_doc_idindex_get(COMPS_DocIdIndex *index,
+                                    COMPS_ObjList *list, const char *id) {
+    COMPS_DocIdIndexItem *item;
+
+    item = __comps_doc_idindex_lookup(index, list, id);
+    return (item) ? item->obj : NULL;
+}
+
+int comps_doc_idindex_pos(COMPS_DocIdIndex *index, COMPS_ObjList *list,
+                          const char *id) {
+    COMPS_DocIdIndexItem *item;
+
+    item = __comps_doc_idindex_lookup(index, list, id);
+    /* items are stored in list order */
+    return (item) ? (int)(item - index->items) : -1;
+}
+
+#define COMPS_DOC_BYID(OBJS, OBJNAME, OBJTYPE, INDEX)\
+OBJTYPE* CONCAT(CONCAT(comps_doc_, OBJNAME), _by_id)(COMPS_Doc *doc,\
+                                                     const char *id) {\
+    COMPS_ObjList *list;\
+    COMPS_Object *ret;\
+    list = doc->OBJS;\
+    if (!list) return NULL;\
+    pthread_mutex_lock(&doc->lock);\
+    if (!doc->INDEX) {\
+        doc->INDEX = comps_doc_idindex_create(offsetof(OBJTYPE, id));\
+    }\
+    ret = comps_object_incref(comps_doc_idindex_get(doc->INDEX, list, id));\
+    pthread_mutex_unlock(&doc->lock);\
+    return (OBJTYPE*)ret;\
+}
+
+COMPS_DOC_BYID(groups, group, COMPS_DocGroup, groups_index)
+COMPS_DOC_BYID(categories, category, COMPS_DocCategory, categories_index)
+COMPS_DOC_BYID(environments, environment, COMPS_DocEnv, envs_index)
+
+COMPS_DocMatch* comps_doc_match_create(const char *id, const char *name,
+                                       const char *desc, const char *lang,
+                                       int flags) {
+    COMPS_DocMatch *match;
+
+    if ((match = calloc(1, sizeof(COMPS_DocMatch))) == NULL)
+        return NULL;
+    if ((id && !(match->id = comps_pattern_compile(id, flags)))
+        || (name && !(match->name = comps_pattern_compile(name, flags)))
+        || (desc && !(match->desc = comps_pattern_compile(desc, flags)))) {
+        comps_doc_match_destroy(match);
+        return NULL;
+    }
+    if (lang) {
+        if ((match->lang = malloc(strlen(lang) + 1)) == NULL) {
+            comps_doc_match_destroy(match);
+            return NULL;
+        }
+        strcpy(match->lang, lang);
+    }
+    return match;
+}
+
+void comps_doc_match_destroy(COMPS_DocMatch *match) {
+    if (!match) return;
+    comps_pattern_destroy(match->id);
+    comps_pattern_destroy(match->name);
+    comps_pattern_destroy(match->desc);
+    free(match->lang);
+    free(match);
+}
+
+/* layout of matched objects and their indexes in document */
+typedef struct {
+    size_t list, id_index, name_index;
+    size_t id, name, desc, name_by_lang, desc_by_lang;
+    char desc_any;
+    /**< untranslated description is matched even if language is given */
+} __COMPS_DocMatchInfo;
+
+#define COMPS_DOC_MATCHINFO(OBJS, OBJTYPE, INDEX, NAME_INDEX, DESC_ANY)\
+{\
+    .list = offsetof(COMPS_Doc, OBJS),\
+    .id_index = offsetof(COMPS_Doc, INDEX),\
+    .name_index = offsetof(COMPS_Doc, NAME_INDEX),\
+    .id = offsetof(OBJTYPE, id),\
+    .name = offsetof(OBJTYPE, name),\
+    .desc = offsetof(OBJTYPE, desc),\
+    .name_by_lang = offsetof(OBJTYPE, name_by_lang),\
+    .desc_by_lang = offsetof(OBJTYPE, desc_by_lang),\
+    .desc_any = DESC_ANY\
+}
+
+static const __COMPS_DocMatchInfo __comps_doc_groups_matchinfo =
+    COMPS_DOC_MATCHINFO(groups, COMPS_DocGroup, groups_index,
+                        groups_name_index, 1);
+static const __COMPS_DocMatchInfo __comps_doc_categories_matchinfo =
+    COMPS_DOC_MATCHINFO(categories, COMPS_DocCategory, categories_index,
+                        categories_name_index, 0);
+static const __COMPS_DocMatchInfo __comps_doc_envs_matchinfo =
+    COMPS_DOC_MATCHINFO(environments, COMPS_DocEnv, envs_index,
+                        envs_name_index, 0);
+
+#define __COMPS_DOC_MEMBER(PTR, OFFSET, TYPE) (*(TYPE*)((char*)(PTR) + (OFFSET)))
+
+static COMPS_Str* __comps_doc_match_lang(COMPS_Object *obj, size_t offset,
+                                         const char *lang) {
+    COMPS_ObjDict *dict = __COMPS_DOC_MEMBER(obj, offset, COMPS_ObjDict*);
+    return (dict) ? (COMPS_Str*)comps_objdict_get_x(dict, lang) : NULL;
+}
+
+static int __comps_doc_match_prop(const COMPS_Pattern *pattern,
+                                  const COMPS_Str *prop) {
+    return prop && prop->val && comps_pattern_match(pattern, prop);
+}
+
+/* properties are read without touching reference counters, cheapest
+ * checks go first */
+static int __comps_doc_match_obj(const __COMPS_DocMatchInfo *info,
+                                 const COMPS_DocMatch *match,
+                                 COMPS_Object *obj) {
+    COMPS_Str *prop;
+
+    if (match->id) {
+        prop = __COMPS_DOC_MEMBER(obj, info->id, COMPS_Str*);
+        if (!__comps_doc_match_prop(match->id, prop))
+            return 0;
+    }
+    if (match->name) {
+        if (match->lang)
+            prop = __comps_doc_match_lang(obj, info->name_by_lang,
+                                          match->lang);
+        else
+            prop = __COMPS_DOC_MEMBER(obj, info->name, COMPS_Str*);
+        if (!__comps_doc_match_prop(match->name, prop))
+            return 0;
+    }
+    if (match->desc) {
+        prop = __COMPS_DOC_MEMBER(obj, info->desc, COMPS_Str*);
+        if ((!match->lang || info->desc_any)
+            && __comps_doc_match_prop(match->desc, prop))
+            return 1;
+        if (!match->lang)
+            return 0;
+        prop = __comps_doc_match_lang(obj, info->desc_by_lang, match->lang);
+        if (!__comps_doc_match_prop(match->desc, prop))
+            return 0;
+    }
+    return 1;
+}
+
+/* return index which gives all candidates of query or NULL if whole list
+ * has to be scanned */
+static COMPS_DocIdIndex* __comps_doc_match_index(COMPS_Doc *doc,
+                                            const __COMPS_DocMatchInfo *info,
+                                            const COMPS_DocMatch *match,
+                                            const char **key) {
+    COMPS_DocIdIndex **index;
+    size_t offset;
+
+    if (match->id && match->id->type == COMPS_PATTERN_EXACT) {
+        index = &__COMPS_DOC_MEMBER(doc, info->id_index, COMPS_DocIdIndex*);
+        offset = info->id;
+        *key = match->id->literal;
+    } else if (match->name && !match->lang
+               && match->name->type == COMPS_PATTERN_EXACT) {
+        index = &__COMPS_DOC_MEMBER(doc, info->name_index, COMPS_DocIdIndex*);
+        offset = info->name;
+        *key = match->name->literal;
+    } else {
+        return NULL;
+    }
+    if (!*index)
+        *index = comps_doc_idindex_create(offset);
+    return *index;
+}
+
+static COMPS_ObjList* __comps_doc_match(COMPS_Doc *doc,
+                                        const __COMPS_DocMatchInfo *info,
+                                        COMPS_DocMatch **matches,
+                                        unsigned int count) {
+    COMPS_ObjList *ret, *list, **results;
+    COMPS_DocIdIndex *index;
+    COMPS_DocIdIndexItem *item;
+    COMPS_ObjListIt *it;
+    unsigned int *scan, scan_len = 0, x;
+    const char *key;
 
     ret = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
-    #define group ((COMPS_DocGroup*)it->comps_obj)
-
-    if (id != NULL) matched_max++;
-    if (name != NULL) matched_max++;
-    if (desc != NULL) matched_max++;
-
-    for (it = (groups)?groups->first:NULL; it != NULL; it = it->next) {
-        matched = 0;
-        tmp_prop = (COMPS_Str*)comps_docgroup_get_id(group);
-        if (id && tmp_prop && comps_str_fnmatch(tmp_prop, id, flags)) {
-            matched++;
-        }
-        COMPS_OBJECT_DESTROY(tmp_prop);
-        tmp_prop = (COMPS_Str*)comps_docgroup_get_name(group);
-        if (name && !lang && tmp_prop && comps_str_fnmatch(tmp_prop, name, flags))
-            matched++;
-        else if (name && lang != NULL) {
-            COMPS_OBJECT_DESTROY(tmp_prop);
-            tmp_prop = (COMPS_Str*)comps_objdict_get(group->name_by_lang, lang);
-            //printf("tmp_prop %s\n", tmp_prop->val);
-            if (tmp_prop && comps_str_fnmatch(tmp_prop, name, flags)) matched++;
-        }
-        COMPS_OBJECT_DESTROY(tmp_prop);
-        tmp_prop = (COMPS_Str*)comps_docgroup_get_desc(group);
-        if (desc && tmp_prop && comps_str_fnmatch(tmp_prop, desc, flags) == 1)
-            matched++;
-        else if (desc && lang != NULL) {
-            COMPS_OBJECT_DESTROY(tmp_prop);
-            tmp_prop = (COMPS_Str*)comps_objdict_get(group->desc_by_lang, lang);
-            if (tmp_prop && comps_str_fnmatch(tmp_prop, desc, flags)) matched++;
-        }
-        if (matched == matched_max) {
-            comps_objlist_append(ret, (COMPS_Object*)group);
-        }
-        COMPS_OBJECT_DESTROY(tmp_prop);
-    }
-    COMPS_OBJECT_DESTROY(objid);
-    COMPS_OBJECT_DESTROY(objname);
-    COMPS_OBJECT_DESTROY(objdesc);
-    COMPS_OBJECT_DESTROY(groups);
+    results = malloc(sizeof(COMPS_ObjList*) * (count + 1));
+    scan = malloc(sizeof(unsigned int) * (count + 1));
+    if (!results || !scan) {
+        free(results);
+        free(scan);
+        COMPS_OBJECT_DESTROY(ret);
+        return NULL;
+    }
+    list = __COMPS_DOC_MEMBER(doc, info->list, COMPS_ObjList*);
+    pthread_mutex_lock(&doc->lock);
+    for (x = 0; x < count; x++) {
+        results[x] = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+        comps_objlist_append_x(ret, (COMPS_Object*)results[x]);
+        if (!list || !matches[x])
+            continue;
+        index = __comps_doc_match_index(doc, info, matches[x], &key);
+        if (!index) {
+            scan[scan_len++] = x;
+            continue;
+        }
+        for (item = __comps_doc_idindex_lookup(index, list, key); item;
+             item = __comps_doc_idindex_next(index, item, key)) {
+            if (__comps_doc_match_obj(info, matches[x], item->obj))
+                comps_objlist_append(results[x], item->obj);
+        }
+    }
+    pthread_mutex_unlock(&doc->lock);
+    /* one pass over list for all queries without index */
+    for (it = (list && scan_len) ? list->first : NULL; it; it = it->next) {
+        for (x = 0; x < scan_len; x++) {
+            if (__comps_doc_match_obj(info, matches[scan[x]], it->comps_obj))
+                comps_objlist_append(results[scan[x]], it->comps_obj);
+        }
+    }
+    free(results);
+    free(scan);
     return ret;
-    #undef group
 }
 
-COMPS_ObjList* comps_doc_get_categories(COMPS_Doc *doc, char *id, char *name,
-                                        char *desc, char *lang, int flags) {
-    COMPS_ObjListIt *it;
+COMPS_ObjList* comps_doc_match_groups(COMPS_Doc *doc, COMPS_DocMatch **matches,
+                                      unsigned int count) {
+    return __comps_doc_match(doc, &__comps_doc_groups_matchinfo, matches,
+                             count);
+}
+
+COMPS_ObjList* comps_doc_match_categories(COMPS_Doc *doc,
+                                          COMPS_DocMatch **matches,
+                                          unsigned int count) {
+    return __comps_doc_match(doc, &__comps_doc_categories_matchinfo, matches,
+                             count);
+}
+
+COMPS_ObjList* comps_doc_match_envs(COMPS_Doc *doc, COMPS_DocMatch **matches,
+                                    unsigned int count) {
+    return __comps_doc_match(doc, &__comps_doc_envs_matchinfo, matches,
+                             count);
+}
+
+#define COMPS_DOC_GETOBJS(OBJS, MATCHF)\
+COMPS_ObjList* CONCAT(comps_doc_get_, OBJS)(COMPS_Doc *doc, char *id,\
+                                            char *name, char *desc,\
+                                            char *lang, int flags) {\
+    COMPS_DocMatch *match;\
+    COMPS_ObjList *results, *ret;\
+    match = comps_doc_match_create(id, name, desc, lang, flags);\
+    results = MATCHF(doc, &match, 1);\
+    comps_doc_match_destroy(match);\
+    if (!results)\
+        return NULL;\
+    ret = (COMPS_ObjList*)comps_object_incref(results->first->comps_obj);\
+    COMPS_OBJECT_DESTROY(results);\
+    return ret;\
+}
+
+COMPS_DOC_GETOBJS(groups, comps_doc_match_groups)
+COMPS_DOC_GETOBJS(categories, comps_doc_match_categories)
+COMPS_DOC_GETOBJS(envs, comps_doc_match_envs)
+
+COMPS_DocPkgIndex* comps_doc_pkgindex_create() {
+    COMPS_DocPkgIndex *index;
+    index = malloc(sizeof(COMPS_DocPkgIndex));
+    if (!index) return NULL;
+    index->groups = NULL;
+    index->groups_rev = 0;
+    comps_idrev_watch_init(&index->watch);
+    index->id_rev = 0;
+    index->snapshot = NULL;
+    index->groups_len = 0;
+    index->table = NULL;
+    index->items = NULL;
+    index->table_size = 0;
+    return index;
+}
+
+static void __comps_doc_pkgindex_clear(COMPS_DocPkgIndex *index) {
+    unsigned int i;
+    for (i = 0; i < index->groups_len; i++) {
+        COMPS_OBJECT_DESTROY(index->snapshot[i].packages);
+    }
+    free(index->snapshot);
+    free(index->table);
+    free(index->items);
+    index->snapshot = NULL;
+    index->groups_len = 0;
+    index->table = NULL;
+    index->items = NULL;
+    index->table_size = 0;
+    COMPS_OBJECT_DESTROY(index->groups);
+    index->groups = NULL;
+    comps_idrev_watch_clear(&index->watch);
+}
+
+void comps_doc_pkgindex_destroy(COMPS_DocPkgIndex *index) {
+    if (!index) return;
+    __comps_doc_pkgindex_clear(index);
+    comps_idrev_watch_destroy(&index->watch);
+    free(index);
+}
+
+/* index is up to date if neither groups list nor packages list of any group
+ * was replaced or modified. Indexed lists are referenced by index, so their
+ * addresses can't be reused by other lists meanwhile */
+static int __comps_doc_pkgindex_valid(COMPS_DocPkgIndex *index,
+                                      COMPS_ObjList *groups) {
+    COMPS_DocPkgIndexGroup *snap;
+    unsigned int i;
+
+    if (index->groups != groups || index->groups_rev != groups->rev
+        || !comps_idrev_watch_check(&index->watch, index->id_rev))
+        return 0;
+    for (i = 0, snap = index->snapshot; i < index->groups_len; i++, snap++) {
+        if (snap->group->packages != snap->packages)
+            return 0;
+        if (snap->packages && snap->packages->rev != snap->rev)
+            return 0;
+    }
+    return 1;
+}
+
+static void __comps_doc_pkgindex_build(COMPS_DocPkgIndex *index,
+                                       COMPS_ObjList *groups) {
+    COMPS_ObjListIt *it, *pkg_it;
+    COMPS_DocPkgIndexItem *item;
+    COMPS_DocPkgIndexGroup *snap;
+    COMPS_DocGroup *group;
+    COMPS_Str *name;
+    unsigned int i, size, count = 0;
+
+    __comps_doc_pkgindex_clear(index);
+    for (it = groups->first; it != NULL; it = it->next) {
+        group = (COMPS_DocGroup*)it->comps_obj;
+        if (group->packages)
+            count += group->packages->len;
+    }
+    for (size = 16; size < count + count / 2; size <<= 1);
+    index->table = calloc(size, sizeof(COMPS_DocPkgIndexItem*));
+    index->items = malloc(sizeof(COMPS_DocPkgIndexItem) * (count + 1));
+    index->snapshot = malloc(sizeof(COMPS_DocPkgIndexGroup)
+                             * (groups->len + 1));
+    if (!index->table || !index->items || !index->snapshot) {
+        __comps_doc_pkgindex_clear(index);
+        return;
+    }
+    index->table_size = size;
+    i = 0;
+    for (it = groups->first, snap = index->snapshot; it != NULL;
+         it = it->next, snap++) {
+        group = (COMPS_DocGroup*)it->comps_obj;
+        snap->group = group;
+        snap->packages = (COMPS_ObjList*)
+                         comps_object_incref((COMPS_Object*)group->packages);
+        snap->rev = (group->packages) ? group->packages->rev : 0;
+        index->groups_len++;
+        if (!group->packages)
+            continue;
+        for (pkg_it = group->packages->first; pkg_it != NULL;
+             pkg_it = pkg_it->next, i++) {
+            index->items[i].group = group;
+            index->items[i].package = (COMPS_DocGroupPackage*)
+                                      pkg_it->comps_obj;
+            name = index->items[i].package->name;
+            index->items[i].hash = (name)
+                                   ? comps_object_hash((COMPS_Object*)name)
+                                   : 0;
+            comps_idrev_watch_add(&index->watch,
+                                  &index->items[i].package->id_rev);
+        }
+    }
+    /* insert backwards, so buckets keep occurrences in document order */
+    for (; i > 0; i--) {
+        item = &index->items[i - 1];
+        item->next = index->table[item->hash & (size - 1)];
+        index->table[item->hash & (size - 1)] = item;
+    }
+    index->groups = (COMPS_ObjList*)
+                    comps_object_incref((COMPS_Object*)groups);
+    index->groups_rev = groups->rev;
+    index->id_rev = comps_idrev_watch_rev(&index->watch);
+}
+
+static COMPS_DocPkgIndexItem* __comps_doc_pkgindex_find(
+                                                COMPS_DocPkgIndexItem *item,
+                                                unsigned int hash,
+                                                const char *name) {
+    COMPS_Str *pkgname;
+    for (; item != NULL; item = item->next) {
+        if (item->hash != hash)
+            continue;
+        pkgname = item->package->name;
+        if (pkgname && pkgname->val && strcmp(pkgname->val, name) == 0)
+            return item;
+    }
+    return NULL;
+}
+
+COMPS_DocPkgIndexItem* comps_doc_pkgindex_get(COMPS_DocPkgIndex *index,
+                                              COMPS_ObjList *groups,
+                                              const char *name) {
+    unsigned int hash;
+
+    if (!index || !groups || !name) return NULL;
+    if (!__comps_doc_pkgindex_valid(index, groups)) {
+        __comps_doc_pkgindex_build(index, groups);
+    }
+    if (!index->table) return NULL;
+
+    hash = comps_str_hash(name);
+    return __comps_doc_pkgindex_find(index->table[hash
+                                                  & (index->table_size - 1)],
+                                     hash, name);
+}
+
+COMPS_DocPkgIndexItem* comps_doc_pkgindex_next(COMPS_DocPkgIndexItem *item) {
+    if (!item) return NULL;
+    return __comps_doc_pkgindex_find(item->next, item->hash,
+                                     item->package->name->val);
+}
+
+COMPS_DocPkgIndexItem* comps_doc_package_lookup(COMPS_Doc *doc,
+                                                const char *name) {
+    COMPS_DocPkgIndexItem *ret;
+
+    if (!doc->groups) return NULL;
+    pthread_mutex_lock(&doc->lock);
+    if (!doc->packages_index) {
+        doc->packages_index = comps_doc_pkgindex_create();
+    }
+    ret = comps_doc_pkgindex_get(doc->packages_index, doc->groups, name);
+    pthread_mutex_unlock(&doc->lock);
+    return ret;
+}
+
+COMPS_ObjList* comps_doc_groups_by_package(COMPS_Doc *doc, const char *name) {
+    COMPS_DocPkgIndexItem *item;
+    COMPS_DocGroup *last = NULL;
     COMPS_ObjList *ret;
-    unsigned int matched, matched_max;
-    matched_max = 0;
-    COMPS_ObjList *categories = comps_doc_categories(doc);
-    //COMPS_Object *tmp_prop;
-    COMPS_Str *objid, *objname, *objdesc, *tmp_prop;
-    objid = comps_str(id);
-    objname = comps_str(name);
-    objdesc = comps_str(desc);
 
     ret = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
-    #define category ((COMPS_DocCategory*)it->comps_obj)
-
-    if (id != NULL) matched_max++;
-    if (name != NULL) matched_max++;
-    if (desc != NULL) matched_max++;
-
-    for (it = (categories)?categories->first:NULL; it != NULL; it = it->next) {
-        matched = 0;
-        tmp_prop = (COMPS_Str*)comps_doccategory_get_id(category);
-        if (id && tmp_prop && comps_str_fnmatch(tmp_prop, id, flags)) {
-            matched++;
-        }
-        COMPS_OBJECT_DESTROY(tmp_prop);
-        tmp_prop = (COMPS_Str*)comps_doccategory_get_name(category);
-        if (name && !lang && tmp_prop && comps_str_fnmatch(tmp_prop, name, flags))
-            matched++;
-        else if (name && lang != NULL) {
-            COMPS_OBJECT_DESTROY(tmp_prop);
-            tmp_prop = (COMPS_Str*)comps_objdict_get(category->name_by_lang, lang);
-            if (tmp_prop && comps_str_fnmatch(tmp_prop, name, flags)) matched++;
-        }
-        COMPS_OBJECT_DESTROY(tmp_prop);
-        tmp_prop = (COMPS_Str*)comps_doccategory_get_desc(category);
-        if (desc && !lang && tmp_prop && comps_str_fnmatch(tmp_prop, desc, flags))
-            matched++;
-        else if (desc && lang != NULL) {
-            COMPS_OBJECT_DESTROY(tmp_prop);
-            tmp_prop = (COMPS_Str*)comps_objdict_get(category->desc_by_lang, lang);
-            if (tmp_prop && comps_str_fnmatch(tmp_prop, desc, flags)) matched++;
-        }
-        if (matched == matched_max) {
-            comps_objlist_append(ret, (COMPS_Object*)category);
-        }
-        COMPS_OBJECT_DESTROY(tmp_prop);
-    }
-    COMPS_OBJECT_DESTROY(objid);
-    COMPS_OBJECT_DESTROY(objname);
-    COMPS_OBJECT_DESTROY(objdesc);
-    COMPS_OBJECT_DESTROY(categories);
+    pthread_mutex_lock(&doc->lock);
+    for (item = comps_doc_package_lookup(doc, name); item != NULL;
+         item = comps_doc_pkgindex_next(item)) {
+        /* group could list same package more times */
+        if (item->group == last)
+            continue;
+        last = item->group;
+        comps_objlist_append(ret, (COMPS_Object*)item->group);
+    }
+    pthread_mutex_unlock(&doc->lock);
     return ret;
-    #undef category
 }
 
-COMPS_ObjList* comps_doc_get_envs(COMPS_Doc *doc, char *id, char *name,
-                                  char *desc, char *lang, int flags) {
+COMPS_DocGroupPackage* comps_doc_group_package(COMPS_Doc *doc,
+                                               COMPS_DocGroup *group,
+                                               const char *name) {
+    COMPS_DocPkgIndexItem *item;
+    COMPS_Object *ret = NULL;
+
+    pthread_mutex_lock(&doc->lock);
+    for (item = comps_doc_package_lookup(doc, name); item != NULL;
+         item = comps_doc_pkgindex_next(item)) {
+        if (item->group == group) {
+            ret = comps_object_incref((COMPS_Object*)item->package);
+            break;
+        }
+    }
+    pthread_mutex_unlock(&doc->lock);
+    return (COMPS_DocGroupPackage*)ret;
+}
+
+static void __comps_doc_closure_reset(COMPS_DocClosure *closure) {
+    unsigned int i;
+    for (i = 0; i < closure->deps_len; i++) {
+        COMPS_OBJECT_DESTROY(closure->deps[i].list);
+    }
+    free(closure->deps);
+    closure->deps = NULL;
+    closure->deps_len = 0;
+    closure->deps_size = 0;
+    COMPS_OBJECT_DESTROY(closure->packages);
+    closure->packages = NULL;
+}
+
+static void __comps_doc_closures_destroy(COMPS_DocClosureCache *cache) {
+    COMPS_DocClosure *closure, *next;
+    unsigned int i;
+
+    if (!cache) return;
+    for (i = 0; i < cache->table_size; i++) {
+        for (closure = cache->table[i]; closure != NULL; closure = next) {
+            next = closure->next;
+            __comps_doc_closure_reset(closure);
+            free(closure->key);
+            free(closure);
+        }
+    }
+    free(cache->table);
+    comps_idrev_watch_destroy(&cache->watch);
+    free(cache);
+}
+
+/* state of revisions of objects closure of kind could be resolved from.
+ * Groups, environments and categories are watched by id indexes of
+ * document, the rest by closure cache */
+static unsigned long __comps_doc_closure_rev(COMPS_Doc *doc, char kind,
+                                             char *failed) {
+    COMPS_DocIdIndex *index[2];
+    unsigned long ret;
+    unsigned int i;
+
+    index[0] = doc->groups_index;
+    index[1] = (kind == 'e') ? doc->envs_index : doc->categories_index;
+    ret = comps_idrev_watch_rev(&doc->closures->watch);
+    *failed = doc->closures->watch.failed;
+    for (i = 0; i < 2; i++) {
+        if (!index[i])
+            continue;
+        ret += comps_idrev_watch_rev(&index[i]->watch);
+        *failed |= index[i]->watch.failed;
+    }
+    return ret;
+}
+
+/* lists owned by objects found in earlier dependency lists are recorded
+ * after those, so owner is known to be alive when its slot is checked */
+static int __comps_doc_closure_valid(COMPS_Doc *doc,
+                                     COMPS_DocClosure *closure) {
+    COMPS_DocClosureDep *dep;
+    unsigned int i;
+    char failed;
+
+    if (!closure->packages
+        || __comps_doc_closure_rev(doc, closure->key[0], &failed)
+           != closure->id_rev || failed)
+        return 0;
+    for (i = 0, dep = closure->deps; i < closure->deps_len; i++, dep++) {
+        if (*dep->slot != dep->list)
+            return 0;
+        if (dep->list && dep->list->rev != dep->rev)
+            return 0;
+    }
+    return 1;
+}
+
+static int __comps_doc_closure_dep(COMPS_DocClosure *closure,
+                                   COMPS_ObjList **slot) {
+    COMPS_DocClosureDep *deps;
+    unsigned int size;
+
+    if (closure->deps_len == closure->deps_size) {
+        size = closure->deps_size ? closure->deps_size * 2 : 8;
+        deps = realloc(closure->deps, sizeof(COMPS_DocClosureDep) * size);
+        if (!deps)
+            return 0;
+        closure->deps = deps;
+        closure->deps_size = size;
+    }
+    deps = &closure->deps[closure->deps_len++];
+    deps->slot = slot;
+    deps->list = (COMPS_ObjList*)comps_object_incref((COMPS_Object*)*slot);
+    deps->rev = (*slot) ? (*slot)->rev : 0;
+    return 1;
+}
+
+static int __comps_doc_closure_groups(COMPS_Doc *doc,
+                                      COMPS_DocClosure *closure,
+                                      COMPS_Set *set, COMPS_ObjList *gids,
+                                      COMPS_ObjList *options, int types) {
+    COMPS_ObjListIt *it, *pkg_it, *opt_it;
+    COMPS_DocGroupId *gid;
+    COMPS_DocGroup *group;
+    COMPS_DocGroupPackage *pkg;
+    int ret = 1;
+
+    for (it = (gids) ? gids->first : NULL; it != NULL && ret; it = it->next) {
+        gid = (COMPS_DocGroupId*)it->comps_obj;
+        comps_idrev_watch_add(&doc->closures->watch, &gid->id_rev);
+        if (!gid->name)
+            continue;
+        if (options) {
+            for (opt_it = options->first; opt_it != NULL;
+                 opt_it = opt_it->next) {
+                if (comps_object_cmp(opt_it->comps_obj,
+                                     (COMPS_Object*)gid->name))
+                    break;
+            }
+            if (!opt_it)
+                continue;
+        }
+        group = comps_doc_group_by_id(doc, gid->name->val);
+        if (!group)
+            continue;
+        ret = __comps_doc_closure_dep(closure, &group->packages);
+        for (pkg_it = (group->packages) ? group->packages->first : NULL;
+             pkg_it != NULL && ret; pkg_it = pkg_it->next) {
+            pkg = (COMPS_DocGroupPackage*)pkg_it->comps_obj;
+            comps_idrev_watch_add(&doc->closures->watch, &pkg->id_rev);
+            if (pkg->name && (types & COMPS_PACKAGE_TYPE_MASK(pkg->type)))
+                comps_set_add(set, pkg);
+        }
+        COMPS_OBJECT_DESTROY(group);
+    }
+    return ret;
+}
+
+/* resolve closure of environment (kind 'e') or category (kind 'c') */
+static int __comps_doc_closure_resolve(COMPS_Doc *doc,
+                                       COMPS_DocClosure *closure, char kind,
+                                       const char *id, COMPS_ObjList *options,
+                                       int types) {
+    COMPS_DocEnv *env = NULL;
+    COMPS_DocCategory *cat = NULL;
+    COMPS_HSListItem *hsit;
+    COMPS_Set *set;
+    int ret;
+    char failed;
+
+    if (kind == 'e') {
+        if (!__comps_doc_closure_dep(closure, &doc->environments))
+            return 0;
+        if (!(env = comps_doc_environment_by_id(doc, id)))
+            return 0;
+    } else {
+        if (!__comps_doc_closure_dep(closure, &doc->categories))
+            return 0;
+        if (!(cat = comps_doc_category_by_id(doc, id)))
+            return 0;
+    }
+    if (env) {
+        ret = __comps_doc_closure_dep(closure, &env->group_list)
+              && __comps_doc_closure_dep(closure, &env->option_list);
+    } else {
+        ret = __comps_doc_closure_dep(closure, &cat->group_ids);
+    }
+    ret = ret && __comps_doc_closure_dep(closure, &doc->groups);
+
+    set = comps_set_create();
+    comps_set_init_hashed(set, NULL, NULL, NULL, &comps_docpackage_cmp_set,
+                          &comps_docpackage_hash_set);
+    if (env) {
+        ret = ret && __comps_doc_closure_groups(doc, closure, set,
+                                                env->group_list, NULL, types);
+        if (options) {
+            ret = ret && __comps_doc_closure_groups(doc, closure, set,
+                                                    env->option_list,
+                                                    options, types);
+        }
+    } else {
+        ret = ret && __comps_doc_closure_groups(doc, closure, set,
+                                                cat->group_ids, NULL, types);
+    }
+    /* all objects closure depends on are watched now */
+    closure->id_rev = __comps_doc_closure_rev(doc, kind, &failed);
+    if (ret) {
+        closure->packages = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+        for (hsit = set->data->first; hsit != NULL; hsit = hsit->next) {
+            comps_objlist_append(closure->packages, (COMPS_Object*)
+                                 ((COMPS_DocGroupPackage*)hsit->data)->name);
+        }
+    }
+    comps_set_destroy(&set);
+    COMPS_OBJECT_DESTROY(env);
+    COMPS_OBJECT_DESTROY(cat);
+    return ret;
+}
+
+static int __comps_doc_strcmp(const void *s1, const void *s2) {
+    return strcmp(*(char**)s1, *(char**)s2);
+}
+
+/* key doesn't depend on order of options, because result doesn't */
+static char* __comps_doc_closure_key(char kind, const char *id,
+                                     COMPS_ObjList *options, int types) {
     COMPS_ObjListIt *it;
+    char **opts = NULL, *key, *p;
+    size_t len, i, count = 0;
+
+    len = strlen(id) + 16;
+    if (options && options->len) {
+        opts = malloc(sizeof(char*) * options->len);
+        if (!opts)
+            return NULL;
+        for (it = options->first; it != NULL; it = it->next) {
+            opts[count] = ((COMPS_Str*)it->comps_obj)->val;
+            len += strlen(opts[count++]) + 1;
+        }
+        qsort(opts, count, sizeof(char*), &__comps_doc_strcmp);
+    }
+    if ((key = malloc(len)) != NULL) {
+        p = key + sprintf(key, "%c%x:%s", kind, (unsigned)types, id);
+        for (i = 0; i < count; i++) {
+            p += sprintf(p, "\n%s", opts[i]);
+        }
+    }
+    free(opts);
+    return key;
+}
+
+static int __comps_doc_closures_grow(COMPS_DocClosureCache *cache) {
+    COMPS_DocClosure **table, *closure, *next;
+    unsigned int i, size;
+
+    size = cache->table_size ? cache->table_size * 2 : 16;
+    if ((table = calloc(size, sizeof(COMPS_DocClosure*))) == NULL)
+        return 0;
+    for (i = 0; i < cache->table_size; i++) {
+        for (closure = cache->table[i]; closure != NULL; closure = next) {
+            next = closure->next;
+            closure->next = table[closure->hash & (size - 1)];
+            table[closure->hash & (size - 1)] = closure;
+        }
+    }
+    free(cache->table);
+    cache->table = table;
+    cache->table_size = size;
+    return 1;
+}
+
+static COMPS_ObjList* __comps_doc_closure_get(COMPS_Doc *doc, char kind,
+                                              const char *id,
+                                              COMPS_ObjList *options,
+                                              int types) {
+    COMPS_DocClosureCache *cache;
+    COMPS_DocClosure *closure = NULL;
+    unsigned int hash;
+    char *key;
+
+    if (!doc->closures) {
+        doc->closures = calloc(1, sizeof(COMPS_DocClosureCache));
+        if (!doc->closures) return NULL;
+        comps_idrev_watch_init(&doc->closures->watch);
+    }
+    cache = doc->closures;
+    if ((key = __comps_doc_closure_key(kind, id, options, types)) == NULL)
+        return NULL;
+    hash = comps_str_hash(key);
+    if (cache->table_size) {
+        for (closure = cache->table[hash & (cache->table_size - 1)];
+             closure != NULL; closure = closure->next) {
+            if (closure->hash == hash && strcmp(closure->key, key) == 0)
+                break;
+        }
+    }
+    if (closure) {
+        free(key);
+        if (__comps_doc_closure_valid(doc, closure))
+            return (COMPS_ObjList*)
+                   comps_object_share((COMPS_Object*)closure->packages);
+        __comps_doc_closure_reset(closure);
+    } else {
+        if (cache->count >= cache->table_size / 4 * 3
+            && !__comps_doc_closures_grow(cache)) {
+            free(key);
+            return NULL;
+        }
+        if ((closure = calloc(1, sizeof(COMPS_DocClosure))) == NULL) {
+            free(key);
+            return NULL;
+        }
+        closure->key = key;
+        closure->hash = hash;
+        closure->next = cache->table[hash & (cache->table_size - 1)];
+        cache->table[hash & (cache->table_size - 1)] = closure;
+        cache->count++;
+    }
+    if (!__comps_doc_closure_resolve(doc, closure, kind, id, options, types)) {
+        /* closure without packages is never valid, it's resolved again
+         * on next call */
+        __comps_doc_closure_reset(closure);
+        return NULL;
+    }
+    return (COMPS_ObjList*)comps_object_share((COMPS_Object*)closure->packages);
+}
+
+static COMPS_ObjList* __comps_doc_closure(COMPS_Doc *doc, char kind,
+                                          const char *id,
+                                          COMPS_ObjList *options, int types) {
     COMPS_ObjList *ret;
-    unsigned int matched, matched_max;
-    matched_max = 0;
-    COMPS_ObjList *envs = comps_doc_environments(doc);
-    //COMPS_Object *tmp_prop;
-    COMPS_Str *objid, *objname, *objdesc, *tmp_prop;
-    objid = comps_str(id);
-    objname = comps_str(name);
-    objdesc = comps_str(desc);
 
-    ret = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
-    #define env ((COMPS_DocEnv*)it->comps_obj)
-
-    if (id != NULL) matched_max++;
-    if (name != NULL) matched_max++;
-    if (desc != NULL) matched_max++;
-
-    for (it = (envs)?envs->first:NULL; it != NULL; it = it->next) {
-        matched = 0;
-        tmp_prop = (COMPS_Str*)comps_docenv_get_id(env);
-        if (id && tmp_prop && comps_str_fnmatch(tmp_prop, id, flags)) {
-            matched++;
-        }
-        COMPS_OBJECT_DESTROY(tmp_prop);
-        tmp_prop = (COMPS_Str*)comps_docenv_get_name(env);
-        if (name && !lang && tmp_prop && comps_str_fnmatch(tmp_prop, name, flags))
-            matched++;
-        else if (name && lang != NULL) {
-            COMPS_OBJECT_DESTROY(tmp_prop);
-            tmp_prop = (COMPS_Str*)comps_objdict_get(env->name_by_lang, lang);
-            if (tmp_prop && comps_str_fnmatch(tmp_prop, name, flags)) matched++;
-        }
-        COMPS_OBJECT_DESTROY(tmp_prop);
-        tmp_prop = (COMPS_Str*)comps_docenv_get_desc(env);
-        if (desc && !lang && tmp_prop && comps_str_fnmatch(tmp_prop, desc, flags))
-            matched++;
-        else if (desc && lang != NULL) {
-            COMPS_OBJECT_DESTROY(tmp_prop);
-            tmp_prop = (COMPS_Str*)comps_objdict_get(env->desc_by_lang, lang);
-            if (tmp_prop && comps_str_fnmatch(tmp_prop, desc, flags)) matched++;
-        }
-        if (matched == matched_max) {
-            comps_objlist_append(ret, (COMPS_Object*)env);
-        }
-        COMPS_OBJECT_DESTROY(tmp_prop);
-    }
-    COMPS_OBJECT_DESTROY(objid);
-    COMPS_OBJECT_DESTROY(objname);
-    COMPS_OBJECT_DESTROY(objdesc);
-    COMPS_OBJECT_DESTROY(envs);
+    if (!doc || !id) return NULL;
+    pthread_mutex_lock(&doc->lock);
+    ret = __comps_doc_closure_get(doc, kind, id, options, types);
+    pthread_mutex_unlock(&doc->lock);
     return ret;
-    #undef env
+}
+
+COMPS_ObjList* comps_doc_environment_packages(COMPS_Doc *doc, const char *id,
+                                              COMPS_ObjList *options,
+                                              int types) {
+    return __comps_doc_closure(doc, 'e', id, options, types);
+}
+
+COMPS_ObjList* comps_doc_category_packages(COMPS_Doc *doc, const char *id,
+                                           int types) {
+    return __comps_doc_closure(doc, 'c', id, NULL, types);
 }
 
 static signed char comps_doc_xml(COMPS_Doc *doc, xmlTextWriterPtr writer,
@@ -751,9 +1615,13 @@ static signed char comps_doc_xml(COMPS_Doc *doc, xmlTextWriterPtr writer,
                 xmlTextWriterWriteAttribute(writer, BAD_CAST "name",
                         (xmlChar*) ((COMPS_ObjRTreePair*)hsit->data)->key);
 
-                tmp = comps_object_tostr(it->comps_obj);
-                xmlTextWriterWriteAttribute(writer, BAD_CAST "arch", BAD_CAST tmp);
-                free(tmp);
+                /* package blacklisted for all arches has no arch */
+                if (((COMPS_Str*)it->comps_obj)->val) {
+                    tmp = comps_object_tostr(it->comps_obj);
+                    xmlTextWriterWriteAttribute(writer, BAD_CAST "arch",
+                                                BAD_CAST tmp);
+                    free(tmp);
+                }
 
                 retc = xmlTextWriterEndElement(writer);
                 if (__comps_check_xml_get(retc, (COMPS_Object*)doc->log) < 0) {
@@ -840,15 +1708,16 @@ void comps_doc_doctype_pubid_set(COMPS_Doc* doc, COMPS_Str *val) {
 }
 
 
-COMPS_Doc* comps_doc_arch_filter(COMPS_Doc *source, COMPS_ObjList *arches) {
+/* filter source by arches list directly, used for arches which don't fit
+ * into COMPS_ArchMap */
+static void __comps_doc_arch_filter_list(COMPS_Doc *source,
+                                         COMPS_ObjList *arches,
+                                         COMPS_Doc *ret) {
     COMPS_ObjList *list, *arches2;
-    COMPS_Doc *ret;
     COMPS_DocCategory *cat;
     COMPS_DocGroup *group;
     COMPS_DocEnv *env;
 
-    ret = COMPS_OBJECT_CREATE(COMPS_Doc, (COMPS_Object*[])
-                                         {(COMPS_Object*)source->encoding});
     list = comps_doc_categories(source);
     for (COMPS_ObjListIt *it = list->first; it != NULL; it = it->next) {
         arches2 = comps_doccategory_arches((COMPS_DocCategory*)it->comps_obj);
@@ -885,6 +1754,101 @@ COMPS_Doc* comps_doc_arch_filter(COMPS_Doc *source, COMPS_ObjList *arches) {
         COMPS_OBJECT_DESTROY(arches2);
     }
     COMPS_OBJECT_DESTROY(list);
+}
+
+/* filter every object of list by all masks. Arches of object are looked up
+ * once, filtered object is passed only to documents whose mask intersects
+ * them */
+#define COMPS_DOC_ARCH_FILTER_OBJS(LIST, OBJTYPE, FILTERF, ADDF)\
+    for (it = source->LIST ? source->LIST->first : NULL; it != NULL;\
+         it = it->next) {\
+        mask = comps_archmap_mask(map, ((OBJTYPE*)it->comps_obj)->arches);\
+        for (x = 0, passed = 0; x < count; x++) {\
+            obj_masks[x] = (mask & masks[x]) ? masks[x] : 0;\
+            passed |= (obj_masks[x] != 0);\
+        }\
+        if (!passed)\
+            continue;\
+        FILTERF((OBJTYPE*)it->comps_obj, map, obj_masks, count,\
+                (OBJTYPE**)objs);\
+        for (x = 0; x < count; x++) {\
+            if (objs[x])\
+                ADDF(docs[x], (OBJTYPE*)objs[x]);\
+        }\
+    }
+
+static void __comps_doc_arch_filter_masks(COMPS_Doc *source,
+                                          const COMPS_ArchMap *map,
+                                          const COMPS_ArchMask *masks,
+                                          unsigned int count,
+                                          COMPS_Doc **docs) {
+    COMPS_ArchMask mask, *obj_masks;
+    COMPS_Object **objs;
+    COMPS_ObjListIt *it;
+    unsigned int x;
+    char passed;
+
+    obj_masks = malloc(sizeof(COMPS_ArchMask) * count);
+    objs = malloc(sizeof(COMPS_Object*) * count);
+    COMPS_DOC_ARCH_FILTER_OBJS(categories, COMPS_DocCategory,
+                               comps_doccategory_arch_filter_multi,
+                               comps_doc_add_category)
+    COMPS_DOC_ARCH_FILTER_OBJS(groups, COMPS_DocGroup,
+                               comps_docgroup_arch_filter_multi,
+                               comps_doc_add_group)
+    COMPS_DOC_ARCH_FILTER_OBJS(environments, COMPS_DocEnv,
+                               comps_docenv_arch_filter_multi,
+                               comps_doc_add_environment)
+    free(obj_masks);
+    free(objs);
+}
+
+COMPS_ObjList* comps_doc_arch_filter_multi(COMPS_Doc *source,
+                                           COMPS_ObjList **arches,
+                                           unsigned int count) {
+    COMPS_ObjList *ret;
+    COMPS_ArchMap map;
+    COMPS_ArchMask *masks;
+    COMPS_Doc **docs;
+    unsigned int x, y;
+
+    ret = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+    masks = malloc(sizeof(COMPS_ArchMask) * (count + 1));
+    docs = malloc(sizeof(COMPS_Doc*) * (count + 1));
+    for (x = 0; x < count; x++) {
+        docs[x] = COMPS_OBJECT_CREATE(COMPS_Doc, (COMPS_Object*[])
+                                        {(COMPS_Object*)source->encoding});
+        comps_objlist_append_x(ret, (COMPS_Object*)docs[x]);
+    }
+    /* arch sets are processed in runs fitting into single map, usually
+     * all of them at once */
+    for (x = 0; x < count; x = y) {
+        comps_archmap_init(&map);
+        for (y = x; y < count; y++) {
+            if (comps_archmap_add(&map, arches[y], &masks[y]))
+                break;
+        }
+        if (y == x) {
+            __comps_doc_arch_filter_list(source, arches[x], docs[x]);
+            y++;
+        } else {
+            __comps_doc_arch_filter_masks(source, &map, masks + x, y - x,
+                                          docs + x);
+        }
+        comps_archmap_clear(&map);
+    }
+    free(masks);
+    free(docs);
+    return ret;
+}
+
+COMPS_Doc* comps_doc_arch_filter(COMPS_Doc *source, COMPS_ObjList *arches) {
+    COMPS_ObjList *docs;
+    COMPS_Doc *ret;
+
+    docs = comps_doc_arch_filter_multi(source, &arches, 1);
+    ret = (COMPS_Doc*)comps_object_incref(docs->first->comps_obj);
+    COMPS_OBJECT_DESTROY(docs);
     return ret;
 }
 
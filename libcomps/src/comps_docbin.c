@@ -0,0 +1,831 @@
+/* libcomps - C alternative to yum.comps library
+ * Copyright (C) 2013 Jindrich Luza
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * any later version.
+ *
+ * This program is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to  Free Software
+ * Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301,
+ * USA
+ */
+
+/* fileno, mmap and posix_madvise */
+#define _POSIX_C_SOURCE 200112L
+
+#include <errno.h>
+#include <fcntl.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <string.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+#include "comps_docbin.h"
+#include "comps_set.h"
+
+#define __COMPS_DOCBIN_MAGIC "COMPSBIN"
+#define __COMPS_DOCBIN_BOM 0x01020304u
+
+/* All numbers in file are uint32_t words in native byte order. Strings
+ * are referenced by their offset in string table plus one, zero reference
+ * is NULL string. Lists and dictionaries start with number of items plus
+ * one, zero means NULL list */
+typedef struct {
+    char magic[8];
+    uint32_t version;
+    uint32_t byte_order;
+    uint32_t checksum; /* Adler-32 of everything following header */
+    uint32_t strings_len; /* length of string table */
+    uint32_t records_len; /* length of object records */
+    uint32_t counts[3];
+    /* number of groups, categories and environments plus one, zero for
+     * NULL list. Indexes of their record offsets follow records */
+} __COMPS_DocBinHeader;
+
+typedef enum {
+    __COMPS_BIN_END,
+    __COMPS_BIN_STR,
+    __COMPS_BIN_ISTR, /* interned string */
+    __COMPS_BIN_NUM,
+    __COMPS_BIN_ENUM,
+    __COMPS_BIN_BOOL,
+    __COMPS_BIN_ARCHES, /* list of interned strings */
+    __COMPS_BIN_DICT,
+    __COMPS_BIN_IDICT, /* dictionary with interned values */
+    __COMPS_BIN_MDICT, /* multi-dictionary with interned values */
+    __COMPS_BIN_LIST /* list of objects */
+} __COMPS_DocBinKind;
+
+/* tags of values in dictionaries */
+#define __COMPS_BIN_TAG_NULL 0
+#define __COMPS_BIN_TAG_STR 1
+#define __COMPS_BIN_TAG_NUM 2
+
+/* presence of member in loaded object. Loading fails if required member
+ * is NULL. __COMPS_BIN_STROBJ string member is never NULL, NULL reference
+ * is loaded as string object without value */
+#define __COMPS_BIN_OPTIONAL 0
+#define __COMPS_BIN_REQUIRED 1
+#define __COMPS_BIN_STROBJ 2
+
+typedef struct __COMPS_DocBinType __COMPS_DocBinType;
+
+typedef struct {
+    size_t offset;
+    __COMPS_DocBinKind kind;
+    const __COMPS_DocBinType *items; /* type of items of __COMPS_BIN_LIST */
+    char presence;
+} __COMPS_DocBinField;
+
+/* layout of object record, fields are stored in order of table */
+struct __COMPS_DocBinType {
+    COMPS_ObjectInfo *obj_info;
+    const __COMPS_DocBinField *fields;
+};
+
+#define __COMPS_BIN_FIELD(OBJTYPE, MEMBER, KIND)\
+    {offsetof(OBJTYPE, MEMBER), __COMPS_BIN_##KIND, NULL, __COMPS_BIN_OPTIONAL}
+#define __COMPS_BIN_FIELD_P(OBJTYPE, MEMBER, KIND, PRESENCE)\
+    {offsetof(OBJTYPE, MEMBER), __COMPS_BIN_##KIND, NULL,\
+     __COMPS_BIN_##PRESENCE}
+#define __COMPS_BIN_LIST_FIELD(OBJTYPE, MEMBER, ITEMS)\
+    {offsetof(OBJTYPE, MEMBER), __COMPS_BIN_LIST, ITEMS, __COMPS_BIN_REQUIRED}
+#define __COMPS_BIN_FIELD_END {0, __COMPS_BIN_END, NULL, __COMPS_BIN_OPTIONAL}
+
+static const __COMPS_DocBinType __comps_docbin_package = {
+    &COMPS_DocGroupPackage_ObjInfo, (const __COMPS_DocBinField[]){
+    __COMPS_BIN_FIELD(COMPS_DocGroupPackage, type, ENUM),
+    __COMPS_BIN_FIELD(COMPS_DocGroupPackage, name, ISTR),
+    __COMPS_BIN_FIELD(COMPS_DocGroupPackage, requires, ISTR),
+    __COMPS_BIN_FIELD(COMPS_DocGroupPackage, basearchonly, NUM),
+    __COMPS_BIN_FIELD(COMPS_DocGroupPackage, arches, ARCHES),
+    __COMPS_BIN_FIELD_END}
+};
+
+static const __COMPS_DocBinType __comps_docbin_groupid = {
+    &COMPS_DocGroupId_ObjInfo, (const __COMPS_DocBinField[]){
+    __COMPS_BIN_FIELD(COMPS_DocGroupId, name, ISTR),
+    __COMPS_BIN_FIELD(COMPS_DocGroupId, def, BOOL),
+    __COMPS_BIN_FIELD(COMPS_DocGroupId, arches, ARCHES),
+    __COMPS_BIN_FIELD_END}
+};
+
+#define __COMPS_BIN_DOCOBJ_FIELDS(OBJTYPE)\
+    __COMPS_BIN_FIELD(OBJTYPE, id, ISTR),\
+    __COMPS_BIN_FIELD(OBJTYPE, name, STR),\
+    __COMPS_BIN_FIELD(OBJTYPE, desc, STR),\
+    __COMPS_BIN_FIELD(OBJTYPE, display_order, NUM),\
+    __COMPS_BIN_FIELD(OBJTYPE, arches, ARCHES),\
+    __COMPS_BIN_FIELD(OBJTYPE, properties, DICT),\
+    __COMPS_BIN_FIELD_P(OBJTYPE, name_by_lang, DICT, REQUIRED),\
+    __COMPS_BIN_FIELD_P(OBJTYPE, desc_by_lang, DICT, REQUIRED)
+
+static const __COMPS_DocBinType __comps_docbin_group = {
+    &COMPS_DocGroup_ObjInfo, (const __COMPS_DocBinField[]){
+    __COMPS_BIN_DOCOBJ_FIELDS(COMPS_DocGroup),
+    __COMPS_BIN_FIELD(COMPS_DocGroup, def, NUM),
+    __COMPS_BIN_FIELD(COMPS_DocGroup, uservisible, NUM),
+    __COMPS_BIN_FIELD(COMPS_DocGroup, biarchonly, NUM),
+    __COMPS_BIN_FIELD(COMPS_DocGroup, langonly, STR),
+    __COMPS_BIN_LIST_FIELD(COMPS_DocGroup, packages, &__comps_docbin_package),
+    __COMPS_BIN_FIELD_END}
+};
+
+static const __COMPS_DocBinType __comps_docbin_category = {
+    &COMPS_DocCategory_ObjInfo, (const __COMPS_DocBinField[]){
+    __COMPS_BIN_DOCOBJ_FIELDS(COMPS_DocCategory),
+    __COMPS_BIN_LIST_FIELD(COMPS_DocCategory, group_ids,
+                           &__comps_docbin_groupid),
+    __COMPS_BIN_FIELD_END}
+};
+
+static const __COMPS_DocBinType __comps_docbin_env = {
+    &COMPS_DocEnv_ObjInfo, (const __COMPS_DocBinField[]){
+    __COMPS_BIN_DOCOBJ_FIELDS(COMPS_DocEnv),
+    __COMPS_BIN_LIST_FIELD(COMPS_DocEnv, group_list, &__comps_docbin_groupid),
+    __COMPS_BIN_LIST_FIELD(COMPS_DocEnv, option_list,
+                           &__comps_docbin_groupid),
+    __COMPS_BIN_FIELD_END}
+};
+
+static const __COMPS_DocBinType __comps_docbin_doc = {
+    &COMPS_Doc_ObjInfo, (const __COMPS_DocBinField[]){
+    __COMPS_BIN_FIELD(COMPS_Doc, encoding, STR),
+    __COMPS_BIN_FIELD_P(COMPS_Doc, doctype_name, STR, REQUIRED),
+    __COMPS_BIN_FIELD_P(COMPS_Doc, doctype_sysid, STR, STROBJ),
+    __COMPS_BIN_FIELD_P(COMPS_Doc, doctype_pubid, STR, STROBJ),
+    __COMPS_BIN_FIELD(COMPS_Doc, lang, STR),
+    __COMPS_BIN_FIELD(COMPS_Doc, langpacks, IDICT),
+    __COMPS_BIN_FIELD(COMPS_Doc, blacklist, MDICT),
+    __COMPS_BIN_FIELD(COMPS_Doc, whiteout, MDICT),
+    __COMPS_BIN_FIELD_END}
+};
+
+/* document lists stored through indexes, in order of header counts */
+static const struct {
+    size_t offset;
+    const __COMPS_DocBinType *type;
+} __comps_docbin_lists[] = {
+    {offsetof(COMPS_Doc, groups), &__comps_docbin_group},
+    {offsetof(COMPS_Doc, categories), &__comps_docbin_category},
+    {offsetof(COMPS_Doc, environments), &__comps_docbin_env}
+};
+
+#define __COMPS_DOCBIN_MEMBER(PTR, OFFSET, TYPE)\
+    (*(TYPE*)((char*)(PTR) + (OFFSET)))
+
+static uint32_t __comps_docbin_adler32(uint32_t adler, const char *data,
+                                       size_t len) {
+    uint32_t a = adler & 0xffff, b = adler >> 16;
+    size_t n;
+
+    while (len) {
+        /* largest block which can't overflow b */
+        n = (len < 5552) ? len : 5552;
+        len -= n;
+        while (n--) {
+            a += (unsigned char)*data++;
+            b += a;
+        }
+        a %= 65521;
+        b %= 65521;
+    }
+    return (b << 16) | a;
+}
+
+/* Saving */
+
+typedef struct {
+    char *data;
+    size_t len, size;
+} __COMPS_DocBinBuff;
+
+typedef struct __COMPS_DocBinWriter __COMPS_DocBinWriter;
+
+/* string stored in string table or looked up there */
+typedef struct {
+    __COMPS_DocBinWriter *writer;
+    const char *val; /* value of looked up string */
+    uint32_t len;
+    uint32_t hash;
+    uint32_t ref; /* reference of stored string, value is in table */
+} __COMPS_DocBinString;
+
+struct __COMPS_DocBinWriter {
+    __COMPS_DocBinBuff strings, records, index;
+    COMPS_Set *table; /* __COMPS_DocBinString items */
+    char error;
+};
+
+static const char* __comps_docbin_string_val(__COMPS_DocBinString *str) {
+    if (!str->ref)
+        return str->val;
+    /* table is reallocated as it grows, so value isn't kept as pointer */
+    return str->writer->strings.data + str->ref - 1 + sizeof(uint32_t);
+}
+
+static unsigned int __comps_docbin_string_hash(void *str) {
+    return ((__COMPS_DocBinString*)str)->hash;
+}
+
+static char __comps_docbin_string_eq(void *str1, void *str2) {
+    #define _str1 ((__COMPS_DocBinString*)str1)
+    #define _str2 ((__COMPS_DocBinString*)str2)
+    return _str1->len == _str2->len
+           && memcmp(__comps_docbin_string_val(_str1),
+                     __comps_docbin_string_val(_str2), _str1->len) == 0;
+    #undef _str1
+    #undef _str2
+}
+
+static void* __comps_docbin_reserve(__COMPS_DocBinWriter *writer,
+                                    __COMPS_DocBinBuff *buff, size_t len) {
+    size_t size;
+    char *data;
+
+    if (buff->len + len > buff->size) {
+        for (size = buff->size ? buff->size * 2 : 4096;
+             size < buff->len + len; size *= 2);
+        if (size > UINT32_MAX || (data = realloc(buff->data, size)) == NULL) {
+            writer->error = 1;
+            return NULL;
+        }
+        buff->data = data;
+        buff->size = size;
+    }
+    buff->len += len;
+    return buff->data + buff->len - len;
+}
+
+static void __comps_docbin_put(__COMPS_DocBinWriter *writer,
+                               __COMPS_DocBinBuff *buff, uint32_t word) {
+    void *dst;
+    if ((dst = __comps_docbin_reserve(writer, buff, sizeof(uint32_t))))
+        memcpy(dst, &word, sizeof(uint32_t));
+}
+
+static void __comps_docbin_put_string(__COMPS_DocBinWriter *writer,
+                                      const char *val, uint32_t len,
+                                      uint32_t hash) {
+    __COMPS_DocBinString key, *str;
+    size_t padded;
+    char *dst;
+
+    if (!val) {
+        __comps_docbin_put(writer, &writer->records, 0);
+        return;
+    }
+    key.writer = writer;
+    key.val = val;
+    key.len = len;
+    key.hash = hash;
+    key.ref = 0;
+    str = comps_set_data_at(writer->table, &key);
+    if (!str) {
+        /* length, value, NUL and padding to word boundary */
+        padded = (sizeof(uint32_t) + len + 1 + 3) & ~(size_t)3;
+        if (!(str = malloc(sizeof(*str)))
+            || !(dst = __comps_docbin_reserve(writer, &writer->strings,
+                                              padded))) {
+            free(str);
+            writer->error = 1;
+            return;
+        }
+        memcpy(dst, &len, sizeof(uint32_t));
+        memcpy(dst + sizeof(uint32_t), val, len);
+        memset(dst + sizeof(uint32_t) + len, 0,
+               padded - sizeof(uint32_t) - len);
+        *str = key;
+        str->val = NULL;
+        str->ref = (uint32_t)(dst - writer->strings.data) + 1;
+        comps_set_add(writer->table, str);
+    }
+    __comps_docbin_put(writer, &writer->records, str->ref);
+}
+
+static void __comps_docbin_put_str(__COMPS_DocBinWriter *writer,
+                                   COMPS_Str *str) {
+    if (!str || !str->val)
+        __comps_docbin_put_string(writer, NULL, 0, 0);
+    else
+        __comps_docbin_put_string(writer, str->val, str->len,
+                                  comps_object_hash((COMPS_Object*)str));
+}
+
+static void __comps_docbin_put_key(__COMPS_DocBinWriter *writer,
+                                   const char *key) {
+    __comps_docbin_put_string(writer, key, strlen(key), comps_str_hash(key));
+}
+
+static void __comps_docbin_put_value(__COMPS_DocBinWriter *writer,
+                                     COMPS_Object *obj) {
+    if (!obj) {
+        __comps_docbin_put(writer, &writer->records, __COMPS_BIN_TAG_NULL);
+    } else if (obj->obj_info == &COMPS_Str_ObjInfo) {
+        __comps_docbin_put(writer, &writer->records, __COMPS_BIN_TAG_STR);
+        __comps_docbin_put_str(writer, (COMPS_Str*)obj);
+    } else if (obj->obj_info == &COMPS_Num_ObjInfo) {
+        __comps_docbin_put(writer, &writer->records, __COMPS_BIN_TAG_NUM);
+        __comps_docbin_put(writer, &writer->records,
+                           (uint32_t)((COMPS_Num*)obj)->val);
+    } else {
+        writer->error = 1;
+        errno = EINVAL;
+    }
+}
+
+static uint32_t __comps_docbin_count(COMPS_HSList *pairs) {
+    COMPS_HSListItem *hsit;
+    uint32_t count = 0;
+    for (hsit = pairs->first; hsit != NULL; hsit = hsit->next, count++);
+    return count;
+}
+
+static void __comps_docbin_put_obj(__COMPS_DocBinWriter *writer,
+                                   const __COMPS_DocBinType *type,
+                                   COMPS_Object *obj) {
+    const __COMPS_DocBinField *field;
+    COMPS_HSList *pairs;
+    COMPS_HSListItem *hsit;
+    COMPS_ObjListIt *it;
+    COMPS_Object *member;
+
+    for (field = type->fields; field->kind != __COMPS_BIN_END; field++) {
+        member = __COMPS_DOCBIN_MEMBER(obj, field->offset, COMPS_Object*);
+        switch (field->kind) {
+            case __COMPS_BIN_STR:
+            case __COMPS_BIN_ISTR:
+                __comps_docbin_put_str(writer, (COMPS_Str*)member);
+            break;
+            case __COMPS_BIN_NUM:
+                if (member && member->obj_info != &COMPS_Num_ObjInfo) {
+                    writer->error = 1;
+                    errno = EINVAL;
+                }
+                __comps_docbin_put_value(writer, member);
+            break;
+            case __COMPS_BIN_ENUM:
+                __comps_docbin_put(writer, &writer->records,
+                        (uint32_t)__COMPS_DOCBIN_MEMBER(obj, field->offset,
+                                                        COMPS_PackageType));
+            break;
+            case __COMPS_BIN_BOOL:
+                __comps_docbin_put(writer, &writer->records,
+                        __COMPS_DOCBIN_MEMBER(obj, field->offset, bool));
+            break;
+            case __COMPS_BIN_ARCHES:
+            case __COMPS_BIN_LIST:
+                if (!member) {
+                    __comps_docbin_put(writer, &writer->records, 0);
+                    break;
+                }
+                __comps_docbin_put(writer, &writer->records,
+                                   ((COMPS_ObjList*)member)->len + 1);
+                for (it = ((COMPS_ObjList*)member)->first; it != NULL;
+                     it = it->next) {
+                    if (field->kind == __COMPS_BIN_LIST)
+                        __comps_docbin_put_obj(writer, field->items,
+                                               it->comps_obj);
+                    else
+                        __comps_docbin_put_str(writer,
+                                               (COMPS_Str*)it->comps_obj);
+                }
+            break;
+            case __COMPS_BIN_DICT:
+            case __COMPS_BIN_IDICT:
+                if (!member) {
+                    __comps_docbin_put(writer, &writer->records, 0);
+                    break;
+                }
+                pairs = comps_objdict_pairs((COMPS_ObjDict*)member);
+                __comps_docbin_put(writer, &writer->records,
+                                   __comps_docbin_count(pairs) + 1);
+                for (hsit = pairs->first; hsit != NULL; hsit = hsit->next) {
+                    __comps_docbin_put_key(writer,
+                                    ((COMPS_ObjRTreePair*)hsit->data)->key);
+                    __comps_docbin_put_value(writer,
+                                    ((COMPS_ObjRTreePair*)hsit->data)->data);
+                }
+                comps_hslist_destroy(&pairs);
+            break;
+            case __COMPS_BIN_MDICT:
+                if (!member) {
+                    __comps_docbin_put(writer, &writer->records, 0);
+                    break;
+                }
+                pairs = comps_objmdict_pairs((COMPS_ObjMDict*)member);
+                __comps_docbin_put(writer, &writer->records,
+                                   __comps_docbin_count(pairs) + 1);
+                for (hsit = pairs->first; hsit != NULL; hsit = hsit->next) {
+                    #define _pair ((COMPS_ObjMRTreePair*)hsit->data)
+                    __comps_docbin_put_key(writer, _pair->key);
+                    __comps_docbin_put(writer, &writer->records,
+                                       _pair->data ? _pair->data->len : 0);
+                    for (it = _pair->data ? _pair->data->first : NULL;
+                         it != NULL; it = it->next)
+                        __comps_docbin_put_value(writer, it->comps_obj);
+                    #undef _pair
+                }
+                comps_hslist_destroy(&pairs);
+            break;
+            case __COMPS_BIN_END:
+            break;
+        }
+    }
+}
+
+static signed char __comps_docbin_write(FILE *f, const void *data,
+                                        size_t len) {
+    return (len && fwrite(data, 1, len, f) != len) ? -1 : 0;
+}
+
+signed char comps_doc_save_bin(COMPS_Doc *doc, const char *filename) {
+    __COMPS_DocBinWriter writer;
+    __COMPS_DocBinHeader header;
+    COMPS_ObjList *list;
+    COMPS_ObjListIt *it;
+    signed char ret = -1;
+    unsigned int i;
+    FILE *f = NULL;
+
+    memset(&writer, 0, sizeof(writer));
+    memset(&header, 0, sizeof(header));
+    errno = 0;
+    writer.table = comps_set_create();
+    comps_set_init_hashed(writer.table, NULL, NULL, &free,
+                          &__comps_docbin_string_eq,
+                          &__comps_docbin_string_hash);
+
+    __comps_docbin_put_obj(&writer, &__comps_docbin_doc, (COMPS_Object*)doc);
+    for (i = 0; i < 3; i++) {
+        list = __COMPS_DOCBIN_MEMBER(doc, __comps_docbin_lists[i].offset,
+                                     COMPS_ObjList*);
+        header.counts[i] = (list) ? list->len + 1 : 0;
+        for (it = list ? list->first : NULL; it != NULL; it = it->next) {
+            __comps_docbin_put(&writer, &writer.index,
+                               (uint32_t)writer.records.len);
+            __comps_docbin_put_obj(&writer, __comps_docbin_lists[i].type,
+                                   it->comps_obj);
+        }
+    }
+    if (writer.error) {
+        if (!errno)
+            errno = ENOMEM;
+        goto out;
+    }
+
+    memcpy(header.magic, __COMPS_DOCBIN_MAGIC, sizeof(header.magic));
+    header.version = COMPS_DOCBIN_VERSION;
+    header.byte_order = __COMPS_DOCBIN_BOM;
+    header.strings_len = (uint32_t)writer.strings.len;
+    header.records_len = (uint32_t)writer.records.len;
+    header.checksum = __comps_docbin_adler32(1, writer.strings.data,
+                                             writer.strings.len);
+    header.checksum = __comps_docbin_adler32(header.checksum,
+                                             writer.records.data,
+                                             writer.records.len);
+    header.checksum = __comps_docbin_adler32(header.checksum,
+                                             writer.index.data,
+                                             writer.index.len);
+    if ((f = fopen(filename, "wb")) == NULL)
+        goto out;
+    if (__comps_docbin_write(f, &header, sizeof(header))
+        || __comps_docbin_write(f, writer.strings.data, writer.strings.len)
+        || __comps_docbin_write(f, writer.records.data, writer.records.len)
+        || __comps_docbin_write(f, writer.index.data, writer.index.len))
+        goto out;
+    ret = 0;
+
+    out:
+    if (f && fclose(f) != 0)
+        ret = -1;
+    comps_set_destroy(&writer.table);
+    free(writer.strings.data);
+    free(writer.records.data);
+    free(writer.index.data);
+    return ret;
+}
+
+/* Loading */
+
+typedef struct {
+    const char *strings;
+    uint32_t strings_len;
+    const char *records;
+    const uint32_t *pos, *end; /* read position in records */
+    COMPS_Str **interned; /* interned strings by their string table slot */
+    char error;
+} __COMPS_DocBinReader;
+
+static uint32_t __comps_docbin_get(__COMPS_DocBinReader *reader) {
+    if (reader->pos >= reader->end) {
+        reader->error = 1;
+        return 0;
+    }
+    return *reader->pos++;
+}
+
+/* return value of string referenced at read position, NULL for NULL
+ * reference or invalid one (error is set then) */
+static const char* __comps_docbin_get_string(__COMPS_DocBinReader *reader,
+                                             uint32_t *len, uint32_t *ref) {
+    uint32_t offset;
+
+    *ref = __comps_docbin_get(reader);
+    if (*ref == 0)
+        return NULL;
+    offset = *ref - 1;
+    if (offset % sizeof(uint32_t) || reader->strings_len < sizeof(uint32_t)
+        || offset > reader->strings_len - sizeof(uint32_t)) {
+        reader->error = 1;
+        return NULL;
+    }
+    memcpy(len, reader->strings + offset, sizeof(uint32_t));
+    offset += sizeof(uint32_t);
+    if (*len >= reader->strings_len - offset
+        || reader->strings[offset + *len] != 0) {
+        reader->error = 1;
+        return NULL;
+    }
+    return reader->strings + offset;
+}
+
+static COMPS_Str* __comps_docbin_get_str(__COMPS_DocBinReader *reader,
+                                         char intern) {
+    const char *val;
+    uint32_t len, ref;
+    COMPS_Str **slot;
+
+    if (!(val = __comps_docbin_get_string(reader, &len, &ref)))
+        return NULL;
+    if (!intern)
+        return comps_str_n(val, len);
+    slot = &reader->interned[(ref - 1) / sizeof(uint32_t)];
+    if (!*slot)
+        *slot = comps_str_intern(val);
+    return (COMPS_Str*)comps_object_incref((COMPS_Object*)*slot);
+}
+
+static COMPS_Object* __comps_docbin_get_value(__COMPS_DocBinReader *reader,
+                                              char intern) {
+    COMPS_Str *str;
+
+    switch (__comps_docbin_get(reader)) {
+        case __COMPS_BIN_TAG_NULL:
+            return NULL;
+        case __COMPS_BIN_TAG_STR:
+            /* string object without value (blacklist package without arch)
+             * isn't the same as missing value */
+            str = __comps_docbin_get_str(reader, intern);
+            if (!str && !reader->error)
+                str = comps_str(NULL);
+            return (COMPS_Object*)str;
+        case __COMPS_BIN_TAG_NUM:
+            return (COMPS_Object*)comps_num(
+                                        (int)__comps_docbin_get(reader));
+    }
+    reader->error = 1;
+    return NULL;
+}
+
+/* replace member with newly created object or NULL. Return member */
+static COMPS_Object* __comps_docbin_get_member(__COMPS_DocBinReader *reader,
+                                               COMPS_Object **member,
+                                               const __COMPS_DocBinField *field,
+                                               COMPS_ObjectInfo *obj_info,
+                                               uint32_t count) {
+    if (count == 0 && field->presence == __COMPS_BIN_REQUIRED)
+        reader->error = 1;
+    if (count == 0) {
+        COMPS_OBJECT_DESTROY(*member);
+        *member = NULL;
+    } else if (!*member) {
+        *member = comps_object_create(obj_info, NULL);
+    }
+    return *member;
+}
+
+static COMPS_Object* __comps_docbin_get_obj(__COMPS_DocBinReader *reader,
+                                            const __COMPS_DocBinType *type,
+                                            COMPS_Object *obj) {
+    const __COMPS_DocBinField *field;
+    COMPS_Object **member, *value;
+    const char *key;
+    uint32_t count, values, len, ref;
+
+    if (!obj)
+        obj = comps_object_create(type->obj_info, NULL);
+    for (field = type->fields;
+         field->kind != __COMPS_BIN_END && !reader->error; field++) {
+        member = &__COMPS_DOCBIN_MEMBER(obj, field->offset, COMPS_Object*);
+        switch (field->kind) {
+            case __COMPS_BIN_STR:
+            case __COMPS_BIN_ISTR:
+            case __COMPS_BIN_NUM:
+                COMPS_OBJECT_DESTROY(*member);
+                if (field->kind != __COMPS_BIN_NUM) {
+                    *member = (COMPS_Object*)__comps_docbin_get_str(reader,
+                                        field->kind == __COMPS_BIN_ISTR);
+                    if (*member || reader->error)
+                        break;
+                    if (field->presence == __COMPS_BIN_REQUIRED)
+                        reader->error = 1;
+                    else if (field->presence == __COMPS_BIN_STROBJ)
+                        *member = (COMPS_Object*)comps_str(NULL);
+                } else if ((*member = __comps_docbin_get_value(reader, 0))
+                         && (*member)->obj_info != &COMPS_Num_ObjInfo)
+                    reader->error = 1;
+            break;
+            case __COMPS_BIN_ENUM:
+                count = __comps_docbin_get(reader);
+                if (count > COMPS_PACKAGE_UNKNOWN)
+                    reader->error = 1;
+                __COMPS_DOCBIN_MEMBER(obj, field->offset, COMPS_PackageType)
+                                    = (COMPS_PackageType)count;
+            break;
+            case __COMPS_BIN_BOOL:
+                __COMPS_DOCBIN_MEMBER(obj, field->offset, bool)
+                                    = __comps_docbin_get(reader) != 0;
+            break;
+            case __COMPS_BIN_ARCHES:
+            case __COMPS_BIN_LIST:
+                count = __comps_docbin_get(reader);
+                if (!__comps_docbin_get_member(reader, member, field,
+                                               &COMPS_ObjList_ObjInfo, count))
+                    break;
+                for (; count > 1 && !reader->error; count--) {
+                    if (field->kind == __COMPS_BIN_LIST)
+                        value = __comps_docbin_get_obj(reader, field->items,
+                                                       NULL);
+                    else
+                        value = (COMPS_Object*)__comps_docbin_get_str(reader,
+                                                                      1);
+                    comps_objlist_append_x((COMPS_ObjList*)*member, value);
+                }
+            break;
+            case __COMPS_BIN_DICT:
+            case __COMPS_BIN_IDICT:
+            case __COMPS_BIN_MDICT:
+                count = __comps_docbin_get(reader);
+                if (!__comps_docbin_get_member(reader, member, field,
+                                (field->kind == __COMPS_BIN_MDICT)
+                                    ? &COMPS_ObjMDict_ObjInfo
+                                    : &COMPS_ObjDict_ObjInfo, count))
+                    break;
+                for (; count > 1 && !reader->error; count--) {
+                    key = __comps_docbin_get_string(reader, &len, &ref);
+                    if (!key) {
+                        reader->error = 1;
+                        break;
+                    }
+                    if (field->kind != __COMPS_BIN_MDICT) {
+                        value = __comps_docbin_get_value(reader,
+                                            field->kind == __COMPS_BIN_IDICT);
+                        /* dictionaries don't hold NULL values */
+                        if (!value) {
+                            reader->error = 1;
+                            break;
+                        }
+                        comps_objdict_set_x((COMPS_ObjDict*)*member,
+                                            (char*)key, value);
+                        continue;
+                    }
+                    for (values = __comps_docbin_get(reader);
+                         values > 0 && !reader->error; values--) {
+                        value = __comps_docbin_get_value(reader, 1);
+                        if (!value) {
+                            reader->error = 1;
+                            break;
+                        }
+                        comps_objmdict_set_x((COMPS_ObjMDict*)*member,
+                                             (char*)key, value);
+                    }
+                }
+            break;
+            case __COMPS_BIN_END:
+            break;
+        }
+    }
+    return obj;
+}
+
+static COMPS_Doc* __comps_docbin_load(const char *data, size_t len) {
+    __COMPS_DocBinHeader header;
+    __COMPS_DocBinReader reader;
+    const uint32_t *index, *records_end;
+    COMPS_ObjList **list;
+    COMPS_Doc *doc;
+    size_t index_len = 0, x;
+    uint32_t i, count;
+
+    if (len < sizeof(header)) {
+        errno = EINVAL;
+        return NULL;
+    }
+    memcpy(&header, data, sizeof(header));
+    for (i = 0; i < 3; i++)
+        index_len += (header.counts[i]) ? header.counts[i] - 1 : 0;
+    if (memcmp(header.magic, __COMPS_DOCBIN_MAGIC, sizeof(header.magic))
+        || header.version != COMPS_DOCBIN_VERSION
+        || header.byte_order != __COMPS_DOCBIN_BOM
+        || header.strings_len % sizeof(uint32_t)
+        || header.records_len % sizeof(uint32_t)
+        || len - sizeof(header) != (size_t)header.strings_len
+                                   + header.records_len
+                                   + index_len * sizeof(uint32_t)
+        || header.checksum != __comps_docbin_adler32(1, data + sizeof(header),
+                                                     len - sizeof(header))) {
+        errno = EINVAL;
+        return NULL;
+    }
+
+    memset(&reader, 0, sizeof(reader));
+    reader.strings = data + sizeof(header);
+    reader.strings_len = header.strings_len;
+    reader.records = reader.strings + header.strings_len;
+    records_end = (const uint32_t*)(reader.records + header.records_len);
+    index = records_end;
+    reader.interned = calloc(header.strings_len / sizeof(uint32_t) + 1,
+                             sizeof(COMPS_Str*));
+    if (!reader.interned) {
+        errno = ENOMEM;
+        return NULL;
+    }
+
+    reader.pos = (const uint32_t*)reader.records;
+    reader.end = records_end;
+    doc = (COMPS_Doc*)__comps_docbin_get_obj(&reader, &__comps_docbin_doc,
+                                             NULL);
+    for (i = 0; i < 3 && !reader.error; i++) {
+        list = &__COMPS_DOCBIN_MEMBER(doc, __comps_docbin_lists[i].offset,
+                                      COMPS_ObjList*);
+        if (!(count = header.counts[i]))
+            continue;
+        *list = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+        for (; count > 1 && !reader.error; count--, index++) {
+            if (*index % sizeof(uint32_t) || *index >= header.records_len) {
+                reader.error = 1;
+                break;
+            }
+            reader.pos = (const uint32_t*)(reader.records + *index);
+            comps_objlist_append_x(*list, __comps_docbin_get_obj(&reader,
+                                            __comps_docbin_lists[i].type,
+                                            NULL));
+        }
+    }
+
+    for (x = 0; x < header.strings_len / sizeof(uint32_t); x++)
+        COMPS_OBJECT_DESTROY(reader.interned[x]);
+    free(reader.interned);
+    if (reader.error) {
+        COMPS_OBJECT_DESTROY(doc);
+        errno = EINVAL;
+        return NULL;
+    }
+    return doc;
+}
+
+COMPS_Doc* comps_doc_load_bin(const char *filename) {
+    struct stat st;
+    COMPS_Doc *doc;
+    void *map;
+    int fd, err;
+
+    if ((fd = open(filename, O_RDONLY)) < 0)
+        return NULL;
+    if (fstat(fd, &st) != 0) {
+        err = errno;
+        close(fd);
+        errno = err;
+        return NULL;
+    }
+    if (!S_ISREG(st.st_mode)
+        || (uintmax_t)st.st_size < sizeof(__COMPS_DocBinHeader)
+        || (uintmax_t)st.st_size > SIZE_MAX) {
+        close(fd);
+        errno = EINVAL;
+        return NULL;
+    }
+    map = mmap(NULL, (size_t)st.st_size, PROT_READ, MAP_PRIVATE, fd, 0);
+    err = errno;
+    close(fd);
+    if (map == MAP_FAILED) {
+        errno = err;
+        return NULL;
+    }
+    posix_madvise(map, (size_t)st.st_size, POSIX_MADV_SEQUENTIAL);
+    doc = __comps_docbin_load(map, (size_t)st.st_size);
+    err = errno;
+    munmap(map, (size_t)st.st_size);
+    errno = err;
+    return doc;
+}
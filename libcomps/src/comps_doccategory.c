@@ -22,36 +22,55 @@
 
 void comps_doccategory_create(COMPS_DocCategory *category, COMPS_Object **args) {
     (void)args;
-    category->properties = COMPS_OBJECT_CREATE(COMPS_ObjDict, NULL);
+    category->id = NULL;
+    category->name = NULL;
+    category->desc = NULL;
+    category->display_order = NULL;
+    category->arches = NULL;
+    category->properties = NULL;
     category->name_by_lang = COMPS_OBJECT_CREATE(COMPS_ObjDict, NULL);
     category->desc_by_lang = COMPS_OBJECT_CREATE(COMPS_ObjDict, NULL);
     category->group_ids = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+    category->id_rev = NULL;
 }
 COMPS_CREATE_u(doccategory, COMPS_DocCategory)  /*comps_utils.h macro*/
 
 void comps_doccategory_copy(COMPS_DocCategory *category_dst,
                             COMPS_DocCategory *category_src) {
-    category_dst->properties = (COMPS_ObjDict*)
-                                COMPS_OBJECT_COPY(category_src->properties);
-    category_dst->name_by_lang = (COMPS_ObjDict*)
-                                COMPS_OBJECT_COPY(category_src->name_by_lang);
-    category_dst->desc_by_lang = (COMPS_ObjDict*)
-                                COMPS_OBJECT_COPY(category_src->desc_by_lang);
-    category_dst->group_ids = (COMPS_ObjList*)
-                                COMPS_OBJECT_COPY(category_src->group_ids);
+    /* members are shared copy-on-write, exposed ones are copied */
+    #define _SHARE(TYPE, MEMBER)\
+        category_dst->MEMBER = (TYPE*)comps_object_share(\
+                                        (COMPS_Object*)category_src->MEMBER)
+    _SHARE(COMPS_Str, id);
+    _SHARE(COMPS_Str, name);
+    _SHARE(COMPS_Str, desc);
+    _SHARE(COMPS_Num, display_order);
+    _SHARE(COMPS_ObjList, arches);
+    _SHARE(COMPS_ObjDict, properties);
+    _SHARE(COMPS_ObjDict, name_by_lang);
+    _SHARE(COMPS_ObjDict, desc_by_lang);
+    _SHARE(COMPS_ObjList, group_ids);
+    #undef _SHARE
+    category_dst->id_rev = NULL;
 }
 COMPS_COPY_u(doccategory, COMPS_DocCategory)    /*comps_utils.h macro*/
 
 static void comps_doccategory_destroy(COMPS_DocCategory *category) {
+    COMPS_OBJECT_DESTROY(category->id);
+    COMPS_OBJECT_DESTROY(category->name);
+    COMPS_OBJECT_DESTROY(category->desc);
+    COMPS_OBJECT_DESTROY(category->display_order);
+    COMPS_OBJECT_DESTROY(category->arches);
     COMPS_OBJECT_DESTROY(category->properties);
     COMPS_OBJECT_DESTROY(category->name_by_lang);
     COMPS_OBJECT_DESTROY(category->desc_by_lang);
     COMPS_OBJECT_DESTROY(category->group_ids);
+    comps_idrev_release(category->id_rev);
 }
 COMPS_DESTROY_u(doccategory, COMPS_DocCategory) /*comps_utils.h macro*/
 
-COMPS_STRPROP_SETTER(category, COMPS_DocCategory, id) /*comps_utils.h macro*/
-COMPS_STRPROP_SETTER(category, COMPS_DocCategory, name) /*comps_utils.h macro*/
+COMPS_IDPROP_SETTER(category, COMPS_DocCategory) /*comps_utils.h macro*/
+COMPS_NAMEPROP_SETTER(category, COMPS_DocCategory) /*comps_utils.h macro*/
 COMPS_STRPROP_SETTER(category, COMPS_DocCategory, desc) /*comps_utils.h macro*/
 COMPS_NUMPROP_SETTER(category, COMPS_DocCategory, display_order) /*comps_utils.h macro*/
 
@@ -77,6 +96,7 @@ void comps_doccategory_add_groupid(COMPS_DocCategory *category,
     if (category->group_ids == NULL) {
         category->group_ids = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
     }
+    comps_object_unshare((COMPS_Object**)&category->group_ids);
     comps_objlist_append_x(category->group_ids, (COMPS_Object*)gid);
 }
 
@@ -84,8 +104,12 @@ signed char comps_doccategory_cmp_u(COMPS_Object *cat1, COMPS_Object *cat2) {
     #define _cat1 ((COMPS_DocCategory*)cat1)
     #define _cat2 ((COMPS_DocCategory*)cat2)
 
-    if (!comps_object_cmp((COMPS_Object*)_cat1->properties,
-                          (COMPS_Object*)_cat2->properties)) {
+    if (!COMPS_OBJECT_CMP(_cat1->id, _cat2->id) ||
+        !COMPS_OBJECT_CMP(_cat1->name, _cat2->name) ||
+        !COMPS_OBJECT_CMP(_cat1->desc, _cat2->desc) ||
+        !COMPS_OBJECT_CMP(_cat1->display_order, _cat2->display_order) ||
+        !COMPS_OBJECT_CMP(_cat1->arches, _cat2->arches) ||
+        !comps_objdict_equal(_cat1->properties, _cat2->properties)) {
         //printf("Category properties cmp fail\n");
         return 0;
     }
@@ -111,14 +135,12 @@ signed char comps_doccategory_cmp_u(COMPS_Object *cat1, COMPS_Object *cat2) {
 }
 
 char __comps_doccategory_idcmp(void *c1, void *c2) {
-    COMPS_Object *obj1, *obj2;
-    char ret;
-    obj1 = comps_objdict_get(((COMPS_DocCategory*)c1)->properties, "id");
-    obj2 = comps_objdict_get(((COMPS_DocCategory*)c2)->properties, "id");
-    ret = comps_object_cmp(obj1, obj2);
-    COMPS_OBJECT_DESTROY(obj1);
-    COMPS_OBJECT_DESTROY(obj2);
-    return ret;
+    return COMPS_OBJECT_CMP(((COMPS_DocCategory*)c1)->id,
+                            ((COMPS_DocCategory*)c2)->id);
+}
+
+unsigned int __comps_doccategory_idhash(void *c) {
+    return comps_object_hash((COMPS_Object*)((COMPS_DocCategory*)c)->id);
 }
 
 COMPS_DocCategory* comps_doccategory_union(COMPS_DocCategory *c1,
@@ -127,16 +149,37 @@ COMPS_DocCategory* comps_doccategory_union(COMPS_DocCategory *c1,
     COMPS_ObjListIt *it;
     COMPS_Set *set;
     COMPS_Object *obj;
+    COMPS_ObjList *list;
     void *data;
     int index;
 
     res = COMPS_OBJECT_CREATE(COMPS_DocCategory,NULL);
-    COMPS_OBJECT_DESTROY(res->properties);
-
-    res->properties = comps_objdict_union(c1->properties, c2->properties);
+    #define _PROP_UNION(TYPE, PROP)\
+        res->PROP = (TYPE*)__comps_prop_union((COMPS_Object*)c1->PROP,\
+                                              (COMPS_Object*)c2->PROP)
+    _PROP_UNION(COMPS_Str, id);
+    _PROP_UNION(COMPS_Str, name);
+    _PROP_UNION(COMPS_Str, desc);
+    _PROP_UNION(COMPS_Num, display_order);
+    _PROP_UNION(COMPS_ObjList, arches);
+    #undef _PROP_UNION
+    res->properties = comps_objdict_union_share(c1->properties,
+                                                c2->properties);
+    COMPS_OBJECT_DESTROY(res->name_by_lang);
+    COMPS_OBJECT_DESTROY(res->desc_by_lang);
+    res->name_by_lang = comps_objdict_union_share(c1->name_by_lang,
+                                                  c2->name_by_lang);
+    res->desc_by_lang = comps_objdict_union_share(c1->desc_by_lang,
+                                                  c2->desc_by_lang);
+    if ((list = __comps_list_union(c1->group_ids, c2->group_ids)) != NULL) {
+        COMPS_OBJECT_DESTROY(res->group_ids);
+        res->group_ids = list;
+        return res;
+    }
     set = comps_set_create();
-    comps_set_init(set, NULL, NULL, &comps_object_destroy_v,
-                                    &__comps_docgroupid_cmp_set);
+    comps_set_init_hashed(set, NULL, NULL, &comps_object_destroy_v,
+                               &__comps_docgroupid_cmp_set,
+                               &__comps_docgroupid_hash_set);
     it = c1->group_ids?c1->group_ids->first:NULL;
     for (; it != NULL; it = it->next) {
         obj = comps_object_copy(it->comps_obj);
@@ -156,10 +199,6 @@ COMPS_DocCategory* comps_doccategory_union(COMPS_DocCategory *c1,
         }
     }
     comps_set_destroy(&set);
-    COMPS_OBJECT_DESTROY(res->name_by_lang);
-    COMPS_OBJECT_DESTROY(res->desc_by_lang);
-    res->name_by_lang = comps_objdict_union(c1->name_by_lang, c2->name_by_lang);
-    res->desc_by_lang = comps_objdict_union(c1->desc_by_lang, c2->desc_by_lang);
     return res;
 }
 
@@ -167,32 +206,23 @@ COMPS_DocCategory* comps_doccategory_intersect(COMPS_DocCategory *c1,
                                          COMPS_DocCategory *c2) {
     COMPS_DocCategory *res;
     COMPS_ObjListIt *it;
-    COMPS_HSListItem *hsit;
     COMPS_Set *set;
 
-    COMPS_HSList *pairs1, *pairs2;
-
     res = COMPS_OBJECT_CREATE(COMPS_DocCategory, NULL);
-    set = comps_set_create();
-    comps_set_init(set, NULL, NULL, NULL, &comps_objrtree_paircmp);
+    #define _PROP_INTERSECT(TYPE, PROP)\
+        res->PROP = (TYPE*)__comps_prop_intersect((COMPS_Object*)c1->PROP,\
+                                                  (COMPS_Object*)c2->PROP)
+    _PROP_INTERSECT(COMPS_Str, id);
+    _PROP_INTERSECT(COMPS_Str, name);
+    _PROP_INTERSECT(COMPS_Str, desc);
+    _PROP_INTERSECT(COMPS_Num, display_order);
+    _PROP_INTERSECT(COMPS_ObjList, arches);
+    #undef _PROP_INTERSECT
+    res->properties = comps_objdict_intersect(c1->properties, c2->properties);
 
-    pairs1 = comps_objdict_pairs(c1->properties);
-    for (hsit = pairs1->first; hsit != NULL; hsit = hsit->next) {
-        comps_set_add(set, hsit->data);
-        
-    }
-    pairs2 = comps_objdict_pairs(c2->properties);
-    for (hsit = pairs2->first; hsit != NULL; hsit = hsit->next) {
-        if (comps_set_in(set, hsit->data)) {
-            comps_objdict_set(res->properties, ((COMPS_RTreePair*)hsit->data)->key,
-                  ((COMPS_RTreePair*)hsit->data)->data);
-        }
-    }
-    comps_hslist_destroy(&pairs1);
-    comps_hslist_destroy(&pairs2);
-    comps_set_clear(set);
-
-    comps_set_init(set, NULL, NULL, NULL, &__comps_docgroupid_cmp_set);
+    set = comps_set_create();
+    comps_set_init_hashed(set, NULL, NULL, NULL, &__comps_docgroupid_cmp_set,
+                               &__comps_docgroupid_hash_set);
 
     for (it = c1->group_ids->first; it != NULL; it = it->next) {
         comps_set_add(set, it->comps_obj);
@@ -217,6 +247,10 @@ signed char comps_doccategory_xml(COMPS_DocCategory *category,
     COMPS_HSListItem *hsit;
 
     static char* props[] = {"id", "name", "name", "desc", "desc", "display_order"};
+    static size_t fields[] = {offsetof(COMPS_DocCategory, id),
+                              offsetof(COMPS_DocCategory, name), 0,
+                              offsetof(COMPS_DocCategory, desc), 0,
+                              offsetof(COMPS_DocCategory, display_order)};
     static size_t type[] =   {0, 0, offsetof(COMPS_DocCategory, name_by_lang),
                            0, offsetof(COMPS_DocCategory, desc_by_lang), 0};
     static char* aliases[] = {NULL, NULL, NULL, "description", "description", NULL};
@@ -239,7 +273,7 @@ signed char comps_doccategory_xml(COMPS_DocCategory *category,
     }
     for (int i=0; i<6; i++) {
         if (!type[i]) {
-            obj = comps_objdict_get_x(category->properties, props[i]);
+            obj = *(COMPS_Object**)(((char*)category)+fields[i]);
             if (obj) {
                 str = comps_object_tostr(obj);
                 __comps_xml_prop((aliases[i])?aliases[i]:props[i], str, writer);
@@ -339,29 +373,57 @@ char* comps_doccategory_tostr_u(COMPS_Object* cat) {
     #undef _cat_
 }
 
-COMPS_DocCategory* comps_doccategory_arch_filter(COMPS_DocCategory *source,
-                                                 COMPS_ObjList *arches) {
-    COMPS_ObjList *arches2;
+/* return category sharing everything but group ids with source, reference
+ * of group_ids is stolen */
+static COMPS_DocCategory* __comps_doccategory_arch_filtered(
+                                                COMPS_DocCategory *source,
+                                                COMPS_ObjList *group_ids) {
     COMPS_DocCategory *ret = COMPS_OBJECT_CREATE(COMPS_DocCategory, NULL);
-    COMPS_OBJECT_DESTROY(ret->properties);
-    ret->properties = (COMPS_ObjDict*)COMPS_OBJECT_COPY(source->properties);
+    ret->id = (COMPS_Str*)comps_object_share((COMPS_Object*)source->id);
+    ret->name = (COMPS_Str*)comps_object_share((COMPS_Object*)source->name);
+    ret->desc = (COMPS_Str*)comps_object_share((COMPS_Object*)source->desc);
+    ret->display_order = (COMPS_Num*)
+                    comps_object_share((COMPS_Object*)source->display_order);
+    ret->arches = (COMPS_ObjList*)
+                    comps_object_share((COMPS_Object*)source->arches);
+    ret->properties = (COMPS_ObjDict*)
+                    comps_object_share((COMPS_Object*)source->properties);
     COMPS_OBJECT_DESTROY(ret->name_by_lang);
-    ret->name_by_lang = (COMPS_ObjDict*)COMPS_OBJECT_COPY(source->name_by_lang);
+    ret->name_by_lang = (COMPS_ObjDict*)
+                    comps_object_share((COMPS_Object*)source->name_by_lang);
     COMPS_OBJECT_DESTROY(ret->desc_by_lang);
-    ret->desc_by_lang = (COMPS_ObjDict*)COMPS_OBJECT_COPY(source->desc_by_lang);
-    for (COMPS_ObjListIt *it = source->group_ids->first;
-         it != NULL; it = it->next) {
-        arches2 = comps_docgroupid_arches((COMPS_DocGroupId*)it->comps_obj);
-        if (!arches2) continue;
-        if (__comps_objlist_intersected(arches, arches2)) {
-            comps_doccategory_add_groupid(ret, (COMPS_DocGroupId*)
-                                          comps_object_copy(it->comps_obj));
-        }
-        COMPS_OBJECT_DESTROY(arches2);
-    }
+    ret->desc_by_lang = (COMPS_ObjDict*)
+                    comps_object_share((COMPS_Object*)source->desc_by_lang);
+    COMPS_OBJECT_DESTROY(ret->group_ids);
+    ret->group_ids = group_ids;
     return ret;
 }
 
+COMPS_DocCategory* comps_doccategory_arch_filter(COMPS_DocCategory *source,
+                                                 COMPS_ObjList *arches) {
+    return __comps_doccategory_arch_filtered(source,
+                    __comps_docgroupids_arch_filter(source->group_ids, arches));
+}
+
+void comps_doccategory_arch_filter_multi(COMPS_DocCategory *source,
+                                         const COMPS_ArchMap *map,
+                                         const COMPS_ArchMask *masks,
+                                         unsigned int count,
+                                         COMPS_DocCategory **ret) {
+    COMPS_ObjList **group_ids;
+    unsigned int x;
+
+    group_ids = malloc(sizeof(COMPS_ObjList*) * count);
+    __comps_docgroupids_arch_filter_multi(source->group_ids, map, masks,
+                                          count, group_ids);
+    for (x = 0; x < count; x++) {
+        ret[x] = (group_ids[x])
+                 ? __comps_doccategory_arch_filtered(source, group_ids[x])
+                 : NULL;
+    }
+    free(group_ids);
+}
+
 COMPS_ObjectInfo COMPS_DocCategory_ObjInfo = {
     .obj_size = sizeof(COMPS_DocCategory),
     .constructor = &comps_doccategory_create_u,
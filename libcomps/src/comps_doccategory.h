@@ -48,12 +48,20 @@
 /** COMPS_Object derivate representing category element in comps.xml structure*/
 typedef struct {
     COMPS_Object_HEAD;
-    COMPS_ObjDict *properties; /**< properties of category */
+    COMPS_Str *id; /**< category id */
+    COMPS_Str *name; /**< category name */
+    COMPS_Str *desc; /**< category description */
+    COMPS_Num *display_order; /**< category display order */
+    COMPS_ObjList *arches; /**< arches category is limited to */
+    COMPS_ObjDict *properties;
+    /**< other properties of category, NULL until first one is set */
     COMPS_ObjDict *name_by_lang; /**<language localization of name attribute*/
     COMPS_ObjDict *desc_by_lang;
     /**<language localization of description attribute */
     COMPS_ObjList *group_ids;
     /**< list of group_ids */
+    COMPS_IdRev *id_rev;
+    /**< revision of id and name, NULL until category is indexed */
 } COMPS_DocCategory;
 COMPS_Object_TAIL(COMPS_DocCategory);
 
@@ -140,7 +148,8 @@ HEAD_COMPS_PROP_GETTER(category, COMPS_DocCategory, display_order) /*comps_utils
 /** COMPS_DocCategory group_ids list getter
  * @param obj COMPS_DocCategory object
  * @return COMPS_ObjList object with group_ids items. Reference of object isn't
- * incremented
+ * incremented. List isn't shared with copies of object made
+ * afterwards, so it could be modified
  */
 HEAD_COMPS_DOCOBJ_GETOBJLIST(doccategory, COMPS_DocCategory, group_ids, group_ids)
 /**@}*/
@@ -163,6 +172,7 @@ HEAD_COMPS_DOCOBJ_GETARCHES(doccategory, COMPS_DocCategory)
 HEAD_COMPS_DOCOBJ_SETARCHES(doccategory, COMPS_DocCategory)
 
 char __comps_doccategory_idcmp(void *c1, void *c2);
+unsigned int __comps_doccategory_idhash(void *c);
 
 /** COMPS_DocCategory compare callback
  * @param cat1 COMPS_DocCategory object
@@ -202,5 +212,14 @@ signed char comps_doccategory_xml(COMPS_DocCategory *category,
 COMPS_DocCategory* comps_doccategory_arch_filter(COMPS_DocCategory *source,
                                                  COMPS_ObjList *arches);
 
+/** Filter category group ids by several arch masks at once
+ * @see comps_docgroup_arch_filter_multi
+ */
+void comps_doccategory_arch_filter_multi(COMPS_DocCategory *source,
+                                         const COMPS_ArchMap *map,
+                                         const COMPS_ArchMask *masks,
+                                         unsigned int count,
+                                         COMPS_DocCategory **ret);
+
 extern COMPS_ValRuleGeneric* COMPS_DocCategory_ValidateRules[];
 #endif
@@ -0,0 +1,640 @@
+/* libcomps - C alternative to yum.comps library
+ * Copyright (C) 2013 Jindrich Luza
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * any later version.
+ *
+ * This program is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to  Free Software
+ * Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301,
+ * USA
+ */
+
+#include "comps_docdiff.h"
+#include "comps_set.h"
+
+#include <stddef.h>
+#include <stdint.h>
+#include <stdlib.h>
+
+#define __COMPS_DOCDIFF_MEMBER(PTR, OFFSET, TYPE)\
+    (*(TYPE*)((char*)(PTR) + (OFFSET)))
+
+/* layout of compared objects and their lists in document */
+typedef struct {
+    size_t list, id_index, items, items_len;
+    size_t id, name, desc, name_by_lang, desc_by_lang, properties;
+    size_t attrs[7];
+    /**< other properties compared by comps_object_cmp, 0 terminated */
+    size_t content, options; /**< content lists, options is 0 if none */
+    unsigned int (*content_hash)(void*);
+} __COMPS_DocDiffInfo;
+
+#define COMPS_DOCDIFF_INFO(OBJS, INDEX, ITEMS, OBJTYPE)\
+    .list = offsetof(COMPS_Doc, OBJS),\
+    .id_index = offsetof(COMPS_Doc, INDEX),\
+    .items = offsetof(COMPS_DocDiff, ITEMS),\
+    .items_len = offsetof(COMPS_DocDiff, ITEMS##_len),\
+    .id = offsetof(OBJTYPE, id),\
+    .name = offsetof(OBJTYPE, name),\
+    .desc = offsetof(OBJTYPE, desc),\
+    .name_by_lang = offsetof(OBJTYPE, name_by_lang),\
+    .desc_by_lang = offsetof(OBJTYPE, desc_by_lang),\
+    .properties = offsetof(OBJTYPE, properties)
+
+static const __COMPS_DocDiffInfo __comps_docdiff_groups = {
+    COMPS_DOCDIFF_INFO(groups, groups_index, groups, COMPS_DocGroup),
+    .attrs = {offsetof(COMPS_DocGroup, def),
+              offsetof(COMPS_DocGroup, uservisible),
+              offsetof(COMPS_DocGroup, biarchonly),
+              offsetof(COMPS_DocGroup, display_order),
+              offsetof(COMPS_DocGroup, langonly),
+              offsetof(COMPS_DocGroup, arches), 0},
+    .content = offsetof(COMPS_DocGroup, packages),
+    .options = 0,
+    .content_hash = &comps_docpackage_hash_set
+};
+static const __COMPS_DocDiffInfo __comps_docdiff_categories = {
+    COMPS_DOCDIFF_INFO(categories, categories_index, categories,
+                       COMPS_DocCategory),
+    .attrs = {offsetof(COMPS_DocCategory, display_order),
+              offsetof(COMPS_DocCategory, arches), 0},
+    .content = offsetof(COMPS_DocCategory, group_ids),
+    .options = 0,
+    .content_hash = &__comps_docgroupid_hash_set
+};
+static const __COMPS_DocDiffInfo __comps_docdiff_envs = {
+    COMPS_DOCDIFF_INFO(environments, envs_index, envs, COMPS_DocEnv),
+    .attrs = {offsetof(COMPS_DocEnv, display_order),
+              offsetof(COMPS_DocEnv, arches), 0},
+    .content = offsetof(COMPS_DocEnv, group_list),
+    .options = offsetof(COMPS_DocEnv, option_list),
+    .content_hash = &__comps_docgroupid_hash_set
+};
+
+static const __COMPS_DocDiffInfo *__comps_docdiff_infos[] = {
+    &__comps_docdiff_groups, &__comps_docdiff_categories,
+    &__comps_docdiff_envs, NULL
+};
+
+static COMPS_DocIdIndex* __comps_docdiff_index(COMPS_Doc *doc,
+                                             const __COMPS_DocDiffInfo *info) {
+    COMPS_DocIdIndex **index;
+
+    index = &__COMPS_DOCDIFF_MEMBER(doc, info->id_index, COMPS_DocIdIndex*);
+    if (!*index)
+        *index = comps_doc_idindex_create(info->id);
+    return *index;
+}
+
+static const char* __comps_docdiff_id(const __COMPS_DocDiffInfo *info,
+                                      COMPS_Object *obj) {
+    COMPS_Str *id = __COMPS_DOCDIFF_MEMBER(obj, info->id, COMPS_Str*);
+    return (id) ? id->val : NULL;
+}
+
+/* copies of items of list which aren't in other list */
+static COMPS_ObjList* __comps_docdiff_missing(COMPS_ObjList *list,
+                                              COMPS_ObjList *other,
+                                              unsigned int (*hashf)(void*)) {
+    COMPS_ObjList *ret;
+    COMPS_ObjListIt *it;
+    COMPS_Set *set;
+
+    ret = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+    set = comps_set_create();
+    comps_set_init_hashed(set, NULL, NULL, NULL, &comps_object_cmp_v, hashf);
+    for (it = other ? other->first : NULL; it != NULL; it = it->next)
+        comps_set_add(set, it->comps_obj);
+    for (it = list ? list->first : NULL; it != NULL; it = it->next) {
+        if (!comps_set_in(set, it->comps_obj))
+            comps_objlist_append_x(ret, comps_object_copy(it->comps_obj));
+    }
+    comps_set_destroy(&set);
+    return ret;
+}
+
+/* properties are compared in the same way as by comps_object_cmp, so
+ * objects without changed properties are equal */
+static int __comps_docdiff_props(const __COMPS_DocDiffInfo *info,
+                                 COMPS_Object *o, COMPS_Object *n) {
+    const size_t *attr;
+    int props = 0;
+
+    #define _CMP(OFFSET)\
+        comps_object_cmp(__COMPS_DOCDIFF_MEMBER(o, OFFSET, COMPS_Object*),\
+                         __COMPS_DOCDIFF_MEMBER(n, OFFSET, COMPS_Object*))
+    if (!_CMP(info->name))
+        props |= COMPS_DIFF_NAME;
+    if (!_CMP(info->desc))
+        props |= COMPS_DIFF_DESC;
+    if (!_CMP(info->name_by_lang) || !_CMP(info->desc_by_lang))
+        props |= COMPS_DIFF_LANG;
+    for (attr = info->attrs; *attr && !(props & COMPS_DIFF_ATTRS); attr++) {
+        if (!_CMP(*attr))
+            props |= COMPS_DIFF_ATTRS;
+    }
+    if (!comps_objdict_equal(
+            __COMPS_DOCDIFF_MEMBER(o, info->properties, COMPS_ObjDict*),
+            __COMPS_DOCDIFF_MEMBER(n, info->properties, COMPS_ObjDict*)))
+        props |= COMPS_DIFF_ATTRS;
+    if (!_CMP(info->content) || (info->options && !_CMP(info->options)))
+        props |= COMPS_DIFF_CONTENT;
+    #undef _CMP
+    return props;
+}
+
+static void __comps_docdiff_item(COMPS_DocDiffItem *item,
+                                 COMPS_DocDiffType type, COMPS_Object *obj,
+                                 int pos) {
+    item->type = type;
+    item->props = 0;
+    item->pos = pos;
+    item->obj = comps_object_copy(obj);
+    item->added = NULL;
+    item->removed = NULL;
+    item->options_added = NULL;
+    item->options_removed = NULL;
+}
+
+static void __comps_docdiff_content(const __COMPS_DocDiffInfo *info,
+                                    COMPS_DocDiffItem *item,
+                                    COMPS_Object *o, COMPS_Object *n) {
+    #define _LIST(OBJ, OFFSET) __COMPS_DOCDIFF_MEMBER(OBJ, OFFSET, COMPS_ObjList*)
+    item->added = __comps_docdiff_missing(_LIST(n, info->content),
+                                          _LIST(o, info->content),
+                                          info->content_hash);
+    item->removed = __comps_docdiff_missing(_LIST(o, info->content),
+                                            _LIST(n, info->content),
+                                            info->content_hash);
+    if (info->options) {
+        item->options_added = __comps_docdiff_missing(
+                                                _LIST(n, info->options),
+                                                _LIST(o, info->options),
+                                                info->content_hash);
+        item->options_removed = __comps_docdiff_missing(
+                                                _LIST(o, info->options),
+                                                _LIST(n, info->options),
+                                                info->content_hash);
+    }
+    #undef _LIST
+}
+
+/* mark longest increasing subsequence of seq in keep. Objects on it keep
+ * their relative order and don't have to be moved */
+static int __comps_docdiff_stationary(const int *seq, unsigned int len,
+                                      char *keep) {
+    int *tails, *prev, k;
+    unsigned int x, lo, hi, mid, tails_len = 0;
+
+    if (!len)
+        return 0;
+    tails = malloc(sizeof(int) * len);
+    prev = malloc(sizeof(int) * len);
+    if (!tails || !prev) {
+        free(tails);
+        free(prev);
+        return -1;
+    }
+    for (x = 0; x < len; x++) {
+        lo = 0;
+        hi = tails_len;
+        while (lo < hi) {
+            mid = (lo + hi) / 2;
+            if (seq[tails[mid]] < seq[x])
+                lo = mid + 1;
+            else
+                hi = mid;
+        }
+        prev[x] = (lo) ? tails[lo - 1] : -1;
+        tails[lo] = x;
+        if (lo == tails_len)
+            tails_len++;
+    }
+    for (k = tails[tails_len - 1]; k >= 0; k = prev[k])
+        keep[k] = 1;
+    free(tails);
+    free(prev);
+    return 0;
+}
+
+static int __comps_docdiff_objs(const __COMPS_DocDiffInfo *info,
+                                COMPS_DocDiff *diff, COMPS_Doc *old_doc,
+                                COMPS_Doc *new_doc) {
+    COMPS_ObjList *olist, *nlist;
+    COMPS_DocIdIndex *oindex, *nindex;
+    COMPS_DocDiffItem *items, *item;
+    COMPS_ObjListIt *it;
+    COMPS_Object *o;
+    int *opos = NULL, *seq = NULL, ret = -1;
+    char *seen = NULL, *keep = NULL;
+    unsigned int i, olen, nlen, len = 0, seq_len = 0;
+    const char *id;
+    int props;
+
+    olist = __COMPS_DOCDIFF_MEMBER(old_doc, info->list, COMPS_ObjList*);
+    nlist = __COMPS_DOCDIFF_MEMBER(new_doc, info->list, COMPS_ObjList*);
+    olen = (olist) ? olist->len : 0;
+    nlen = (nlist) ? nlist->len : 0;
+    oindex = __comps_docdiff_index(old_doc, info);
+    nindex = __comps_docdiff_index(new_doc, info);
+    items = malloc(sizeof(COMPS_DocDiffItem) * (olen + nlen + 1));
+    opos = malloc(sizeof(int) * (nlen + 1));
+    seq = malloc(sizeof(int) * (nlen + 1));
+    seen = calloc(olen + 1, sizeof(char));
+    keep = calloc(nlen + 1, sizeof(char));
+    if (!items || !opos || !seq || !seen || !keep || !oindex || !nindex)
+        goto out;
+
+    /* pair objects of new document with first object of same id in old
+     * one, -2 marks objects which are ignored */
+    for (i = 0, it = nlist ? nlist->first : NULL; it != NULL;
+         it = it->next, i++) {
+        opos[i] = -2;
+        if (!(id = __comps_docdiff_id(info, it->comps_obj)))
+            continue;
+        if (comps_doc_idindex_get(nindex, nlist, id) != it->comps_obj)
+            continue;
+        opos[i] = comps_doc_idindex_pos(oindex, olist, id);
+        if (opos[i] >= 0) {
+            seen[opos[i]] = 1;
+            seq[seq_len++] = opos[i];
+        }
+    }
+    /* keep is indexed by paired objects here, move it to new positions */
+    if (__comps_docdiff_stationary(seq, seq_len, keep))
+        goto out;
+    for (i = nlen; i > 0; i--) {
+        if (opos[i - 1] >= 0) {
+            seq_len--;
+            keep[i - 1] = keep[seq_len];
+        } else {
+            keep[i - 1] = 0;
+        }
+    }
+
+    for (i = 0, it = olist ? olist->first : NULL; it != NULL;
+         it = it->next, i++) {
+        if (seen[i] || !(id = __comps_docdiff_id(info, it->comps_obj)))
+            continue;
+        if (comps_doc_idindex_get(oindex, olist, id) != it->comps_obj)
+            continue;
+        __comps_docdiff_item(&items[len++], COMPS_DIFF_REMOVED,
+                             it->comps_obj, -1);
+    }
+    for (i = 0, it = nlist ? nlist->first : NULL; it != NULL;
+         it = it->next, i++) {
+        if (opos[i] == -2)
+            continue;
+        if (opos[i] == -1) {
+            __comps_docdiff_item(&items[len++], COMPS_DIFF_ADDED,
+                                 it->comps_obj, i);
+            continue;
+        }
+        o = olist->items[opos[i]]->comps_obj;
+        props = __comps_docdiff_props(info, o, it->comps_obj);
+        if (props) {
+            item = &items[len++];
+            __comps_docdiff_item(item, COMPS_DIFF_CHANGED, it->comps_obj,
+                                 keep[i] ? -1 : (int)i);
+            item->props = props;
+            if (props & COMPS_DIFF_CONTENT)
+                __comps_docdiff_content(info, item, o, it->comps_obj);
+        } else if (!keep[i]) {
+            __comps_docdiff_item(&items[len++], COMPS_DIFF_MOVED,
+                                 it->comps_obj, i);
+        }
+    }
+    ret = 0;
+
+    out:
+    if (ret || !len) {
+        free(items);
+        items = NULL;
+    }
+    __COMPS_DOCDIFF_MEMBER(diff, info->items, COMPS_DocDiffItem*) = items;
+    __COMPS_DOCDIFF_MEMBER(diff, info->items_len, unsigned int) = len;
+    free(opos);
+    free(seq);
+    free(seen);
+    free(keep);
+    return ret;
+}
+
+static void __comps_docdiff_langpacks(COMPS_DocDiff *diff,
+                                      COMPS_ObjDict *old_lp,
+                                      COMPS_ObjDict *new_lp) {
+    COMPS_HSList *pairs;
+    COMPS_HSListItem *hsit;
+    COMPS_ObjRTreePair *pair;
+
+    if (new_lp) {
+        pairs = comps_objdict_pairs(new_lp);
+        for (hsit = pairs->first; hsit != NULL; hsit = hsit->next) {
+            pair = hsit->data;
+            if (old_lp && comps_object_cmp(comps_objdict_get_x(old_lp,
+                                                               pair->key),
+                                           pair->data))
+                continue;
+            if (!diff->langpacks)
+                diff->langpacks = COMPS_OBJECT_CREATE(COMPS_ObjDict, NULL);
+            comps_objdict_set_x(diff->langpacks, pair->key,
+                                comps_object_copy(pair->data));
+        }
+        comps_hslist_destroy(&pairs);
+    }
+    if (old_lp) {
+        pairs = comps_objdict_pairs(old_lp);
+        for (hsit = pairs->first; hsit != NULL; hsit = hsit->next) {
+            pair = hsit->data;
+            if (new_lp && comps_objdict_get_x(new_lp, pair->key))
+                continue;
+            if (!diff->langpacks_removed)
+                diff->langpacks_removed = COMPS_OBJECT_CREATE(COMPS_ObjList,
+                                                              NULL);
+            comps_objlist_append_x(diff->langpacks_removed,
+                                   (COMPS_Object*)comps_str(pair->key));
+        }
+        comps_hslist_destroy(&pairs);
+    }
+}
+
+/* value lists of every key are compared in order, missing multi-dict is
+ * the same as empty one */
+static int __comps_docdiff_mdict_eq(COMPS_ObjMDict *old_dict,
+                                    COMPS_ObjMDict *new_dict) {
+    COMPS_HSList *pairs;
+    COMPS_HSListItem *it;
+    COMPS_ObjMRTreePair *pair;
+    COMPS_ObjList *values;
+    int ret = 1;
+
+    if ((old_dict ? old_dict->len : 0) != (new_dict ? new_dict->len : 0))
+        return 0;
+    if (!old_dict || !old_dict->len)
+        return 1;
+    pairs = comps_objmdict_pairs(old_dict);
+    for (it = pairs->first; it != NULL && ret; it = it->next) {
+        pair = (COMPS_ObjMRTreePair*)it->data;
+        values = comps_objmdict_get(new_dict, pair->key);
+        ret = comps_object_cmp((COMPS_Object*)pair->data,
+                               (COMPS_Object*)values);
+        COMPS_OBJECT_DESTROY(values);
+    }
+    comps_hslist_destroy(&pairs);
+    return ret;
+}
+
+static COMPS_ObjMDict* __comps_docdiff_mdict(COMPS_ObjMDict *old_dict,
+                                             COMPS_ObjMDict *new_dict) {
+    if (__comps_docdiff_mdict_eq(old_dict, new_dict))
+        return NULL;
+    if (!new_dict)
+        return COMPS_OBJECT_CREATE(COMPS_ObjMDict, NULL);
+    return (COMPS_ObjMDict*)comps_object_copy((COMPS_Object*)new_dict);
+}
+
+/* indexes of both documents are used together. Documents are locked in
+ * order of their addresses, so diffs of the same documents in opposite
+ * directions can't deadlock. The same document is locked twice, lock is
+ * recursive */
+static void __comps_docdiff_lock(COMPS_Doc *doc1, COMPS_Doc *doc2) {
+    if ((uintptr_t)doc1 > (uintptr_t)doc2) {
+        comps_doc_lock(doc2);
+        comps_doc_lock(doc1);
+    } else {
+        comps_doc_lock(doc1);
+        comps_doc_lock(doc2);
+    }
+}
+
+COMPS_DocDiff* comps_doc_diff(COMPS_Doc *old_doc, COMPS_Doc *new_doc) {
+    const __COMPS_DocDiffInfo **info;
+    COMPS_DocDiff *diff;
+    int ret = 0;
+
+    if ((diff = calloc(1, sizeof(COMPS_DocDiff))) == NULL)
+        return NULL;
+    __comps_docdiff_lock(old_doc, new_doc);
+    for (info = __comps_docdiff_infos; *info != NULL && !ret; info++)
+        ret = __comps_docdiff_objs(*info, diff, old_doc, new_doc);
+    comps_doc_unlock(old_doc);
+    comps_doc_unlock(new_doc);
+    if (ret) {
+        comps_doc_diff_destroy(diff);
+        return NULL;
+    }
+    __comps_docdiff_langpacks(diff, old_doc->langpacks, new_doc->langpacks);
+    diff->blacklist = __comps_docdiff_mdict(old_doc->blacklist,
+                                            new_doc->blacklist);
+    diff->whiteout = __comps_docdiff_mdict(old_doc->whiteout,
+                                           new_doc->whiteout);
+    if (!COMPS_OBJECT_CMP(old_doc->doctype_name, new_doc->doctype_name)
+        || !COMPS_OBJECT_CMP(old_doc->doctype_sysid, new_doc->doctype_sysid)
+        || !COMPS_OBJECT_CMP(old_doc->doctype_pubid, new_doc->doctype_pubid)) {
+        diff->doctype_changed = 1;
+        #define _DOCTYPE(MEMBER)\
+            diff->MEMBER = (COMPS_Str*)comps_object_copy(\
+                                            (COMPS_Object*)new_doc->MEMBER)
+        _DOCTYPE(doctype_name);
+        _DOCTYPE(doctype_sysid);
+        _DOCTYPE(doctype_pubid);
+        #undef _DOCTYPE
+    }
+    return diff;
+}
+
+static void __comps_docdiff_items_destroy(COMPS_DocDiffItem *items,
+                                          unsigned int len) {
+    unsigned int i;
+
+    for (i = 0; i < len; i++) {
+        COMPS_OBJECT_DESTROY(items[i].obj);
+        COMPS_OBJECT_DESTROY(items[i].added);
+        COMPS_OBJECT_DESTROY(items[i].removed);
+        COMPS_OBJECT_DESTROY(items[i].options_added);
+        COMPS_OBJECT_DESTROY(items[i].options_removed);
+    }
+    free(items);
+}
+
+void comps_doc_diff_destroy(COMPS_DocDiff *diff) {
+    if (!diff) return;
+    __comps_docdiff_items_destroy(diff->groups, diff->groups_len);
+    __comps_docdiff_items_destroy(diff->categories, diff->categories_len);
+    __comps_docdiff_items_destroy(diff->envs, diff->envs_len);
+    COMPS_OBJECT_DESTROY(diff->langpacks);
+    COMPS_OBJECT_DESTROY(diff->langpacks_removed);
+    COMPS_OBJECT_DESTROY(diff->blacklist);
+    COMPS_OBJECT_DESTROY(diff->whiteout);
+    COMPS_OBJECT_DESTROY(diff->doctype_name);
+    COMPS_OBJECT_DESTROY(diff->doctype_sysid);
+    COMPS_OBJECT_DESTROY(diff->doctype_pubid);
+    free(diff);
+}
+
+unsigned int comps_doc_diff_len(const COMPS_DocDiff *diff) {
+    return diff->groups_len + diff->categories_len + diff->envs_len
+           + (diff->langpacks ? diff->langpacks->len : 0)
+           + (diff->langpacks_removed ? diff->langpacks_removed->len : 0)
+           + (diff->blacklist != NULL) + (diff->whiteout != NULL)
+           + diff->doctype_changed;
+}
+
+typedef struct {
+    const char *removed;
+    size_t pos;
+} __COMPS_DocPatchCursor;
+
+static char __comps_docpatch_removed(COMPS_Object *obj, void *cursor) {
+    (void)obj;
+    return ((__COMPS_DocPatchCursor*)cursor)->removed[
+                                    ((__COMPS_DocPatchCursor*)cursor)->pos++];
+}
+
+/* objects are looked up before list is modified, so id index is built
+ * only once */
+static unsigned int __comps_docpatch_objs(const __COMPS_DocDiffInfo *info,
+                                          COMPS_Doc *doc,
+                                          const COMPS_DocDiff *diff) {
+    const COMPS_DocDiffItem *items, *item;
+    COMPS_ObjList **list;
+    COMPS_DocIdIndex *index;
+    COMPS_Object *obj;
+    __COMPS_DocPatchCursor cursor;
+    const COMPS_DocDiffItem **replaced = NULL;
+    char *removed = NULL, *appended = NULL;
+    unsigned int i, len, conflicts = 0;
+    size_t llen, x;
+    const char *id;
+    int pos;
+
+    items = __COMPS_DOCDIFF_MEMBER(diff, info->items, COMPS_DocDiffItem*);
+    len = __COMPS_DOCDIFF_MEMBER(diff, info->items_len, unsigned int);
+    if (!len)
+        return 0;
+    list = &__COMPS_DOCDIFF_MEMBER(doc, info->list, COMPS_ObjList*);
+    if (!*list)
+        *list = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+    llen = (*list)->len;
+    index = __comps_docdiff_index(doc, info);
+    removed = calloc(llen + 1, sizeof(char));
+    replaced = calloc(llen + 1, sizeof(COMPS_DocDiffItem*));
+    appended = calloc(len, sizeof(char));
+    if (!index || !removed || !replaced || !appended) {
+        conflicts = len;
+        goto out;
+    }
+
+    for (i = 0; i < len; i++) {
+        item = &items[i];
+        id = __comps_docdiff_id(info, item->obj);
+        pos = (id) ? comps_doc_idindex_pos(index, *list, id) : -1;
+        if (pos >= 0 && (removed[pos] || replaced[pos]))
+            pos = -1;
+        if (item->type == COMPS_DIFF_REMOVED) {
+            if (pos < 0)
+                conflicts++;
+            else
+                removed[pos] = 1;
+        } else if (pos < 0) {
+            if (item->type != COMPS_DIFF_ADDED)
+                conflicts++;
+            appended[i] = (item->pos < 0);
+        } else if (item->type == COMPS_DIFF_ADDED || item->pos >= 0) {
+            conflicts += (item->type == COMPS_DIFF_ADDED);
+            removed[pos] = 1;
+        } else {
+            replaced[pos] = item;
+        }
+    }
+
+    for (x = 0; x < llen; x++) {
+        if (!replaced[x])
+            continue;
+        obj = comps_object_copy(replaced[x]->obj);
+        comps_objlist_set(*list, x, obj);
+        COMPS_OBJECT_DESTROY(obj);
+    }
+    cursor.removed = removed;
+    cursor.pos = 0;
+    comps_objlist_remove_if(*list, &__comps_docpatch_removed, &cursor);
+    /* positions are ascending, so all objects preceding inserted one in
+     * new document are already in place */
+    for (i = 0; i < len; i++) {
+        item = &items[i];
+        if (item->type == COMPS_DIFF_REMOVED || item->pos < 0)
+            continue;
+        x = ((size_t)item->pos < (*list)->len) ? (size_t)item->pos
+                                               : (*list)->len;
+        comps_objlist_insert_at_x(*list, x, comps_object_copy(item->obj));
+    }
+    for (i = 0; i < len; i++) {
+        if (appended[i])
+            comps_objlist_append_x(*list, comps_object_copy(items[i].obj));
+    }
+
+    out:
+    free(removed);
+    free(replaced);
+    free(appended);
+    return conflicts;
+}
+
+unsigned int comps_doc_patch(COMPS_Doc *doc, const COMPS_DocDiff *diff) {
+    const __COMPS_DocDiffInfo **info;
+    COMPS_HSList *pairs;
+    COMPS_HSListItem *hsit;
+    COMPS_ObjListIt *it;
+    unsigned int conflicts = 0;
+
+    comps_doc_lock(doc);
+    for (info = __comps_docdiff_infos; *info != NULL; info++)
+        conflicts += __comps_docpatch_objs(*info, doc, diff);
+    comps_doc_unlock(doc);
+
+    if (diff->langpacks_removed && doc->langpacks) {
+        for (it = diff->langpacks_removed->first; it != NULL; it = it->next)
+            comps_objdict_unset(doc->langpacks,
+                                ((COMPS_Str*)it->comps_obj)->val);
+    }
+    if (diff->langpacks) {
+        if (!doc->langpacks)
+            doc->langpacks = COMPS_OBJECT_CREATE(COMPS_ObjDict, NULL);
+        pairs = comps_objdict_pairs(diff->langpacks);
+        for (hsit = pairs->first; hsit != NULL; hsit = hsit->next) {
+            comps_objdict_set_x(doc->langpacks,
+                                ((COMPS_ObjRTreePair*)hsit->data)->key,
+                                comps_object_copy(
+                                    ((COMPS_ObjRTreePair*)hsit->data)->data));
+        }
+        comps_hslist_destroy(&pairs);
+    }
+    #define _PATCH_MDICT(DICT)\
+    if (diff->DICT) {\
+        COMPS_Object *dict = comps_object_copy((COMPS_Object*)diff->DICT);\
+        comps_doc_set_##DICT(doc, (COMPS_ObjMDict*)dict);\
+        COMPS_OBJECT_DESTROY(dict);\
+    }
+    _PATCH_MDICT(blacklist)
+    _PATCH_MDICT(whiteout)
+    #undef _PATCH_MDICT
+    if (diff->doctype_changed) {
+        #define _PATCH_DOCTYPE(MEMBER)\
+            COMPS_OBJECT_DESTROY(doc->MEMBER);\
+            doc->MEMBER = (COMPS_Str*)comps_object_copy(\
+                                            (COMPS_Object*)diff->MEMBER)
+        _PATCH_DOCTYPE(doctype_name);
+        _PATCH_DOCTYPE(doctype_sysid);
+        _PATCH_DOCTYPE(doctype_pubid);
+        #undef _PATCH_DOCTYPE
+    }
+    return conflicts;
+}
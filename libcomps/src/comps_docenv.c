@@ -22,34 +22,52 @@
 
 void comps_docenv_create(COMPS_DocEnv* env, COMPS_Object **args) {
     (void)args;
-    env->properties = COMPS_OBJECT_CREATE(COMPS_ObjDict, NULL);
+    env->id = NULL;
+    env->name = NULL;
+    env->desc = NULL;
+    env->display_order = NULL;
+    env->arches = NULL;
+    env->properties = NULL;
     env->name_by_lang = COMPS_OBJECT_CREATE(COMPS_ObjDict, NULL);
     env->desc_by_lang = COMPS_OBJECT_CREATE(COMPS_ObjDict, NULL);
     env->group_list = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
     env->option_list = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+    env->id_rev = NULL;
 }
 COMPS_CREATE_u(docenv, COMPS_DocEnv)
 
 void comps_docenv_copy(COMPS_DocEnv *env_dst, COMPS_DocEnv *env_src) {
-    env_dst->properties = (COMPS_ObjDict*)comps_object_copy(
-                                       (COMPS_Object*)env_src->properties);
-    env_dst->name_by_lang = (COMPS_ObjDict*)comps_object_copy(
-                                    (COMPS_Object*)env_src->name_by_lang);
-    env_dst->desc_by_lang = (COMPS_ObjDict*)comps_object_copy(
-                                    (COMPS_Object*)env_src->desc_by_lang);
-    env_dst->group_list = (COMPS_ObjList*)comps_object_copy(
-                                    (COMPS_Object*)env_src->group_list);
-    env_dst->option_list = (COMPS_ObjList*)comps_object_copy(
-                                    (COMPS_Object*)env_src->option_list);
+    /* members are shared copy-on-write, exposed ones are copied */
+    #define _SHARE(TYPE, MEMBER)\
+        env_dst->MEMBER = (TYPE*)comps_object_share(\
+                                        (COMPS_Object*)env_src->MEMBER)
+    _SHARE(COMPS_Str, id);
+    _SHARE(COMPS_Str, name);
+    _SHARE(COMPS_Str, desc);
+    _SHARE(COMPS_Num, display_order);
+    _SHARE(COMPS_ObjList, arches);
+    _SHARE(COMPS_ObjDict, properties);
+    _SHARE(COMPS_ObjDict, name_by_lang);
+    _SHARE(COMPS_ObjDict, desc_by_lang);
+    _SHARE(COMPS_ObjList, group_list);
+    _SHARE(COMPS_ObjList, option_list);
+    #undef _SHARE
+    env_dst->id_rev = NULL;
 }
 COMPS_COPY_u(docenv, COMPS_DocEnv)    /*comps_utils.h macro*/
 
 static void comps_docenv_destroy(COMPS_DocEnv *env) {
+    comps_object_destroy((COMPS_Object*)env->id);
+    comps_object_destroy((COMPS_Object*)env->name);
+    comps_object_destroy((COMPS_Object*)env->desc);
+    comps_object_destroy((COMPS_Object*)env->display_order);
+    comps_object_destroy((COMPS_Object*)env->arches);
     comps_object_destroy((COMPS_Object*)env->properties);
     comps_object_destroy((COMPS_Object*)env->name_by_lang);
     comps_object_destroy((COMPS_Object*)env->desc_by_lang);
     comps_object_destroy((COMPS_Object*)env->group_list);
     comps_object_destroy((COMPS_Object*)env->option_list);
+    comps_idrev_release(env->id_rev);
 }
 COMPS_DESTROY_u(docenv, COMPS_DocEnv) /*comps_utils.h macro*/
 
@@ -59,8 +77,8 @@ COMPS_PROP_GETTER(env, COMPS_DocEnv, name) /*comps_utils.h macro*/
 COMPS_PROP_GETTER(env, COMPS_DocEnv, desc) /*comps_utils.h macro*/
 COMPS_PROP_GETTER(env, COMPS_DocEnv, display_order) /*comps_utils.h macro*/
 
-COMPS_STRPROP_SETTER(env, COMPS_DocEnv, id) /*comps_utils.h macro*/
-COMPS_STRPROP_SETTER(env, COMPS_DocEnv, name) /*comps_utils.h macro*/
+COMPS_IDPROP_SETTER(env, COMPS_DocEnv) /*comps_utils.h macro*/
+COMPS_NAMEPROP_SETTER(env, COMPS_DocEnv) /*comps_utils.h macro*/
 COMPS_STRPROP_SETTER(env, COMPS_DocEnv, desc) /*comps_utils.h macro*/
 COMPS_NUMPROP_SETTER(env, COMPS_DocEnv, display_order) /*comps_utils.h macro*/
 
@@ -83,6 +101,7 @@ void comps_docenv_add_groupid(COMPS_DocEnv *env,
     if (env->group_list == NULL) {
         env->group_list = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
     }
+    comps_object_unshare((COMPS_Object**)&env->group_list);
     comps_objlist_append_x(env->group_list, (COMPS_Object*)gid);
 }
 
@@ -96,6 +115,7 @@ void comps_docenv_add_optionid(COMPS_DocEnv *env,
     if (env->option_list == NULL) {
         env->option_list = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
     }
+    comps_object_unshare((COMPS_Object**)&env->option_list);
     comps_objlist_append_x(env->option_list, (COMPS_Object*)gid);
 }
 
@@ -103,8 +123,12 @@ signed char comps_docenv_cmp_u(COMPS_Object *env1, COMPS_Object *env2) {
     #define _env1 ((COMPS_DocEnv*)env1)
     #define _env2 ((COMPS_DocEnv*)env2)
 
-    if (!comps_object_cmp((COMPS_Object*)_env1->properties,
-                          (COMPS_Object*)_env2->properties)) {
+    if (!COMPS_OBJECT_CMP(_env1->id, _env2->id) ||
+        !COMPS_OBJECT_CMP(_env1->name, _env2->name) ||
+        !COMPS_OBJECT_CMP(_env1->desc, _env2->desc) ||
+        !COMPS_OBJECT_CMP(_env1->display_order, _env2->display_order) ||
+        !COMPS_OBJECT_CMP(_env1->arches, _env2->arches) ||
+        !comps_objdict_equal(_env1->properties, _env2->properties)) {
         //printf("Env properties cmp fail\n");
         return 0;
     }
@@ -138,14 +162,11 @@ signed char comps_docenv_cmp_u(COMPS_Object *env1, COMPS_Object *env2) {
 }
 
 char __comps_docenv_idcmp(void *e1, void *e2) {
-    COMPS_Object *obj1, *obj2;
-    char ret;
-    obj1 = comps_objdict_get(((COMPS_DocEnv*)e1)->properties, "id");
-    obj2 = comps_objdict_get(((COMPS_DocEnv*)e2)->properties, "id");
-    ret = comps_object_cmp(obj1, obj2);
-    COMPS_OBJECT_DESTROY(obj1);
-    COMPS_OBJECT_DESTROY(obj2);
-    return ret;
+    return COMPS_OBJECT_CMP(((COMPS_DocEnv*)e1)->id, ((COMPS_DocEnv*)e2)->id);
+}
+
+unsigned int __comps_docenv_idhash(void *e) {
+    return comps_object_hash((COMPS_Object*)((COMPS_DocEnv*)e)->id);
 }
 
 COMPS_DocEnv* comps_docenv_union(COMPS_DocEnv *e1, COMPS_DocEnv *e2) {
@@ -153,41 +174,71 @@ COMPS_DocEnv* comps_docenv_union(COMPS_DocEnv *e1, COMPS_DocEnv *e2) {
     COMPS_ObjListIt *it;
     COMPS_Set *set;
     COMPS_Object *obj;
+    COMPS_ObjList *list;
     int index;
     void *data;
+    char ret;
 
     res = COMPS_OBJECT_CREATE(COMPS_DocEnv, NULL);
-    COMPS_OBJECT_DESTROY(res->properties);
-
-    res->properties = comps_objdict_union(e1->properties, e2->properties);
-    set = comps_set_create();
-    comps_set_init(set, NULL, NULL, (void(*)(void*))&comps_object_destroy,
-                                    &__comps_docgroupid_cmp_set);
-    it = e1->group_list?e1->group_list->first:NULL;
-    for (; it != NULL; it = it->next) {
-        obj = comps_object_copy(it->comps_obj);
-        comps_set_add(set, (void*)comps_object_incref(obj));
-        comps_docenv_add_groupid(res, (COMPS_DocGroupId*)obj);
-    }
-    it = e2->group_list?e2->group_list->first:NULL;
-    for (; it != NULL; it = it->next) {
-        if ((data = comps_set_data_at(set, (void*)it->comps_obj)) != NULL) {
-            index = comps_objlist_index(res->group_list, (COMPS_Object*)data);
-            comps_objlist_remove_at(res->group_list, index);
-            comps_objlist_insert_at_x(res->group_list, index,
-                                      comps_object_copy(it->comps_obj));
-        } else {
-            comps_docenv_add_groupid(res, (COMPS_DocGroupId*)
-                                            comps_object_copy(it->comps_obj));
+    #define _PROP_UNION(TYPE, PROP)\
+        res->PROP = (TYPE*)__comps_prop_union((COMPS_Object*)e1->PROP,\
+                                              (COMPS_Object*)e2->PROP)
+    _PROP_UNION(COMPS_Str, id);
+    _PROP_UNION(COMPS_Str, name);
+    _PROP_UNION(COMPS_Str, desc);
+    _PROP_UNION(COMPS_Num, display_order);
+    _PROP_UNION(COMPS_ObjList, arches);
+    #undef _PROP_UNION
+    res->properties = comps_objdict_union_share(e1->properties,
+                                                e2->properties);
+    comps_object_destroy((COMPS_Object*)res->name_by_lang);
+    comps_object_destroy((COMPS_Object*)res->desc_by_lang);
+    res->name_by_lang = comps_objdict_union_share(e1->name_by_lang,
+                                                  e2->name_by_lang);
+    res->desc_by_lang = comps_objdict_union_share(e1->desc_by_lang,
+                                                  e2->desc_by_lang);
+    if ((list = __comps_list_union(e1->group_list, e2->group_list)) != NULL) {
+        comps_object_destroy((COMPS_Object*)res->group_list);
+        res->group_list = list;
+    } else {
+        set = comps_set_create();
+        comps_set_init_hashed(set, NULL, NULL,
+                                   (void(*)(void*))&comps_object_destroy,
+                                   &__comps_docgroupid_cmp_set,
+                                   &__comps_docgroupid_hash_set);
+        it = e1->group_list?e1->group_list->first:NULL;
+        for (; it != NULL; it = it->next) {
+            obj = comps_object_copy(it->comps_obj);
+            comps_set_add(set, (void*)comps_object_incref(obj));
+            comps_docenv_add_groupid(res, (COMPS_DocGroupId*)obj);
+        }
+        it = e2->group_list?e2->group_list->first:NULL;
+        for (; it != NULL; it = it->next) {
+            data = comps_set_data_at(set, (void*)it->comps_obj);
+            if (data != NULL) {
+                index = comps_objlist_index(res->group_list,
+                                            (COMPS_Object*)data);
+                comps_objlist_remove_at(res->group_list, index);
+                comps_objlist_insert_at_x(res->group_list, index,
+                                          comps_object_copy(it->comps_obj));
+            } else {
+                comps_docenv_add_groupid(res, (COMPS_DocGroupId*)
+                                         comps_object_copy(it->comps_obj));
+            }
         }
+        comps_set_destroy(&set);
+    }
+    if ((list = __comps_list_union(e1->option_list,
+                                   e2->option_list)) != NULL) {
+        comps_object_destroy((COMPS_Object*)res->option_list);
+        res->option_list = list;
+        return res;
     }
-    comps_set_destroy(&set);
-
     set = comps_set_create();
-    comps_set_init(set, NULL, NULL, &comps_object_destroy_v,
-                                    &__comps_docgroupid_cmp_set);
+    comps_set_init_hashed(set, NULL, NULL, &comps_object_destroy_v,
+                               &__comps_docgroupid_cmp_set,
+                               &__comps_docgroupid_hash_set);
     it = e1->option_list?e1->option_list->first:NULL;
-    char ret;
     /*!!! DO NOT MODIFY some comps have same optionid in one option_list !!!*/
     for (; it != NULL; it = it->next) {
         obj = comps_object_copy(it->comps_obj);
@@ -212,10 +263,6 @@ COMPS_DocEnv* comps_docenv_union(COMPS_DocEnv *e1, COMPS_DocEnv *e2) {
         }
     }
     comps_set_destroy(&set);
-    comps_object_destroy((COMPS_Object*)res->name_by_lang);
-    comps_object_destroy((COMPS_Object*)res->desc_by_lang);
-    res->name_by_lang = comps_objdict_union(e1->name_by_lang, e2->name_by_lang);
-    res->desc_by_lang = comps_objdict_union(e1->desc_by_lang, e2->desc_by_lang);
     return res;
 }
 
@@ -224,31 +271,25 @@ COMPS_DocEnv* comps_docenv_intersect(COMPS_DocEnv *e1, COMPS_DocEnv *e2) {
     COMPS_ObjListIt *it;
     COMPS_HSListItem *hsit;
     COMPS_Set *set, *set2;
-    COMPS_HSList *pairs1, *pairs2;
 
     res = COMPS_OBJECT_CREATE(COMPS_DocEnv, NULL);
-    set = comps_set_create();
-    comps_set_init(set, NULL, NULL, NULL, &comps_objrtree_paircmp);
-
-    pairs1 = comps_objdict_pairs(e1->properties);
-    for (hsit = pairs1->first; hsit != NULL; hsit = hsit->next) {
-        comps_set_add(set, hsit->data);
-    }
-    pairs2 = comps_objdict_pairs(e2->properties);
-    for (hsit = pairs2->first; hsit != NULL; hsit = hsit->next) {
-        if (comps_set_in(set, hsit->data)) {
-            comps_objdict_set(res->properties, ((COMPS_RTreePair*)hsit->data)->key,
-                              ((COMPS_RTreePair*)hsit->data)->data);
-        }
-    }
-    comps_hslist_destroy(&pairs1);
-    comps_hslist_destroy(&pairs2);
-    comps_set_destroy(&set);
+    #define _PROP_INTERSECT(TYPE, PROP)\
+        res->PROP = (TYPE*)__comps_prop_intersect((COMPS_Object*)e1->PROP,\
+                                                  (COMPS_Object*)e2->PROP)
+    _PROP_INTERSECT(COMPS_Str, id);
+    _PROP_INTERSECT(COMPS_Str, name);
+    _PROP_INTERSECT(COMPS_Str, desc);
+    _PROP_INTERSECT(COMPS_Num, display_order);
+    _PROP_INTERSECT(COMPS_ObjList, arches);
+    #undef _PROP_INTERSECT
+    res->properties = comps_objdict_intersect(e1->properties, e2->properties);
 
     set = comps_set_create();
-    comps_set_init(set, NULL, NULL, NULL, &__comps_docgroupid_cmp_set);
+    comps_set_init_hashed(set, NULL, NULL, NULL, &__comps_docgroupid_cmp_set,
+                               &__comps_docgroupid_hash_set);
     set2 = comps_set_create();
-    comps_set_init(set2, NULL, NULL, NULL, &__comps_docgroupid_cmp_set);
+    comps_set_init_hashed(set2, NULL, NULL, NULL, &__comps_docgroupid_cmp_set,
+                                &__comps_docgroupid_hash_set);
 
     for (it = e1->group_list->first; it != NULL; it = it->next) {
         comps_set_add(set, it->comps_obj);
@@ -267,9 +308,11 @@ COMPS_DocEnv* comps_docenv_intersect(COMPS_DocEnv *e1, COMPS_DocEnv *e2) {
     comps_set_destroy(&set2);
 
     set = comps_set_create();
-    comps_set_init(set, NULL, NULL, NULL, &__comps_docgroupid_cmp_set);
+    comps_set_init_hashed(set, NULL, NULL, NULL, &__comps_docgroupid_cmp_set,
+                               &__comps_docgroupid_hash_set);
     set2 = comps_set_create();
-    comps_set_init(set2, NULL, NULL, NULL, &__comps_docgroupid_cmp_set);
+    comps_set_init_hashed(set2, NULL, NULL, NULL, &__comps_docgroupid_cmp_set,
+                                &__comps_docgroupid_hash_set);
 
     for (it = e1->option_list->first; it != NULL; it = it->next) {
         comps_set_add(set, it->comps_obj);
@@ -299,6 +342,10 @@ signed char comps_docenv_xml(COMPS_DocEnv *env, xmlTextWriterPtr writer,
 
     static char* props[] = {"id", "name", "name", "desc", "desc",
                             "display_order"};
+    static size_t fields[] = {offsetof(COMPS_DocEnv, id),
+                              offsetof(COMPS_DocEnv, name), 0,
+                              offsetof(COMPS_DocEnv, desc), 0,
+                              offsetof(COMPS_DocEnv, display_order)};
     static size_t type[] =   {0, 0, offsetof(COMPS_DocEnv, name_by_lang),
                               0, offsetof(COMPS_DocEnv, desc_by_lang), 0};
     static char* aliases[] = {NULL, NULL, NULL, "description", "description",
@@ -323,7 +370,7 @@ signed char comps_docenv_xml(COMPS_DocEnv *env, xmlTextWriterPtr writer,
     }
     for (int i=0; i<6; i++) {
         if (!type[i]) {
-            obj = comps_objdict_get_x(env->properties, props[i]);
+            obj = *(COMPS_Object**)(((char*)env)+fields[i]);
             if (obj != NULL) {
                 str = comps_object_tostr(obj);
                 __comps_xml_prop((aliases[i])?aliases[i]:props[i], str, writer);
@@ -440,39 +487,64 @@ char* comps_docenv_tostr_u(COMPS_Object* env) {
     #undef _env_
 }
 
-COMPS_DocEnv* comps_docenv_arch_filter(COMPS_DocEnv *source,
-                                       COMPS_ObjList *arches) {
-    COMPS_ObjList *arches2;
+/* return environment sharing everything but group and option lists with
+ * source, references of group_list and option_list are stolen */
+static COMPS_DocEnv* __comps_docenv_arch_filtered(COMPS_DocEnv *source,
+                                                  COMPS_ObjList *group_list,
+                                                  COMPS_ObjList *option_list) {
     COMPS_DocEnv *ret = COMPS_OBJECT_CREATE(COMPS_DocEnv, NULL);
-    COMPS_OBJECT_DESTROY(ret->properties);
-    ret->properties = (COMPS_ObjDict*)COMPS_OBJECT_COPY(source->properties);
+    ret->id = (COMPS_Str*)comps_object_share((COMPS_Object*)source->id);
+    ret->name = (COMPS_Str*)comps_object_share((COMPS_Object*)source->name);
+    ret->desc = (COMPS_Str*)comps_object_share((COMPS_Object*)source->desc);
+    ret->display_order = (COMPS_Num*)
+                    comps_object_share((COMPS_Object*)source->display_order);
+    ret->arches = (COMPS_ObjList*)
+                    comps_object_share((COMPS_Object*)source->arches);
+    ret->properties = (COMPS_ObjDict*)
+                    comps_object_share((COMPS_Object*)source->properties);
     COMPS_OBJECT_DESTROY(ret->name_by_lang);
-    ret->name_by_lang = (COMPS_ObjDict*)COMPS_OBJECT_COPY(source->name_by_lang);
+    ret->name_by_lang = (COMPS_ObjDict*)
+                    comps_object_share((COMPS_Object*)source->name_by_lang);
     COMPS_OBJECT_DESTROY(ret->desc_by_lang);
-    ret->desc_by_lang = (COMPS_ObjDict*)COMPS_OBJECT_COPY(source->desc_by_lang);
-    for (COMPS_ObjListIt *it = source->group_list->first;
-         it != NULL; it = it->next) {
-        arches2 = comps_docgroupid_arches((COMPS_DocGroupId*)it->comps_obj);
-        if (!arches2) continue;
-        if (__comps_objlist_intersected(arches, arches2)) {
-            comps_docenv_add_groupid(ret, (COMPS_DocGroupId*)
-                                          comps_object_copy(it->comps_obj));
-        }
-        COMPS_OBJECT_DESTROY(arches2);
-    }
-    for (COMPS_ObjListIt *it = source->option_list->first;
-         it != NULL; it = it->next) {
-        arches2 = comps_docgroupid_arches((COMPS_DocGroupId*)it->comps_obj);
-        if (!arches2) continue;
-        if (__comps_objlist_intersected(arches, arches2)) {
-            comps_docenv_add_optionid(ret, (COMPS_DocGroupId*)
-                                          comps_object_copy(it->comps_obj));
-        }
-        COMPS_OBJECT_DESTROY(arches2);
-    }
+    ret->desc_by_lang = (COMPS_ObjDict*)
+                    comps_object_share((COMPS_Object*)source->desc_by_lang);
+    COMPS_OBJECT_DESTROY(ret->group_list);
+    ret->group_list = group_list;
+    COMPS_OBJECT_DESTROY(ret->option_list);
+    ret->option_list = option_list;
     return ret;
 }
 
+COMPS_DocEnv* comps_docenv_arch_filter(COMPS_DocEnv *source,
+                                       COMPS_ObjList *arches) {
+    return __comps_docenv_arch_filtered(source,
+                __comps_docgroupids_arch_filter(source->group_list, arches),
+                __comps_docgroupids_arch_filter(source->option_list, arches));
+}
+
+void comps_docenv_arch_filter_multi(COMPS_DocEnv *source,
+                                    const COMPS_ArchMap *map,
+                                    const COMPS_ArchMask *masks,
+                                    unsigned int count,
+                                    COMPS_DocEnv **ret) {
+    COMPS_ObjList **lists;
+    unsigned int x;
+
+    /* group lists are followed by option lists */
+    lists = malloc(sizeof(COMPS_ObjList*) * count * 2);
+    __comps_docgroupids_arch_filter_multi(source->group_list, map, masks,
+                                          count, lists);
+    __comps_docgroupids_arch_filter_multi(source->option_list, map, masks,
+                                          count, lists + count);
+    for (x = 0; x < count; x++) {
+        ret[x] = (lists[x])
+                 ? __comps_docenv_arch_filtered(source, lists[x],
+                                                lists[count + x])
+                 : NULL;
+    }
+    free(lists);
+}
+
 COMPS_ObjectInfo COMPS_DocEnv_ObjInfo = {
     .obj_size = sizeof(COMPS_DocEnv),
     .constructor = &comps_docenv_create_u,
@@ -17,8 +17,13 @@
 /** COMPS_Object derivate representing environment element in comps.xml file */
 typedef struct {
     COMPS_Object_HEAD;
+    COMPS_Str *id; /**< environment id */
+    COMPS_Str *name; /**< environment name */
+    COMPS_Str *desc; /**< environment description */
+    COMPS_Num *display_order; /**< environment display order */
+    COMPS_ObjList *arches; /**< arches environment is limited to */
     COMPS_ObjDict *properties;
-    /**< properties of group */
+    /**< other properties of environment, NULL until first one is set */
     COMPS_ObjDict *name_by_lang;
     /**< language localization of name attribute */
     COMPS_ObjDict *desc_by_lang;
@@ -27,6 +32,8 @@ typedef struct {
     /**< list of group_ids in environment */
     COMPS_ObjList *option_list;
     /**< list of options in environment */
+    COMPS_IdRev *id_rev;
+    /**< revision of id and name, NULL until environment is indexed */
 } COMPS_DocEnv;
 
 //HEAD_COMPS_CREATE_u(docenv, COMPS_DocEnv)  /*comps_utils.h macro*/
@@ -122,14 +129,16 @@ HEAD_COMPS_PROP_GETTER(env, COMPS_DocEnv, display_order) /*comps_utils.h macro*/
 /** COMPS_DocEnv group_ids list getter
  * @param obj COMPS_DocEnv object
  * @return COMPS_ObjList with packages in group. Reference of list isn't
- * incremented
+ * incremented. List isn't shared with copies of object made
+ * afterwards, so it could be modified
  */
 HEAD_COMPS_DOCOBJ_GETOBJLIST(docenv, COMPS_DocEnv, group_list, group_list)
 
 /** COMPS_DocEnv option_ids list getter
  * @param obj COMPS_DocEnv object
  * @return COMPS_ObjList with packages in group. Reference of list isn't
- * incremented
+ * incremented. List isn't shared with copies of object made
+ * afterwards, so it could be modified
  */
 HEAD_COMPS_DOCOBJ_GETOBJLIST(docenv, COMPS_DocEnv, option_list, option_list)
 /**@}*/
@@ -160,6 +169,7 @@ HEAD_COMPS_DOCOBJ_GETARCHES(docenv, COMPS_DocEnv)
 HEAD_COMPS_DOCOBJ_SETARCHES(docenv, COMPS_DocEnv)
 
 char __comps_docenv_idcmp(void *e1, void *e2);
+unsigned int __comps_docenv_idhash(void *e);
 
 /** add group_id to group_ids list in environment
  * @param env COMPS_DocEnv object
@@ -197,6 +207,15 @@ signed char comps_docenv_xml(COMPS_DocEnv *env, xmlTextWriterPtr writer,
 COMPS_DocEnv* comps_docenv_arch_filter(COMPS_DocEnv *source,
                                        COMPS_ObjList *arches);
 
+/** Filter environment group and option lists by several arch masks at once
+ * @see comps_docgroup_arch_filter_multi
+ */
+void comps_docenv_arch_filter_multi(COMPS_DocEnv *source,
+                                    const COMPS_ArchMap *map,
+                                    const COMPS_ArchMask *masks,
+                                    unsigned int count,
+                                    COMPS_DocEnv **ret);
+
 extern COMPS_ObjectInfo COMPS_DocEnv_ObjInfo;
 extern COMPS_ValRuleGeneric* COMPS_DocEnv_ValidateRules[];
 
@@ -22,37 +22,67 @@
 
 void comps_docgroup_create(COMPS_DocGroup* group, COMPS_Object **args) {
     (void)args;
-    group->properties = COMPS_OBJECT_CREATE(COMPS_ObjDict, NULL);
+    group->id = NULL;
+    group->name = NULL;
+    group->desc = NULL;
+    group->def = NULL;
+    group->uservisible = NULL;
+    group->biarchonly = NULL;
+    group->display_order = NULL;
+    group->langonly = NULL;
+    group->arches = NULL;
+    group->properties = NULL;
     group->name_by_lang = COMPS_OBJECT_CREATE(COMPS_ObjDict, NULL);
     group->desc_by_lang = COMPS_OBJECT_CREATE(COMPS_ObjDict, NULL);
     group->packages = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+    group->id_rev = NULL;
 }
 COMPS_CREATE_u(docgroup, COMPS_DocGroup)
 
 void comps_docgroup_copy(COMPS_DocGroup *group_dst,
                          COMPS_DocGroup *group_src) {
-    group_dst->properties = (COMPS_ObjDict*)comps_object_copy(
-                                       (COMPS_Object*)group_src->properties);
-    group_dst->name_by_lang = (COMPS_ObjDict*)comps_object_copy(
-                                    (COMPS_Object*)group_src->name_by_lang);
-    group_dst->desc_by_lang = (COMPS_ObjDict*)comps_object_copy(
-                                    (COMPS_Object*)group_src->desc_by_lang);
-    group_dst->packages = (COMPS_ObjList*)comps_object_copy(
-                                    (COMPS_Object*)group_src->packages);
+    /* members are shared copy-on-write, exposed ones are copied */
+    #define _SHARE(TYPE, MEMBER)\
+        group_dst->MEMBER = (TYPE*)comps_object_share(\
+                                        (COMPS_Object*)group_src->MEMBER)
+    _SHARE(COMPS_Str, id);
+    _SHARE(COMPS_Str, name);
+    _SHARE(COMPS_Str, desc);
+    _SHARE(COMPS_Num, def);
+    _SHARE(COMPS_Num, uservisible);
+    _SHARE(COMPS_Num, biarchonly);
+    _SHARE(COMPS_Num, display_order);
+    _SHARE(COMPS_Str, langonly);
+    _SHARE(COMPS_ObjList, arches);
+    _SHARE(COMPS_ObjDict, properties);
+    _SHARE(COMPS_ObjDict, name_by_lang);
+    _SHARE(COMPS_ObjDict, desc_by_lang);
+    _SHARE(COMPS_ObjList, packages);
+    #undef _SHARE
+    group_dst->id_rev = NULL;
 }
 COMPS_COPY_u(docgroup, COMPS_DocGroup)    /*comps_utils.h macro*/
 
 static void comps_docgroup_destroy(COMPS_DocGroup *group) {
-    
+    COMPS_OBJECT_DESTROY(group->id);
+    COMPS_OBJECT_DESTROY(group->name);
+    COMPS_OBJECT_DESTROY(group->desc);
+    COMPS_OBJECT_DESTROY(group->def);
+    COMPS_OBJECT_DESTROY(group->uservisible);
+    COMPS_OBJECT_DESTROY(group->biarchonly);
+    COMPS_OBJECT_DESTROY(group->display_order);
+    COMPS_OBJECT_DESTROY(group->langonly);
+    COMPS_OBJECT_DESTROY(group->arches);
     COMPS_OBJECT_DESTROY(group->properties);
     COMPS_OBJECT_DESTROY(group->name_by_lang);
     COMPS_OBJECT_DESTROY(group->desc_by_lang);
     COMPS_OBJECT_DESTROY(group->packages);
+    comps_idrev_release(group->id_rev);
 }
 COMPS_DESTROY_u(docgroup, COMPS_DocGroup) /*comps_utils.h macro*/
 
-COMPS_STRPROP_SETTER(group, COMPS_DocGroup, id) /*comps_utils.h macro*/
-COMPS_STRPROP_SETTER(group, COMPS_DocGroup, name) /*comps_utils.h macro*/
+COMPS_IDPROP_SETTER(group, COMPS_DocGroup) /*comps_utils.h macro*/
+COMPS_NAMEPROP_SETTER(group, COMPS_DocGroup) /*comps_utils.h macro*/
 COMPS_STRPROP_SETTER(group, COMPS_DocGroup, desc) /*comps_utils.h macro*/
 COMPS_NUMPROP_SETTER(group, COMPS_DocGroup, def) /*comps_utils.h macro*/
 COMPS_NUMPROP_SETTER(group, COMPS_DocGroup, uservisible) /*comps_utils.h macro*/
@@ -86,6 +116,7 @@ void comps_docgroup_add_package(COMPS_DocGroup *group,
     if (group->packages == NULL) {
         group->packages = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
     }
+    comps_object_unshare((COMPS_Object**)&group->packages);
     comps_objlist_append_x(group->packages, (COMPS_Object*)package);
 }
 
@@ -101,6 +132,8 @@ COMPS_ObjList* comps_docgroup_get_packages(COMPS_DocGroup *group, char *name,
     if (!group) return NULL;
 
     ret = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+    /* returned packages could be modified */
+    comps_object_expose((COMPS_Object**)&group->packages);
 
     if (name != NULL) matched_max++;
     if (type != COMPS_PACKAGE_UNKNOWN) matched_max++;
@@ -125,8 +158,16 @@ signed char comps_docgroup_cmp_u(COMPS_Object *group1, COMPS_Object *group2) {
     #define _group1 ((COMPS_DocGroup*)group1)
     #define _group2 ((COMPS_DocGroup*)group2)
 
-    if (!comps_object_cmp((COMPS_Object*)_group1->properties,
-                          (COMPS_Object*)_group2->properties)) {
+    if (!COMPS_OBJECT_CMP(_group1->id, _group2->id) ||
+        !COMPS_OBJECT_CMP(_group1->name, _group2->name) ||
+        !COMPS_OBJECT_CMP(_group1->desc, _group2->desc) ||
+        !COMPS_OBJECT_CMP(_group1->def, _group2->def) ||
+        !COMPS_OBJECT_CMP(_group1->uservisible, _group2->uservisible) ||
+        !COMPS_OBJECT_CMP(_group1->biarchonly, _group2->biarchonly) ||
+        !COMPS_OBJECT_CMP(_group1->display_order, _group2->display_order) ||
+        !COMPS_OBJECT_CMP(_group1->langonly, _group2->langonly) ||
+        !COMPS_OBJECT_CMP(_group1->arches, _group2->arches) ||
+        !comps_objdict_equal(_group1->properties, _group2->properties)) {
         printf("Group properties cmp fail\n");
         return 0;
     }
@@ -155,14 +196,12 @@ signed char comps_docgroup_cmp_u(COMPS_Object *group1, COMPS_Object *group2) {
 }
 
 char __comps_docgroup_idcmp(void *g1, void *g2) {
-    COMPS_Object *obj1, *obj2;
-    char ret;
-    obj1 = comps_objdict_get(((COMPS_DocGroup*)g1)->properties, "id");
-    obj2 = comps_objdict_get(((COMPS_DocGroup*)g2)->properties, "id");
-    ret = comps_object_cmp(obj1, obj2);
-    COMPS_OBJECT_DESTROY(obj1);
-    COMPS_OBJECT_DESTROY(obj2);
-    return ret;
+    return COMPS_OBJECT_CMP(((COMPS_DocGroup*)g1)->id,
+                            ((COMPS_DocGroup*)g2)->id);
+}
+
+unsigned int __comps_docgroup_idhash(void *g) {
+    return comps_object_hash((COMPS_Object*)((COMPS_DocGroup*)g)->id);
 }
 
 COMPS_DocGroup* comps_docgroup_union(COMPS_DocGroup *g1, COMPS_DocGroup *g2) {
@@ -170,14 +209,40 @@ COMPS_DocGroup* comps_docgroup_union(COMPS_DocGroup *g1, COMPS_DocGroup *g2) {
     COMPS_ObjListIt *it;
     COMPS_Set *set;
     COMPS_DocGroupPackage *pkg;
+    COMPS_ObjList *list;
 
     res = COMPS_OBJECT_CREATE(COMPS_DocGroup, NULL);
-    COMPS_OBJECT_DESTROY(res->properties);
-
-    res->properties = comps_objdict_union(g1->properties, g2->properties);
+    #define _PROP_UNION(TYPE, PROP)\
+        res->PROP = (TYPE*)__comps_prop_union((COMPS_Object*)g1->PROP,\
+                                              (COMPS_Object*)g2->PROP)
+    _PROP_UNION(COMPS_Str, id);
+    _PROP_UNION(COMPS_Str, name);
+    _PROP_UNION(COMPS_Str, desc);
+    _PROP_UNION(COMPS_Num, def);
+    _PROP_UNION(COMPS_Num, uservisible);
+    _PROP_UNION(COMPS_Num, biarchonly);
+    _PROP_UNION(COMPS_Num, display_order);
+    _PROP_UNION(COMPS_Str, langonly);
+    _PROP_UNION(COMPS_ObjList, arches);
+    #undef _PROP_UNION
+    res->properties = comps_objdict_union_share(g1->properties,
+                                                g2->properties);
+    comps_object_destroy((COMPS_Object*)res->name_by_lang);
+    comps_object_destroy((COMPS_Object*)res->desc_by_lang);
+    res->name_by_lang = comps_objdict_union_share(g1->name_by_lang,
+                                                  g2->name_by_lang);
+    res->desc_by_lang = comps_objdict_union_share(g1->desc_by_lang,
+                                                  g2->desc_by_lang);
+    if ((list = __comps_list_union(g1->packages, g2->packages)) != NULL) {
+        comps_object_destroy((COMPS_Object*)res->packages);
+        res->packages = list;
+        return res;
+    }
     set = comps_set_create();
-    comps_set_init(set, NULL, NULL, (void(*)(void*))&comps_object_destroy,
-                                    &comps_docpackage_cmp_set);
+    comps_set_init_hashed(set, NULL, NULL,
+                               (void(*)(void*))&comps_object_destroy,
+                               &comps_docpackage_cmp_set,
+                               &comps_docpackage_hash_set);
     it = g1->packages?g1->packages->first:NULL;
     for (; it != NULL; it = it->next) {
         pkg = (COMPS_DocGroupPackage*) comps_object_copy(it->comps_obj);
@@ -199,10 +264,6 @@ COMPS_DocGroup* comps_docgroup_union(COMPS_DocGroup *g1, COMPS_DocGroup *g2) {
         }
     }
     comps_set_destroy(&set);
-    comps_object_destroy((COMPS_Object*)res->name_by_lang);
-    comps_object_destroy((COMPS_Object*)res->desc_by_lang);
-    res->name_by_lang = comps_objdict_union(g1->name_by_lang, g2->name_by_lang);
-    res->desc_by_lang = comps_objdict_union(g1->desc_by_lang, g2->desc_by_lang);
     return res;
 }
 
@@ -210,36 +271,28 @@ COMPS_DocGroup* comps_docgroup_intersect(COMPS_DocGroup *g1,
                                          COMPS_DocGroup *g2) {
     COMPS_DocGroup *res;
     COMPS_ObjListIt *it;
-    COMPS_HSListItem *hsit;
     COMPS_Set *set;
     COMPS_DocGroupPackage *newpkg;
-    COMPS_HSList *pairs1, *pairs2;
 
     res = COMPS_OBJECT_CREATE(COMPS_DocGroup, NULL);
-    set = comps_set_create();
-    //comps_objrtree_paircmp(void *obj1, void *obj2) {
-    comps_set_init(set, NULL, NULL, NULL, &comps_objrtree_paircmp);
-
-    pairs1 = comps_objdict_pairs(g1->properties);
-    for (hsit = pairs1->first; hsit != NULL; hsit = hsit->next) {
-        comps_set_add(set, hsit->data);
-    }
-    pairs2 = comps_objdict_pairs(g2->properties);
-    for (hsit = pairs2->first; hsit != NULL; hsit = hsit->next) {
-        if (comps_set_in(set, hsit->data)) {
-            comps_objdict_set(res->properties,
-                              ((COMPS_RTreePair*)hsit->data)->key,
-                              ((COMPS_RTreePair*)hsit->data)->data);
-        }
-    }
-    comps_hslist_destroy(&pairs1);
-    comps_hslist_destroy(&pairs2);
-    comps_set_clear(set);
-    //res->packages = (COMPS_ObjList*)comps_object_create(&COMPS_ObjList_ObjInfo,
-    //                                                    NULL);
+    #define _PROP_INTERSECT(TYPE, PROP)\
+        res->PROP = (TYPE*)__comps_prop_intersect((COMPS_Object*)g1->PROP,\
+                                                  (COMPS_Object*)g2->PROP)
+    _PROP_INTERSECT(COMPS_Str, id);
+    _PROP_INTERSECT(COMPS_Str, name);
+    _PROP_INTERSECT(COMPS_Str, desc);
+    _PROP_INTERSECT(COMPS_Num, def);
+    _PROP_INTERSECT(COMPS_Num, uservisible);
+    _PROP_INTERSECT(COMPS_Num, biarchonly);
+    _PROP_INTERSECT(COMPS_Num, display_order);
+    _PROP_INTERSECT(COMPS_Str, langonly);
+    _PROP_INTERSECT(COMPS_ObjList, arches);
+    #undef _PROP_INTERSECT
+    res->properties = comps_objdict_intersect(g1->properties, g2->properties);
 
-    //set = comps_set_create();
-    comps_set_init(set, NULL, NULL, NULL, &comps_docpackage_cmp_set);
+    set = comps_set_create();
+    comps_set_init_hashed(set, NULL, NULL, NULL, &comps_docpackage_cmp_set,
+                               &comps_docpackage_hash_set);
 
     for (it = g1->packages->first; it != NULL; it = it->next) {
         comps_set_add(set, it->comps_obj);
@@ -268,13 +321,21 @@ signed char comps_docgroup_xml(COMPS_DocGroup *group, xmlTextWriterPtr writer,
     static char* props[] = {"id", "name", "name", "desc",
                             "desc", "def", "uservisible", "biarchonly",
                             "display_order", "langonly"};
+    static size_t fields[] = {offsetof(COMPS_DocGroup, id),
+                              offsetof(COMPS_DocGroup, name), 0,
+                              offsetof(COMPS_DocGroup, desc), 0,
+                              offsetof(COMPS_DocGroup, def),
+                              offsetof(COMPS_DocGroup, uservisible),
+                              offsetof(COMPS_DocGroup, biarchonly),
+                              offsetof(COMPS_DocGroup, display_order),
+                              offsetof(COMPS_DocGroup, langonly)};
     static size_t type[] =   {0, 0, offsetof(COMPS_DocGroup, name_by_lang),
                               0, offsetof(COMPS_DocGroup, desc_by_lang), 0,
                               0, 0, 0, 0};
     static char* aliases[] = {NULL, NULL, NULL, "description", "description",
                               "default", NULL, NULL, NULL, NULL};
-    static bool explicit[] = {true, true, true, true, true, false, false,
-                              false, true, true};
+    bool explicit[] = {true, true, true, true, true, false, false,
+                       false, true, true};
     const char *str_true = "true";
     const char *str_false = "false";
     const char *default_val[] = {NULL, NULL, NULL, NULL, NULL,
@@ -315,7 +376,7 @@ signed char comps_docgroup_xml(COMPS_DocGroup *group, xmlTextWriterPtr writer,
     for (int i=0; i<10; i++) {
         //printf("%s\n", props[i]);
         if (!type[i]) {
-            obj = comps_objdict_get_x(group->properties, props[i]);
+            obj = *(COMPS_Object**)(((char*)group)+fields[i]);
             if (explicit[i]) {
                 if (obj) {
                     str = tostrf[i](obj);
@@ -424,25 +485,72 @@ char* comps_docgroup_tostr_u(COMPS_Object* group) {
 COMPS_DocGroup* comps_docgroup_arch_filter(COMPS_DocGroup *source,
                                            COMPS_ObjList *arches) {
     COMPS_ObjList *arches2;
-    COMPS_DocGroup *ret = COMPS_OBJECT_CREATE(COMPS_DocGroup, NULL);
-    COMPS_OBJECT_DESTROY(ret->properties);
-    ret->properties = (COMPS_ObjDict*)COMPS_OBJECT_COPY(source->properties);
-    COMPS_OBJECT_DESTROY(ret->name_by_lang);
-    ret->name_by_lang = (COMPS_ObjDict*)COMPS_OBJECT_COPY(source->name_by_lang);
-    COMPS_OBJECT_DESTROY(ret->desc_by_lang);
-    ret->desc_by_lang = (COMPS_ObjDict*)COMPS_OBJECT_COPY(source->desc_by_lang);
-    for (COMPS_ObjListIt *it = source->packages->first;
-         it != NULL; it = it->next) {
-        arches2 = comps_docpackage_arches((COMPS_DocGroupPackage*)it->comps_obj);
-        if (__comps_objlist_intersected(arches, arches2)) {
+    COMPS_ObjListIt *it;
+    COMPS_DocGroup *ret;
+
+    /* package list stays shared if every package passes. Package without
+     * arches isn't limited to any */
+    it = source->packages ? source->packages->first : NULL;
+    for (; it != NULL; it = it->next) {
+        arches2 = ((COMPS_DocGroupPackage*)it->comps_obj)->arches;
+        if (arches2 && !__comps_objlist_intersected(arches, arches2))
+            break;
+    }
+    ret = (COMPS_DocGroup*)comps_object_copy((COMPS_Object*)source);
+    if (it == NULL)
+        return ret;
+    COMPS_OBJECT_DESTROY(ret->packages);
+    ret->packages = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+    for (it = source->packages->first; it != NULL; it = it->next) {
+        arches2 = ((COMPS_DocGroupPackage*)it->comps_obj)->arches;
+        if (!arches2 || __comps_objlist_intersected(arches, arches2)) {
             comps_docgroup_add_package(ret, (COMPS_DocGroupPackage*)
                                             comps_object_copy(it->comps_obj));
         }
-        COMPS_OBJECT_DESTROY(arches2);
     }
     return ret;
 }
 
+void comps_docgroup_arch_filter_multi(COMPS_DocGroup *source,
+                                      const COMPS_ArchMap *map,
+                                      const COMPS_ArchMask *masks,
+                                      unsigned int count,
+                                      COMPS_DocGroup **ret) {
+    COMPS_ArchMask *pkg_masks;
+    COMPS_ObjList *arches;
+    COMPS_ObjListIt *it;
+    unsigned int x, i, len = source->packages ? source->packages->len : 0;
+
+    /* package without arches gets full mask and passes every filter */
+    pkg_masks = malloc(sizeof(COMPS_ArchMask) * (len + 1));
+    it = source->packages ? source->packages->first : NULL;
+    for (i = 0; it != NULL; it = it->next, i++) {
+        arches = ((COMPS_DocGroupPackage*)it->comps_obj)->arches;
+        pkg_masks[i] = arches ? comps_archmap_mask(map, arches)
+                              : COMPS_ARCHMASK_ALL;
+    }
+    for (x = 0; x < count; x++) {
+        if (!masks[x]) {
+            ret[x] = NULL;
+            continue;
+        }
+        ret[x] = (COMPS_DocGroup*)comps_object_copy((COMPS_Object*)source);
+        for (i = 0; i < len && (pkg_masks[i] & masks[x]); i++);
+        if (i == len)
+            continue;
+        COMPS_OBJECT_DESTROY(ret[x]->packages);
+        ret[x]->packages = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+        it = source->packages->first;
+        for (i = 0; it != NULL; it = it->next, i++) {
+            if (pkg_masks[i] & masks[x]) {
+                comps_docgroup_add_package(ret[x], (COMPS_DocGroupPackage*)
+                                            comps_object_copy(it->comps_obj));
+            }
+        }
+    }
+    free(pkg_masks);
+}
+
 COMPS_ObjectInfo COMPS_DocGroup_ObjInfo = {
     .obj_size = sizeof(COMPS_DocGroup),
     .constructor = &comps_docgroup_create_u,
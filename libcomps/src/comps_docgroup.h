@@ -28,6 +28,7 @@
 #include "comps_validate.h"
 #include "comps_radix.h"
 #include "comps_default.h"
+#include "comps_archmask.h"
 
 #include <stddef.h>
 #include <assert.h>
@@ -48,14 +49,25 @@
 /** COMPS_Object derivate representing group element in comps.xml file */
 typedef struct {
     COMPS_Object_HEAD;
+    COMPS_Str *id; /**< group id */
+    COMPS_Str *name; /**< group name */
+    COMPS_Str *desc; /**< group description */
+    COMPS_Num *def; /**< group default attribute */
+    COMPS_Num *uservisible; /**< group uservisible attribute */
+    COMPS_Num *biarchonly; /**< group biarchonly attribute */
+    COMPS_Num *display_order; /**< group display order */
+    COMPS_Str *langonly; /**< group langonly attribute */
+    COMPS_ObjList *arches; /**< arches group is limited to */
     COMPS_ObjDict *properties;
-    /**< properties of group */
+    /**< other properties of group, NULL until first one is set */
     COMPS_ObjDict *name_by_lang;
     /**< language localization of name attribute */
     COMPS_ObjDict *desc_by_lang;
     /**< language localization of description attribute */
     COMPS_ObjList *packages;
     /**< list of packages in group */
+    COMPS_IdRev *id_rev;
+    /**< revision of id and name, NULL until group is indexed */
 } COMPS_DocGroup;
 
 //HEAD_COMPS_CREATE_u(docgroup, COMPS_DocGroup)  /*comps_utils.h macro*/
@@ -194,7 +206,8 @@ HEAD_COMPS_PROP_GETTER(group, COMPS_DocGroup, langonly) /*comps_utils.h macro*/
 /** COMPS_DocGroup package list getter
  * @param obj COMPS_DocGroup object
  * @return COMPS_ObjList with packages in group. Reference of list isn't
- * incremented
+ * incremented. List isn't shared with copies of object made
+ * afterwards, so it could be modified
  */
 HEAD_COMPS_DOCOBJ_GETOBJLIST(docgroup, COMPS_DocGroup, packages, packages)
 /**@}*/
@@ -218,6 +231,7 @@ HEAD_COMPS_DOCOBJ_SETARCHES(docgroup, COMPS_DocGroup)
 
 signed char comps_docgroup_cmp_u(COMPS_Object *group1, COMPS_Object *group2);
 char __comps_docgroup_idcmp(void *g1, void *g2);
+unsigned int __comps_docgroup_idhash(void *g);
 
 /** add package to packages list in group
  * @param cat COMPS_DocGroup object
@@ -260,6 +274,23 @@ signed char comps_docgroup_xml(COMPS_DocGroup *group, xmlTextWriterPtr writer,
 COMPS_DocGroup* comps_docgroup_arch_filter(COMPS_DocGroup *source,
                                            COMPS_ObjList *arches);
 
+/** Filter group packages by several arch masks at once
+ *
+ * Same as comps_docgroup_arch_filter called for every mask, but arches of
+ * each package are looked up only once
+ * @param source COMPS_DocGroup object
+ * @param map COMPS_ArchMap with registered arches of all masks
+ * @param masks arch masks, zero mask means result isn't wanted
+ * @param count number of masks
+ * @param ret array of count results, new COMPS_DocGroup objects or NULL
+ * for zero masks
+ */
+void comps_docgroup_arch_filter_multi(COMPS_DocGroup *source,
+                                      const COMPS_ArchMap *map,
+                                      const COMPS_ArchMask *masks,
+                                      unsigned int count,
+                                      COMPS_DocGroup **ret);
+
 extern COMPS_ObjectInfo COMPS_DocGroup_ObjInfo;
 extern COMPS_ValRuleGeneric* COMPS_DocGroup_ValidateRules[];
 
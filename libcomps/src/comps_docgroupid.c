@@ -24,20 +24,24 @@ void comps_docgroupid_create(COMPS_DocGroupId* groupid, COMPS_Object **args) {
     groupid->name = NULL;
     groupid->def = 0;
     groupid->arches = NULL;
+    groupid->id_rev = NULL;
 }
 COMPS_CREATE_u(docgroupid, COMPS_DocGroupId)
 
 void comps_docgroupid_copy(COMPS_DocGroupId *gid_dst,
                            COMPS_DocGroupId *gid_src) {
-    gid_dst->name = (COMPS_Str*)comps_object_copy((COMPS_Object*)gid_src->name);
-    gid_dst->arches = (COMPS_ObjList*)comps_object_copy((COMPS_Object*)gid_src->arches);
+    gid_dst->name = (COMPS_Str*)comps_object_share((COMPS_Object*)gid_src->name);
+    gid_dst->arches = (COMPS_ObjList*)comps_object_share(
+                                            (COMPS_Object*)gid_src->arches);
     gid_dst->def = gid_src->def;
+    gid_dst->id_rev = NULL;
 }
 COMPS_COPY_u(docgroupid, COMPS_DocGroupId)    /*comps_utils.h macro*/
 
 void comps_docgroupid_destroy(COMPS_DocGroupId *gid) {
     COMPS_OBJECT_DESTROY(gid->name);
     COMPS_OBJECT_DESTROY(gid->arches);
+    comps_idrev_release(gid->id_rev);
 }
 COMPS_DESTROY_u(docgroupid, COMPS_DocGroupId) /*comps_utils.h macro*/
 
@@ -49,7 +53,8 @@ void comps_docgroupid_set_name(COMPS_DocGroupId *gid, char *name, char copy) {
     (void)copy;
     if (gid->name)
         COMPS_OBJECT_DESTROY(gid->name);
-    gid->name = comps_str(name);
+    gid->name = comps_str_intern(name);
+    comps_idrev_bump(gid->id_rev);
 }
 
 COMPS_Object* comps_docgroupid_get_default(COMPS_DocGroupId *gid) {
@@ -60,7 +65,8 @@ void comps_docgroupid_set_default(COMPS_DocGroupId *gid, int def) {
 }
 
 COMPS_ObjList* comps_docgroupid_arches(COMPS_DocGroupId *gid) {
-    return (COMPS_ObjList*)comps_object_incref((COMPS_Object*)gid->arches);
+    return (COMPS_ObjList*)comps_object_incref(
+                            comps_object_expose((COMPS_Object**)&gid->arches));
 }
 void comps_docgroupid_set_arches(COMPS_DocGroupId *gid,
                                  COMPS_ObjList *arches) {
@@ -89,6 +95,12 @@ char __comps_docgroupid_cmp_set(void *gid1, void *gid2) {
     return comps_object_cmp((COMPS_Object*)((COMPS_DocGroupId*)gid1)->name,
                             (COMPS_Object*)((COMPS_DocGroupId*)gid2)->name);
 }
+unsigned int __comps_docgroupid_hash_set(void *gid) {
+    return comps_object_hash((COMPS_Object*)((COMPS_DocGroupId*)gid)->name);
+}
+static unsigned int comps_docgroupid_hash_u(COMPS_Object *gid) {
+    return __comps_docgroupid_hash_set(gid);
+}
 char* comps_docgroupid_str_u(COMPS_Object* docgroupid) {
     const int len = strlen("<COMPS_DocGroupId name='' default=''>");
     char *name = comps_object_tostr((COMPS_Object*)((COMPS_DocGroupId*)docgroupid)->name);
@@ -99,6 +111,69 @@ char* comps_docgroupid_str_u(COMPS_Object* docgroupid) {
     return ret;
 }
 
+COMPS_ObjList* __comps_docgroupids_arch_filter(COMPS_ObjList *list,
+                                               COMPS_ObjList *arches) {
+    COMPS_ObjList *ret, *arches2;
+    COMPS_ObjListIt *it;
+
+    for (it = list ? list->first : NULL; it != NULL; it = it->next) {
+        arches2 = ((COMPS_DocGroupId*)it->comps_obj)->arches;
+        if (!arches2 || !__comps_objlist_intersected(arches, arches2))
+            break;
+    }
+    if (it == NULL) {
+        if (!list)
+            return COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+        return (COMPS_ObjList*)comps_object_share((COMPS_Object*)list);
+    }
+    ret = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+    for (it = list->first; it != NULL; it = it->next) {
+        arches2 = ((COMPS_DocGroupId*)it->comps_obj)->arches;
+        if (arches2 && __comps_objlist_intersected(arches, arches2))
+            comps_objlist_append_x(ret, comps_object_copy(it->comps_obj));
+    }
+    return ret;
+}
+
+void __comps_docgroupids_arch_filter_multi(COMPS_ObjList *list,
+                                           const COMPS_ArchMap *map,
+                                           const COMPS_ArchMask *masks,
+                                           unsigned int count,
+                                           COMPS_ObjList **ret) {
+    COMPS_ArchMask *gid_masks;
+    COMPS_ObjListIt *it;
+    unsigned int x, i, len = list ? list->len : 0;
+
+    /* group id without arches gets empty mask and passes no filter */
+    gid_masks = malloc(sizeof(COMPS_ArchMask) * (len + 1));
+    for (it = list ? list->first : NULL, i = 0; it != NULL;
+         it = it->next, i++) {
+        gid_masks[i] = comps_archmap_mask(map,
+                                ((COMPS_DocGroupId*)it->comps_obj)->arches);
+    }
+    for (x = 0; x < count; x++) {
+        if (!masks[x]) {
+            ret[x] = NULL;
+            continue;
+        }
+        for (i = 0; i < len && (gid_masks[i] & masks[x]); i++);
+        if (i == len) {
+            if (!list)
+                ret[x] = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+            else
+                ret[x] = (COMPS_ObjList*)comps_object_share(
+                                                    (COMPS_Object*)list);
+            continue;
+        }
+        ret[x] = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+        for (it = list->first, i = 0; it != NULL; it = it->next, i++) {
+            if (gid_masks[i] & masks[x])
+                comps_objlist_append_x(ret[x], comps_object_copy(it->comps_obj));
+        }
+    }
+    free(gid_masks);
+}
+
 signed char comps_docgroupid_xml(COMPS_DocGroupId *groupid,
                                   xmlTextWriterPtr writer,
                                   COMPS_Log *log, COMPS_XMLOptions *options,
@@ -147,7 +222,8 @@ COMPS_ObjectInfo COMPS_DocGroupId_ObjInfo = {
     .destructor = &comps_docgroupid_destroy_u,
     .copy = &comps_docgroupid_copy_u,
     .obj_cmp = &comps_docgroupid_cmp_u,
-    .to_str = &comps_docgroupid_str_u
+    .to_str = &comps_docgroupid_str_u,
+    .hash = &comps_docgroupid_hash_u
 };
 
 COMPS_ValRuleGeneric* COMPS_DocGroupId_ValidateRules[] = {
@@ -26,19 +26,21 @@ static void comps_docpackage_create(COMPS_DocGroupPackage* package, COMPS_Object
     package->basearchonly = NULL;
     package->arches = NULL;
     package->type = COMPS_PACKAGE_UNKNOWN;
+    package->id_rev = NULL;
 }
 COMPS_CREATE_u(docpackage, COMPS_DocGroupPackage)
 
 static void comps_docpackage_copy(COMPS_DocGroupPackage *pkg_dst,
                            COMPS_DocGroupPackage *pkg_src) {
-    pkg_dst->name = (COMPS_Str*)comps_object_copy((COMPS_Object*)pkg_src->name);
-    pkg_dst->requires = (COMPS_Str*)comps_object_copy(
+    pkg_dst->name = (COMPS_Str*)comps_object_share((COMPS_Object*)pkg_src->name);
+    pkg_dst->requires = (COMPS_Str*)comps_object_share(
                                             (COMPS_Object*)pkg_src->requires);
-    pkg_dst->basearchonly = (COMPS_Num*)comps_object_copy(
+    pkg_dst->basearchonly = (COMPS_Num*)comps_object_share(
                                           (COMPS_Object*)pkg_src->basearchonly);
-    pkg_dst->arches = (COMPS_ObjList*)comps_object_copy(
+    pkg_dst->arches = (COMPS_ObjList*)comps_object_share(
                                           (COMPS_Object*)pkg_src->arches);
     pkg_dst->type = pkg_src->type;
+    pkg_dst->id_rev = NULL;
 }
 COMPS_COPY_u(docpackage, COMPS_DocGroupPackage)    /*comps_utils.h macro*/
 
@@ -47,6 +49,7 @@ static void comps_docpackage_destroy(COMPS_DocGroupPackage *pkg) {
     comps_object_destroy((COMPS_Object*)pkg->requires);
     comps_object_destroy((COMPS_Object*)pkg->basearchonly);
     comps_object_destroy((COMPS_Object*)pkg->arches);
+    comps_idrev_release(pkg->id_rev);
 }
 COMPS_DESTROY_u(docpackage, COMPS_DocGroupPackage) /*comps_utils.h macro*/
 
@@ -54,7 +57,8 @@ void comps_docpackage_set_name(COMPS_DocGroupPackage *pkg, char *name, char copy
     (void)copy;
     if (pkg->name)
         comps_object_destroy((COMPS_Object*)pkg->name);
-    pkg->name = comps_str(name);
+    pkg->name = comps_str_intern(name);
+    comps_idrev_bump(pkg->id_rev);
 }
 
 COMPS_Object* comps_docpackage_get_name(COMPS_DocGroupPackage *pkg) {
@@ -65,7 +69,7 @@ void comps_docpackage_set_requires(COMPS_DocGroupPackage *pkg, char *requires, c
     (void)copy;
     if (pkg->requires)
         comps_object_destroy((COMPS_Object*)pkg->requires);
-    pkg->requires = comps_str(requires);
+    pkg->requires = comps_str_intern(requires);
 }
 
 COMPS_Object* comps_docpackage_get_requires(COMPS_DocGroupPackage *pkg) {
@@ -88,12 +92,14 @@ COMPS_Object* comps_docpackage_get_basearchonly(COMPS_DocGroupPackage *pkg) {
 void comps_docpackage_set_type_i(COMPS_DocGroupPackage *pkg, int type, bool unset) {
     (void)unset;
     pkg->type = type;
+    comps_idrev_bump(pkg->id_rev);
 }
 
 void comps_docpackage_set_type(COMPS_DocGroupPackage *pkg,
                                    COMPS_PackageType type, bool unset) {
     (void)unset;
     pkg->type = type;
+    comps_idrev_bump(pkg->id_rev);
 }
 
 COMPS_Object* comps_docpackage_get_type(COMPS_DocGroupPackage *pkg) {
@@ -140,6 +146,14 @@ inline char comps_docpackage_cmp_set(void *pkg1, void *pkg2) {
                             ((COMPS_DocGroupPackage*)pkg2)->name);
 }
 
+unsigned int comps_docpackage_hash_set(void *pkg) {
+    return comps_object_hash((COMPS_Object*)((COMPS_DocGroupPackage*)pkg)->name);
+}
+
+static unsigned int comps_docpackage_hash_u(COMPS_Object *pkg) {
+    return comps_docpackage_hash_set(pkg);
+}
+
 signed char comps_docpackage_xml(COMPS_DocGroupPackage *pkg,
                                  xmlTextWriterPtr writer,
                                  COMPS_Log *log, COMPS_XMLOptions *xml_options,
@@ -229,7 +243,8 @@ static char* comps_docpackage_str_u(COMPS_Object* docpackage) {
 }
 
 COMPS_ObjList* comps_docpackage_arches(COMPS_DocGroupPackage *pkg) {
-    return (COMPS_ObjList*)comps_object_incref((COMPS_Object*)pkg->arches);
+    return (COMPS_ObjList*)comps_object_incref(
+                            comps_object_expose((COMPS_Object**)&pkg->arches));
 }
 void comps_docpackage_set_arches(COMPS_DocGroupPackage *pkg,
                                  COMPS_ObjList *arches) {
@@ -251,5 +266,6 @@ COMPS_ObjectInfo COMPS_DocGroupPackage_ObjInfo = {
     .destructor = &comps_docpackage_destroy_u,
     .copy = &comps_docpackage_copy_u,
     .obj_cmp = &comps_docpackage_cmp_u,
-    .to_str = &comps_docpackage_str_u
+    .to_str = &comps_docpackage_str_u,
+    .hash = &comps_docpackage_hash_u
 };
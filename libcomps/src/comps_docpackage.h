@@ -37,6 +37,9 @@ typedef enum {COMPS_PACKAGE_DEFAULT, COMPS_PACKAGE_OPTIONAL,
               COMPS_PACKAGE_CONDITIONAL, COMPS_PACKAGE_MANDATORY,
               COMPS_PACKAGE_UNKNOWN} COMPS_PackageType;
 
+/** bit of COMPS_PackageType in mask of package types */
+#define COMPS_PACKAGE_TYPE_MASK(TYPE) (1 << (TYPE))
+
 /** COMPS_Object derivate representing packagereq element in comps.xml structure*/
 typedef struct {
     COMPS_Object_HEAD;
@@ -45,6 +48,8 @@ typedef struct {
     COMPS_Str *requires; /**< packagereq requires attribute */
     COMPS_Num *basearchonly;
     COMPS_ObjList *arches;
+    COMPS_IdRev *id_rev;
+    /**< revision of name and type, NULL until package is indexed */
 } COMPS_DocGroupPackage;
 
 
@@ -54,6 +59,7 @@ typedef struct {
 
 signed char comps_docpackage_cmp_u(COMPS_Object *pkg1, COMPS_Object *pkg2);
 char comps_docpackage_cmp_set(void *pkg1, void *pkg2);
+unsigned int comps_docpackage_hash_set(void *pkg);
 
 /** COMPS_DocGroupPackage name getter
  * @param pkg COMPS_DocGroupPackage object
@@ -130,6 +136,13 @@ void comps_docpackage_set_basearchonly(COMPS_DocGroupPackage *pkg,
 COMPS_Object* comps_docpackage_get_basearchonly(COMPS_DocGroupPackage *pkg);
 
 char __comps_docpackage_idcmp(void *pkg1, void *pkg2);
+
+/** return arches package is limited to
+ * @param pkg COMPS_DocGroupPackage object
+ * @return COMPS_ObjList of arches with incremented reference count or NULL.
+ * List isn't shared with copies of package made afterwards, so it could be
+ * modified
+ */
 COMPS_ObjList* comps_docpackage_arches(COMPS_DocGroupPackage *pkg);
 void comps_docpackage_set_arches(COMPS_DocGroupPackage *pkg,
                                  COMPS_ObjList *arches);
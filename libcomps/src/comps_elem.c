@@ -57,7 +57,8 @@ const COMPS_ElemInfo COMPS_NAME_ElemInfo = {
                                           COMPS_ELEM_CATEGORY,
                                           COMPS_ELEM_ENV,
                                           COMPS_ELEM_SENTINEL},
-    .attributes = (const COMPS_ElemAttrInfo*[]){&COMPS_XMLLANG_ElemAttrInfo},
+    .attributes = (const COMPS_ElemAttrInfo*[]){&COMPS_XMLLANG_ElemAttrInfo,
+                                                NULL},
     .preproc = NULL,//&comps_elem_name_preproc,
     .postproc = &comps_elem_idnamedesc_postproc
 };
@@ -67,7 +68,8 @@ const COMPS_ElemInfo COMPS_DESC_ElemInfo = {
                                           COMPS_ELEM_CATEGORY,
                                           COMPS_ELEM_ENV,
                                           COMPS_ELEM_SENTINEL},
-    .attributes = (const COMPS_ElemAttrInfo*[]){&COMPS_XMLLANG_ElemAttrInfo},
+    .attributes = (const COMPS_ElemAttrInfo*[]){&COMPS_XMLLANG_ElemAttrInfo,
+                                                NULL},
     .preproc = NULL,//&comps_elem_desc_preproc,
     .postproc = &comps_elem_idnamedesc_postproc
 };
@@ -440,7 +442,7 @@ COMPS_ObjList * __comps_split_arches(char *arches) {
     list = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
     pch = strtok(arches, " ");
     while (pch != NULL) {
-        comps_objlist_append_x(list, (COMPS_Object*)comps_str(pch));
+        comps_objlist_append_x(list, (COMPS_Object*)comps_str_intern(pch));
         pch = strtok(NULL, " ");
     }
     return list;
@@ -457,7 +459,7 @@ void comps_elem_group_preproc(COMPS_Parsed* parsed, COMPS_Elem *elem) {
 
     COMPS_DocGroup *group = COMPS_OBJECT_CREATE(COMPS_DocGroup, NULL);
     comps_doc_add_group(parsed->comps_doc, group);
-    arches = comps_dict_get(elem->attrs, "arch");
+    arches = comps_elem_get_attr(elem, "arch");
     if (arches) {
         COMPS_ObjList *larches = __comps_split_arches(arches);
         comps_docgroup_set_arches(group, larches);
@@ -503,7 +505,7 @@ void comps_elem_category_preproc(COMPS_Parsed *parsed, COMPS_Elem *elem) {
     char *arches;
     COMPS_DocCategory *category = COMPS_OBJECT_CREATE(COMPS_DocCategory, NULL);
     comps_doc_add_category(parsed->comps_doc, category);
-    arches = comps_dict_get(elem->attrs, "arch");
+    arches = comps_elem_get_attr(elem, "arch");
     if (arches) {
         COMPS_ObjList *larches = __comps_split_arches(arches);
         comps_doccategory_set_arches(category, larches);
@@ -528,7 +530,7 @@ void comps_elem_env_preproc(COMPS_Parsed *parsed, COMPS_Elem *elem) {
     char *arches;
     COMPS_DocEnv *env = COMPS_OBJECT_CREATE(COMPS_DocEnv, NULL);
     comps_doc_add_environment(parsed->comps_doc, env);
-    arches = comps_dict_get(elem->attrs, "arch");
+    arches = comps_elem_get_attr(elem, "arch");
     if (arches) {
         COMPS_ObjList *larches = __comps_split_arches(arches);
         comps_docenv_set_arches(env, larches);
@@ -597,18 +599,18 @@ void comps_elem_packagereq_preproc(COMPS_Parsed *parsed, COMPS_Elem *elem) {
     package = COMPS_OBJECT_CREATE(COMPS_DocGroupPackage, NULL);
 
     comps_docgroup_add_package(group, package);
-    tmp = comps_dict_get(elem->attrs, "type");
+    tmp = comps_elem_get_attr(elem, "type");
     if (!tmp)
         package->type = parsed->def_options->default_pkgtype;
     else
         package->type = comps_package_get_type(tmp);
-    tmp = comps_dict_get(elem->attrs, "requires");
+    tmp = comps_elem_get_attr(elem, "requires");
     if (tmp)
-        package->requires = comps_str(tmp);
-    tmp = comps_dict_get(elem->attrs, "basearchonly");
+        package->requires = comps_str_intern(tmp);
+    tmp = comps_elem_get_attr(elem, "basearchonly");
     if (tmp && (strcmp(tmp, "true") == 0))
         package->basearchonly = comps_num(1);
-    char *arches = comps_dict_get(elem->attrs, "arch");
+    char *arches = comps_elem_get_attr(elem, "arch");
     if (arches) {
         COMPS_ObjList *larches = __comps_split_arches(arches);
         comps_docpackage_set_arches(package, larches);
@@ -635,7 +637,7 @@ void comps_elem_groupid_preproc(COMPS_Parsed *parsed, COMPS_Elem *elem) {
     COMPS_ObjList *list;
     char *tmp;
     groupid = COMPS_OBJECT_CREATE(COMPS_DocGroupId, NULL);
-    tmp = comps_dict_get(elem->attrs, "default");
+    tmp = comps_elem_get_attr(elem, "default");
     if (tmp)
         comps_docgroupid_set_default(groupid,
                                      __comps_strcmp(tmp, "true")?1:0);
@@ -659,7 +661,7 @@ void comps_elem_groupid_preproc(COMPS_Parsed *parsed, COMPS_Elem *elem) {
             comps_doccategory_add_groupid(cat, groupid);
         }
     }
-    char *arches = comps_dict_get(elem->attrs, "arch");
+    char *arches = comps_elem_get_attr(elem, "arch");
     if (arches) {
         //printf("arches :%s\n", arches);
         COMPS_ObjList *larches = __comps_split_arches(arches);
@@ -695,42 +697,56 @@ void comps_elem_groupid_postproc(COMPS_Parsed *parsed, COMPS_Elem *elem) {
 }
 void comps_elem_match_preproc(COMPS_Parsed *parsed, COMPS_Elem *elem) {
     comps_doc_add_langpack(parsed->comps_doc,
-                           comps_dict_get(elem->attrs, "name"),
-                           comps_str(comps_dict_get(elem->attrs, "install")));
+                           comps_elem_get_attr(elem, "name"),
+                           comps_str_intern(comps_elem_get_attr(elem,
+                                                                "install")));
 }
 void comps_elem_package_preproc(COMPS_Parsed *parsed, COMPS_Elem *elem) {
     comps_doc_add_blacklist(parsed->comps_doc,
-                            comps_dict_get(elem->attrs, "name"),
-                            comps_str((comps_dict_get(elem->attrs, "arch"))));
+                            comps_elem_get_attr(elem, "name"),
+                            comps_str_intern(comps_elem_get_attr(elem,
+                                                                 "arch")));
 }
 void comps_elem_ignoredep_preproc(COMPS_Parsed *parsed, COMPS_Elem *elem) {
     comps_doc_add_whiteout(parsed->comps_doc,
-                           comps_dict_get(elem->attrs, "requires"),
-                           comps_str((comps_dict_get(elem->attrs, "package"))));
+                           comps_elem_get_attr(elem, "requires"),
+                           comps_str_intern(comps_elem_get_attr(elem,
+                                                                "package")));
 }
 void comps_elem_idnamedesc_postproc(COMPS_Parsed *parsed, COMPS_Elem *elem) {
-    COMPS_ObjDict *props, *name_by_lang, *desc_by_lang;
+    COMPS_ObjDict *name_by_lang, *desc_by_lang;
+    COMPS_Str **id, **name, **desc;
+    COMPS_IdRev *id_rev;
     COMPS_ObjList *list;
     char *lang;
 
     if (elem->ancestor->type == COMPS_ELEM_GROUP) {
         list = comps_doc_groups(parsed->comps_doc);
         COMPS_DocGroup *group = (COMPS_DocGroup*)list->last->comps_obj;
-        props = group->properties;
+        id = &group->id;
+        name = &group->name;
+        desc = &group->desc;
         name_by_lang = group->name_by_lang;
         desc_by_lang = group->desc_by_lang;
+        id_rev = group->id_rev;
     } else if (elem->ancestor->type == COMPS_ELEM_CATEGORY) {
         list = comps_doc_categories(parsed->comps_doc);
         COMPS_DocCategory *cat = (COMPS_DocCategory*)list->last->comps_obj;
-        props = cat->properties;
+        id = &cat->id;
+        name = &cat->name;
+        desc = &cat->desc;
         name_by_lang = cat->name_by_lang;
         desc_by_lang = cat->desc_by_lang;
+        id_rev = cat->id_rev;
     } else {
         list = comps_doc_environments(parsed->comps_doc);
         COMPS_DocEnv *env = (COMPS_DocEnv*)list->last->comps_obj;
-        props = env->properties;
+        id = &env->id;
+        name = &env->name;
+        desc = &env->desc;
         name_by_lang = env->name_by_lang;
         desc_by_lang = env->desc_by_lang;
+        id_rev = env->id_rev;
     }
     COMPS_OBJECT_DESTROY(list);
     if (!parsed->tmp_buffer) {
@@ -741,30 +757,32 @@ void comps_elem_idnamedesc_postproc(COMPS_Parsed *parsed, COMPS_Elem *elem) {
         return;
     }
     if (elem->type == COMPS_ELEM_ID) {
-        __comps_check_allready_set(comps_objdict_get(props, "id"), "id",parsed);
-        comps_objdict_set_x(props, "id",
-                            (COMPS_Object*)comps_str(parsed->tmp_buffer));
+        __comps_check_allready_set(COMPS_OBJECT_INCREF(*id), "id", parsed);
+        COMPS_OBJECT_DESTROY(*id);
+        *id = comps_str_intern(parsed->tmp_buffer);
+        comps_idrev_bump(id_rev);
         //printf("id set %s\n", parsed->tmp_buffer);
     } else if (elem->type == COMPS_ELEM_NAME) {
-        if ((lang = comps_dict_get(elem->attrs, "xml:lang"))) {
+        if ((lang = comps_elem_get_attr(elem, "xml:lang"))) {
             comps_objdict_set_x(name_by_lang, lang,
                                 (COMPS_Object*)comps_str(parsed->tmp_buffer));
         } else {
-            __comps_check_allready_set(comps_objdict_get(props, "name"),
+            __comps_check_allready_set(COMPS_OBJECT_INCREF(*name),
                                        "name", parsed);
             //printf("name set %s\n", parsed->tmp_buffer);
-            comps_objdict_set_x(props, "name",
-                                (COMPS_Object*)comps_str(parsed->tmp_buffer));
+            COMPS_OBJECT_DESTROY(*name);
+            *name = comps_str(parsed->tmp_buffer);
+            comps_idrev_bump(id_rev);
         }
     } else {
-        if ((lang = comps_dict_get(elem->attrs, "xml:lang"))) {
+        if ((lang = comps_elem_get_attr(elem, "xml:lang"))) {
             comps_objdict_set_x(desc_by_lang, lang,
                                 (COMPS_Object*)comps_str(parsed->tmp_buffer));
         } else {
-            __comps_check_allready_set(comps_objdict_get(props, "desc"),
+            __comps_check_allready_set(COMPS_OBJECT_INCREF(*desc),
                                        "desc", parsed);
-            comps_objdict_set_x(props, "desc",
-                                (COMPS_Object*)comps_str(parsed->tmp_buffer));
+            COMPS_OBJECT_DESTROY(*desc);
+            *desc = comps_str(parsed->tmp_buffer);
         }
     }
     parsed->tmp_buffer = NULL;
@@ -789,8 +807,7 @@ void comps_elem_default_postproc(COMPS_Parsed *parsed, COMPS_Elem *elem) {
 void comps_elem_langonly_postproc(COMPS_Parsed *parsed, COMPS_Elem *elem) {
     (void)elem;
     COMPS_ObjList *list = comps_doc_groups(parsed->comps_doc);
-    __comps_check_allready_set(comps_objdict_get(last_group->properties,
-                                                 "langonly"),
+    __comps_check_allready_set(comps_docgroup_get_langonly(last_group),
                                "langonly", parsed);
     comps_docgroup_set_langonly(last_group, parsed->tmp_buffer, 1);
     COMPS_OBJECT_DESTROY(list);
@@ -830,37 +847,31 @@ void comps_elem_biarchonly_postproc(COMPS_Parsed *parsed, COMPS_Elem *elem) {
     parsed->tmp_buffer = NULL;
 }
 void comps_elem_display_order_postproc(COMPS_Parsed *parsed, COMPS_Elem *elem) {
-    COMPS_Object* prop;
-    COMPS_ObjDict *dict;
+    COMPS_Num **prop;
     COMPS_ObjList *list;
 
     if (elem->ancestor->type == COMPS_ELEM_CATEGORY) {
         list = comps_doc_categories(parsed->comps_doc);
         COMPS_DocCategory *category = (COMPS_DocCategory*)list->last->comps_obj;
-        dict = category->properties;
-        prop = comps_doccategory_get_display_order(category);
+        prop = &category->display_order;
     } else if (elem->ancestor->type == COMPS_ELEM_ENV) {
         list = comps_doc_environments(parsed->comps_doc);
         COMPS_DocEnv *env = (COMPS_DocEnv*)list->last->comps_obj;
-        dict = env->properties;
-        prop = comps_docenv_get_display_order(env);
+        prop = &env->display_order;
     } else {
         list = comps_doc_groups(parsed->comps_doc);
         COMPS_DocGroup *group = (COMPS_DocGroup*)list->last->comps_obj;
-        dict = group->properties;
-        prop = comps_docgroup_get_display_order(group);
+        prop = &group->display_order;
     }
     COMPS_OBJECT_DESTROY(list);
-    if (prop) {
+    if (*prop) {
         comps_log_warning_x(parsed->log, COMPS_ERR_ELEM_ALREADYSET, 3,
                             comps_str(elem->name), comps_num(parser_line),
                             comps_num(parser_col));
-    } else if (dict) {
-        prop = (COMPS_Object*)comps_num(0);
-        comps_objdict_set_x(dict, "display_order", prop);
+    } else {
+        *prop = comps_num(0);
     }
-    if (prop)
-        sscanf(parsed->tmp_buffer, "%d", &((COMPS_Num*)prop)->val);
+    sscanf(parsed->tmp_buffer, "%d", &(*prop)->val);
     parsed->tmp_buffer = NULL;
 }
     #undef parser_line
@@ -895,38 +906,49 @@ COMPS_ElemAttr * comps_elem_attr_create(const char *name, const char *val) {
 COMPS_Elem* comps_elem_create(const char * s, const char ** attrs,
                               COMPS_ElemType type) {
     COMPS_Elem *elem;
-    char *val;
-    if ((elem = malloc(sizeof(COMPS_Elem))) == NULL)
+    size_t size, len, count = 0;
+    char *data;
+    int x;
+
+    /* element, attributes array and all strings are one allocation */
+    size = sizeof(COMPS_Elem);
+    if (type == COMPS_ELEM_UNKNOWN)
+        size += strlen(s) + 1;
+    for (x = 0; attrs != NULL && attrs[x] != NULL; x++) {
+        size += strlen(attrs[x]) + 1;
+        count++;
+    }
+    size += sizeof(char*) * (count + 1);
+    if ((elem = malloc(size)) == NULL)
         return NULL;
 
     elem->type = type;
+    elem->attrs = (char**)(elem + 1);
+    data = (char*)(elem->attrs + count + 1);
+    for (x = 0; x < (int)count; x++) {
+        len = strlen(attrs[x]) + 1;
+        elem->attrs[x] = memcpy(data, attrs[x], sizeof(char) * len);
+        data += len;
+    }
+    elem->attrs[count] = NULL;
     if (type == COMPS_ELEM_UNKNOWN) {
-        if ((elem->name = malloc(sizeof(char) * (strlen(s)+1))) == NULL) {
-            free(elem);
-            return NULL;
-        }
+        elem->name = data;
         memcpy(elem->name, s, (strlen(s)+1) * sizeof(char));
     } else {
         elem->name = NULL;
     }
+    return elem;
+}
 
-    /* Add attributes to elem */
-    elem->attrs = comps_dict_create(NULL, NULL, &free);
-    if (attrs != NULL) {
-        for (; *attrs != NULL; attrs += 2) {
-            val = malloc((strlen(*(attrs+1))+1)*sizeof(char));
-            if (val == NULL) return NULL;
-            memcpy(val, *(attrs+1), sizeof(char) * (strlen(*(attrs+1))+1));
-            comps_dict_set(elem->attrs, (char*)*attrs, val);
-        }
+char* comps_elem_get_attr(COMPS_Elem *elem, const char *name) {
+    for (char **attr = elem->attrs; *attr != NULL; attr += 2) {
+        if (strcmp(*attr, name) == 0)
+            return *(attr + 1);
     }
-    return elem;
+    return NULL;
 }
 
 void comps_elem_destroy(void * elem)
 {
-    if (elem == NULL) return;
-    if (((COMPS_Elem*)elem)->name) free(((COMPS_Elem*)elem)->name);
-    comps_dict_destroy(((COMPS_Elem*)elem)->attrs);
     free(elem);
 }
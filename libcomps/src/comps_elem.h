@@ -64,7 +64,8 @@ struct COMPS_Elem{
     char valid;
     COMPS_Elem *ancestor;
     COMPS_ElemType type;
-    COMPS_Dict *attrs;
+    char **attrs; /**< NULL terminated array of attribute name, value pairs.
+                       Element is allocated together with its attributes */
 };
 
 typedef struct COMPS_ElemAttrInfo {
@@ -88,6 +89,11 @@ COMPS_ElemAttr * comps_elem_attr_create(const char *name, const char *val);
 COMPS_Elem* comps_elem_create(const char * s, const char ** attrs,
                               COMPS_ElemType type);
 COMPS_ElemType comps_elem_get_type(const char * name);
+/** Return value of element attribute or NULL if attribute isn't present
+ * @param elem element
+ * @param name attribute name
+ */
+char* comps_elem_get_attr(COMPS_Elem *elem, const char *name);
 
 void comps_elem_destroy(void * elem);
 
@@ -46,7 +46,8 @@ const char* COMPS_LogCodeFormat[] = {
       [COMPS_ERR_GROUPIDS_EMPTY] = "Category with id %s has no group ids."
                                   "skipping xml output\n",
       [COMPS_ERR_IDS_EMPTY] = "Environment with id %s has no group ids and no ."
-                                  "option ids. Skipping xml output\n"
+                                  "option ids. Skipping xml output\n",
+      [COMPS_ERR_DECOMPRESS] = "ERROR: Can't decompress %s input: %s\n"
 };
 
 void comps_log_create(COMPS_Log *log, COMPS_Object **args){
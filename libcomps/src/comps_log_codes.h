@@ -36,6 +36,7 @@
 #define COMPS_ERR_PKGLIST_EMPTY         25
 #define COMPS_ERR_IDS_EMPTY             26
 #define COMPS_ERR_ATTR_UNKNOWN          27
+#define COMPS_ERR_DECOMPRESS            28
 
 #define LOG_TEST_CODE1              1001
 #define LOG_TEST_CODE2              1002
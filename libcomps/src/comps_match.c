@@ -0,0 +1,164 @@
+/* libcomps - C alternative to yum.comps library
+ * Copyright (C) 2013 Jindrich Luza
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * any later version.
+ *
+ * This program is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to  Free Software
+ * Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301,
+ * USA
+ */
+
+#include "comps_match.h"
+
+#include <fnmatch.h>
+#include <stdlib.h>
+#include <string.h>
+
+/* flags which don't change meaning of asterisk-only patterns handled here.
+ * FNM_PATHNAME forbids asterisk to match slash, so it's allowed for exact
+ * patterns only */
+#define __COMPS_PATTERN_FLAGS (FNM_NOESCAPE | FNM_PERIOD)
+#define __COMPS_PATTERN_EXACT_FLAGS (FNM_NOESCAPE | FNM_PERIOD | FNM_PATHNAME)
+
+static COMPS_PatternType __comps_pattern_type(const char *pattern, int flags,
+                                              unsigned int *stars) {
+    const char *p;
+    unsigned int x = 0;
+
+    for (p = pattern; *p; p++) {
+        if (*p == '*') {
+            x++;
+        } else if (*p == '?' || *p == '[' ||
+                   (*p == '\\' && !(flags & FNM_NOESCAPE))) {
+            return COMPS_PATTERN_FNMATCH;
+        }
+    }
+    *stars = x;
+    if (x == 0) {
+        return (flags & ~__COMPS_PATTERN_EXACT_FLAGS) ? COMPS_PATTERN_FNMATCH
+                                                      : COMPS_PATTERN_EXACT;
+    }
+    if (flags & ~__COMPS_PATTERN_FLAGS)
+        return COMPS_PATTERN_FNMATCH;
+    if (x == 1 && p[-1] == '*')
+        return COMPS_PATTERN_PREFIX;
+    return COMPS_PATTERN_GLOB;
+}
+
+COMPS_Pattern* comps_pattern_compile(const char *pattern, int flags) {
+    COMPS_Pattern *ret;
+    unsigned int stars = 0, x;
+    size_t len = strlen(pattern) + 1;
+    char *p;
+
+    if ((ret = calloc(1, sizeof(COMPS_Pattern))) == NULL)
+        return NULL;
+    ret->flags = flags;
+    ret->type = __comps_pattern_type(pattern, flags, &stars);
+    /* original pattern and its literal copy share one allocation */
+    if ((ret->pattern = malloc(len * 2)) == NULL) {
+        free(ret);
+        return NULL;
+    }
+    ret->literal = ret->pattern + len;
+    memcpy(ret->pattern, pattern, len);
+    memcpy(ret->literal, pattern, len);
+    switch (ret->type) {
+        case COMPS_PATTERN_EXACT:
+            ret->len = strlen(ret->literal);
+        break;
+        case COMPS_PATTERN_PREFIX:
+            ret->len = strlen(ret->literal) - 1;
+            ret->literal[ret->len] = 0;
+        break;
+        case COMPS_PATTERN_GLOB:
+            ret->segments_len = stars + 1;
+            ret->segments = malloc(sizeof(char*) * ret->segments_len);
+            ret->lens = malloc(sizeof(unsigned int) * ret->segments_len);
+            if (!ret->segments || !ret->lens) {
+                comps_pattern_destroy(ret);
+                return NULL;
+            }
+            /* split literal copy of pattern at asterisks */
+            ret->segments[0] = ret->literal;
+            for (p = ret->literal, x = 1; *p; p++) {
+                if (*p == '*') {
+                    *p = 0;
+                    ret->segments[x++] = p + 1;
+                }
+            }
+            for (x = 0; x < ret->segments_len; x++)
+                ret->lens[x] = strlen(ret->segments[x]);
+            ret->len = ret->lens[0];
+        break;
+        default:
+        break;
+    }
+    return ret;
+}
+
+void comps_pattern_destroy(COMPS_Pattern *pattern) {
+    if (!pattern)
+        return;
+    free(pattern->pattern);
+    free(pattern->segments);
+    free(pattern->lens);
+    free(pattern);
+}
+
+static int __comps_pattern_glob(const COMPS_Pattern *pattern,
+                                const char *str, unsigned int len) {
+    const char *start, *end, *found;
+    unsigned int last = pattern->segments_len - 1, x;
+
+    /* asterisk doesn't match leading period with FNM_PERIOD */
+    if ((pattern->flags & FNM_PERIOD) && pattern->lens[0] == 0
+        && str[0] == '.')
+        return 0;
+    if (len < pattern->lens[0] + pattern->lens[last])
+        return 0;
+    if (memcmp(str, pattern->segments[0], pattern->lens[0]) != 0)
+        return 0;
+    end = str + len - pattern->lens[last];
+    if (memcmp(end, pattern->segments[last], pattern->lens[last]) != 0)
+        return 0;
+    /* leftmost occurrence of each middle segment leaves most space for
+     * following ones */
+    start = str + pattern->lens[0];
+    for (x = 1; x < last; x++) {
+        if (pattern->lens[x] == 0)
+            continue;
+        found = strstr(start, pattern->segments[x]);
+        if (!found || found + pattern->lens[x] > end)
+            return 0;
+        start = found + pattern->lens[x];
+    }
+    return 1;
+}
+
+int comps_pattern_match(const COMPS_Pattern *pattern, const COMPS_Str *str) {
+    switch (pattern->type) {
+        case COMPS_PATTERN_EXACT:
+            return str->len == pattern->len
+                   && memcmp(str->val, pattern->literal, pattern->len) == 0;
+        case COMPS_PATTERN_PREFIX:
+            if ((pattern->flags & FNM_PERIOD) && pattern->len == 0
+                && str->val[0] == '.')
+                return 0;
+            return str->len >= pattern->len
+                   && memcmp(str->val, pattern->literal, pattern->len) == 0;
+        case COMPS_PATTERN_GLOB:
+            return __comps_pattern_glob(pattern, str->val, str->len);
+        default:
+            return fnmatch(pattern->pattern, str->val, pattern->flags) == 0;
+    }
+}
@@ -3,26 +3,94 @@
 #include <math.h>
 #include <stdio.h>
 #include <fnmatch.h>
+#include <pthread.h>
 
-COMPS_Object * comps_object_create(COMPS_ObjectInfo *obj_info, COMPS_Object **args){
+/* Object allocated from arena is preceded by pointer to the arena. Prefix
+ * keeps alignment of arena allocations */
+#define OBJ_ARENA_PREFIX (2 * sizeof(void*))
+#define OBJ_SIZE_ALIGNED(size) (((size) + sizeof(void*) - 1) \
+                                & ~(sizeof(void*) - 1))
+
+/* Allocate object with extra bytes following it. Object and extra bytes
+ * are one allocation, from current arena if there's one */
+static COMPS_Object* __comps_object_alloc(COMPS_ObjectInfo *obj_info,
+                                          size_t extra) {
     COMPS_Object *obj;
-    obj = malloc(obj_info->obj_size);
+    COMPS_Arena *arena;
+    size_t size;
+    char *mem;
+
+    size = extra ? OBJ_SIZE_ALIGNED(obj_info->obj_size) + extra
+                 : obj_info->obj_size;
+    if ((arena = comps_arena_current()) == NULL) {
+        obj = malloc(size);
+        obj->flags = 0;
+    } else {
+        mem = comps_arena_alloc(arena, OBJ_ARENA_PREFIX + size);
+        *(COMPS_Arena**)mem = comps_arena_incref(arena);
+        obj = (COMPS_Object*)(mem + OBJ_ARENA_PREFIX);
+        obj->flags = COMPS_OBJ_ARENA;
+    }
+    if (extra)
+        obj->flags |= COMPS_OBJ_INLINE;
+    obj->refc = 0;
     obj->obj_info = obj_info;
-    obj->refc = comps_refc_create((void*)obj,
-                                 (void (*)(void*)) obj_info->destructor);
+    return obj;
+}
+
+/* Return extra bytes allocated together with object */
+static void* __comps_object_inline(COMPS_Object *obj) {
+    return (char*)obj + OBJ_SIZE_ALIGNED(obj->obj_info->obj_size);
+}
+
+COMPS_Arena* comps_object_arena(COMPS_Object *obj) {
+    if (!(obj->flags & COMPS_OBJ_ARENA))
+        return NULL;
+    return *(COMPS_Arena**)((char*)obj - OBJ_ARENA_PREFIX);
+}
+
+COMPS_Object * comps_object_create(COMPS_ObjectInfo *obj_info, COMPS_Object **args){
+    COMPS_Object *obj;
+    obj = __comps_object_alloc(obj_info, 0);
     if (obj_info->constructor)
         obj_info->constructor(obj, args);
     return obj;
 }
 
+static void __comps_str_unintern(COMPS_Str *str);
+
+/* Atomically drop one reference of shared object. Return zero if there's
+ * no reference to drop and object has to be destroyed */
+static int __comps_object_decref(COMPS_Object *obj) {
+    unsigned int refc;
+
+    while ((refc = __sync_fetch_and_add(&obj->refc, 0)) != 0) {
+        if (__sync_bool_compare_and_swap(&obj->refc, refc, refc - 1))
+            return 1;
+    }
+    return 0;
+}
+
 void comps_object_destroy(COMPS_Object *comps_obj) {
-    if (!comps_obj || !comps_obj->refc) return;
-    if (comps_obj->refc->ref_count)
-        comps_refc_destroy(comps_obj->refc);
-    else {
-        comps_refc_destroy(comps_obj->refc);
-        free(comps_obj);
+    if (!comps_obj) return;
+    if (comps_obj->flags & COMPS_OBJ_INTERNED) {
+        __comps_str_unintern((COMPS_Str*)comps_obj);
+        return;
     }
+    if (comps_obj->flags & COMPS_OBJ_SHARED) {
+        if (__comps_object_decref(comps_obj))
+            return;
+    } else if (comps_obj->refc) {
+        comps_obj->refc--;
+        return;
+    }
+    if (comps_obj->obj_info->destructor)
+        comps_obj->obj_info->destructor(comps_obj);
+    /* object memory is released together with arena */
+    if (comps_obj->flags & COMPS_OBJ_ARENA)
+        comps_arena_destroy(comps_object_arena(comps_obj));
+    else
+        free(comps_obj);
 }
 
 void comps_object_destroy_v(void *comps_obj) {
@@ -32,21 +100,54 @@ void comps_object_destroy_v(void *comps_obj) {
 COMPS_Object* comps_object_copy(COMPS_Object *comps_obj) {
     if (!comps_obj) return NULL;
     COMPS_Object *obj;
-    obj = malloc(comps_obj->obj_info->obj_size);
-    obj->refc = comps_refc_create((void*)obj,
-                             (void (*)(void*)) comps_obj->obj_info->destructor);
-    obj->obj_info = comps_obj->obj_info;
+    /* interned strings are immutable */
+    if (comps_obj->flags & COMPS_OBJ_INTERNED)
+        return comps_object_incref(comps_obj);
+    obj = __comps_object_alloc(comps_obj->obj_info, 0);
     comps_obj->obj_info->copy(obj, comps_obj);
     return obj;
 }
 
+COMPS_Object* comps_object_share(COMPS_Object *comps_obj) {
+    if (!comps_obj) return NULL;
+    if (comps_obj->flags & COMPS_OBJ_EXPOSED)
+        return comps_object_copy(comps_obj);
+    /* object isn't shared with other thread yet, so flag can be set
+     * directly */
+    if (!(comps_obj->flags & COMPS_OBJ_INTERNED))
+        comps_obj->flags |= COMPS_OBJ_SHARED;
+    return comps_object_incref(comps_obj);
+}
+
+COMPS_Object* comps_object_unshare(COMPS_Object **comps_obj) {
+    COMPS_Object *obj = *comps_obj;
+
+    if (!obj || !(obj->flags & COMPS_OBJ_SHARED))
+        return obj;
+    if (__sync_fetch_and_add(&obj->refc, 0) == 0) {
+        /* other owners released object meanwhile */
+        obj->flags &= ~COMPS_OBJ_SHARED;
+        return obj;
+    }
+    *comps_obj = comps_object_copy(obj);
+    comps_object_destroy(obj);
+    return *comps_obj;
+}
+
+COMPS_Object* comps_object_expose(COMPS_Object **comps_obj) {
+    if (!comps_object_unshare(comps_obj))
+        return NULL;
+    (*comps_obj)->flags |= COMPS_OBJ_EXPOSED;
+    return *comps_obj;
+}
+
 /*COMPS_Object* comps_object_copy_deep(COMPS_Object *comps_obj) {
    (void) comps_obj;
     return NULL;
 }*/
 
 signed char comps_object_cmp(COMPS_Object *obj1, COMPS_Object *obj2) {
-    if (!obj1 && !obj2)
+    if (obj1 == obj2)
         return 1;
     else if (!obj1 || !obj2)
         return 0;
@@ -71,9 +172,23 @@ char* comps_object_tostr(COMPS_Object *obj1) {
     }
 }
 
+unsigned int comps_object_hash(COMPS_Object *obj) {
+    if (obj && obj->obj_info->hash)
+        return obj->obj_info->hash(obj);
+    return 0;
+}
+unsigned int comps_object_hash_v(void *obj) {
+    return comps_object_hash((COMPS_Object*)obj);
+}
+
 inline COMPS_Object* comps_object_incref(COMPS_Object *obj) {
-    if (obj && obj->refc)
-        comps_refc_incref(obj->refc);
+    if (!obj)
+        return obj;
+    /* interned strings and shared objects are shared between threads */
+    if (obj->flags & (COMPS_OBJ_INTERNED | COMPS_OBJ_SHARED))
+        __sync_fetch_and_add(&obj->refc, 1);
+    else
+        obj->refc++;
     return obj;
 }
 
@@ -110,33 +225,49 @@ signed char comps_num_cmp_u(COMPS_Object *num1, COMPS_Object *num2) {
     return ((COMPS_Num*)num1)->val == ((COMPS_Num*)num2)->val;
 }
 
-void comps_str_create_u(COMPS_Object* str, COMPS_Object **args){
-    if (args && args[0]->obj_info == &COMPS_Str_ObjInfo) {
-        ((COMPS_Str*)str)->val = malloc(sizeof(char) *
-                                        (strlen(((COMPS_Str*)args[0])->val)+1));
-        strcpy(((COMPS_Str*)str)->val, ((COMPS_Str*)args[0])->val);
-    }
+unsigned int comps_num_hash_u(COMPS_Object *num) {
+    return (unsigned int)((COMPS_Num*)num)->val;
 }
 
 void comps_str_copy_u(COMPS_Object *str_dst, COMPS_Object *str_src) {
-    if (((COMPS_Str*)str_src)->val) {
-        ((COMPS_Str*)str_dst)->val =
-                      malloc(sizeof(char) *
-                             (strlen(((COMPS_Str*)str_src)->val) + 1));
-        strcpy(((COMPS_Str*)str_dst)->val, ((COMPS_Str*)str_src)->val);
+    #define _dst_ ((COMPS_Str*)str_dst)
+    #define _src_ ((COMPS_Str*)str_src)
+    _dst_->len = _src_->len;
+    _dst_->hash = _src_->hash;
+    if (_src_->val) {
+        _dst_->val = malloc(sizeof(char) * (_src_->len + 1));
+        memcpy(_dst_->val, _src_->val, sizeof(char) * (_src_->len + 1));
     } else
-        ((COMPS_Str*)str_dst)->val = NULL;
+        _dst_->val = NULL;
+    #undef _dst_
+    #undef _src_
+}
+
+void comps_str_create_u(COMPS_Object* str, COMPS_Object **args){
+    ((COMPS_Str*)str)->val = NULL;
+    ((COMPS_Str*)str)->len = 0;
+    ((COMPS_Str*)str)->hash = 0;
+    if (args && args[0]->obj_info == &COMPS_Str_ObjInfo)
+        comps_str_copy_u(str, args[0]);
+}
+
+/* Return non-zero if string value is allocated together with object */
+static int __comps_str_inline(COMPS_Str *str) {
+    return (str->flags & COMPS_OBJ_INLINE)
+           && str->val == __comps_object_inline((COMPS_Object*)str);
 }
 
 void comps_str_destroy_u(COMPS_Object *str){
-    free(((COMPS_Str*)str)->val);
+    if (!__comps_str_inline((COMPS_Str*)str))
+        free(((COMPS_Str*)str)->val);
 }
 
 char* comps_str_tostr(COMPS_Object *str) {
     char *ret;
     if (((COMPS_Str*)str)->val) {
-        ret = malloc(sizeof(char)*(strlen(((COMPS_Str*)str)->val)+1));
-        strcpy(ret, ((COMPS_Str*)str)->val);
+        ret = malloc(sizeof(char) * (((COMPS_Str*)str)->len + 1));
+        memcpy(ret, ((COMPS_Str*)str)->val,
+               sizeof(char) * (((COMPS_Str*)str)->len + 1));
     } else {
         ret = malloc(sizeof(char));
         ret[0] = 0;
@@ -145,14 +276,40 @@ char* comps_str_tostr(COMPS_Object *str) {
 }
 
 signed char comps_str_cmp_u(COMPS_Object *str1, COMPS_Object *str2) {
-    if (!((COMPS_Str*)str1)->val && !((COMPS_Str*)str2)->val) {
+    #define _str1_ ((COMPS_Str*)str1)
+    #define _str2_ ((COMPS_Str*)str2)
+    /* equal interned strings are one object */
+    if (str1->flags & str2->flags & COMPS_OBJ_INTERNED)
+        return str1 == str2;
+    if (!_str1_->val && !_str2_->val) {
         return 1;
-    } else if (!((COMPS_Str*)str1)->val || !((COMPS_Str*)str2)->val) {
+    } else if (!_str1_->val || !_str2_->val) {
+        return 0;
+    }
+    if (_str1_->len != _str2_->len)
         return 0;
-    } else return strcmp(((COMPS_Str*)str1)->val,
-                         ((COMPS_Str*)str2)->val) == 0;
+    if (_str1_->hash != _str2_->hash)
+        return 0;
+    return memcmp(_str1_->val, _str2_->val, _str1_->len) == 0;
+    #undef _str1_
+    #undef _str2_
 }
 
+unsigned int comps_str_hash(const char *s) {
+    /* FNV-1a */
+    unsigned int hash = 2166136261u;
+    const unsigned char *c = (const unsigned char*)s;
+    if (!c) return 0;
+    for (; *c; c++) {
+        hash ^= *c;
+        hash *= 16777619u;
+    }
+    return hash;
+}
+
+unsigned int comps_str_hash_u(COMPS_Object *str) {
+    return ((COMPS_Str*)str)->hash;
+}
 
 COMPS_Num* comps_num(int n) {
     COMPS_Num *ret = COMPS_OBJECT_CREATE(COMPS_Num, NULL);
@@ -161,23 +318,168 @@ COMPS_Num* comps_num(int n) {
 }
 
 COMPS_Str* comps_str(const char *s) {
-    COMPS_Str *ret = COMPS_OBJECT_CREATE(COMPS_Str, NULL);
-    if (s) {
-        ret->val = malloc(sizeof(char) * ((strlen(s)+1)));
-        strcpy(ret->val, s);
-    } else 
-        ret->val = NULL;
+    if (!s)
+        return COMPS_OBJECT_CREATE(COMPS_Str, NULL);
+    return comps_str_n(s, strlen(s));
+}
+COMPS_Str* comps_str_n(const char *s, size_t len) {
+    COMPS_Str *ret;
+    /* value is allocated together with object */
+    ret = (COMPS_Str*)__comps_object_alloc(&COMPS_Str_ObjInfo, len + 1);
+    ret->val = __comps_object_inline((COMPS_Object*)ret);
+    memcpy(ret->val, s, sizeof(char) * len);
+    ret->val[len] = 0;
+    ret->len = len;
+    ret->hash = comps_str_hash(ret->val);
     return ret;
 }
 COMPS_Str* comps_str_x(char *s) {
     COMPS_Str *ret = COMPS_OBJECT_CREATE(COMPS_Str, NULL);
     ret->val = s;
+    ret->len = (s) ? strlen(s) : 0;
+    ret->hash = comps_str_hash(s);
+    return ret;
+}
+#define INTERN_INIT_SIZE 1024
+
+/* Table of live interned strings. It's open addressing hash table with
+ * linear probing which doesn't own its strings, they're removed from it when
+ * they're destroyed. Size is power of 2 and table is at most half full */
+static struct {
+    COMPS_Str **strs;
+    unsigned int *hashes;
+    size_t size;
+    size_t count;
+} __comps_intern = {NULL, NULL, 0, 0};
+static pthread_mutex_t __comps_intern_lock = PTHREAD_MUTEX_INITIALIZER;
+
+/* Return slot holding string \a s or empty slot where it belongs */
+static size_t __comps_intern_slot(const char *s, unsigned int hash) {
+    size_t i, mask = __comps_intern.size - 1;
+    for (i = hash & mask; __comps_intern.strs[i] != NULL; i = (i + 1) & mask) {
+        if (__comps_intern.hashes[i] == hash &&
+            strcmp(__comps_intern.strs[i]->val, s) == 0)
+            break;
+    }
+    return i;
+}
+
+static int __comps_intern_grow() {
+    COMPS_Str **strs = __comps_intern.strs;
+    unsigned int *hashes = __comps_intern.hashes;
+    size_t size = __comps_intern.size, i, slot;
+
+    __comps_intern.size = size ? size * 2 : INTERN_INIT_SIZE;
+    __comps_intern.strs = calloc(__comps_intern.size, sizeof(COMPS_Str*));
+    __comps_intern.hashes = malloc(__comps_intern.size * sizeof(unsigned int));
+    if (!__comps_intern.strs || !__comps_intern.hashes) {
+        free(__comps_intern.strs);
+        free(__comps_intern.hashes);
+        __comps_intern.strs = strs;
+        __comps_intern.hashes = hashes;
+        __comps_intern.size = size;
+        return 0;
+    }
+    for (i = 0; i < size; i++) {
+        if (!strs[i])
+            continue;
+        slot = __comps_intern_slot(strs[i]->val, hashes[i]);
+        __comps_intern.strs[slot] = strs[i];
+        __comps_intern.hashes[slot] = hashes[i];
+    }
+    free(strs);
+    free(hashes);
+    return 1;
+}
+
+/* Remove string from table. Entries following it are moved back, so
+ * lookups don't need deletion markers */
+static void __comps_intern_remove(COMPS_Str *str) {
+    size_t i, j, home, mask = __comps_intern.size - 1;
+
+    for (i = str->hash & mask; __comps_intern.strs[i] != str;
+         i = (i + 1) & mask);
+    for (j = (i + 1) & mask; __comps_intern.strs[j] != NULL;
+         j = (j + 1) & mask) {
+        home = __comps_intern.hashes[j] & mask;
+        /* entry can't move before its home slot */
+        if ((j > i && (home <= i || home > j)) ||
+            (j < i && (home <= i && home > j))) {
+            __comps_intern.strs[i] = __comps_intern.strs[j];
+            __comps_intern.hashes[i] = __comps_intern.hashes[j];
+            i = j;
+        }
+    }
+    __comps_intern.strs[i] = NULL;
+    __comps_intern.count--;
+}
+
+COMPS_Str* comps_str_intern(const char *s) {
+    COMPS_Str *ret;
+    COMPS_Arena *arena;
+    unsigned int hash;
+    size_t slot;
+
+    if (!s)
+        return comps_str(NULL);
+    hash = comps_str_hash(s);
+    pthread_mutex_lock(&__comps_intern_lock);
+    if ((__comps_intern.count + 1) * 2 > __comps_intern.size &&
+        !__comps_intern_grow()) {
+        pthread_mutex_unlock(&__comps_intern_lock);
+        return comps_str(s);
+    }
+    slot = __comps_intern_slot(s, hash);
+    if ((ret = __comps_intern.strs[slot]) != NULL) {
+        __sync_fetch_and_add(&ret->refc, 1);
+    } else {
+        /* shared string can't be released with arena of one document */
+        arena = comps_arena_set_current(NULL);
+        ret = comps_str(s);
+        comps_arena_set_current(arena);
+        ret->flags |= COMPS_OBJ_INTERNED;
+        __comps_intern.strs[slot] = ret;
+        __comps_intern.hashes[slot] = hash;
+        __comps_intern.count++;
+    }
+    pthread_mutex_unlock(&__comps_intern_lock);
     return ret;
 }
+
+static void __comps_str_unintern(COMPS_Str *str) {
+    unsigned int refc;
+
+    /* dropping one of more references doesn't need lock */
+    while ((refc = __sync_fetch_and_add(&str->refc, 0)) != 0) {
+        if (__sync_bool_compare_and_swap(&str->refc, refc, refc - 1))
+            return;
+    }
+    pthread_mutex_lock(&__comps_intern_lock);
+    /* string could be looked up again in the meantime */
+    if (__sync_fetch_and_add(&str->refc, 0)) {
+        __sync_fetch_and_sub(&str->refc, 1);
+        pthread_mutex_unlock(&__comps_intern_lock);
+        return;
+    }
+    __comps_intern_remove(str);
+    pthread_mutex_unlock(&__comps_intern_lock);
+    comps_str_destroy_u((COMPS_Object*)str);
+    free(str);
+}
+
 void comps_str_set(COMPS_Str *str, char *s) {
-    free(str->val);
-    str->val = malloc(sizeof(char) * ((strlen(s)+1)));
-    strcpy(str->val, s);
+    size_t len = strlen(s);
+    str->hash = comps_str_hash(s);
+    if (__comps_str_inline(str) && len <= str->len) {
+        memcpy(str->val, s, sizeof(char) * (len + 1));
+        str->len = len;
+        return;
+    }
+    if (!__comps_str_inline(str))
+        free(str->val);
+    str->val = malloc(sizeof(char) * (len + 1));
+    memcpy(str->val, s, sizeof(char) * (len + 1));
+    str->len = len;
 }
 signed char comps_str_fnmatch(COMPS_Str *str, char *pattern, int flags) {
     return fnmatch(pattern, str->val, flags) == 0;
@@ -192,7 +494,8 @@ COMPS_ObjectInfo COMPS_Num_ObjInfo = {
     .destructor = &comps_num_destroy_u,
     .copy = &comps_num_copy_u,
     .to_str = &comps_num_tostr,
-    .obj_cmp = &comps_num_cmp_u
+    .obj_cmp = &comps_num_cmp_u,
+    .hash = &comps_num_hash_u
 };
 
 COMPS_ObjectInfo COMPS_Str_ObjInfo = {
@@ -201,6 +504,7 @@ COMPS_ObjectInfo COMPS_Str_ObjInfo = {
     .destructor = &comps_str_destroy_u,
     .copy = &comps_str_copy_u,
     .to_str = &comps_str_tostr,
-    .obj_cmp = &comps_str_cmp_u
+    .obj_cmp = &comps_str_cmp_u,
+    .hash = &comps_str_hash_u
 };
 
@@ -21,6 +21,7 @@
 #define COMPS_OBJECT_H
 
 #include "comps_mm.h"
+#include "comps_arena.h"
 
 /** \file comps_obj.h
  * \brief COMPS_Object header file
@@ -83,9 +84,25 @@
 /** ensure that COMPS_Object derivate has need struct members for properly
  * behaviour
  */
-#define COMPS_Object_HEAD COMPS_RefC *refc;\
+#define COMPS_Object_HEAD unsigned int refc;\
+                         unsigned int flags;\
                          COMPS_ObjectInfo *obj_info
 
+/** object is allocated from arena @see comps_object_arena */
+#define COMPS_OBJ_ARENA 1
+/** object is followed by data allocated together with it (string value of
+ * COMPS_Str) */
+#define COMPS_OBJ_INLINE 2
+/** object is interned string shared by all its users
+ * @see comps_str_intern */
+#define COMPS_OBJ_INTERNED 4
+/** object is shared copy-on-write by several owners. Its reference counter
+ * is changed atomically @see comps_object_share */
+#define COMPS_OBJ_SHARED 8
+/** reference of object was handed out for modification, so object is never
+ * shared @see comps_object_expose */
+#define COMPS_OBJ_EXPOSED 16
+
 #define COMPS_Object_TAIL(obj) extern COMPS_ObjectInfo obj##_ObjInfo
 
 typedef struct COMPS_Object COMPS_Object;
@@ -113,6 +130,9 @@ struct COMPS_ObjectInfo {
     /**< pointer to comparator function*/
     char* (*to_str)(COMPS_Object*);
     /**< pointer to string representation convert function */
+    unsigned int (*hash)(COMPS_Object*);
+    /**< pointer to hash function. Objects equal by obj_cmp must have
+     * equal hashes @see comps_object_hash*/
 };
 
 /** COMPS Object structure
@@ -122,7 +142,12 @@ struct COMPS_ObjectInfo {
  * comparing with other object, string representation
 */
 struct COMPS_Object {
-    COMPS_RefC *refc; /**< reference counter pointer for COMPS_Object*/
+    unsigned int refc; /**< number of references besides the first one.
+                            Object is destroyed when it's released with
+                            zero refc */
+    unsigned int flags; /**< COMPS_OBJ_ARENA, COMPS_OBJ_INLINE,
+                             COMPS_OBJ_INTERNED, COMPS_OBJ_SHARED,
+                             COMPS_OBJ_EXPOSED flags */
     COMPS_ObjectInfo *obj_info; /**< pointer to COMPS_ObjectInfo struct*/
 };
 
@@ -138,11 +163,15 @@ COMPS_Object_TAIL(COMPS_Num);
 
 /** COMPS Object derivate representing string
  *
- * COMPS_Str represents string as COMPS Object
+ * COMPS_Str represents string as COMPS Object. Value created by comps_str is
+ * allocated together with object. Length and hash are computed when value
+ * is set, so shared strings are only read
 */
 struct COMPS_Str {
     COMPS_Object_HEAD; /** \n */
     char *val; /**< holds reprezented string, freed at destruction time*/
+    unsigned int len; /**< length of val without terminating NUL */
+    unsigned int hash; /**< hash of val @see comps_str_hash */
 };
 COMPS_Object_TAIL(COMPS_Str);
 
@@ -173,6 +202,40 @@ void comps_object_destroy_v(void *comps_obj);
  */
 COMPS_Object* comps_object_copy(COMPS_Object *comps_obj);
 
+/** Return copy of COMPS_Object derivate which shares object itself
+ *
+ * Object is marked as shared and its reference counter is incremented, so
+ * copy costs nothing. Owners of shared object must not modify it, they
+ * replace it with private copy first by comps_object_unshare. Object which
+ * was exposed for modification is copied by comps_object_copy instead
+ * @param comps_obj derivate object want to be copied or NULL
+ * @return new reference of shared object or new copy of object
+ * @see comps_object_unshare
+ * @see comps_object_expose
+ */
+COMPS_Object* comps_object_share(COMPS_Object *comps_obj);
+
+/** Make object referenced from \a comps_obj private to its owner
+ *
+ * If object is shared with other owner, it's replaced with its copy and
+ * reference of shared object is released
+ * @param comps_obj pointer to owner's reference of object
+ * @return private object or NULL if referenced object is NULL
+ * @see comps_object_share
+ */
+COMPS_Object* comps_object_unshare(COMPS_Object **comps_obj);
+
+/** Make object referenced from \a comps_obj private to its owner and mark
+ * it as exposed
+ *
+ * Call this function before reference of object is handed out to code which
+ * could modify object. Exposed object is never shared by comps_object_share
+ * @param comps_obj pointer to owner's reference of object
+ * @return private object or NULL if referenced object is NULL
+ * @see comps_object_unshare
+ */
+COMPS_Object* comps_object_expose(COMPS_Object **comps_obj);
+
 /** Compare two COMPS_Object derivates and return non-zero value if equals
  *
  * \warning Function doen't check equality of derivate types (COMPS_ObjectInfo)!!
@@ -194,10 +257,28 @@ char comps_object_cmp_v(void *obj1, void *obj2);
  */
 char* comps_object_tostr(COMPS_Object *obj1);
 
+/** Return hash of COMPS_Object derivate
+ *
+ * Objects which are equal by comps_object_cmp have equal hashes. If object
+ * type doesn't provide hash function, zero is returned
+ *
+ * @param obj COMPS_Object derivate
+ * @return hash value
+ */
+unsigned int comps_object_hash(COMPS_Object *obj);
+unsigned int comps_object_hash_v(void *obj);
+
 /** Increment COMPS_Object derivate reference counter
  */
 COMPS_Object* comps_object_incref(COMPS_Object *obj);
 
+/** Return arena object is allocated from
+ * @param obj COMPS_Object derivate
+ * @return arena or NULL if object is allocated on heap
+ * @see comps_arena.h
+ */
+COMPS_Arena* comps_object_arena(COMPS_Object *obj);
+
 /** Directly construct COMPS_Num derivate from passed argument
  * @param n value of COMPS_Num
  */
@@ -219,13 +300,49 @@ COMPS_Str* comps_str(const char *s);
  */
 COMPS_Str* comps_str_x(char *s);
 
+/** Return interned COMPS_Str with value \a s
+ *
+ * All interned strings with the same value which exist at the same time are
+ * one shared object, so they take memory only once and are equal only if
+ * they are the same object. Copy of interned string is the string itself
+ * with incremented reference counter. Parser and setters intern ids, package
+ * names, requires and arches, which repeat across documents. Interning is
+ * thread safe
+ * @param s string value
+ * @return interned string with incremented reference counter
+ */
+COMPS_Str* comps_str_intern(const char *s);
+
+/** Directly construct COMPS_Str derivate from first \a len bytes of \a s
+ *
+ * \a s doesn't have to be NUL terminated. Value is allocated together with
+ * object
+ * @param s string value of derivate
+ * @param len length of value
+ */
+COMPS_Str* comps_str_n(const char *s, size_t len);
+
 /** Set memory copy of passed argument as COMPS_Str value
  *
+ * If new value isn't longer than current value allocated together with
+ * object, it's stored in place
+ * \warning \a str->val mustn't be changed by other way, because it would
+ * invalidate length and hash of string
+ * \warning interned strings are shared, so they must not be changed
+ * @see comps_str_intern
  * @param str COMPS_Str object
  * @param s desired new COMPS_Str object value
  */
 void comps_str_set(COMPS_Str *str, char *s);
 
+/** Return hash of plain C string
+ *
+ * Returned value is the same as comps_object_hash returns for COMPS_Str
+ * object with same value
+ * @param s string
+ */
+unsigned int comps_str_hash(const char *s);
+
 //extern COMPS_ObjectInfo COMPS_Num_ObjInfo;
 //extern COMPS_ObjectInfo COMPS_Str_ObjInfo;
 
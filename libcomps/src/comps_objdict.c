@@ -61,9 +61,57 @@ inline COMPS_HSList* comps_objdict_pairs(COMPS_ObjDict *rt) {
     return comps_objrtree_pairs((COMPS_ObjRTree*)rt);
 }
 inline COMPS_ObjDict* comps_objdict_union(COMPS_ObjDict *d1, COMPS_ObjDict *d2) {
+    if (!d1 || !d2)
+        return (COMPS_ObjDict*)comps_object_copy((COMPS_Object*)(d1 ? d1 : d2));
     return comps_objrtree_union((COMPS_ObjRTree*)d1, (COMPS_ObjRTree*)d2);
 }
 
+COMPS_ObjDict* comps_objdict_union_share(COMPS_ObjDict *d1,
+                                         COMPS_ObjDict *d2) {
+    if (!d2 || !d2->len || d1 == d2)
+        return (COMPS_ObjDict*)comps_object_share((COMPS_Object*)(d1 ? d1 : d2));
+    if (!d1 || !d1->len)
+        return (COMPS_ObjDict*)comps_object_share((COMPS_Object*)d2);
+    return comps_objdict_union(d1, d2);
+}
+
+COMPS_ObjDict* comps_objdict_intersect(COMPS_ObjDict *d1, COMPS_ObjDict *d2) {
+    COMPS_ObjDict *ret = NULL;
+    COMPS_HSList *pairs1, *pairs2;
+    COMPS_HSListItem *hsit;
+    COMPS_Set *set;
+
+    if (!d1 || !d2 || !d1->len || !d2->len)
+        return NULL;
+    set = comps_set_create();
+    comps_set_init(set, NULL, NULL, NULL, &comps_objrtree_paircmp);
+    pairs1 = comps_objdict_pairs(d1);
+    for (hsit = pairs1->first; hsit != NULL; hsit = hsit->next) {
+        comps_set_add(set, hsit->data);
+    }
+    pairs2 = comps_objdict_pairs(d2);
+    for (hsit = pairs2->first; hsit != NULL; hsit = hsit->next) {
+        if (comps_set_in(set, hsit->data)) {
+            if (!ret)
+                ret = COMPS_OBJECT_CREATE(COMPS_ObjDict, NULL);
+            comps_objdict_set(ret, ((COMPS_ObjRTreePair*)hsit->data)->key,
+                              ((COMPS_ObjRTreePair*)hsit->data)->data);
+        }
+    }
+    comps_hslist_destroy(&pairs1);
+    comps_hslist_destroy(&pairs2);
+    comps_set_destroy(&set);
+    return ret;
+}
+
+signed char comps_objdict_equal(COMPS_ObjDict *d1, COMPS_ObjDict *d2) {
+    if (!d1 || !d2) {
+        d1 = d1 ? d1 : d2;
+        return !d1 || !d1->len;
+    }
+    return comps_object_cmp((COMPS_Object*)d1, (COMPS_Object*)d2);
+}
+
 inline void comps_objmdict_set_x(COMPS_ObjMDict *rt, char *key, COMPS_Object *data){
     comps_objmrtree_set_x((COMPS_ObjMRTree*) rt, key, data);
 }
@@ -324,12 +324,42 @@ COMPS_HSList* comps_objmdict_pairs(COMPS_ObjMDict *rt);
  *
  * New dictionary is filled with pairs of first dictionary and then
  * with pairs of second dictionary with skipped items whose keys are already
- * in dictionary
+ * in dictionary. NULL is treated as empty dictionary
  *
- * @param d1 COMPS_ObjDict object
- * @param d2 COMPS_ObjDict object
- * @return new COMPS_ObjDict object
+ * @param d1 COMPS_ObjDict object or NULL
+ * @param d2 COMPS_ObjDict object or NULL
+ * @return new COMPS_ObjDict object or NULL if both dictionaries are NULL
  */
 COMPS_ObjDict* comps_objdict_union(COMPS_ObjDict *d1, COMPS_ObjDict *d2);
+
+/** Return union of two dictionaries like comps_objdict_union, but if union
+ * is one of them, it's shared instead of copied
+ *
+ * @param d1 COMPS_ObjDict object or NULL
+ * @param d2 COMPS_ObjDict object or NULL
+ * @return new reference of COMPS_ObjDict object or NULL if both dictionaries
+ * are NULL
+ * @see comps_object_share
+ */
+COMPS_ObjDict* comps_objdict_union_share(COMPS_ObjDict *d1,
+                                         COMPS_ObjDict *d2);
+
+/** Return dictionary with pairs present in both dictionaries
+ *
+ * Pairs are compared by key and value. NULL is treated as empty dictionary
+ *
+ * @param d1 COMPS_ObjDict object or NULL
+ * @param d2 COMPS_ObjDict object or NULL
+ * @return new COMPS_ObjDict object or NULL if there's no common pair
+ */
+COMPS_ObjDict* comps_objdict_intersect(COMPS_ObjDict *d1, COMPS_ObjDict *d2);
+
+/** Compare two dictionaries treating NULL as empty dictionary
+ *
+ * @param d1 COMPS_ObjDict object or NULL
+ * @param d2 COMPS_ObjDict object or NULL
+ * @return non-zero if dictionaries are equal, zero otherwise
+ */
+signed char comps_objdict_equal(COMPS_ObjDict *d1, COMPS_ObjDict *d2);
 /** @}*/
 #endif
@@ -36,9 +36,29 @@ void comps_objlist_create(COMPS_ObjList *objlist, COMPS_Object **args) {
     objlist->first = NULL;
     objlist->last = NULL;
     objlist->len = 0;
+    objlist->rev = 0;
+    objlist->items = NULL;
+    objlist->items_size = 0;
 }
 COMPS_CREATE_u(objlist, COMPS_ObjList)
 
+static int __comps_objlist_reserve(COMPS_ObjList *objlist, size_t size) {
+    COMPS_ObjListIt **items;
+    size_t new_size;
+
+    if (size <= objlist->items_size)
+        return 1;
+    new_size = (objlist->items_size) ? objlist->items_size * 2 : 8;
+    while (new_size < size)
+        new_size *= 2;
+    items = realloc(objlist->items, sizeof(COMPS_ObjListIt*) * new_size);
+    if (!items)
+        return 0;
+    objlist->items = items;
+    objlist->items_size = new_size;
+    return 1;
+}
+
 void comps_objlist_copy(COMPS_ObjList *objlist_dst,
                         COMPS_ObjList *objlist_src) {
     COMPS_ObjListIt *it;
@@ -46,6 +66,10 @@ void comps_objlist_copy(COMPS_ObjList *objlist_dst,
     objlist_dst->first = NULL;
     objlist_dst->last = NULL;
     objlist_dst->len = 0;
+    objlist_dst->rev = 0;
+    objlist_dst->items = NULL;
+    objlist_dst->items_size = 0;
+    __comps_objlist_reserve(objlist_dst, objlist_src->len);
 
     for (it = objlist_src->first; it != NULL; it = it->next) {
         comps_objlist_append_x(objlist_dst, comps_object_copy(it->comps_obj));
@@ -65,6 +89,7 @@ void comps_objlist_destroy(COMPS_ObjList *objlist) {
     }
     if (oldit)
         comps_objlist_it_destroy(oldit);
+    free(objlist->items);
 }
 COMPS_DESTROY_u(objlist, COMPS_ObjList)
 
@@ -73,53 +98,26 @@ void comps_objlist_clear(COMPS_ObjList *objlist) {
     objlist->first = NULL;
     objlist->last = NULL;
     objlist->len = 0;
+    objlist->rev++;
+    objlist->items = NULL;
+    objlist->items_size = 0;
 }
 
 
 COMPS_Object* comps_objlist_get(COMPS_ObjList *objlist, unsigned int atpos) {
-    unsigned int pos;
-    COMPS_ObjListIt *it;
-    if (!objlist) return NULL;
-
-    for (it = objlist->first, pos=0;
-         it != NULL && pos != atpos;
-         it = it->next, pos++);
-
-    if (pos != atpos)
-        return NULL;
-
-    return (it)?comps_object_incref(it->comps_obj):NULL;
+    if (!objlist || atpos >= objlist->len) return NULL;
+    return comps_object_incref(objlist->items[atpos]->comps_obj);
 }
 
 COMPS_Object* comps_objlist_get_x(COMPS_ObjList *objlist, unsigned int atpos) {
-    unsigned int pos;
-    COMPS_ObjListIt *it;
-    if (!objlist) return NULL;
-
-    for (it = objlist->first, pos=0;
-         it != NULL && pos != atpos;
-         it = it->next, pos++);
-
-    if (pos != atpos)
-        return NULL;
-
-    return (it)?it->comps_obj:NULL;
+    if (!objlist || atpos >= objlist->len) return NULL;
+    return objlist->items[atpos]->comps_obj;
 }
 
 COMPS_ObjListIt* comps_objlist_get_it(COMPS_ObjList *objlist,
                               unsigned int atpos) {
-    unsigned int pos;
-    COMPS_ObjListIt *it;
-    if (!objlist) return NULL;
-
-    for (it = objlist->first, pos=0;
-         it != NULL && pos != atpos;
-         it = it->next, pos++);
-
-    if (pos+1 != atpos)
-        return NULL;
-
-    return (it)?it:NULL;
+    if (!objlist || atpos >= objlist->len) return NULL;
+    return objlist->items[atpos];
 }
 
 
@@ -142,19 +140,47 @@ int comps_objlist_walk_r(COMPS_ObjListIt *start,
     return 1;
 }
 
-static int __comps_objlist_append(COMPS_ObjList *objlist, COMPS_ObjListIt *objit) {
-    if (!objlist) return 0;
-    if (objlist->first == NULL) {
-        objlist->first = objit;
-        objlist->last = objit;
+static int __comps_objlist_insert_at(COMPS_ObjList *objlist,
+                                     unsigned int pos,
+                                     COMPS_ObjListIt *newit) {
+    if (!newit) return 0;
+    if (!__comps_objlist_reserve(objlist, objlist->len + 1)) {
+        comps_objlist_it_destroy(newit);
+        return 0;
+    }
+    newit->next = (pos < objlist->len) ? objlist->items[pos] : NULL;
+    if (pos == 0) {
+        objlist->first = newit;
     } else {
-        objlist->last->next = objit;
-        objlist->last = objlist->last->next;
+        objlist->items[pos - 1]->next = newit;
     }
+    if (pos == objlist->len) {
+        objlist->last = newit;
+    } else {
+        memmove(&objlist->items[pos + 1], &objlist->items[pos],
+                sizeof(COMPS_ObjListIt*) * (objlist->len - pos));
+    }
+    objlist->items[pos] = newit;
     objlist->len++;
+    objlist->rev++;
     return 1;
 }
 
+static int __comps_objlist_it_pos(COMPS_ObjList *objlist,
+                                  COMPS_ObjListIt *it) {
+    size_t pos;
+    for (pos = 0; pos < objlist->len; pos++) {
+        if (objlist->items[pos] == it)
+            return (int)pos;
+    }
+    return -1;
+}
+
+static int __comps_objlist_append(COMPS_ObjList *objlist, COMPS_ObjListIt *objit) {
+    if (!objlist) return 0;
+    return __comps_objlist_insert_at(objlist, objlist->len, objit);
+}
+
 int comps_objlist_append_x(COMPS_ObjList *objlist, COMPS_Object *obj) {
     COMPS_ObjListIt *new_it = comps_objlist_it_create_x(obj);
     return __comps_objlist_append(objlist, new_it);
@@ -167,73 +193,27 @@ int comps_objlist_append(COMPS_ObjList *objlist, COMPS_Object *obj) {
 int comps_objlist_insert_after(COMPS_ObjList *objlist,
                               COMPS_ObjListIt *it,
                               COMPS_Object *obj) {
+    int pos;
     if (!objlist) return -1;
     if (!it) return -1;
+    if ((pos = __comps_objlist_it_pos(objlist, it)) < 0) return -1;
 
     COMPS_ObjListIt *new_it = comps_objlist_it_create(obj);
-
-    new_it->next = it->next;
-    it->next = new_it;
-    if (it == objlist->last) {
-        objlist->last = new_it;
-    }
-    objlist->len++;
-    return 1;
+    return __comps_objlist_insert_at(objlist, pos + 1, new_it);
 }
 
 int comps_objlist_insert_before(COMPS_ObjList *objlist,
                                COMPS_ObjListIt *it,
                                COMPS_Object *obj) {
+    int pos;
     if (!objlist) return -1;
     if (!it) return -1;
+    if ((pos = __comps_objlist_it_pos(objlist, it)) < 0) return -1;
 
     COMPS_ObjListIt *new_it = comps_objlist_it_create(obj);
-    COMPS_ObjListIt *tmpit;
-    for (tmpit = objlist->first; tmpit->next != it; tmpit = tmpit->next);
-
-    if (tmpit == objlist->first) {
-        new_it->next = objlist->first;
-        objlist->first = new_it;
-        if (objlist->last == NULL)
-            objlist->last = new_it;
-    } else {
-        new_it->next = tmpit->next;
-        tmpit->next = new_it;
-    }
-    objlist->len++;
-    return 1;
+    return __comps_objlist_insert_at(objlist, pos, new_it);
 }
 
-int __comps_objlist_insert_at(COMPS_ObjList *objlist,
-                           unsigned int pos,
-                           COMPS_ObjListIt *newit) {
-    COMPS_ObjListIt *tmpit, *oldit;
-    unsigned int i;
-    if (pos == 0) {
-        newit->next = objlist->first;
-        objlist->first = newit;
-        if (!objlist->last) {
-            objlist->last = newit;
-        }
-        objlist->len++;
-    } else if (pos == objlist->len){
-        newit->next = NULL;
-        objlist->last->next = newit;
-        objlist->last = newit;
-        objlist->len++;
-    } else {
-        i = 0;
-        oldit = NULL;
-        for (tmpit = objlist->first; tmpit != NULL && i != pos;
-             i++, tmpit = tmpit->next) {
-            oldit = tmpit;
-        }
-        newit->next = oldit->next;
-        oldit->next = newit; 
-        objlist->len++;
-    }
-    return 1;
-}
 int comps_objlist_insert_at_x(COMPS_ObjList *objlist,
                            unsigned int pos,
                            COMPS_Object *obj) {
@@ -252,77 +232,77 @@ int comps_objlist_insert_at(COMPS_ObjList *objlist,
 }
 
 int comps_objlist_remove_at(COMPS_ObjList *objlist, unsigned int atpos) {
-    int pos;
-    COMPS_ObjListIt *it, *itprev=NULL, *removed=NULL;
+    COMPS_ObjListIt *removed;
     if (!objlist) return 0;
+    if (atpos >= objlist->len) return 0;
 
-    for (it = objlist->first, pos=0;
-         it != NULL && pos != (int)atpos;
-         it = it->next, pos++) {
-        itprev = it;
+    removed = objlist->items[atpos];
+    if (atpos == 0) {
+        objlist->first = removed->next;
+    } else {
+        objlist->items[atpos - 1]->next = removed->next;
     }
-    if (atpos == 0 && objlist->first) {
-        removed = objlist->first;
-        objlist->first = objlist->first->next;
-        if (objlist->last == removed) {
-            objlist->last = NULL;
-        }
-    } else if (pos != (int)(atpos))
-        return 0;
-    if (itprev) {
-        removed = it;
-        if (itprev->next)
-            itprev->next = itprev->next->next;
-        else
-            itprev->next = NULL;
-        if (removed == objlist->last) {
-            objlist->last = itprev;
-        }
+    if (removed == objlist->last) {
+        objlist->last = (atpos) ? objlist->items[atpos - 1] : NULL;
     }
+    memmove(&objlist->items[atpos], &objlist->items[atpos + 1],
+            sizeof(COMPS_ObjListIt*) * (objlist->len - atpos - 1));
     comps_objlist_it_destroy(removed);
     objlist->len--;
+    objlist->rev++;
     return 1;
 }
 
 int comps_objlist_remove(COMPS_ObjList *objlist, COMPS_Object *obj) {
-    //int pos;
-    COMPS_ObjListIt *it, *itprev = NULL;
+    int pos;
     if (!objlist) return 0;
 
-    for (it = objlist->first; it != NULL && it->comps_obj != obj;
-         it = it->next) {
-        itprev = it;
-    }
-    if (it == NULL)
+    pos = comps_objlist_index(objlist, obj);
+    if (pos < 0)
         return 0;
+    return comps_objlist_remove_at(objlist, pos);
+}
 
-    if (itprev == NULL && it->comps_obj == obj) {
-        if (objlist->last == objlist->first)
-            objlist->last = NULL;
-        objlist->first = objlist->first->next;
-        comps_object_destroy(it->comps_obj);
-        free(it);
-    } else {
-        itprev->next = it->next;
-        comps_object_destroy(it->comps_obj);
-        free(it);
-        if (it == objlist->last) {
-            objlist->last = itprev;
+size_t comps_objlist_remove_if(COMPS_ObjList *objlist,
+                               char (*pred)(COMPS_Object*, void*),
+                               void *data) {
+    COMPS_ObjListIt *it, *prev = NULL;
+    size_t x, kept = 0;
+
+    if (!objlist) return 0;
+    for (x = 0; x < objlist->len; x++) {
+        it = objlist->items[x];
+        if (pred(it->comps_obj, data)) {
+            comps_objlist_it_destroy(it);
+            continue;
         }
+        if (prev)
+            prev->next = it;
+        else
+            objlist->first = it;
+        objlist->items[kept++] = prev = it;
     }
-    objlist->len--;
-    return 1;
+    if (kept == objlist->len)
+        return 0;
+    if (prev)
+        prev->next = NULL;
+    else
+        objlist->first = NULL;
+    objlist->last = prev;
+    x = objlist->len - kept;
+    objlist->len = kept;
+    objlist->rev++;
+    return x;
 }
 
 int comps_objlist_index(COMPS_ObjList *objlist, COMPS_Object *obj) {
-    int x;
-    COMPS_ObjListIt *it;
+    size_t x;
 
-    for (it = objlist->first, x=0; it != NULL && it->comps_obj != obj;
-         it = it->next, x++) {
-    };
-    if (it == NULL) return -1;
-    return x;
+    for (x = 0; x < objlist->len; x++) {
+        if (objlist->items[x]->comps_obj == obj)
+            return (int)x;
+    }
+    return -1;
 }
 
 COMPS_ObjList* comps_objlist_sublist_it(COMPS_ObjListIt *startit,
@@ -360,14 +340,12 @@ COMPS_ObjList* comps_objlist_sublist_indexed(COMPS_ObjList *objlist,
                                            unsigned int end) {
     unsigned int pos;
     COMPS_ObjList *ret;
-    COMPS_ObjListIt *it;
     ret = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
 
-    for (it = objlist->first, pos=0;
-         it != NULL && pos != start;
-         it = it->next, pos++);
-    for (; it->next != NULL && pos != end; it = it->next, pos++) {
-        comps_objlist_append(ret, it->comps_obj);
+    if (end > objlist->len)
+        end = objlist->len;
+    for (pos = start; pos < end; pos++) {
+        comps_objlist_append(ret, objlist->items[pos]->comps_obj);
     }
     return ret;
 }
@@ -377,21 +355,15 @@ COMPS_ObjList* comps_objlist_sublist_indexed_step(COMPS_ObjList *objlist,
                                                unsigned int end,
                                                unsigned int step) {
     unsigned int pos;
-    unsigned int stepc;
     COMPS_ObjList *ret;
-    COMPS_ObjListIt *it;
     ret = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
 
-    pos = 0;
-    stepc = 0;
-    for (it = objlist->first;
-         it != NULL && pos != start;
-         it = it->next, pos++);
-    for (; it->next != NULL && pos != end; it = it->next, pos++, stepc++) {
-        if (stepc == step) {
-            step = 0;
-            comps_objlist_append(ret, it->comps_obj);
-        }
+    if (!step)
+        step = 1;
+    if (end > objlist->len)
+        end = objlist->len;
+    for (pos = start; pos < end; pos += step) {
+        comps_objlist_append(ret, objlist->items[pos]->comps_obj);
     }
     return ret;
 }
@@ -451,16 +423,14 @@ signed char comps_objlist_cmp(COMPS_Object *list1, COMPS_Object *list2) {
 int comps_objlist_set(COMPS_ObjList *objlist, unsigned int atpos,
                       COMPS_Object *obj) {
     COMPS_ObjListIt *it;
-    unsigned int i = 0;
 
     if (!objlist) return -1;
-    it =  ((COMPS_ObjList*)objlist)->first;
-
-    for (; it != NULL && i != atpos; it = it->next, i++);
-    if (!it)
+    if (atpos >= objlist->len)
         return -1;
+    it = objlist->items[atpos];
     COMPS_OBJECT_DESTROY(it->comps_obj);
     it->comps_obj = comps_object_incref(obj);
+    objlist->rev++;
     return 0;
 }
 
@@ -43,6 +43,12 @@ typedef struct COMPS_ObjList {
     COMPS_ObjListIt *first; /**< first list item iterator */
     COMPS_ObjListIt *last; /**< last list item iterator */
     size_t len; /**< list lenght*/
+    unsigned long rev; /**< list revision. Incremented by every list
+                         modification, so cached data derived from list
+                         content can detect it's out of date */
+    COMPS_ObjListIt **items; /**< list item iterators in list order. Makes
+                               random access to items constant time */
+    size_t items_size; /**< allocated size of items array */
 } COMPS_ObjList;
 COMPS_Object_TAIL(COMPS_ObjList);
 
@@ -112,6 +118,15 @@ int comps_objlist_append(COMPS_ObjList *objlist, COMPS_Object *obj);
  */
 COMPS_Object* comps_objlist_get(COMPS_ObjList *objlist, unsigned int atpos);
 
+/** Return item's iterator at specified position
+ *
+ * @param objlist COMPS_ObjList object
+ * @param atpos item's position
+ * @return if list has enough items, return item's iterator, otherwise NULL
+ */
+COMPS_ObjListIt* comps_objlist_get_it(COMPS_ObjList *objlist,
+                                      unsigned int atpos);
+
 /** Set item's object at specified positoin
  *
  * set new item to specified position, increment new item's reference counter
@@ -177,6 +192,19 @@ int comps_objlist_remove_at(COMPS_ObjList *objlist, unsigned int atpos);
 int comps_objlist_remove(COMPS_ObjList *objlist, COMPS_Object *obj);
 
 
+/** Remove all items matching predicate in one pass
+ *
+ * Order of remaining items is kept. Predicate is called once for every
+ * item in list order
+ * @param objlist COMPS_ObjList object
+ * @param pred predicate called with item and data, item is removed if it
+ * returns nonzero
+ * @param data user data passed to pred
+ * @return number of removed items
+ */
+size_t comps_objlist_remove_if(COMPS_ObjList *objlist,
+                               char (*pred)(COMPS_Object*, void*),
+                               void *data);
 int comps_objlist_index(COMPS_ObjList *objlist, COMPS_Object *obj);
 
 /** Returns new sublist from original list
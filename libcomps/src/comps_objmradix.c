@@ -22,9 +22,8 @@
 #include <stdio.h>
 
 void comps_objmrtree_data_destroy(COMPS_ObjMRTreeData * rtd) {
-    free(rtd->key);
     COMPS_OBJECT_DESTROY(rtd->data);
-    comps_hslist_destroy(&rtd->subnodes);
+    comps_radixnodes_clear(&rtd->subnodes, &comps_objmrtree_data_destroy_v);
     free(rtd);
 }
 
@@ -32,27 +31,28 @@ inline void comps_objmrtree_data_destroy_v(void * rtd) {
     comps_objmrtree_data_destroy((COMPS_ObjMRTreeData*)rtd);
 }
 
+static COMPS_ObjMRTreeData * __comps_objmrtree_node_create(const char *key,
+                                                           size_t keylen) {
+    COMPS_ObjMRTreeData * rtd;
+    if ((rtd = malloc(sizeof(*rtd) + sizeof(char) * (keylen+1))) == NULL)
+        return NULL;
+    memcpy(rtd->key, key, sizeof(char)*keylen);
+    rtd->key[keylen] = '\0';
+    rtd->data = NULL;
+    comps_radixnodes_init(&rtd->subnodes);
+    return rtd;
+}
+
 static COMPS_ObjMRTreeData * __comps_objmrtree_data_create(char * key,
                                                     size_t keylen,
                                                     COMPS_Object *data) {
 
     COMPS_ObjMRTreeData * rtd;
-    if ((rtd = malloc(sizeof(*rtd))) == NULL)
+    if ((rtd = __comps_objmrtree_node_create(key, keylen)) == NULL)
         return NULL;
-    if ((rtd->key = malloc(sizeof(char) * (keylen+1))) == NULL) {
-        free(rtd);
-        return NULL;
-    }
-    memcpy(rtd->key, key, sizeof(char)*keylen);
-    rtd->key[keylen] = '\0';
-    rtd->is_leaf = 1;
     rtd->data = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
     if (data)
         comps_objlist_append_x(rtd->data, data);
-    rtd->subnodes = comps_hslist_create();
-    comps_hslist_init(rtd->subnodes, NULL,
-                                     NULL,
-                                     &comps_objmrtree_data_destroy_v);
     return rtd;
 }
 
@@ -70,12 +70,7 @@ COMPS_ObjMRTreeData * comps_objmrtree_data_create_n(char * key, unsigned keylen,
 }
 static void comps_objmrtree_create(COMPS_ObjMRTree *rtree, COMPS_Object **args){
     (void)args;
-    rtree->subnodes = comps_hslist_create();
-    comps_hslist_init(rtree->subnodes, NULL, NULL, &comps_objmrtree_data_destroy_v);
-    if (rtree->subnodes == NULL) {
-        COMPS_OBJECT_DESTROY(rtree);
-        return;
-    }
+    comps_radixnodes_init(&rtree->subnodes);
     rtree->len = 0;
 }
 void comps_objmrtree_create_u(COMPS_Object * obj, COMPS_Object **args) {
@@ -84,274 +79,150 @@ void comps_objmrtree_create_u(COMPS_Object * obj, COMPS_Object **args) {
 }
 
 static void comps_objmrtree_destroy(COMPS_ObjMRTree * rt) {
-    comps_hslist_destroy(&(rt->subnodes));
+    comps_radixnodes_clear(&rt->subnodes, &comps_objmrtree_data_destroy_v);
 }
 void comps_objmrtree_destroy_u(COMPS_Object *obj) {
     comps_objmrtree_destroy((COMPS_ObjMRTree*)obj);
 }
 
-void comps_objmrtree_values_walk(COMPS_ObjMRTree * rt, void* udata,
-                              void (*walk_f)(void*, void*)) {
-    COMPS_HSList *tmplist, *tmp_subnodes;
-    COMPS_HSListItem *it, *it2;
-    tmplist = comps_hslist_create();
-    comps_hslist_init(tmplist, NULL, NULL, NULL);
-    comps_hslist_append(tmplist, rt->subnodes, 0);
-    while (tmplist->first != NULL) {
-        it = tmplist->first;
-        comps_hslist_remove(tmplist, tmplist->first);
-        tmp_subnodes = (COMPS_HSList*)it->data;
-        free(it);
-        for (it = tmp_subnodes->first; it != NULL; it=it->next) {
-            if (((COMPS_ObjMRTreeData*)it->data)->subnodes->first) {
-                comps_hslist_append(tmplist,
-                                    ((COMPS_ObjMRTreeData*)it->data)->subnodes, 0);
-            }
-            for (it2 = (COMPS_HSListItem*)((COMPS_ObjMRTreeData*)it->data)->data->first;
-                 it2 != NULL; it2 = it2->next) {
-                walk_f(udata, it2->data);
-            }
+static void __comps_objmrtree_values_walk(COMPS_RadixNodes *subnodes,
+                                          void *udata,
+                                          void (*walk_f)(void*, void*)) {
+    COMPS_ObjMRTreeData *rtdata;
+    COMPS_ObjListIt *it;
+    unsigned x;
+
+    for (x = 0; x < subnodes->len; x++) {
+        rtdata = (COMPS_ObjMRTreeData*)subnodes->nodes[x];
+        if (rtdata->data != NULL) {
+            for (it = rtdata->data->first; it != NULL; it = it->next)
+                walk_f(udata, it->comps_obj);
         }
+        __comps_objmrtree_values_walk(&rtdata->subnodes, udata, walk_f);
     }
-    comps_hslist_destroy(&tmplist);
 }
 
-void comps_objmrtree_copy(COMPS_ObjMRTree *ret, COMPS_ObjMRTree *rt){
-    COMPS_HSList * to_clone, *tmplist, *new_subnodes;
-    COMPS_HSListItem *it, *it2;
-    COMPS_ObjMRTreeData *rtdata;
-    COMPS_ObjList *new_data_list;
-
-    to_clone = comps_hslist_create();
-    comps_hslist_init(to_clone, NULL, NULL, NULL);
-
-    for (it = rt->subnodes->first; it != NULL; it = it->next) {
-        rtdata = comps_objmrtree_data_create(
-                                       ((COMPS_ObjMRTreeData*)it->data)->key,
-                                       NULL);
-        new_data_list = (COMPS_ObjList*)
-                        COMPS_OBJECT_COPY(((COMPS_ObjMRTreeData*)it->data)->data);
-        COMPS_OBJECT_DESTROY(&rtdata->data);
-        comps_hslist_destroy(&rtdata->subnodes);
-        rtdata->subnodes = ((COMPS_ObjMRTreeData*)it->data)->subnodes;
-        rtdata->data = new_data_list;
-        comps_hslist_append(ret->subnodes, rtdata, 0);
-
-        comps_hslist_append(to_clone, rtdata, 0);
-    }
+void comps_objmrtree_values_walk(COMPS_ObjMRTree * rt, void* udata,
+                              void (*walk_f)(void*, void*)) {
+    __comps_objmrtree_values_walk(&rt->subnodes, udata, walk_f);
+}
 
-    while (to_clone->first) {
-        it2 = to_clone->first;
-        tmplist = ((COMPS_ObjMRTreeData*)it2->data)->subnodes;
-        comps_hslist_remove(to_clone, to_clone->first);
-
-        new_subnodes = comps_hslist_create();
-        comps_hslist_init(new_subnodes, NULL, NULL, &comps_objmrtree_data_destroy_v);
-        for (it = tmplist->first; it != NULL; it = it->next) {
-            rtdata = comps_objmrtree_data_create(
-                                          ((COMPS_ObjMRTreeData*)it->data)->key,
-                                          NULL);
-            new_data_list = (COMPS_ObjList*)
-                            COMPS_OBJECT_COPY(((COMPS_ObjMRTreeData*)it->data)->data);
-
-            comps_hslist_destroy(&rtdata->subnodes);
-            COMPS_OBJECT_DESTROY(rtdata->data);
-            rtdata->subnodes = ((COMPS_ObjMRTreeData*)it->data)->subnodes;
-            rtdata->data = new_data_list;
-            comps_hslist_append(new_subnodes, rtdata, 0);
-
-            comps_hslist_append(to_clone, rtdata, 0);
-        }
-        ((COMPS_ObjMRTreeData*)it2->data)->subnodes = new_subnodes;
-        free(it2);
+/* copy list of values sharing values themselves with original list */
+static COMPS_ObjList* __comps_objmrtree_list_copy_shallow(COMPS_ObjList *list) {
+    COMPS_ObjList *ret;
+    COMPS_ObjListIt *it;
+
+    ret = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+    for (it = list->first; it != NULL; it = it->next)
+        comps_objlist_append(ret, it->comps_obj);
+    return ret;
+}
+
+static COMPS_ObjList* __comps_objmrtree_list_copy(COMPS_ObjList *list) {
+    return (COMPS_ObjList*)COMPS_OBJECT_COPY(list);
+}
+
+/* copy children of node with copy_f applied to every values list */
+static void __comps_objmrtree_subnodes_copy(COMPS_RadixNodes *dst,
+                                            const COMPS_RadixNodes *src,
+                                   COMPS_ObjList* (*copy_f)(COMPS_ObjList*)) {
+    COMPS_ObjMRTreeData *rtd, *rtdata;
+    unsigned x;
+
+    if (comps_radixnodes_copy(dst, src))
+        return;
+    for (x = 0; x < src->len; x++) {
+        rtdata = (COMPS_ObjMRTreeData*)src->nodes[x];
+        rtd = __comps_objmrtree_node_create(rtdata->key, strlen(rtdata->key));
+        if (rtdata->data != NULL)
+            rtd->data = copy_f(rtdata->data);
+        __comps_objmrtree_subnodes_copy(&rtd->subnodes, &rtdata->subnodes,
+                                        copy_f);
+        dst->nodes[x] = rtd;
     }
+}
+
+void comps_objmrtree_copy(COMPS_ObjMRTree *ret, COMPS_ObjMRTree *rt){
+    __comps_objmrtree_subnodes_copy(&ret->subnodes, &rt->subnodes,
+                                    &__comps_objmrtree_list_copy);
     ret->len = rt->len;
-    comps_hslist_destroy(&to_clone);
 }
 COMPS_COPY_u(objmrtree, COMPS_ObjMRTree) /*comps_utils.h macro*/
 
 void comps_objmrtree_copy_shallow(COMPS_ObjMRTree *ret, COMPS_ObjMRTree *rt){
-    COMPS_HSList * to_clone, *tmplist, *new_subnodes;
-    COMPS_HSListItem *it, *it2;
-    COMPS_ObjMRTreeData *rtdata;
-    COMPS_ObjList *new_data_list;
-
-    to_clone = comps_hslist_create();
-    comps_hslist_init(to_clone, NULL, NULL, NULL);
-
-    for (it = rt->subnodes->first; it != NULL; it = it->next) {
-        rtdata = comps_objmrtree_data_create(
-                                       ((COMPS_ObjMRTreeData*)it->data)->key,
-                                       NULL);
-        new_data_list = (COMPS_ObjList*)
-                        COMPS_OBJECT_COPY(((COMPS_ObjMRTreeData*)it->data)->data);
-        COMPS_OBJECT_DESTROY(&rtdata->data);
-        comps_hslist_destroy(&rtdata->subnodes);
-        rtdata->subnodes = ((COMPS_ObjMRTreeData*)it->data)->subnodes;
-        rtdata->data = new_data_list;
-        comps_hslist_append(ret->subnodes, rtdata, 0);
-
-        comps_hslist_append(to_clone, rtdata, 0);
-    }
-
-    while (to_clone->first) {
-        it2 = to_clone->first;
-        tmplist = ((COMPS_ObjMRTreeData*)it2->data)->subnodes;
-        comps_hslist_remove(to_clone, to_clone->first);
-
-        new_subnodes = comps_hslist_create();
-        comps_hslist_init(new_subnodes, NULL, NULL, &comps_objmrtree_data_destroy_v);
-        for (it = tmplist->first; it != NULL; it = it->next) {
-            rtdata = comps_objmrtree_data_create(
-                                          ((COMPS_ObjMRTreeData*)it->data)->key,
-                                          NULL);
-            new_data_list = ((COMPS_ObjMRTreeData*)it->data)->data;
-
-            comps_hslist_destroy(&rtdata->subnodes);
-            COMPS_OBJECT_DESTROY(rtdata->data);
-            rtdata->subnodes = ((COMPS_ObjMRTreeData*)it->data)->subnodes;
-            rtdata->data = new_data_list;
-            comps_hslist_append(new_subnodes, rtdata, 0);
-
-            comps_hslist_append(to_clone, rtdata, 0);
-        }
-        ((COMPS_ObjMRTreeData*)it2->data)->subnodes = new_subnodes;
-        free(it2);
-    }
+    comps_objmrtree_clear(ret);
+    __comps_objmrtree_subnodes_copy(&ret->subnodes, &rt->subnodes,
+                                    &__comps_objmrtree_list_copy_shallow);
     ret->len = rt->len;
-    comps_hslist_destroy(&to_clone);
 }
 
 COMPS_ObjMRTree * comps_objmrtree_clone(COMPS_ObjMRTree * rt) {
-    COMPS_HSList * to_clone, *tmplist, *new_subnodes;
     COMPS_ObjMRTree * ret;
-    COMPS_HSListItem *it, *it2;
-    COMPS_ObjMRTreeData *rtdata;
-    COMPS_ObjList *new_data_list;
 
-    to_clone = comps_hslist_create();
-    comps_hslist_init(to_clone, NULL, NULL, NULL);
     ret = COMPS_OBJECT_CREATE(COMPS_ObjMRTree, NULL);
+    __comps_objmrtree_subnodes_copy(&ret->subnodes, &rt->subnodes,
+                                    &__comps_objmrtree_list_copy);
+    ret->len = rt->len;
+    return ret;
+}
 
-    for (it = rt->subnodes->first; it != NULL; it = it->next) {
-        rtdata = comps_objmrtree_data_create(
-                                       ((COMPS_ObjMRTreeData*)it->data)->key,
-                                       NULL);
-        new_data_list = (COMPS_ObjList*)
-                        COMPS_OBJECT_COPY(((COMPS_ObjMRTreeData*)it->data)->data);
-        COMPS_OBJECT_DESTROY(&rtdata->data);
-        comps_hslist_destroy(&rtdata->subnodes);
-        rtdata->subnodes = ((COMPS_ObjMRTreeData*)it->data)->subnodes;
-        rtdata->data = new_data_list;
-        comps_hslist_append(ret->subnodes, rtdata, 0);
-
-        comps_hslist_append(to_clone, rtdata, 0);
+/* call walk_f with full key of every node with values list in subnodes. Key
+ * is built in *key buffer of *size bytes, keylen bytes of it belongs to
+ * predecessors */
+static void __comps_objmrtree_pairs_walk(COMPS_RadixNodes *subnodes,
+                                         char **key, size_t *size,
+                                         size_t keylen, void *udata,
+                        void (*walk_f)(void*, char*, size_t, COMPS_ObjList*)) {
+    COMPS_ObjMRTreeData *rtdata;
+    size_t len;
+    char *tmp;
+    unsigned x;
+
+    for (x = 0; x < subnodes->len; x++) {
+        rtdata = (COMPS_ObjMRTreeData*)subnodes->nodes[x];
+        len = strlen(rtdata->key);
+        if (keylen + len + 1 > *size) {
+            if ((tmp = realloc(*key, (keylen + len + 1) * 2)) == NULL)
+                return;
+            *key = tmp;
+            *size = (keylen + len + 1) * 2;
+        }
+        memcpy(*key + keylen, rtdata->key, len + 1);
+        if (rtdata->data != NULL)
+            walk_f(udata, *key, keylen + len, rtdata->data);
+        __comps_objmrtree_pairs_walk(&rtdata->subnodes, key, size,
+                                     keylen + len, udata, walk_f);
     }
+}
 
-    while (to_clone->first) {
-        it2 = to_clone->first;
-        tmplist = ((COMPS_ObjMRTreeData*)it2->data)->subnodes;
-        comps_hslist_remove(to_clone, to_clone->first);
-
-        new_subnodes = comps_hslist_create();
-        comps_hslist_init(new_subnodes, NULL, NULL, &comps_objmrtree_data_destroy_v);
-        for (it = tmplist->first; it != NULL; it = it->next) {
-            rtdata = comps_objmrtree_data_create(
-                                          ((COMPS_ObjMRTreeData*)it->data)->key,
-                                          NULL);
-            new_data_list = (COMPS_ObjList*)
-                            COMPS_OBJECT_COPY(((COMPS_ObjMRTreeData*)it->data)->data);
-
-            comps_hslist_destroy(&rtdata->subnodes);
-            COMPS_OBJECT_DESTROY(rtdata->data);
-            rtdata->subnodes = ((COMPS_ObjMRTreeData*)it->data)->subnodes;
-            rtdata->data = new_data_list;
-            comps_hslist_append(new_subnodes, rtdata, 0);
-
-            comps_hslist_append(to_clone, rtdata, 0);
-        }
-        ((COMPS_ObjMRTreeData*)it2->data)->subnodes = new_subnodes;
-        free(it2);
+static void __comps_objmrtree_walk(COMPS_ObjMRTree *rt, void *udata,
+                        void (*walk_f)(void*, char*, size_t, COMPS_ObjList*)) {
+    size_t size = 64;
+    char *key = malloc(sizeof(char) * size);
+
+    if (!key)
+        return;
+    __comps_objmrtree_pairs_walk(&rt->subnodes, &key, &size, 0, udata, walk_f);
+    free(key);
+}
+
+static void __comps_objmrtree_unite_set(void *rt, char *key, size_t len,
+                                        COMPS_ObjList *data) {
+    COMPS_ObjListIt *it;
+    for (it = data->first; it != NULL; it = it->next) {
+        __comps_objmrtree_set((COMPS_ObjMRTree*)rt, key, len,
+                              comps_object_incref(it->comps_obj));
     }
-    ret->len = rt->len;
-    comps_hslist_destroy(&to_clone);
-    return ret;
 }
 
 void comps_objmrtree_unite(COMPS_ObjMRTree *rt1, COMPS_ObjMRTree *rt2) {
-    COMPS_HSList *tmplist, *tmp_subnodes;
-    COMPS_HSListItem *it;
-    COMPS_ObjListIt *it2;
-    struct Pair {
-        COMPS_HSList * subnodes;
-        char * key;
-        char added;
-    } *pair, *parent_pair;
-
-    pair = malloc(sizeof(struct Pair));
-    pair->subnodes = rt2->subnodes;
-    pair->key = NULL;
-
-    tmplist = comps_hslist_create();
-    comps_hslist_init(tmplist, NULL, NULL, &free);
-    comps_hslist_append(tmplist, pair, 0);
-
-    while (tmplist->first != NULL) {
-        it = tmplist->first;
-        comps_hslist_remove(tmplist, tmplist->first);
-        tmp_subnodes = ((struct Pair*)it->data)->subnodes;
-        parent_pair = (struct Pair*) it->data;
-        free(it);
-
-        pair->added = 0;
-        for (it = tmp_subnodes->first; it != NULL; it=it->next) {
-            pair = malloc(sizeof(struct Pair));
-            pair->subnodes = ((COMPS_ObjMRTreeData*)it->data)->subnodes;
-
-            if (parent_pair->key != NULL) {
-                pair->key =
-                    malloc(sizeof(char)
-                           * (strlen(((COMPS_ObjMRTreeData*)it->data)->key)
-                           + strlen(parent_pair->key) + 1));
-                memcpy(pair->key, parent_pair->key,
-                       sizeof(char) * strlen(parent_pair->key));
-                memcpy(pair->key+strlen(parent_pair->key),
-                       ((COMPS_ObjMRTreeData*)it->data)->key,
-                       sizeof(char)*(strlen(((COMPS_ObjMRTreeData*)it->data)->key)+1));
-            } else {
-                pair->key = malloc(sizeof(char)*
-                                (strlen(((COMPS_ObjMRTreeData*)it->data)->key) +
-                                1));
-                memcpy(pair->key, ((COMPS_ObjMRTreeData*)it->data)->key,
-                       sizeof(char)*(strlen(((COMPS_ObjMRTreeData*)it->data)->key)+1));
-            }
-            /* current node has data */
-            if (((COMPS_ObjMRTreeData*)it->data)->data->first != NULL) {
-                for (it2 = ((COMPS_ObjMRTreeData*)it->data)->data->first;
-                     it2 != NULL; it2 = it2->next) {
-                    comps_objmrtree_set(rt1, pair->key, it2->comps_obj);
-                }
-
-                if (((COMPS_ObjMRTreeData*)it->data)->subnodes->first) {
-                    comps_hslist_append(tmplist, pair, 0);
-                } else {
-                    free(pair->key);
-                    free(pair);
-                }
-            /* current node hasn't data */
-            } else {
-                if (((COMPS_ObjMRTreeData*)it->data)->subnodes->first) {
-                    comps_hslist_append(tmplist, pair, 0);
-                } else {
-                    free(pair->key);
-                    free(pair);
-                }
-            }
-        }
-        free(parent_pair->key);
-        free(parent_pair);
-    }
-    comps_hslist_destroy(&tmplist);
+    COMPS_ObjMRTree *tmp = NULL;
+
+    /* values are appended to lists which are being walked through */
+    if (rt1 == rt2)
+        rt2 = tmp = comps_objmrtree_clone(rt2);
+    __comps_objmrtree_walk(rt2, rt1, &__comps_objmrtree_unite_set);
+    COMPS_OBJECT_DESTROY(tmp);
 }
 
 void comps_objmrtree_set_x(COMPS_ObjMRTree *rt, char *key, COMPS_Object *data) {
@@ -363,100 +234,65 @@ void comps_objmrtree_set(COMPS_ObjMRTree *rt, char *key, COMPS_Object *data) {
 
 void __comps_objmrtree_set(COMPS_ObjMRTree *rt, char *key,
                            size_t len, COMPS_Object *ndata) {
-    static COMPS_HSListItem *it;
-    COMPS_HSList *subnodes;
+    COMPS_RadixNodes *subnodes;
     COMPS_ObjMRTreeData *rtd;
-    static COMPS_ObjMRTreeData *rtdata;
-
-    size_t _len, offset=0;
-    unsigned x, found = 0;
-    char ended;//, tmpch;
-
-    if (rt->subnodes == NULL)
-        return;
+    COMPS_ObjMRTreeData *rtdata;
+    size_t offset = 0, x;
+    int pos;
 
-    subnodes = rt->subnodes;
+    subnodes = &rt->subnodes;
     while (offset != len)
     {
-        found = 0;
-        for (it = subnodes->first; it != NULL; it = it->next) {
-            if (((COMPS_ObjMRTreeData*)it->data)->key[0] == key[offset]) {
-                found = 1;
+        pos = comps_radixnodes_find(subnodes, key[offset]);
+        if (pos < 0) { // not found in subnodes; create new subnode
+            rtd = __comps_objmrtree_data_create(key+offset, len-offset, ndata);
+            if (!rtd)
+                return;
+            comps_radixnodes_insert(subnodes, subnodes->len, key[offset], rtd);
+            rt->len++;
+            return;
+        }
+        rtdata = (COMPS_ObjMRTreeData*)subnodes->nodes[pos];
+        for (x = 1; rtdata->key[x] != 0 && x != len - offset; x++) {
+            if (key[offset+x] != rtdata->key[x])
                 break;
-            }
         }
-        if (!found) { // not found in subnodes; create new subnode
-            rtd = comps_objmrtree_data_create(key+offset, ndata);
-            comps_hslist_append(subnodes, rtd, 0);
+        if (rtdata->key[x] == 0 && x == len - offset) {
+            //keys equals; append new data
+            if (rtdata->data == NULL)
+                rtdata->data = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+            else if (ndata == NULL)
+                return;
+            if (ndata)
+                comps_objlist_append_x(rtdata->data, ndata);
             rt->len++;
             return;
+        } else if (rtdata->key[x] == 0) { //local key ends first; go deeper
+            subnodes = &rtdata->subnodes;
+            offset += x;
         } else {
-            rtdata = (COMPS_ObjMRTreeData*)it->data;
-            ended = 0;
-            for (x=1; ;x++) {
-                if (rtdata->key[x] == 0) ended += 1;
-                if (x == len - offset) ended += 2;
-                if (ended != 0) break;
-                if (key[offset+x] != rtdata->key[x]) break;
-            }
-            if (ended == 3) { //keys equals; append new data
-                comps_objlist_append_x(rtdata->data, ndata);
-                rt->len++;
-                return;
-            } else if (ended == 2) { //global key ends first; make global leaf
-                comps_hslist_remove(subnodes, it);
-                it->next = NULL;
-                rtd = comps_objmrtree_data_create(key+offset, ndata);
-                comps_hslist_append(subnodes, rtd, 0);
-                ((COMPS_ObjMRTreeData*)subnodes->last->data)->subnodes->last = it;
-                ((COMPS_ObjMRTreeData*)subnodes->last->data)->subnodes->first = it;
-                _len = strlen(key + offset);
-                memmove(rtdata->key,rtdata->key + _len,
-                                    strlen(rtdata->key) - _len);
-                rtdata->key[strlen(rtdata->key) - _len] = 0;
-                rtdata->key = realloc(rtdata->key,
-                                      sizeof(char)* (strlen(rtdata->key)+1));
-                rt->len++;
-                return;
-            } else if (ended == 1) { //local key ends first; go deeper
-                subnodes = rtdata->subnodes;
-                offset += x;
-            } else { /* keys differ */
-                COMPS_ObjList *tmpdata = rtdata->data;
-                COMPS_HSList *tmphslist = rtdata->subnodes;
-
-                rtdata->subnodes = comps_hslist_create();
-                comps_hslist_init(rtdata->subnodes, NULL, NULL,
-                                  &comps_objmrtree_data_destroy_v);
-                int cmpret = strcmp(key+offset+x, rtdata->key+x);
-                rtdata->data = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
-
-                if (cmpret > 0) {
-                    rtd = comps_objmrtree_data_create(rtdata->key+x,
-                                                      (COMPS_Object*)tmpdata);
-                    comps_hslist_destroy(&rtd->subnodes);
-                    rtd->subnodes = tmphslist;
-
-                    comps_hslist_append(rtdata->subnodes, rtd, 0);
-                    rtd = comps_objmrtree_data_create(key+offset+x,
-                                                     (COMPS_Object*)ndata);
-                    comps_hslist_append(rtdata->subnodes, rtd, 0);
-
-                } else {
-                    rtd = comps_objmrtree_data_create(key+offset+x,
-                                                     (COMPS_Object*)ndata);
-                    comps_hslist_append(rtdata->subnodes, rtd, 0);
-                    rtd = comps_objmrtree_data_create(rtdata->key+x,
-                                                     (COMPS_Object*)tmpdata);
-                    comps_hslist_destroy(&rtd->subnodes);
-                    rtd->subnodes = tmphslist;
-                    comps_hslist_append(rtdata->subnodes, rtd, 0);
-                }
-                rtdata->key = realloc(rtdata->key, sizeof(char)*(x+1));
-                rtdata->key[x] = 0;
-                rt->len++;
+            /* split node key; new node with common part of key takes place
+             * of current node and current node becomes its child */
+            rtd = __comps_objmrtree_node_create(key+offset, x);
+            if (!rtd)
                 return;
+            memmove(rtdata->key, rtdata->key + x, strlen(rtdata->key + x) + 1);
+            comps_radixnodes_insert(&rtd->subnodes, 0, rtdata->key[0], rtdata);
+            subnodes->nodes[pos] = rtd;
+            if (x == len - offset) { //global key ends first; make global leaf
+                rtd->data = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+                if (ndata)
+                    comps_objlist_append_x(rtd->data, ndata);
+            } else {
+                rtdata = __comps_objmrtree_data_create(key+offset+x,
+                                                       len-offset-x, ndata);
+                if (!rtdata)
+                    return;
+                comps_radixnodes_insert(&rtd->subnodes, 1, key[offset+x],
+                                        rtdata);
             }
+            rt->len++;
+            return;
         }
     }
 }
@@ -467,136 +303,82 @@ void comps_objmrtree_set_n(COMPS_ObjMRTree *rt, char *key,
 }
 
 COMPS_ObjList * comps_objmrtree_get(COMPS_ObjMRTree * rt, const char * key) {
-    COMPS_HSList * subnodes;
-    COMPS_HSListItem * it = NULL;
-    COMPS_ObjMRTreeData * rtdata;
-    unsigned int offset, len, x;
-    char found, ended;
+    COMPS_RadixNodes *subnodes;
+    COMPS_ObjMRTreeData *rtdata;
+    size_t offset, len, x;
+    int pos;
 
     len = strlen(key);
     offset = 0;
-    subnodes = rt->subnodes;
+    subnodes = &rt->subnodes;
     while (offset != len) {
-        found = 0;
-        for (it = subnodes->first; it != NULL; it=it->next) {
-            if (((COMPS_ObjMRTreeData*)it->data)->key[0] == key[offset]) {
-                found = 1;
-                break;
-            }
-        }
-        if (!found)
+        pos = comps_radixnodes_find(subnodes, key[offset]);
+        if (pos < 0)
             return NULL;
-        rtdata = (COMPS_ObjMRTreeData*)it->data;
-
-        for (x=1; ;x++) {
-            ended=0;
-            if (rtdata->key[x] == 0) ended += 1;
-            if (x == len - offset) ended += 2;
-            if (ended != 0) break;
-            if (key[offset+x] != rtdata->key[x]) break;
+        rtdata = (COMPS_ObjMRTreeData*)subnodes->nodes[pos];
+        for (x = 1; rtdata->key[x] != 0; x++) {
+            if (key[offset+x] != rtdata->key[x])
+                return NULL;
         }
-        if (ended == 3) return (COMPS_ObjList*)
-                               comps_object_incref((COMPS_Object*)rtdata->data);
-        else if (ended == 1) offset+=x;
-        else return NULL;
-        subnodes = ((COMPS_ObjMRTreeData*)it->data)->subnodes;
+        offset += x;
+        subnodes = &rtdata->subnodes;
+        if (offset == len)
+            return (COMPS_ObjList*)
+                   comps_object_incref((COMPS_Object*)rtdata->data);
     }
-    if (it)
-        return ((COMPS_ObjMRTreeData*)it->data)->data;
-    else return NULL;
+    return NULL;
 }
 
-void comps_objmrtree_unset(COMPS_ObjMRTree * rt, const char * key) {
-    COMPS_HSList * subnodes;
-    COMPS_HSListItem * it;
-    COMPS_ObjMRTreeData * rtdata;
-    unsigned int offset, len, x;
-    char found, ended;
-    COMPS_HSList * path;
-
-    struct Relation {
-        COMPS_HSList * parent_nodes;
-        COMPS_HSListItem * child_it;
-    } *relation;
-
-    path = comps_hslist_create();
-    comps_hslist_init(path, NULL, NULL, &free);
-
-    len = strlen(key);
-    offset = 0;
-    subnodes = rt->subnodes;
-    while (offset != len) {
-        found = 0;
-        for (it = subnodes->first; it != NULL; it=it->next) {
-            if (((COMPS_ObjMRTreeData*)it->data)->key[0] == key[offset]) {
-                found = 1;
-                break;
-            }
-        }
-        if (!found) {
-            comps_hslist_destroy(&path);
-            return;
-        }
-        rtdata = (COMPS_ObjMRTreeData*)it->data;
-
-        for (x=1; ;x++) {
-            ended=0;
-            if (rtdata->key[x] == 0) ended += 1;
-            if (x == len - offset) ended += 2;
-            if (ended != 0) break;
-            if (key[offset+x] != rtdata->key[x]) break;
-        }
-        if (ended == 3) {
-            /* remove node from tree only if there's no descendant*/
-            if (rtdata->subnodes->last == NULL) {
-                comps_hslist_remove(subnodes, it);
-                rt->len -= rtdata->data->len;
-                comps_objmrtree_data_destroy(rtdata);
-                free(it);
-            }
-            else {
-                rt->len -= rtdata->data->len;
-                comps_objlist_clear(rtdata->data);
-                rtdata->is_leaf = 0;
-            }
-
-            if (path->last == NULL) {
-                comps_hslist_destroy(&path);
-                return;
-            }
-            rtdata = (COMPS_ObjMRTreeData*)
-                     ((struct Relation*)path->last->data)->child_it->data;
-
-            /*remove all predecessor of deleted node (recursive) with no childs*/
-            while (rtdata->subnodes->last == NULL) {
-                //printf("removing '%s'\n", rtdata->key);
-                comps_objmrtree_data_destroy(rtdata);
-                comps_hslist_remove(
-                            ((struct Relation*)path->last->data)->parent_nodes,
-                            ((struct Relation*)path->last->data)->child_it);
-                free(((struct Relation*)path->last->data)->child_it);
-                it = path->last;
-                comps_hslist_remove(path, path->last);
-                free(it);
-                rtdata = (COMPS_ObjMRTreeData*)
-                         ((struct Relation*)path->last->data)->child_it->data;
-            }
-            comps_hslist_destroy(&path);
+/* remove values under key from subnodes. Nodes left without values and
+ * children are removed, nodes left without values and with single child are
+ * merged with that child */
+static void __comps_objmrtree_unset(COMPS_ObjMRTree *rt,
+                                    COMPS_RadixNodes *subnodes,
+                                    const char *key, size_t len) {
+    COMPS_ObjMRTreeData *rtdata, *child;
+    size_t keylen, childlen;
+    int pos;
+
+    if (len == 0)
+        return;
+    pos = comps_radixnodes_find(subnodes, key[0]);
+    if (pos < 0)
+        return;
+    rtdata = (COMPS_ObjMRTreeData*)subnodes->nodes[pos];
+    keylen = strlen(rtdata->key);
+    if (keylen > len || memcmp(rtdata->key, key, keylen) != 0)
+        return;
+    if (keylen == len) {
+        if (rtdata->data == NULL)
             return;
-        }
-        else if (ended == 1) offset+=x;
-        else return;
-        if ((relation = malloc(sizeof(struct Relation))) == NULL) {
-            comps_hslist_destroy(&path);
+        rt->len -= rtdata->data->len;
+        COMPS_OBJECT_DESTROY(rtdata->data);
+        rtdata->data = NULL;
+    } else {
+        __comps_objmrtree_unset(rt, &rtdata->subnodes, key + keylen,
+                                len - keylen);
+    }
+    if (rtdata->data != NULL)
+        return;
+    if (rtdata->subnodes.len == 0) {
+        comps_radixnodes_remove(subnodes, pos);
+        comps_objmrtree_data_destroy(rtdata);
+    } else if (rtdata->subnodes.len == 1) {
+        child = (COMPS_ObjMRTreeData*)rtdata->subnodes.nodes[0];
+        childlen = strlen(child->key);
+        child = realloc(child, sizeof(*child) + keylen + childlen + 1);
+        if (!child)
             return;
-        }
-        subnodes = ((COMPS_ObjMRTreeData*)it->data)->subnodes;
-        relation->parent_nodes = subnodes;
-        relation->child_it = it;
-        comps_hslist_append(path, (void*)relation, 0);
+        memmove(child->key + keylen, child->key, childlen + 1);
+        memcpy(child->key, rtdata->key, keylen);
+        subnodes->nodes[pos] = child;
+        comps_radixnodes_clear(&rtdata->subnodes, NULL);
+        comps_objmrtree_data_destroy(rtdata);
     }
-    comps_hslist_destroy(&path);
-    return;
+}
+
+void comps_objmrtree_unset(COMPS_ObjMRTree * rt, const char * key) {
+    __comps_objmrtree_unset(rt, &rt->subnodes, key, strlen(key));
 }
 
 inline void comps_objmrtree_pair_destroy_v(void * pair) {
@@ -604,67 +386,45 @@ inline void comps_objmrtree_pair_destroy_v(void * pair) {
     free(pair);
 }
 
-inline COMPS_HSList* __comps_objmrtree_all(COMPS_ObjMRTree * rt, char keyvalpair) {
-    COMPS_HSList *to_process, *ret;
-    COMPS_HSListItem *hsit, *oldit;
-    size_t x;
-    struct Pair {
-        char *key;
-        void *data;
-        COMPS_HSList *subnodes;
-    } *pair, *current_pair=NULL;//, *oldpair=NULL;
+static void __comps_objmrtree_key_append(void *ret, char *key, size_t len,
+                                         COMPS_ObjList *data) {
+    (void)len;
+    (void)data;
+    comps_hslist_append((COMPS_HSList*)ret, __comps_strcpy(key), 0);
+}
+
+static void __comps_objmrtree_value_append(void *ret, char *key, size_t len,
+                                           COMPS_ObjList *data) {
+    (void)key;
+    (void)len;
+    comps_hslist_append((COMPS_HSList*)ret, data, 0);
+}
+
+static void __comps_objmrtree_pair_append(void *ret, char *key, size_t len,
+                                          COMPS_ObjList *data) {
     COMPS_ObjMRTreePair *rtpair;
+    (void)len;
+    rtpair = malloc(sizeof(COMPS_ObjMRTreePair));
+    rtpair->key = __comps_strcpy(key);
+    rtpair->data = data;
+    comps_hslist_append((COMPS_HSList*)ret, rtpair, 0);
+}
 
-    to_process = comps_hslist_create();
-    comps_hslist_init(to_process, NULL, NULL, &free);
+static inline COMPS_HSList* __comps_objmrtree_all(COMPS_ObjMRTree * rt,
+                                                  char keyvalpair) {
+    COMPS_HSList *ret;
 
     ret = comps_hslist_create();
-    if (keyvalpair == 0)
+    if (keyvalpair == 0) {
         comps_hslist_init(ret, NULL, NULL, &free);
-    else if (keyvalpair == 1)
+        __comps_objmrtree_walk(rt, ret, &__comps_objmrtree_key_append);
+    } else if (keyvalpair == 1) {
         comps_hslist_init(ret, NULL, NULL, NULL);
-    else
+        __comps_objmrtree_walk(rt, ret, &__comps_objmrtree_value_append);
+    } else {
         comps_hslist_init(ret, NULL, NULL, &comps_objmrtree_pair_destroy_v);
-
-    for (hsit = rt->subnodes->first; hsit != NULL; hsit = hsit->next) {
-        pair = malloc(sizeof(struct Pair));
-        pair->key = __comps_strcpy(((COMPS_ObjMRTreeData*)hsit->data)->key);
-        pair->data = ((COMPS_ObjMRTreeData*)hsit->data)->data;
-        pair->subnodes = ((COMPS_ObjMRTreeData*)hsit->data)->subnodes;
-        comps_hslist_append(to_process, pair, 0);
+        __comps_objmrtree_walk(rt, ret, &__comps_objmrtree_pair_append);
     }
-    while (to_process->first) {
-        //oldpair = current_pair;
-        current_pair = to_process->first->data;
-        oldit = to_process->first;
-        comps_hslist_remove(to_process, to_process->first);
-        if (current_pair->data) {
-            if (keyvalpair == 0) {
-                comps_hslist_append(ret, __comps_strcpy(current_pair->key), 0);
-            } else if (keyvalpair == 1) {
-                comps_hslist_append(ret, current_pair->data, 0);
-            } else {
-                rtpair = malloc(sizeof(COMPS_ObjMRTreePair));
-                rtpair->key = __comps_strcpy(current_pair->key);
-                rtpair->data = current_pair->data;
-                comps_hslist_append(ret, rtpair, 0);
-            }
-        }
-        for (hsit = current_pair->subnodes->first, x = 0;
-             hsit != NULL; hsit = hsit->next, x++) {
-            pair = malloc(sizeof(struct Pair));
-            pair->key = __comps_strcat(current_pair->key,
-                                       ((COMPS_ObjMRTreeData*)hsit->data)->key);
-            pair->data = ((COMPS_ObjMRTreeData*)hsit->data)->data;
-            pair->subnodes = ((COMPS_ObjMRTreeData*)hsit->data)->subnodes;
-            comps_hslist_insert_at(to_process, x, pair, 0);
-        }
-        free(current_pair->key);
-        free(current_pair);
-        free(oldit);
-    }
-
-    comps_hslist_destroy(&to_process);
     return ret;
 }
 
@@ -681,22 +441,9 @@ COMPS_HSList* comps_objmrtree_pairs(COMPS_ObjMRTree * rt) {
 }
 
 void comps_objmrtree_clear(COMPS_ObjMRTree * rt) {
-    COMPS_HSListItem *it, *oldit;
     if (rt == NULL) return;
-    if (rt->subnodes == NULL) return;
-    oldit = rt->subnodes->first;
-    it = (oldit)?oldit->next:NULL;
-    for (;it != NULL; it=it->next) {
-        if (rt->subnodes->data_destructor != NULL)
-            rt->subnodes->data_destructor(oldit->data);
-        free(oldit);
-        oldit = it;
-    }
-    if (oldit) {
-        if (rt->subnodes->data_destructor != NULL)
-            rt->subnodes->data_destructor(oldit->data);
-        free(oldit);
-    }
+    comps_radixnodes_clear(&rt->subnodes, &comps_objmrtree_data_destroy_v);
+    rt->len = 0;
 }
 
 char comps_objmrtree_paircmp(void *obj1, void *obj2) {
@@ -704,7 +451,7 @@ char comps_objmrtree_paircmp(void *obj1, void *obj2) {
                ((COMPS_ObjMRTreePair*)obj2)->key) != 0)
         return 0;
     return comps_object_cmp((COMPS_Object*)((COMPS_ObjMRTreePair*)obj1)->data,
-                            (COMPS_Object*)((COMPS_ObjMRTreePair*)obj1)->data);
+                            (COMPS_Object*)((COMPS_ObjMRTreePair*)obj2)->data);
 }
 
 signed char comps_objmrtree_cmp(COMPS_ObjMRTree *ort1, COMPS_ObjMRTree *ort2) {
@@ -27,17 +27,18 @@
 #include "comps_utils.h"
 #include "comps_hslist.h"
 #include "comps_objlist.h"
+#include "comps_radixnodes.h"
 
+/** node of COMPS_ObjMRTree. Node and its key part are single allocation */
 typedef struct {
-    char * key;
-    unsigned is_leaf;
-    COMPS_HSList * subnodes;
-    COMPS_ObjList * data;
+    COMPS_ObjList *data; /**< values of node, NULL for inner nodes */
+    COMPS_RadixNodes subnodes; /**< children in insertion order */
+    char key[]; /**< part of key belonging to node */
 } COMPS_ObjMRTreeData;
 
 typedef struct {
     COMPS_Object_HEAD;
-    COMPS_HSList *  subnodes;
+    COMPS_RadixNodes subnodes;
     unsigned int len;
 } COMPS_ObjMRTree;
 
@@ -22,9 +22,8 @@
 #include <stdio.h>
 
 void comps_objrtree_data_destroy(COMPS_ObjRTreeData * rtd) {
-    free(rtd->key);
     comps_object_destroy(rtd->data);
-    comps_hslist_destroy(&rtd->subnodes);
+    comps_radixnodes_clear(&rtd->subnodes, &comps_objrtree_data_destroy_v);
     free(rtd);
 }
 
@@ -36,20 +35,12 @@ inline COMPS_ObjRTreeData * __comps_objrtree_data_create(char *key,
                                                    size_t keylen,
                                                    COMPS_Object *data){
     COMPS_ObjRTreeData * rtd;
-    if ((rtd = malloc(sizeof(*rtd))) == NULL)
+    if ((rtd = malloc(sizeof(*rtd) + sizeof(char) * (keylen+1))) == NULL)
         return NULL;
-    if ((rtd->key = malloc(sizeof(char) * (keylen+1))) == NULL) {
-        free(rtd);
-        return NULL;
-    }
     memcpy(rtd->key, key, sizeof(char)*keylen);
     rtd->key[keylen] = 0;
     rtd->data = data;
-    if (data != NULL) {
-        rtd->is_leaf = 1;
-    }
-    rtd->subnodes = comps_hslist_create();
-    comps_hslist_init(rtd->subnodes, NULL, NULL, &comps_objrtree_data_destroy_v);
+    comps_radixnodes_init(&rtd->subnodes);
     return rtd;
 }
 
@@ -68,12 +59,7 @@ COMPS_ObjRTreeData * comps_objrtree_data_create_n(char *key, size_t keylen,
 
 static void comps_objrtree_create(COMPS_ObjRTree *rtree, COMPS_Object **args) {
     (void)args;
-    rtree->subnodes = comps_hslist_create();
-    comps_hslist_init(rtree->subnodes, NULL, NULL, &comps_objrtree_data_destroy_v);
-    if (rtree->subnodes == NULL) {
-        COMPS_OBJECT_DESTROY(rtree);
-        return;
-    }
+    comps_radixnodes_init(&rtree->subnodes);
     rtree->len = 0;
 }
 void comps_objrtree_create_u(COMPS_Object * obj, COMPS_Object **args) {
@@ -82,205 +68,74 @@ void comps_objrtree_create_u(COMPS_Object * obj, COMPS_Object **args) {
 }
 
 static void comps_objrtree_destroy(COMPS_ObjRTree * rt) {
-    comps_hslist_destroy(&(rt->subnodes));
+    comps_radixnodes_clear(&rt->subnodes, &comps_objrtree_data_destroy_v);
 }
 void comps_objrtree_destroy_u(COMPS_Object *obj) {
     comps_objrtree_destroy((COMPS_ObjRTree*)obj);
 }
 
-COMPS_ObjRTree * comps_objrtree_clone(COMPS_ObjRTree *rt) {
+/* copy children of node with copy_f applied to every value */
+static void __comps_objrtree_subnodes_copy(COMPS_RadixNodes *dst,
+                                           const COMPS_RadixNodes *src,
+                                   COMPS_Object* (*copy_f)(COMPS_Object*)) {
+    COMPS_ObjRTreeData *rtd, *rtdata;
+    unsigned x;
 
-    COMPS_HSList *to_clone, *tmplist, *new_subnodes;
+    if (comps_radixnodes_copy(dst, src))
+        return;
+    for (x = 0; x < src->len; x++) {
+        rtdata = (COMPS_ObjRTreeData*)src->nodes[x];
+        rtd = comps_objrtree_data_create(rtdata->key, NULL);
+        if (rtdata->data != NULL)
+            rtd->data = copy_f(rtdata->data);
+        __comps_objrtree_subnodes_copy(&rtd->subnodes, &rtdata->subnodes,
+                                       copy_f);
+        dst->nodes[x] = rtd;
+    }
+}
+
+COMPS_ObjRTree * comps_objrtree_clone(COMPS_ObjRTree *rt) {
     COMPS_ObjRTree *ret;
-    COMPS_HSListItem *it, *it2;
-    COMPS_ObjRTreeData *rtdata;
-    COMPS_Object *new_data;
 
     if (!rt) return NULL;
 
-    to_clone = comps_hslist_create();
-    comps_hslist_init(to_clone, NULL, NULL, NULL);
     ret = COMPS_OBJECT_CREATE(COMPS_ObjRTree, NULL);
+    __comps_objrtree_subnodes_copy(&ret->subnodes, &rt->subnodes,
+                                   &comps_object_copy);
     ret->len = rt->len;
-
-    for (it = rt->subnodes->first; it != NULL; it = it->next) {
-        rtdata = comps_objrtree_data_create(
-                                    ((COMPS_ObjRTreeData*)it->data)->key, NULL);
-        if (((COMPS_ObjRTreeData*)it->data)->data != NULL)
-            new_data = comps_object_copy(((COMPS_ObjRTreeData*)it->data)->data);
-        else
-            new_data = NULL;
-        comps_hslist_destroy(&rtdata->subnodes);
-        rtdata->subnodes = ((COMPS_ObjRTreeData*)it->data)->subnodes;
-        rtdata->data = new_data;
-        comps_hslist_append(ret->subnodes, rtdata, 0);
-        comps_hslist_append(to_clone, rtdata, 0);
-    }
-
-    while (to_clone->first) {
-        it2 = to_clone->first;
-        tmplist = ((COMPS_ObjRTreeData*)it2->data)->subnodes;
-        comps_hslist_remove(to_clone, to_clone->first);
-
-        new_subnodes = comps_hslist_create();
-        comps_hslist_init(new_subnodes, NULL, NULL, &comps_objrtree_data_destroy_v);
-        for (it = tmplist->first; it != NULL; it = it->next) {
-            rtdata = comps_objrtree_data_create(
-                                      ((COMPS_ObjRTreeData*)it->data)->key, NULL);
-            if (((COMPS_ObjRTreeData*)it->data)->data != NULL)
-                new_data = comps_object_copy(((COMPS_ObjRTreeData*)it->data)->data);
-            else
-                new_data = NULL;
-            comps_hslist_destroy(&rtdata->subnodes);
-            rtdata->subnodes = ((COMPS_ObjRTreeData*)it->data)->subnodes;
-            rtdata->data = new_data;
-            comps_hslist_append(new_subnodes, rtdata, 0);
-            comps_hslist_append(to_clone, rtdata, 0);
-        }
-        ((COMPS_ObjRTreeData*)it2->data)->subnodes = new_subnodes;
-        free(it2);
-    }
-    comps_hslist_destroy(&to_clone);
     return ret;
 }
 void comps_objrtree_copy(COMPS_ObjRTree *rt1, COMPS_ObjRTree *rt2){
-    COMPS_HSList *to_clone, *tmplist, *new_subnodes;
-    COMPS_HSListItem *it, *it2;
-    COMPS_ObjRTreeData *rtdata;
-    COMPS_Object *new_data;
-
-    rt1->subnodes = comps_hslist_create();
-    comps_hslist_init(rt1->subnodes, NULL, NULL, &comps_objrtree_data_destroy_v);
-    if (rt1->subnodes == NULL) {
-        COMPS_OBJECT_DESTROY(rt1);
-        return;
-    }
-    rt1->len = 0;
-
-    to_clone = comps_hslist_create();
-    comps_hslist_init(to_clone, NULL, NULL, NULL);
-
-    for (it = rt2->subnodes->first; it != NULL; it = it->next) {
-        rtdata = comps_objrtree_data_create(
-                                    ((COMPS_ObjRTreeData*)it->data)->key, NULL);
-        if (((COMPS_ObjRTreeData*)it->data)->data != NULL)
-            new_data = comps_object_copy(((COMPS_ObjRTreeData*)it->data)->data);
-        else
-            new_data = NULL;
-        comps_hslist_destroy(&rtdata->subnodes);
-        rtdata->subnodes = ((COMPS_ObjRTreeData*)it->data)->subnodes;
-        rtdata->data = new_data;
-        comps_hslist_append(rt1->subnodes, rtdata, 0);
-        comps_hslist_append(to_clone, rtdata, 0);
-    }
-
-    while (to_clone->first) {
-        it2 = to_clone->first;
-        tmplist = ((COMPS_ObjRTreeData*)it2->data)->subnodes;
-        comps_hslist_remove(to_clone, to_clone->first);
-
-        new_subnodes = comps_hslist_create();
-        comps_hslist_init(new_subnodes, NULL, NULL, &comps_objrtree_data_destroy_v);
-        for (it = tmplist->first; it != NULL; it = it->next) {
-            rtdata = comps_objrtree_data_create(
-                                      ((COMPS_ObjRTreeData*)it->data)->key, NULL);
-            if (((COMPS_ObjRTreeData*)it->data)->data != NULL)
-                new_data = comps_object_copy(((COMPS_ObjRTreeData*)it->data)->data);
-            else
-                new_data = NULL;
-            comps_hslist_destroy(&rtdata->subnodes);
-            rtdata->subnodes = ((COMPS_ObjRTreeData*)it->data)->subnodes;
-            rtdata->data = new_data;
-            comps_hslist_append(new_subnodes, rtdata, 0);
-            comps_hslist_append(to_clone, rtdata, 0);
-        }
-        ((COMPS_ObjRTreeData*)it2->data)->subnodes = new_subnodes;
-        free(it2);
-    }
-    comps_hslist_destroy(&to_clone);
-
+    __comps_objrtree_subnodes_copy(&rt1->subnodes, &rt2->subnodes,
+                                   &comps_object_copy);
+    rt1->len = rt2->len;
 }
 COMPS_COPY_u(objrtree, COMPS_ObjRTree) /*comps_utils.h macro*/
 
 void comps_objrtree_copy_shallow(COMPS_ObjRTree *rt1, COMPS_ObjRTree *rt2){
-    COMPS_HSList *to_clone, *tmplist, *new_subnodes;
-    COMPS_HSListItem *it, *it2;
-    COMPS_ObjRTreeData *rtdata;
-    COMPS_Object *new_data;
+    comps_objrtree_clear(rt1);
+    __comps_objrtree_subnodes_copy(&rt1->subnodes, &rt2->subnodes,
+                                   &comps_object_incref);
+    rt1->len = rt2->len;
+}
 
-    rt1->subnodes = comps_hslist_create();
-    comps_hslist_init(rt1->subnodes, NULL, NULL, &comps_objrtree_data_destroy_v);
-    if (rt1->subnodes == NULL) {
-        COMPS_OBJECT_DESTROY(rt1);
-        return;
-    }
-    rt1->len = 0;
-
-    to_clone = comps_hslist_create();
-    comps_hslist_init(to_clone, NULL, NULL, NULL);
-
-    for (it = rt2->subnodes->first; it != NULL; it = it->next) {
-        rtdata = comps_objrtree_data_create(
-                                    ((COMPS_ObjRTreeData*)it->data)->key, NULL);
-        if (((COMPS_ObjRTreeData*)it->data)->data != NULL)
-            new_data = COMPS_OBJECT_INCREF(((COMPS_ObjRTreeData*)it->data)->data);
-        else
-            new_data = NULL;
-        comps_hslist_destroy(&rtdata->subnodes);
-        rtdata->subnodes = ((COMPS_ObjRTreeData*)it->data)->subnodes;
-        rtdata->data = new_data;
-        comps_hslist_append(rt1->subnodes, rtdata, 0);
-        comps_hslist_append(to_clone, rtdata, 0);
-    }
+static void __comps_objrtree_values_walk(COMPS_RadixNodes *subnodes,
+                                         void *udata,
+                                  void (*walk_f)(void*, COMPS_Object*)) {
+    COMPS_ObjRTreeData *rtdata;
+    unsigned x;
 
-    while (to_clone->first) {
-        it2 = to_clone->first;
-        tmplist = ((COMPS_ObjRTreeData*)it2->data)->subnodes;
-        comps_hslist_remove(to_clone, to_clone->first);
-
-        new_subnodes = comps_hslist_create();
-        comps_hslist_init(new_subnodes, NULL, NULL, &comps_objrtree_data_destroy_v);
-        for (it = tmplist->first; it != NULL; it = it->next) {
-            rtdata = comps_objrtree_data_create(
-                                      ((COMPS_ObjRTreeData*)it->data)->key, NULL);
-            if (((COMPS_ObjRTreeData*)it->data)->data != NULL)
-                new_data = comps_object_incref(((COMPS_ObjRTreeData*)it->data)->data);
-            else
-                new_data = NULL;
-            comps_hslist_destroy(&rtdata->subnodes);
-            rtdata->subnodes = ((COMPS_ObjRTreeData*)it->data)->subnodes;
-            rtdata->data = new_data;
-            comps_hslist_append(new_subnodes, rtdata, 0);
-            comps_hslist_append(to_clone, rtdata, 0);
-        }
-        ((COMPS_ObjRTreeData*)it2->data)->subnodes = new_subnodes;
-        free(it2);
+    for (x = 0; x < subnodes->len; x++) {
+        rtdata = (COMPS_ObjRTreeData*)subnodes->nodes[x];
+        if (rtdata->data != NULL)
+            walk_f(udata, rtdata->data);
+        __comps_objrtree_values_walk(&rtdata->subnodes, udata, walk_f);
     }
-    comps_hslist_destroy(&to_clone);
 }
 
 void comps_objrtree_values_walk(COMPS_ObjRTree * rt, void* udata,
                               void (*walk_f)(void*, COMPS_Object*)) {
-    COMPS_HSList *tmplist, *tmp_subnodes;
-    COMPS_HSListItem *it;
-    tmplist = comps_hslist_create();
-    comps_hslist_init(tmplist, NULL, NULL, NULL);
-    comps_hslist_append(tmplist, rt->subnodes, 0);
-    while (tmplist->first != NULL) {
-        it = tmplist->first;
-        comps_hslist_remove(tmplist, tmplist->first);
-        tmp_subnodes = (COMPS_HSList*)it->data;
-        for (it = tmp_subnodes->first; it != NULL; it=it->next) {
-            if (((COMPS_ObjRTreeData*)it->data)->subnodes->first) {
-                comps_hslist_append(tmplist,
-                                    ((COMPS_ObjRTreeData*)it->data)->subnodes, 0);
-            }
-            if (((COMPS_ObjRTreeData*)it->data)->data != NULL) {
-               walk_f(udata, ((COMPS_ObjRTreeData*)it->data)->data);
-            }
-        }
-    }
-    comps_hslist_destroy(&tmplist);
+    __comps_objrtree_values_walk(&rt->subnodes, udata, walk_f);
 }
 
 char comps_objrtree_paircmp(void *obj1, void *obj2) {
@@ -338,108 +193,68 @@ COMPS_CMP_u(objrtree, COMPS_ObjRTree)
 
 void __comps_objrtree_set(COMPS_ObjRTree *rt, char *key, size_t len,
                           COMPS_Object *ndata) {
-
-    COMPS_HSListItem *it, *lesser;
-    COMPS_HSList *subnodes;
+    COMPS_RadixNodes *subnodes;
     COMPS_ObjRTreeData *rtd;
-    static COMPS_ObjRTreeData *rtdata;
-
-    size_t _len, offset=0;
-    unsigned x, found = 0;
-    char ended;
-
-    //len = strlen(key);
-
-    if (rt->subnodes == NULL)
-        return;
+    COMPS_ObjRTreeData *rtdata;
+    size_t offset = 0, x;
+    int pos;
 
-    subnodes = rt->subnodes;
+    subnodes = &rt->subnodes;
     while (offset != len)
     {
-        found = 0;
-        lesser = NULL;
-        for (it = subnodes->first; it != NULL; it=it->next) {
-            if (((COMPS_ObjRTreeData*)it->data)->key[0] == key[offset]) {
-                found = 1;
+        pos = comps_radixnodes_find(subnodes, key[offset]);
+        if (pos < 0) { // not found in subnodes; create new subnode
+            rtd = comps_objrtree_data_create_n(key+offset, len-offset, ndata);
+            if (!rtd)
+                return;
+            comps_radixnodes_insert(subnodes,
+                                comps_radixnodes_lower(subnodes, key[offset]),
+                                key[offset], rtd);
+            if (ndata)
+                rt->len++;
+            return;
+        }
+        rtdata = (COMPS_ObjRTreeData*)subnodes->nodes[pos];
+        for (x = 1; rtdata->key[x] != 0 && x != len - offset; x++) {
+            if (key[offset+x] != rtdata->key[x])
                 break;
-            } else if (((COMPS_ObjRTreeData*)it->data)->key[0] < key[offset]) {
-                lesser = it;
-            }
         }
-        if (!found) { // not found in subnodes; create new subnode
-            rtd = comps_objrtree_data_create_n(key+offset, len-offset, ndata);
-            if (!lesser) {
-                comps_hslist_prepend(subnodes, rtd, 0);
-            } else {
-                comps_hslist_insert_after(subnodes, lesser, rtd, 0);
-            }
-            rt->len++;
+        if (rtdata->key[x] == 0 && x == len - offset) {
+            //keys equals; data replacement
+            if (!rtdata->data && ndata)
+                rt->len++;
+            else if (rtdata->data && !ndata)
+                rt->len--;
+            comps_object_destroy(rtdata->data);
+            rtdata->data = ndata;
             return;
+        } else if (rtdata->key[x] == 0) { //local key ends first; go deeper
+            subnodes = &rtdata->subnodes;
+            offset += x;
         } else {
-            rtdata = (COMPS_ObjRTreeData*)it->data;
-            ended = 0;
-            for (x=1; ;x++) {
-                if (rtdata->key[x] == 0) ended += 1;
-                if (x == len - offset) ended += 2;
-                if (ended != 0) break;
-                if (key[offset+x] != rtdata->key[x]) break;
-            }
-            if (ended == 3) { //keys equals; data replacement
-                comps_object_destroy(rtdata->data);
-                rtdata->data = ndata;
+            /* split node key; new node with common part of key takes place
+             * of current node and current node becomes its child */
+            rtd = comps_objrtree_data_create_n(key+offset, x, NULL);
+            if (!rtd)
                 return;
-            } else if (ended == 2) { //global key ends first; make global leaf
-                //printf("ended2\n");
-                comps_hslist_remove(subnodes, it);
-                it->next = NULL;
-                rtd = comps_objrtree_data_create_n(key+offset, len-offset, ndata);
-                comps_hslist_append(subnodes, rtd, 0);
-                ((COMPS_ObjRTreeData*)subnodes->last->data)->subnodes->last = it;
-                ((COMPS_ObjRTreeData*)subnodes->last->data)->subnodes->first = it;
-                _len = len - offset;
-
-                memmove(rtdata->key,rtdata->key+_len,
-                        strlen(rtdata->key) - _len);
-                rtdata->key[strlen(rtdata->key) - _len] = 0;
-                rtdata->key = realloc(rtdata->key,
-                                      sizeof(char)* (strlen(rtdata->key)+1));
-                rt->len++;
-                return;
-            } else if (ended == 1) { //local key ends first; go deeper
-                subnodes = rtdata->subnodes;
-                offset += x;
+            memmove(rtdata->key, rtdata->key + x, strlen(rtdata->key + x) + 1);
+            comps_radixnodes_insert(&rtd->subnodes, 0, rtdata->key[0], rtdata);
+            subnodes->nodes[pos] = rtd;
+            if (x == len - offset) { //global key ends first; make global leaf
+                rtd->data = ndata;
             } else {
-                COMPS_Object *tmpdata = rtdata->data;
-                COMPS_HSList *tmphslist = rtdata->subnodes;
-                //tmpch = rtdata->key[x];             // split mutual key
-                rtdata->subnodes = comps_hslist_create();
-                comps_hslist_init(rtdata->subnodes, NULL, NULL,
-                                  &comps_objrtree_data_destroy_v);
-                int cmpret = strcmp(key+offset+x, rtdata->key+x);
-                rtdata->data = NULL;
-
-                if (cmpret > 0) {
-                    rtd = comps_objrtree_data_create(rtdata->key+x, tmpdata);
-                    comps_hslist_destroy(&rtd->subnodes);
-                    rtd->subnodes = tmphslist;
-
-                    comps_hslist_append(rtdata->subnodes,rtd, 0);
-                    rtd = comps_objrtree_data_create(key+offset+x, ndata);
-                    comps_hslist_append(rtdata->subnodes, rtd, 0);
-
-                } else {
-                    rtd = comps_objrtree_data_create(key+offset+x, ndata);
-                    comps_hslist_append(rtdata->subnodes, rtd, 0);
-                    rtd = comps_objrtree_data_create(rtdata->key+x, tmpdata);
-                    comps_hslist_destroy(&rtd->subnodes);
-                    rtd->subnodes = tmphslist;
-                    comps_hslist_append(rtdata->subnodes, rtd, 0);
-                }
-                rtdata->key = realloc(rtdata->key, sizeof(char)*(x+1));
-                rtdata->key[x] = 0;
-                rt->len++;
-                return;
+                rtdata = comps_objrtree_data_create_n(key+offset+x,
+                                                      len-offset-x, ndata);
+                if (!rtdata)
+                    return;
+                subnodes = &rtd->subnodes;
+                comps_radixnodes_insert(subnodes,
+                            comps_radixnodes_lower(subnodes, key[offset+x]),
+                            key[offset+x], rtdata);
             }
+            if (ndata)
+                rt->len++;
+            return;
         }
     }
 }
@@ -460,51 +275,30 @@ void comps_objrtree_set_nx(COMPS_ObjRTree *rt, char *key, size_t len,
 }
 
 COMPS_Object* __comps_objrtree_get(COMPS_ObjRTree * rt, const char * key) {
-    COMPS_HSList * subnodes;
-    COMPS_HSListItem * it = NULL;
-    COMPS_ObjRTreeData * rtdata;
-    unsigned int offset, len, x;
-    char found, ended;
+    COMPS_RadixNodes *subnodes;
+    COMPS_ObjRTreeData *rtdata;
+    size_t offset, len, x;
+    int pos;
 
     len = strlen(key);
     offset = 0;
-    subnodes = rt->subnodes;
+    subnodes = &rt->subnodes;
 
     while (offset != len) {
-        found = 0;
-        for (it = subnodes->first; it != NULL; it=it->next) {
-            if (((COMPS_ObjRTreeData*)it->data)->key[0] == key[offset]) {
-                found = 1;
-                break;
-            }
-        }
-        if (!found) {
+        pos = comps_radixnodes_find(subnodes, key[offset]);
+        if (pos < 0)
             return NULL;
+        rtdata = (COMPS_ObjRTreeData*)subnodes->nodes[pos];
+        for (x = 1; rtdata->key[x] != 0; x++) {
+            if (key[offset+x] != rtdata->key[x])
+                return NULL;
         }
-        rtdata = (COMPS_ObjRTreeData*)it->data;
-
-        for (x=1; ;x++) {
-            ended=0;
-            if (x == strlen(rtdata->key)) ended += 1;
-            if (x == len-offset) ended += 2;
-            if (ended != 0) break;
-            if (key[offset+x] != rtdata->key[x]) break;
-        }
-        if (ended == 3) {
+        offset += x;
+        subnodes = &rtdata->subnodes;
+        if (offset == len)
             return rtdata->data;
-        }
-        else if (ended == 1) offset+=x;
-        else {
-            return NULL;
-        }
-        subnodes = ((COMPS_ObjRTreeData*)it->data)->subnodes;
-    }
-    if (it != NULL) {
-        return ((COMPS_ObjRTreeData*)it->data)->data;
-    }
-    else {
-        return NULL;
     }
+    return NULL;
 }
 COMPS_Object* comps_objrtree_get(COMPS_ObjRTree * rt, const char * key) {
     return comps_object_incref(__comps_objrtree_get(rt, key));
@@ -513,240 +307,153 @@ COMPS_Object* comps_objrtree_get_x(COMPS_ObjRTree * rt, const char * key) {
     return __comps_objrtree_get(rt, key);
 }
 
-void comps_objrtree_unset(COMPS_ObjRTree * rt, const char * key) {
-    COMPS_HSList * subnodes;
-    COMPS_HSListItem * it;
-    COMPS_ObjRTreeData * rtdata;
-    unsigned int offset, len, x;
-    char found, ended;
-    COMPS_HSList * path;
-
-    struct Relation {
-        COMPS_HSList * parent_nodes;
-        COMPS_HSListItem * child_it;
-    } *relation;
+/* remove value under key from subnodes. Nodes left without value and
+ * children are removed, nodes left without value and with single child are
+ * merged with that child */
+static void __comps_objrtree_unset(COMPS_ObjRTree *rt,
+                                   COMPS_RadixNodes *subnodes,
+                                   const char *key, size_t len) {
+    COMPS_ObjRTreeData *rtdata, *child;
+    size_t keylen, childlen;
+    int pos;
 
-    path = comps_hslist_create();
-    comps_hslist_init(path, NULL, NULL, &free);
-
-    len = strlen(key);
-    offset = 0;
-    subnodes = rt->subnodes;
-    while (offset != len) {
-        found = 0;
-        for (it = subnodes->first; it != NULL; it=it->next) {
-            if (((COMPS_ObjRTreeData*)it->data)->key[0] == key[offset]) {
-                found = 1;
-                break;
-            }
-        }
-        if (!found)
-            return;
-        rtdata = (COMPS_ObjRTreeData*)it->data;
-
-        for (x=1; ;x++) {
-            ended=0;
-            if (rtdata->key[x] == 0) ended += 1;
-            if (x == len - offset) ended += 2;
-            if (ended != 0) break;
-            if (key[offset+x] != rtdata->key[x]) break;
-        }
-        if (ended == 3) {
-            /* remove node from tree only if there's no descendant*/
-            if (rtdata->subnodes->last == NULL) {
-                //printf("removing all\n");
-                comps_hslist_remove(subnodes, it);
-                comps_objrtree_data_destroy(rtdata);
-                free(it);
-            }
-            else {
-                //printf("removing data only\n");
-                comps_object_destroy(rtdata->data);
-                rtdata->is_leaf = 0;
-                rtdata->data = NULL;
-            }
-
-            if (path->last == NULL) {
-                comps_hslist_destroy(&path);
-                return;
-            }
-            rtdata = (COMPS_ObjRTreeData*)
-                     ((struct Relation*)path->last->data)->child_it->data;
-
-            /*remove all predecessor of deleted node (recursive) with no childs*/
-            while (rtdata->subnodes->last == NULL) {
-                //printf("removing '%s'\n", rtdata->key);
-                comps_objrtree_data_destroy(rtdata);
-                comps_hslist_remove(
-                            ((struct Relation*)path->last->data)->parent_nodes,
-                            ((struct Relation*)path->last->data)->child_it);
-                free(((struct Relation*)path->last->data)->child_it);
-                it = path->last;
-                comps_hslist_remove(path, path->last);
-                free(it);
-                rtdata = (COMPS_ObjRTreeData*)
-                         ((struct Relation*)path->last->data)->child_it->data;
-            }
-            comps_hslist_destroy(&path);
+    if (len == 0)
+        return;
+    pos = comps_radixnodes_find(subnodes, key[0]);
+    if (pos < 0)
+        return;
+    rtdata = (COMPS_ObjRTreeData*)subnodes->nodes[pos];
+    keylen = strlen(rtdata->key);
+    if (keylen > len || memcmp(rtdata->key, key, keylen) != 0)
+        return;
+    if (keylen == len) {
+        if (rtdata->data == NULL)
             return;
-        }
-        else if (ended == 1) offset+=x;
-        else return;
-        if ((relation = malloc(sizeof(struct Relation))) == NULL) {
-            comps_hslist_destroy(&path);
+        comps_object_destroy(rtdata->data);
+        rtdata->data = NULL;
+        rt->len--;
+    } else {
+        __comps_objrtree_unset(rt, &rtdata->subnodes, key + keylen,
+                               len - keylen);
+    }
+    if (rtdata->data != NULL)
+        return;
+    if (rtdata->subnodes.len == 0) {
+        comps_radixnodes_remove(subnodes, pos);
+        comps_objrtree_data_destroy(rtdata);
+    } else if (rtdata->subnodes.len == 1) {
+        child = (COMPS_ObjRTreeData*)rtdata->subnodes.nodes[0];
+        childlen = strlen(child->key);
+        child = realloc(child, sizeof(*child) + keylen + childlen + 1);
+        if (!child)
             return;
-        }
-        subnodes = ((COMPS_ObjRTreeData*)it->data)->subnodes;
-        relation->parent_nodes = subnodes;
-        relation->child_it = it;
-        comps_hslist_append(path, (void*)relation, 0);
+        memmove(child->key + keylen, child->key, childlen + 1);
+        memcpy(child->key, rtdata->key, keylen);
+        subnodes->nodes[pos] = child;
+        comps_radixnodes_clear(&rtdata->subnodes, NULL);
+        comps_objrtree_data_destroy(rtdata);
     }
-    comps_hslist_destroy(&path);
-    return;
+}
+
+void comps_objrtree_unset(COMPS_ObjRTree * rt, const char * key) {
+    __comps_objrtree_unset(rt, &rt->subnodes, key, strlen(key));
 }
 
 void comps_objrtree_clear(COMPS_ObjRTree * rt) {
-    COMPS_HSListItem *it, *oldit;
     if (rt==NULL) return;
-    if (rt->subnodes == NULL) return;
-    oldit = rt->subnodes->first;
-    it = (oldit)?oldit->next:NULL;
-    for (;it != NULL; it=it->next) {
-        comps_object_destroy(oldit->data);
-        free(oldit);
-        oldit = it;
-    }
-    if (oldit) {
-        comps_object_destroy(oldit->data);
-        free(oldit);
+    comps_radixnodes_clear(&rt->subnodes, &comps_objrtree_data_destroy_v);
+    rt->len = 0;
+}
+
+/* call walk_f with full key of every node with value in subnodes. Key is
+ * built in *key buffer of *size bytes, keylen bytes of it belongs to
+ * predecessors */
+static void __comps_objrtree_pairs_walk(COMPS_RadixNodes *subnodes,
+                                        char **key, size_t *size,
+                                        size_t keylen, void *udata,
+                        void (*walk_f)(void*, char*, size_t, COMPS_Object*)) {
+    COMPS_ObjRTreeData *rtdata;
+    size_t len;
+    char *tmp;
+    unsigned x;
+
+    for (x = 0; x < subnodes->len; x++) {
+        rtdata = (COMPS_ObjRTreeData*)subnodes->nodes[x];
+        len = strlen(rtdata->key);
+        if (keylen + len + 1 > *size) {
+            if ((tmp = realloc(*key, (keylen + len + 1) * 2)) == NULL)
+                return;
+            *key = tmp;
+            *size = (keylen + len + 1) * 2;
+        }
+        memcpy(*key + keylen, rtdata->key, len + 1);
+        if (rtdata->data != NULL)
+            walk_f(udata, *key, keylen + len, rtdata->data);
+        __comps_objrtree_pairs_walk(&rtdata->subnodes, key, size,
+                                    keylen + len, udata, walk_f);
     }
 }
 
-inline COMPS_HSList* __comps_objrtree_all(COMPS_ObjRTree * rt, char keyvalpair) {
-    COMPS_HSList *to_process, *ret;
-    COMPS_HSListItem *hsit, *oldit;
-    size_t x;
-    struct Pair {
-        char *key;
-        void *data;
-        COMPS_HSList *subnodes;
-    } *pair, *current_pair=NULL;//, *oldpair=NULL;
+static void __comps_objrtree_walk(COMPS_ObjRTree *rt, void *udata,
+                        void (*walk_f)(void*, char*, size_t, COMPS_Object*)) {
+    size_t size = 64;
+    char *key = malloc(sizeof(char) * size);
+
+    if (!key)
+        return;
+    __comps_objrtree_pairs_walk(&rt->subnodes, &key, &size, 0, udata, walk_f);
+    free(key);
+}
+
+static void __comps_objrtree_key_append(void *ret, char *key, size_t len,
+                                        COMPS_Object *data) {
+    (void)len;
+    (void)data;
+    comps_hslist_append((COMPS_HSList*)ret, __comps_strcpy(key), 0);
+}
+
+static void __comps_objrtree_value_append(void *ret, char *key, size_t len,
+                                          COMPS_Object *data) {
+    (void)key;
+    (void)len;
+    comps_hslist_append((COMPS_HSList*)ret, data, 0);
+}
+
+static void __comps_objrtree_pair_append(void *ret, char *key, size_t len,
+                                         COMPS_Object *data) {
     COMPS_ObjRTreePair *rtpair;
+    (void)len;
+    rtpair = malloc(sizeof(COMPS_ObjRTreePair));
+    rtpair->key = __comps_strcpy(key);
+    rtpair->data = data;
+    comps_hslist_append((COMPS_HSList*)ret, rtpair, 0);
+}
 
-    to_process = comps_hslist_create();
-    comps_hslist_init(to_process, NULL, NULL, &free);
+inline COMPS_HSList* __comps_objrtree_all(COMPS_ObjRTree * rt, char keyvalpair) {
+    COMPS_HSList *ret;
 
     ret = comps_hslist_create();
-    if (keyvalpair == 0)
+    if (keyvalpair == 0) {
         comps_hslist_init(ret, NULL, NULL, &free);
-    else if (keyvalpair == 1)
+        __comps_objrtree_walk(rt, ret, &__comps_objrtree_key_append);
+    } else if (keyvalpair == 1) {
         comps_hslist_init(ret, NULL, NULL, NULL);
-    else
+        __comps_objrtree_walk(rt, ret, &__comps_objrtree_value_append);
+    } else {
         comps_hslist_init(ret, NULL, NULL, &comps_objrtree_pair_destroy_v);
-
-    for (hsit = rt->subnodes->first; hsit != NULL; hsit = hsit->next) {
-        pair = malloc(sizeof(struct Pair));
-        pair->key = __comps_strcpy(((COMPS_ObjRTreeData*)hsit->data)->key);
-        pair->data = ((COMPS_ObjRTreeData*)hsit->data)->data;
-        pair->subnodes = ((COMPS_ObjRTreeData*)hsit->data)->subnodes;
-        comps_hslist_append(to_process, pair, 0);
+        __comps_objrtree_walk(rt, ret, &__comps_objrtree_pair_append);
     }
-    while (to_process->first) {
-        //oldpair = current_pair;
-        current_pair = to_process->first->data;
-        oldit = to_process->first;
-        comps_hslist_remove(to_process, to_process->first);
-        if (current_pair->data) {
-            if (keyvalpair == 0) {
-                comps_hslist_append(ret, __comps_strcpy(current_pair->key), 0);
-            } else if (keyvalpair == 1) {
-                comps_hslist_append(ret, current_pair->data, 0);
-            } else {
-                rtpair = malloc(sizeof(COMPS_ObjRTreePair));
-                rtpair->key = __comps_strcpy(current_pair->key);
-                rtpair->data = current_pair->data;
-                comps_hslist_append(ret, rtpair, 0);
-            }
-        }
-        for (hsit = current_pair->subnodes->first, x = 0;
-             hsit != NULL; hsit = hsit->next, x++) {
-            pair = malloc(sizeof(struct Pair));
-            pair->key = __comps_strcat(current_pair->key,
-                                       ((COMPS_ObjRTreeData*)hsit->data)->key);
-            pair->data = ((COMPS_ObjRTreeData*)hsit->data)->data;
-            pair->subnodes = ((COMPS_ObjRTreeData*)hsit->data)->subnodes;
-            comps_hslist_insert_at(to_process, x, pair, 0);
-        }
-        free(current_pair->key);
-        free(current_pair);
-        free(oldit);
-    }
-
-    comps_hslist_destroy(&to_process);
     return ret;
 }
 
+static void __comps_objrtree_unite_set(void *rt, char *key, size_t len,
+                                       COMPS_Object *data) {
+    __comps_objrtree_set((COMPS_ObjRTree*)rt, key, len,
+                         comps_object_incref(data));
+}
+
 void comps_objrtree_unite(COMPS_ObjRTree *rt1, COMPS_ObjRTree *rt2) {
-    COMPS_HSList *tmplist, *tmp_subnodes;
-    COMPS_HSListItem *it;
-    struct Pair {
-        COMPS_HSList * subnodes;
-        char * key;
-        char added;
-    } *pair, *parent_pair;
-
-    pair = malloc(sizeof(struct Pair));
-    pair->subnodes = rt2->subnodes;
-    pair->key = NULL;
-
-    tmplist = comps_hslist_create();
-    comps_hslist_init(tmplist, NULL, NULL, &free);
-    comps_hslist_append(tmplist, pair, 0);
-
-    while (tmplist->first != NULL) {
-        it = tmplist->first;
-        comps_hslist_remove(tmplist, tmplist->first);
-        tmp_subnodes = ((struct Pair*)it->data)->subnodes;
-        parent_pair = (struct Pair*) it->data;
-        //printf("key-part:%s\n", parent_pair->key);
-        free(it);
-
-        //pair->added = 0;
-        for (it = tmp_subnodes->first; it != NULL; it=it->next) {
-            pair = malloc(sizeof(struct Pair));
-            pair->subnodes = ((COMPS_ObjRTreeData*)it->data)->subnodes;
-
-            if (parent_pair->key != NULL) {
-                pair->key = malloc(sizeof(char)
-                               * (strlen(((COMPS_ObjRTreeData*)it->data)->key)
-                               + strlen(parent_pair->key) + 1));
-                memcpy(pair->key, parent_pair->key,
-                       sizeof(char) * strlen(parent_pair->key));
-                memcpy(pair->key + strlen(parent_pair->key),
-                       ((COMPS_ObjRTreeData*)it->data)->key,
-                       sizeof(char)*(strlen(((COMPS_ObjRTreeData*)it->data)->key)+1));
-            } else {
-                pair->key = malloc(sizeof(char)*
-                                (strlen(((COMPS_ObjRTreeData*)it->data)->key) +1));
-                memcpy(pair->key, ((COMPS_ObjRTreeData*)it->data)->key,
-                       sizeof(char)*(strlen(((COMPS_ObjRTreeData*)it->data)->key)+1));
-            }
-            /* current node has data */
-            if (((COMPS_ObjRTreeData*)it->data)->data != NULL) {
-                    comps_objrtree_set(rt1, pair->key,
-                                      (((COMPS_ObjRTreeData*)it->data)->data));
-            }
-            if (((COMPS_ObjRTreeData*)it->data)->subnodes->first) {
-                comps_hslist_append(tmplist, pair, 0);
-            } else {
-                free(pair->key);
-                free(pair);
-            }
-        }
-        free(parent_pair->key);
-        free(parent_pair);
-    }
-    comps_hslist_destroy(&tmplist);
+    __comps_objrtree_walk(rt2, rt1, &__comps_objrtree_unite_set);
 }
 
 COMPS_ObjRTree* comps_objrtree_union(COMPS_ObjRTree *rt1, COMPS_ObjRTree *rt2){
@@ -27,17 +27,18 @@
 #include "comps_obj.h"
 #include "comps_utils.h"
 #include "comps_objlist.h"
+#include "comps_radixnodes.h"
 
+/** node of COMPS_ObjRTree. Node and its key part are single allocation */
 typedef struct {
-    char *key;
-    unsigned is_leaf;
-    COMPS_HSList *subnodes;
-    COMPS_Object *data;
+    COMPS_Object *data; /**< value of node, NULL for inner nodes */
+    COMPS_RadixNodes subnodes; /**< children sorted by first key character */
+    char key[]; /**< part of key belonging to node */
 } COMPS_ObjRTreeData;
 
 typedef struct {
     COMPS_Object_HEAD;
-    COMPS_HSList *subnodes;
+    COMPS_RadixNodes subnodes;
     unsigned int len;
 } COMPS_ObjRTree;
 
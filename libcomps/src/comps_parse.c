@@ -17,15 +17,36 @@
  * USA
  */
 
+/* fileno, mmap, posix_madvise, pthreads and sysconf */
+#define _POSIX_C_SOURCE 200112L
+
 #include <stdio.h>
+#include <pthread.h>
+#include <unistd.h>
 #include <ctype.h>
 #include <signal.h>
+#include <limits.h>
+#include <stdint.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+
+#ifdef COMPS_WITH_ZLIB
+#include <zlib.h>
+#endif
+#ifdef COMPS_WITH_LZMA
+#include <lzma.h>
+#endif
+#ifdef COMPS_WITH_ZSTD
+#include <zstd.h>
+#endif
 
 #include "comps_types.h"
 #include "comps_parse.h"
 #include "comps_elem.h"
 
-#define BUFF_SIZE 1024
+#define BUFF_SIZE 65536
+/* max size of memory block passed to decompressor at once */
+#define INPUT_CHUNK_MAX (1 << 30)
 
 #define XML_DTD
 void comps_parse_check_attributes(COMPS_Parsed *parsed, COMPS_Elem* elem);
@@ -59,9 +80,13 @@ unsigned comps_parse_parsed_init(COMPS_Parsed * parsed, const char * encoding,
 
     parsed->enc = encoding;
     parsed->elem_stack = comps_hslist_create();
-    parsed->text_buffer = comps_hslist_create();
+    parsed->text_buffer = NULL;
     parsed->text_buffer_len = 0;
-    parsed->text_buffer_pt = NULL;
+    parsed->text_buffer_size = 0;
+    parsed->text_first_len = 0;
+    parsed->text_ws_len = 0;
+    parsed->text_line = 0;
+    parsed->skip_depth = 0;
     parsed->tmp_buffer = NULL;
     parsed->log = COMPS_OBJECT_CREATE(COMPS_Log, NULL);
     parsed->log->std_out = log_stdout;
@@ -70,17 +95,16 @@ unsigned comps_parse_parsed_init(COMPS_Parsed * parsed, const char * encoding,
     parsed->doctype_sysid = NULL;
     parsed->doctype_pubid = NULL;
     parsed->fatal_error = 0;
-    if (parsed->elem_stack == NULL || parsed->text_buffer == NULL) {
-        if (!parsed->elem_stack)
-            comps_hslist_destroy(&parsed->elem_stack);
-        if (!parsed->text_buffer)
-            comps_hslist_destroy(&parsed->text_buffer);
+    parsed->def_options = &COMPS_DDefaultsOptions;
+    parsed->obj_handler = NULL;
+    parsed->obj_handler_data = NULL;
+    parsed->arena = NULL;
+    if (parsed->elem_stack == NULL) {
         COMPS_OBJECT_DESTROY(parsed->log);
         free(parsed);
         return 0;
     }
     comps_hslist_init(parsed->elem_stack, NULL, NULL, &comps_elem_destroy);
-    comps_hslist_init(parsed->text_buffer, NULL, NULL, &free);
     XML_SetUserData(parsed->parser, parsed);
     return 1;
 }
@@ -97,7 +121,11 @@ void comps_parse_parsed_reinit(COMPS_Parsed *parsed) {
 
     XML_SetUserData(parsed->parser, parsed);
     comps_hslist_clear(parsed->elem_stack);
-    comps_hslist_clear(parsed->text_buffer);
+    parsed->text_buffer_len = 0;
+    parsed->text_first_len = 0;
+    parsed->text_ws_len = 0;
+    parsed->text_line = 0;
+    parsed->skip_depth = 0;
     comps_hslist_clear(parsed->log->entries);
     COMPS_OBJECT_DESTROY(parsed->comps_doc);
     COMPS_OBJECT_DESTROY(parsed->doctype_name);
@@ -106,17 +134,21 @@ void comps_parse_parsed_reinit(COMPS_Parsed *parsed) {
     parsed->doctype_name = NULL;
     parsed->doctype_sysid = NULL;
     parsed->doctype_pubid = NULL;
+    /* objects of previous document keep their arena alive */
+    comps_arena_destroy(parsed->arena);
+    parsed->arena = NULL;
 }
 
 void comps_parse_parsed_destroy(COMPS_Parsed *parsed) {
     comps_hslist_destroy(&parsed->elem_stack);
-    comps_hslist_destroy(&parsed->text_buffer);
+    free(parsed->text_buffer);
     COMPS_OBJECT_DESTROY(parsed->log);
     COMPS_OBJECT_DESTROY(parsed->comps_doc);
     COMPS_OBJECT_DESTROY(parsed->doctype_name);
     COMPS_OBJECT_DESTROY(parsed->doctype_sysid);
     COMPS_OBJECT_DESTROY(parsed->doctype_pubid);
     XML_ParserFree(parsed->parser);
+    comps_arena_destroy(parsed->arena);
     free(parsed);
 }
 
@@ -200,10 +232,343 @@ void __comps_after_parse(COMPS_Parsed *parsed) {
     }
 }
 
+static void __comps_parse_error(COMPS_Parsed *parsed) {
+    comps_log_error_x(parsed->log, COMPS_ERR_PARSER, 3,
+                      comps_num(XML_GetCurrentLineNumber(parsed->parser)),
+                      comps_num(XML_GetCurrentColumnNumber(parsed->parser)),
+                      comps_str(XML_ErrorString(
+                                XML_GetErrorCode(parsed->parser))));
+    parsed->fatal_error = 1;
+}
+
+/* Parse memory block. Expat parses final input directly from passed memory,
+ * so data isn't copied to parser internal buffer. Blocks longer than INT_MAX
+ * are passed in more calls */
+static void __comps_parse_block(COMPS_Parsed *parsed, const char *data,
+                                size_t len, int final) {
+    int chunk;
+    do {
+        chunk = (len > INT_MAX) ? INT_MAX : (int)len;
+        if (!XML_Parse(parsed->parser, data, chunk,
+                       final && (size_t)chunk == len)) {
+            __comps_parse_error(parsed);
+            return;
+        }
+        data += chunk;
+        len -= chunk;
+    } while (len);
+}
+
+/* Parser input. Either memory block (mapped file, string) or stream which is
+ * read by BUFF_SIZE chunks. data and len hold input not consumed yet */
+typedef struct {
+    FILE *f;
+    const char *data;
+    size_t len;
+    char *buff;
+} __COMPS_ParseInput;
+
+typedef enum {
+    __COMPS_INPUT_PLAIN,
+    __COMPS_INPUT_GZ,
+    __COMPS_INPUT_XZ,
+    __COMPS_INPUT_ZSTD
+} __COMPS_InputFormat;
+
+/* Return next chunk of input and mark it as consumed. Zero is returned at
+ * end of input */
+static size_t __comps_input_next(__COMPS_ParseInput *in, const char **data) {
+    size_t len;
+    if (!in->len && in->f) {
+        in->len = fread(in->buff, sizeof(char), BUFF_SIZE, in->f);
+        in->data = in->buff;
+    }
+    len = (in->len > INPUT_CHUNK_MAX) ? INPUT_CHUNK_MAX : in->len;
+    *data = in->data;
+    in->data += len;
+    in->len -= len;
+    return len;
+}
+
+static __COMPS_InputFormat __comps_input_format(__COMPS_ParseInput *in) {
+    const unsigned char *d;
+    if (!in->len && in->f) {
+        in->len = fread(in->buff, sizeof(char), BUFF_SIZE, in->f);
+        in->data = in->buff;
+    }
+    d = (const unsigned char*)in->data;
+    if (in->len >= 2 && d[0] == 0x1f && d[1] == 0x8b)
+        return __COMPS_INPUT_GZ;
+    if (in->len >= 6 && memcmp(d, "\xfd" "7zXZ\0", 6) == 0)
+        return __COMPS_INPUT_XZ;
+    if (in->len >= 4 && memcmp(d, "\x28\xb5\x2f\xfd", 4) == 0)
+        return __COMPS_INPUT_ZSTD;
+    return __COMPS_INPUT_PLAIN;
+}
+
+static void __comps_decompress_error(COMPS_Parsed *parsed, const char *format,
+                                     const char *msg) {
+    comps_log_error_x(parsed->log, COMPS_ERR_DECOMPRESS, 2,
+                      comps_str(format), comps_str(msg));
+    parsed->fatal_error = 1;
+}
+
+/* Decompressors write output directly to parser buffer and parse it.
+ * Memory usage is bounded by BUFF_SIZE no matter how large input is */
+static char* __comps_parse_getbuff(COMPS_Parsed *parsed) {
+    char *buff = XML_GetBuffer(parsed->parser, BUFF_SIZE);
+    if (buff == NULL) {
+        comps_log_error(parsed->log, COMPS_ERR_MALLOC, 0);
+        parsed->fatal_error = 1;
+    }
+    return buff;
+}
+
+static int __comps_parse_buff(COMPS_Parsed *parsed, size_t len, int final) {
+    if (!XML_ParseBuffer(parsed->parser, (int)len, final)) {
+        __comps_parse_error(parsed);
+        return 0;
+    }
+    return 1;
+}
+
+static void __comps_parse_plain(COMPS_Parsed *parsed, __COMPS_ParseInput *in) {
+    const char *data;
+    char *buff;
+    size_t len;
+
+    if (!in->f) {
+        __comps_parse_block(parsed, in->data, in->len, 1);
+        return;
+    }
+    /* chunk read during format detection */
+    len = __comps_input_next(in, &data);
+    if (len && !XML_Parse(parsed->parser, data, (int)len, 0)) {
+        __comps_parse_error(parsed);
+        return;
+    }
+    do {
+        if (!(buff = __comps_parse_getbuff(parsed)))
+            return;
+        len = fread(buff, sizeof(char), BUFF_SIZE, in->f);
+        if (ferror(in->f))
+            comps_log_error(parsed->log, COMPS_ERR_READFD, 0);
+    } while (__comps_parse_buff(parsed, len, len == 0) && len);
+}
+
+#ifdef COMPS_WITH_ZLIB
+static void __comps_parse_gz(COMPS_Parsed *parsed, __COMPS_ParseInput *in) {
+    z_stream zs;
+    const char *data;
+    char *buff;
+    int ret = Z_OK, full = 0;
+
+    memset(&zs, 0, sizeof(zs));
+    /* 16 + MAX_WBITS accepts gzip header only */
+    if (inflateInit2(&zs, 16 + MAX_WBITS) != Z_OK) {
+        __comps_decompress_error(parsed, "gzip", "initialization failed");
+        return;
+    }
+    for (;;) {
+        if (!zs.avail_in && !full) {
+            zs.avail_in = __comps_input_next(in, &data);
+            zs.next_in = (Bytef*)data;
+            if (!zs.avail_in)
+                break;
+        }
+        if (ret == Z_STREAM_END) /* concatenated gzip members */
+            inflateReset(&zs);
+        if (!(buff = __comps_parse_getbuff(parsed)))
+            goto out;
+        zs.next_out = (Bytef*)buff;
+        zs.avail_out = BUFF_SIZE;
+        ret = inflate(&zs, Z_NO_FLUSH);
+        if (ret != Z_OK && ret != Z_STREAM_END && ret != Z_BUF_ERROR) {
+            __comps_decompress_error(parsed, "gzip",
+                                     zs.msg ? zs.msg : "corrupted data");
+            goto out;
+        }
+        /* whole output of finished member fits buffer, nothing pending */
+        full = (ret != Z_STREAM_END && zs.avail_out == 0);
+        if (!__comps_parse_buff(parsed, BUFF_SIZE - zs.avail_out, 0))
+            goto out;
+    }
+    if (ret == Z_STREAM_END)
+        __comps_parse_buff(parsed, 0, 1);
+    else
+        __comps_decompress_error(parsed, "gzip", "unexpected end of input");
+    out:
+    inflateEnd(&zs);
+}
+#endif
+
+#ifdef COMPS_WITH_LZMA
+static void __comps_parse_xz(COMPS_Parsed *parsed, __COMPS_ParseInput *in) {
+    lzma_stream xs = LZMA_STREAM_INIT;
+    lzma_action action = LZMA_RUN;
+    lzma_ret ret;
+    const char *data;
+    char *buff;
+
+    if (lzma_stream_decoder(&xs, UINT64_MAX, LZMA_CONCATENATED) != LZMA_OK) {
+        __comps_decompress_error(parsed, "xz", "initialization failed");
+        return;
+    }
+    for (;;) {
+        if (!xs.avail_in && action == LZMA_RUN) {
+            xs.avail_in = __comps_input_next(in, &data);
+            xs.next_in = (const uint8_t*)data;
+            if (!xs.avail_in)
+                action = LZMA_FINISH;
+        }
+        if (!(buff = __comps_parse_getbuff(parsed)))
+            break;
+        xs.next_out = (uint8_t*)buff;
+        xs.avail_out = BUFF_SIZE;
+        ret = lzma_code(&xs, action);
+        if (ret != LZMA_OK && ret != LZMA_STREAM_END) {
+            __comps_decompress_error(parsed, "xz",
+                                     (ret == LZMA_BUF_ERROR)
+                                     ? "unexpected end of input"
+                                     : "corrupted data");
+            break;
+        }
+        if (!__comps_parse_buff(parsed, BUFF_SIZE - xs.avail_out,
+                                ret == LZMA_STREAM_END))
+            break;
+        if (ret == LZMA_STREAM_END)
+            break;
+    }
+    lzma_end(&xs);
+}
+#endif
+
+#ifdef COMPS_WITH_ZSTD
+static void __comps_parse_zstd(COMPS_Parsed *parsed, __COMPS_ParseInput *in) {
+    ZSTD_DCtx *zs;
+    ZSTD_inBuffer zin = {NULL, 0, 0};
+    ZSTD_outBuffer zout;
+    size_t ret = 0;
+    int full = 0;
+    const char *data;
+    char *buff;
+
+    if (!(zs = ZSTD_createDCtx())) {
+        __comps_decompress_error(parsed, "zstd", "initialization failed");
+        return;
+    }
+    for (;;) {
+        if (zin.pos == zin.size && !full) {
+            zin.size = __comps_input_next(in, &data);
+            zin.src = data;
+            zin.pos = 0;
+            if (!zin.size)
+                break;
+        }
+        if (!(buff = __comps_parse_getbuff(parsed)))
+            goto out;
+        zout.dst = buff;
+        zout.size = BUFF_SIZE;
+        zout.pos = 0;
+        /* zero return value means frame is complete */
+        ret = ZSTD_decompressStream(zs, &zout, &zin);
+        if (ZSTD_isError(ret)) {
+            __comps_decompress_error(parsed, "zstd", ZSTD_getErrorName(ret));
+            goto out;
+        }
+        full = (zout.pos == zout.size);
+        if (!__comps_parse_buff(parsed, zout.pos, 0))
+            goto out;
+    }
+    if (ret == 0)
+        __comps_parse_buff(parsed, 0, 1);
+    else
+        __comps_decompress_error(parsed, "zstd", "unexpected end of input");
+    out:
+    ZSTD_freeDCtx(zs);
+}
+#endif
+
+/* Detect compression of input by magic bytes and parse (decompressed) input */
+static void __comps_parse_input(COMPS_Parsed *parsed, __COMPS_ParseInput *in) {
+    switch (__comps_input_format(in)) {
+        case __COMPS_INPUT_GZ:
+        #ifdef COMPS_WITH_ZLIB
+            __comps_parse_gz(parsed, in);
+        #else
+            __comps_decompress_error(parsed, "gzip", "support not compiled in");
+        #endif
+        break;
+        case __COMPS_INPUT_XZ:
+        #ifdef COMPS_WITH_LZMA
+            __comps_parse_xz(parsed, in);
+        #else
+            __comps_decompress_error(parsed, "xz", "support not compiled in");
+        #endif
+        break;
+        case __COMPS_INPUT_ZSTD:
+        #ifdef COMPS_WITH_ZSTD
+            __comps_parse_zstd(parsed, in);
+        #else
+            __comps_decompress_error(parsed, "zstd", "support not compiled in");
+        #endif
+        break;
+        default:
+            __comps_parse_plain(parsed, in);
+    }
+}
+
+/* Map rest of regular file to memory. Return NULL if file can't be mapped
+ * (pipe, empty file...) */
+static void* __comps_map_file(FILE *f, size_t *map_len, size_t *offset) {
+    struct stat st;
+    long pos;
+    void *map;
+    int fd;
+
+    fd = fileno(f);
+    if (fd < 0 || fstat(fd, &st) != 0 || !S_ISREG(st.st_mode)
+        || st.st_size == 0 || (uintmax_t)st.st_size > SIZE_MAX)
+        return NULL;
+    /* respect data already consumed from stream */
+    pos = ftell(f);
+    if (pos < 0 || pos > st.st_size)
+        return NULL;
+    map = mmap(NULL, (size_t)st.st_size, PROT_READ, MAP_PRIVATE, fd, 0);
+    if (map == MAP_FAILED)
+        return NULL;
+    posix_madvise(map, (size_t)st.st_size, POSIX_MADV_SEQUENTIAL);
+    *map_len = (size_t)st.st_size;
+    *offset = (size_t)pos;
+    return map;
+}
+
+/* Make arena of parsed current, so parsed objects are allocated from it.
+ * Arena is created with first parsed data if options ask for it. Return
+ * previously current arena */
+static COMPS_Arena* __comps_parse_arena_enter(COMPS_Parsed *parsed) {
+    if (!parsed->def_options->arena)
+        return comps_arena_current();
+    if (!parsed->arena)
+        parsed->arena = comps_arena_create(COMPS_ARENA_BLOCK_SIZE);
+    return comps_arena_set_current(parsed->arena);
+}
+
+static signed char __comps_parse_ret(COMPS_Parsed *parsed) {
+    if (parsed->fatal_error == 0 && parsed->log->entries->first == NULL)
+        return 0;
+    else if (parsed->fatal_error != 1)
+        return 1;
+    else
+        return -1;
+}
+
 signed char comps_parse_file(COMPS_Parsed *parsed, FILE *f,
                              COMPS_DefaultsOptions *options) {
-    void *buff;
-    int bytes_read;
+    __COMPS_ParseInput in = {NULL, NULL, 0, NULL};
+    void *map;
+    size_t map_len, offset;
+    COMPS_Arena *arena;
 
     if (!f) {
         comps_log_error(parsed->log, COMPS_ERR_READFD, 0);
@@ -216,92 +581,228 @@ signed char comps_parse_file(COMPS_Parsed *parsed, FILE *f,
     else
         parsed->def_options = &COMPS_DDefaultsOptions;
 
-    for (;;) {
-        buff = XML_GetBuffer(parsed->parser, BUFF_SIZE);
-        if (buff == NULL) {
+    if ((map = __comps_map_file(f, &map_len, &offset)) != NULL) {
+        in.data = (char*)map + offset;
+        in.len = map_len - offset;
+    } else {
+        in.f = f;
+        in.buff = malloc(sizeof(char) * BUFF_SIZE);
+        if (!in.buff) {
             comps_log_error(parsed->log, COMPS_ERR_MALLOC, 0);
             raise(SIGABRT);
             return -1;
         }
-        bytes_read = fread(buff, sizeof(char), BUFF_SIZE, f);
-        if (bytes_read < 0)
-            comps_log_error(parsed->log, COMPS_ERR_READFD, 0);
-        if (!XML_ParseBuffer(parsed->parser, bytes_read, bytes_read == 0)) {
-            comps_log_error_x(parsed->log, COMPS_ERR_PARSER, 3,
-                          comps_num(XML_GetCurrentLineNumber(parsed->parser)),
-                          comps_num(XML_GetCurrentColumnNumber(parsed->parser)),
-                          comps_str(XML_ErrorString(
-                                    XML_GetErrorCode(parsed->parser))));
-            parsed->fatal_error = 1;
-        }
-        if (bytes_read == 0) break;
     }
+    arena = __comps_parse_arena_enter(parsed);
+    __comps_parse_input(parsed, &in);
+    if (map)
+        munmap(map, map_len);
+    free(in.buff);
     fclose(f);
     __comps_after_parse(parsed);
-
-    if (parsed->fatal_error == 0 && parsed->log->entries->first == NULL)
-        return 0;
-    else if (parsed->fatal_error != 1)
-        return 1;
-    else
-        return -1;
+    comps_arena_set_current(arena);
+    return __comps_parse_ret(parsed);
 }
 
 signed char comps_parse_str(COMPS_Parsed *parsed, char *str,
                             COMPS_DefaultsOptions *options) {
+    return comps_parse_str_n(parsed, str, strlen(str), options);
+}
+
+signed char comps_parse_str_n(COMPS_Parsed *parsed, const char *str,
+                              size_t len, COMPS_DefaultsOptions *options) {
+    __COMPS_ParseInput in = {NULL, str, len, NULL};
+    COMPS_Arena *arena;
+
     if (options)
         parsed->def_options = options;
     else
         parsed->def_options = &COMPS_DDefaultsOptions;
 
-    if (!XML_Parse(parsed->parser, str, strlen(str), 1)) {
-        comps_log_error_x(parsed->log, COMPS_ERR_PARSER, 3,
-                          comps_num(XML_GetCurrentLineNumber(parsed->parser)),
-                          comps_num(XML_GetCurrentColumnNumber(parsed->parser)),
-                          comps_str(XML_ErrorString(
-                                            XML_GetErrorCode(parsed->parser))));
-        parsed->fatal_error = 1;
-    }
+    arena = __comps_parse_arena_enter(parsed);
+    __comps_parse_input(parsed, &in);
     __comps_after_parse(parsed);
+    comps_arena_set_current(arena);
+    return __comps_parse_ret(parsed);
+}
 
-    if (parsed->fatal_error == 0 && parsed->log->entries->first == NULL)
-        return 0;
-    else if (parsed->fatal_error != 1)
-        return 1;
-    else
+signed char comps_parse_feed(COMPS_Parsed *parsed, const char *data,
+                             size_t len) {
+    COMPS_Arena *arena;
+
+    /* parser is stopped after fatal error */
+    if (parsed->fatal_error == 1)
         return -1;
+    if (len) {
+        arena = __comps_parse_arena_enter(parsed);
+        __comps_parse_block(parsed, data, len, 0);
+        comps_arena_set_current(arena);
+    }
+    return __comps_parse_ret(parsed);
+}
+
+signed char comps_parse_close(COMPS_Parsed *parsed) {
+    COMPS_Arena *arena;
+
+    arena = __comps_parse_arena_enter(parsed);
+    if (parsed->fatal_error != 1)
+        __comps_parse_block(parsed, NULL, 0, 1);
+    if (parsed->comps_doc)
+        __comps_after_parse(parsed);
+    comps_arena_set_current(arena);
+    return __comps_parse_ret(parsed);
+}
+
+/* Move parsed document (or empty one if there's none) with parser log out
+ * of parsed, so parsed can be used for next file */
+static COMPS_Doc* __comps_parse_take_doc(COMPS_Parsed *parsed) {
+    COMPS_Doc *doc;
+    COMPS_Object *enc;
+
+    if (parsed->comps_doc) {
+        doc = parsed->comps_doc;
+        parsed->comps_doc = NULL;
+    } else {
+        enc = (COMPS_Object*)comps_str("UTF-8");
+        doc = COMPS_OBJECT_CREATE(COMPS_Doc, (COMPS_Object*[]){enc});
+        COMPS_OBJECT_DESTROY(enc);
+    }
+    COMPS_OBJECT_DESTROY(doc->log);
+    doc->log = parsed->log;
+    parsed->log = COMPS_OBJECT_CREATE(COMPS_Log, NULL);
+    parsed->log->std_out = doc->log->std_out;
+    return doc;
+}
+
+typedef struct {
+    const char **paths;
+    size_t count;
+    size_t next; /* index of next file to parse, guarded by lock */
+    pthread_mutex_t lock;
+    COMPS_DefaultsOptions *options;
+    COMPS_Doc **docs;
+    signed char *rets;
+} __COMPS_ParseMany;
+
+static void* __comps_parse_many_worker(void *data) {
+    #define _many_ ((__COMPS_ParseMany*)data)
+    COMPS_Parsed *parsed;
+    size_t i;
+    signed char ret;
+
+    parsed = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed, "UTF-8", 0);
+    for (;;) {
+        pthread_mutex_lock(&_many_->lock);
+        i = _many_->next++;
+        pthread_mutex_unlock(&_many_->lock);
+        if (i >= _many_->count)
+            break;
+        ret = comps_parse_file(parsed, fopen(_many_->paths[i], "r"),
+                               _many_->options);
+        _many_->docs[i] = __comps_parse_take_doc(parsed);
+        if (_many_->rets)
+            _many_->rets[i] = ret;
+    }
+    comps_parse_parsed_destroy(parsed);
+    return NULL;
+    #undef _many_
+}
+
+COMPS_ObjList* comps_parse_many(const char **paths, size_t count,
+                                unsigned workers,
+                                COMPS_DefaultsOptions *options,
+                                signed char *rets) {
+    __COMPS_ParseMany many;
+    pthread_t *threads;
+    COMPS_ObjList *ret;
+    unsigned started;
+    size_t i;
+    long cpus;
+
+    if (workers == 0) {
+        cpus = sysconf(_SC_NPROCESSORS_ONLN);
+        workers = (cpus > 0) ? (unsigned)cpus : 1;
+    }
+    if (workers > count)
+        workers = (unsigned)count;
+
+    many.paths = paths;
+    many.count = count;
+    many.next = 0;
+    many.options = options;
+    many.rets = rets;
+    many.docs = malloc(sizeof(COMPS_Doc*) * (count ? count : 1));
+    threads = malloc(sizeof(pthread_t) * (workers ? workers : 1));
+    if (!many.docs || !threads) {
+        free(many.docs);
+        free(threads);
+        return NULL;
+    }
+    pthread_mutex_init(&many.lock, NULL);
+    for (started = 0; started < workers; started++) {
+        if (pthread_create(&threads[started], NULL,
+                           &__comps_parse_many_worker, &many))
+            break;
+    }
+    if (started == 0 && count) {
+        pthread_mutex_destroy(&many.lock);
+        free(many.docs);
+        free(threads);
+        return NULL;
+    }
+    for (i = 0; i < started; i++)
+        pthread_join(threads[i], NULL);
+    pthread_mutex_destroy(&many.lock);
+
+    ret = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+    for (i = 0; i < count; i++)
+        comps_objlist_append_x(ret, (COMPS_Object*)many.docs[i]);
+    free(many.docs);
+    free(threads);
+    return ret;
+}
+
+/* Pass finished group, category or environment to obj_handler and drop it
+ * from parsed document */
+static void __comps_parse_emit(COMPS_Parsed *parsed, COMPS_ElemType type) {
+    COMPS_ObjList *list;
+
+    switch (type) {
+        case COMPS_ELEM_GROUP:
+            list = comps_doc_groups(parsed->comps_doc);
+        break;
+        case COMPS_ELEM_CATEGORY:
+            list = comps_doc_categories(parsed->comps_doc);
+        break;
+        case COMPS_ELEM_ENV:
+            list = comps_doc_environments(parsed->comps_doc);
+        break;
+        default:
+            return;
+    }
+    if (list && list->last) {
+        parsed->obj_handler(list->last->comps_obj, parsed->obj_handler_data);
+        comps_objlist_remove_at(list, list->len - 1);
+    }
+    COMPS_OBJECT_DESTROY(list);
 }
 
 void comps_parse_end_elem_handler(void *userData, const XML_Char *s) {
-    //COMPS_ListItem * item;
-    char * alltext = NULL;
-    //size_t item_len;
-    //int index=0;
     void *data;
     #define parser_line XML_GetCurrentLineNumber(((COMPS_Parsed*)userData)->parser)
     #define parser_col XML_GetCurrentColumnNumber(((COMPS_Parsed*)userData)->parser)
     #define parsed ((COMPS_Parsed*)userData)
     #define last_elem ((COMPS_Elem*)parsed->elem_stack->last->data)
 
+    parsed->text_ws_len = 0;
+    parsed->text_line = 0;
     /* check if there's some text in recent element - are we interested in?*/
     if (parsed->text_buffer_len) {
-        alltext = malloc(sizeof(char)*(parsed->text_buffer_len + 1));
-        if (alltext == NULL) {
-            comps_log_error(parsed->log, COMPS_ERR_MALLOC, 0);
-            raise(SIGABRT);
-        }
-        alltext[0]=0;
-    }
-    while ((data = comps_hslist_shift(parsed->text_buffer)) != NULL) {
-        //item_len = strlen((char*)data);
-        alltext = strcat(alltext, data);
-        free(data);
-        //index += item_len;
-    }
-    /* set zero char at the end of string */
-    if (alltext)
-        memset(alltext+parsed->text_buffer_len, 0, sizeof(char));
-    parsed->tmp_buffer = alltext;
+        parsed->text_buffer[parsed->text_buffer_len] = 0;
+        parsed->tmp_buffer = parsed->text_buffer;
+    } else
+        parsed->tmp_buffer = NULL;
 
     /* start postprocess for currently processed elements */
     if (comps_elem_get_type(s) == last_elem->type) {
@@ -309,6 +810,8 @@ void comps_parse_end_elem_handler(void *userData, const XML_Char *s) {
             COMPS_ElemInfos[last_elem->type]->postproc((COMPS_Parsed*)userData,
                                                        last_elem);
         }
+        if (last_elem->valid && parsed->obj_handler)
+            __comps_parse_emit(parsed, last_elem->type);
         if (last_elem->valid && parsed->tmp_buffer) {
             comps_log_error_x(parsed->log, COMPS_ERR_TEXT_BETWEEN, 3,
                               comps_str(parsed->tmp_buffer), comps_num(parser_line),
@@ -318,8 +821,9 @@ void comps_parse_end_elem_handler(void *userData, const XML_Char *s) {
         data = comps_hslist_pop(parsed->elem_stack);
         comps_elem_destroy(data);
     }
-    free(alltext);
+    parsed->tmp_buffer = NULL;
     parsed->text_buffer_len = 0;
+    parsed->text_first_len = 0;
     #undef parsed
     #undef parser_line
     #undef parser_col
@@ -331,6 +835,47 @@ void comps_parse_def_handler(void *userData, const XML_Char *s, int len) {
     (void) len;
 }
 
+/* Handlers for skipped section. Only depth of nested elements is tracked */
+static void __comps_parse_skip_start(void *userData, const XML_Char *s,
+                                     const XML_Char **attrs) {
+    (void)s;
+    (void)attrs;
+    ((COMPS_Parsed*)userData)->skip_depth++;
+}
+
+static void __comps_parse_skip_end(void *userData, const XML_Char *s) {
+    #define parsed ((COMPS_Parsed*)userData)
+    (void)s;
+    if (--parsed->skip_depth == 0) {
+        XML_SetElementHandler(parsed->parser, &comps_parse_start_elem_handler,
+                                              &comps_parse_end_elem_handler);
+        XML_SetCharacterDataHandler(parsed->parser,
+                                    &comps_parse_char_data_handler);
+    }
+    #undef parsed
+}
+
+/* Return non-zero if element starts section which should be skipped */
+static int __comps_parse_skipped(COMPS_Parsed *parsed, COMPS_ElemType type) {
+    COMPS_Elem *parent;
+    int section;
+
+    if (!parsed->def_options->skip_sections || !parsed->elem_stack->last)
+        return 0;
+    switch (type) {
+        case COMPS_ELEM_GROUP: section = COMPS_SECTION_GROUPS; break;
+        case COMPS_ELEM_CATEGORY: section = COMPS_SECTION_CATEGORIES; break;
+        case COMPS_ELEM_ENV: section = COMPS_SECTION_ENVIRONMENTS; break;
+        case COMPS_ELEM_LANGPACKS: section = COMPS_SECTION_LANGPACKS; break;
+        case COMPS_ELEM_BLACKLIST: section = COMPS_SECTION_BLACKLIST; break;
+        case COMPS_ELEM_WHITEOUT: section = COMPS_SECTION_WHITEOUT; break;
+        default: return 0;
+    }
+    parent = (COMPS_Elem*)parsed->elem_stack->last->data;
+    return (parsed->def_options->skip_sections & section)
+           && parent->type == COMPS_ELEM_DOC && parent->valid;
+}
+
 void comps_parse_start_elem_handler(void *userData,
                               const XML_Char *s,
                               const XML_Char **attrs) {
@@ -343,8 +888,19 @@ void comps_parse_start_elem_handler(void *userData,
     COMPS_Elem * elem = NULL;
     COMPS_ElemType type;
 
-    /* create new element */
     type = comps_elem_get_type(s);
+    /* consume skipped section without any processing */
+    if (__comps_parse_skipped((COMPS_Parsed*)userData, type)) {
+        ((COMPS_Parsed*)userData)->text_ws_len = 0;
+        ((COMPS_Parsed*)userData)->text_line = 0;
+        ((COMPS_Parsed*)userData)->skip_depth = 1;
+        XML_SetElementHandler(((COMPS_Parsed*)userData)->parser,
+                              &__comps_parse_skip_start,
+                              &__comps_parse_skip_end);
+        XML_SetCharacterDataHandler(((COMPS_Parsed*)userData)->parser, NULL);
+        return;
+    }
+    /* create new element */
     elem = comps_elem_create(s, attrs, type);
     if (elem == NULL) {
         comps_log_error_x(((COMPS_Parsed*)userData)->log, COMPS_ERR_MALLOC, 0);
@@ -375,14 +931,18 @@ void comps_parse_start_elem_handler(void *userData,
                           comps_num(parser_line),
                           comps_num(parser_col));
     }
-    if (((COMPS_Parsed*)userData)->text_buffer->first) {
+    ((COMPS_Parsed*)userData)->text_ws_len = 0;
+    ((COMPS_Parsed*)userData)->text_line = 0;
+    if (((COMPS_Parsed*)userData)->text_buffer_len) {
+        /* report first piece of text only */
+        ((COMPS_Parsed*)userData)->text_buffer[
+                            ((COMPS_Parsed*)userData)->text_first_len] = 0;
         comps_log_error_x(((COMPS_Parsed*)userData)->log,
                           COMPS_ERR_TEXT_BETWEEN, 3,
-                          comps_str((char*)((COMPS_Parsed*)userData)
-                                         ->text_buffer->first->data),
+                          comps_str(((COMPS_Parsed*)userData)->text_buffer),
                           comps_num(parser_line), comps_num(parser_col));
-        comps_hslist_clear(((COMPS_Parsed*)userData)->text_buffer);
         ((COMPS_Parsed*)userData)->text_buffer_len = 0;
+        ((COMPS_Parsed*)userData)->text_first_len = 0;
     }
 
     /* end append it to element stack */
@@ -407,32 +967,57 @@ void comps_parse_start_elem_handler(void *userData,
 }
 
 
+/* Make room for len more bytes of text and terminating zero in text buffer */
+static int __comps_parse_text_reserve(COMPS_Parsed *parsed, size_t len) {
+    size_t need, size;
+    char *buff;
+
+    need = parsed->text_buffer_len + parsed->text_ws_len + len + 1;
+    if (need <= parsed->text_buffer_size)
+        return 1;
+    for (size = parsed->text_buffer_size ? parsed->text_buffer_size : 256;
+         size < need; size *= 2);
+    if ((buff = realloc(parsed->text_buffer, size)) == NULL) {
+        comps_log_error(parsed->log, COMPS_ERR_MALLOC, 0);
+        raise(SIGABRT);
+        return 0;
+    }
+    parsed->text_buffer = buff;
+    parsed->text_buffer_size = size;
+    return 1;
+}
+
 void comps_parse_char_data_handler(void *userData,
                             const XML_Char *s,
                             int len) {
 
-    char * c = NULL;
-    //COMPS_ListItem * it;
+    #define parsed ((COMPS_Parsed*)userData)
 
-    /* skip whitespace data */
-    if (__comps_is_whitespace_only(s, len)) {
+    /* skip whitespace-only lines. Expat passes newlines separately, but text
+     * of line can be split to more calls at input chunk boundaries, so
+     * leading whitespace of line is kept aside until rest of the line shows
+     * up */
+    if (len == 1 && s[0] == '\n') {
+        parsed->text_ws_len = 0;
+        parsed->text_line = 0;
         return;
     }
-    if ((c = malloc(sizeof(char) * (len+1))) == NULL) {
-        comps_log_error(((COMPS_Parsed*)userData)->log, COMPS_ERR_MALLOC, 0);
-        raise(SIGABRT);
+    if (!__comps_parse_text_reserve(parsed, len))
+        return;
+    /* copy text data behind whitespace kept aside */
+    memcpy(parsed->text_buffer + parsed->text_buffer_len + parsed->text_ws_len,
+           s, sizeof(char) * len);
+    if (!parsed->text_line && __comps_is_whitespace_only(s, len)) {
+        parsed->text_ws_len += len;
         return;
     }
-
-    /* copy text data of element to temporal string and append it to text_buffer
-       list*/
-    memcpy(c, s, sizeof(char) * len);
-    memset(c+len, 0, sizeof(char));
-    /* and increment total lenght of strings in text_buffer */
-    ((COMPS_Parsed*)userData)->text_buffer_len += len;
-
-    comps_hslist_append(((COMPS_Parsed*)userData)->text_buffer, c, 0);
-
+    parsed->text_line = 1;
+    if (!parsed->text_buffer_len)
+        parsed->text_first_len = parsed->text_ws_len ? parsed->text_ws_len
+                                                      : (size_t)len;
+    parsed->text_buffer_len += parsed->text_ws_len + len;
+    parsed->text_ws_len = 0;
+    #undef parsed
 }
 
 void comps_parse_check_attributes(COMPS_Parsed *parsed, COMPS_Elem* elem) {
@@ -440,36 +1025,23 @@ void comps_parse_check_attributes(COMPS_Parsed *parsed, COMPS_Elem* elem) {
     #define parser_col XML_GetCurrentColumnNumber(parsed->parser)
     const COMPS_ElemInfo *info;
     info = COMPS_ElemInfos[elem->type];
-    int attr_count;
-    COMPS_HSList *keys;
-    char *val;
-    COMPS_HSListItem *it;
-
-    for (attr_count = 0; info->attributes[attr_count] != NULL; attr_count++);
-    keys = comps_dict_keys(elem->attrs);
-    for (int x =0; x<attr_count; x++) {
-        for (it = keys->first; it != NULL; it = it->next) {
-            if (strcmp((char*)it->data, info->attributes[x]->name) == 0) {
-                if (info->attributes[x]->val_check) {
-                    val = comps_dict_get(elem->attrs, it->data);
-                    if (!info->attributes[x]->val_check(val)) {
-                        ///error
-                    }
-                    
-                }
-                comps_hslist_remove(keys, it);
-                keys->data_destructor(it->data);
-                free(it);
+    int x;
+
+    for (char **attr = elem->attrs; *attr != NULL; attr += 2) {
+        for (x = 0; info->attributes[x] != NULL; x++) {
+            if (strcmp(*attr, info->attributes[x]->name) == 0)
                 break;
+        }
+        if (!info->attributes[x]) {
+            comps_log_warning_x(parsed->log, COMPS_ERR_ATTR_UNKNOWN, 4,
+                                comps_str(*attr), comps_str(info->name),
+                                comps_num(parser_line), comps_num(parser_col));
+        } else if (info->attributes[x]->val_check) {
+            if (!info->attributes[x]->val_check(*(attr + 1))) {
+                ///error
             }
         }
     }
-    for (it = keys->first; it != NULL; it = it->next) {
-        comps_log_warning_x(parsed->log, COMPS_ERR_ATTR_UNKNOWN, 4,
-                            comps_str(it->data), comps_str(info->name),
-                            comps_num(parser_line), comps_num(parser_col));
-    }
-    comps_hslist_destroy(&keys);
     #undef parser_line
     #undef parser_col
 }
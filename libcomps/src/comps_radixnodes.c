@@ -0,0 +1,150 @@
+/* libcomps - C alternative to yum.comps library
+ * Copyright (C) 2013 Jindrich Luza
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * any later version.
+ *
+ * This program is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to  Free Software
+ * Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301,
+ * USA
+ */
+
+#include "comps_radixnodes.h"
+
+#include <stdlib.h>
+#include <string.h>
+
+#define __COMPS_RADIXNODES_BYTES(size) ((size) * (sizeof(void*) + 1))
+
+void comps_radixnodes_init(COMPS_RadixNodes *rn) {
+    rn->nodes = NULL;
+    rn->index = NULL;
+    rn->len = 0;
+    rn->size = 0;
+}
+
+void comps_radixnodes_clear(COMPS_RadixNodes *rn, void (*destructor)(void*)) {
+    unsigned x;
+    if (destructor) {
+        for (x = 0; x < rn->len; x++)
+            destructor(rn->nodes[x]);
+    }
+    free(rn->nodes);
+    free(rn->index);
+    comps_radixnodes_init(rn);
+}
+
+static void __comps_radixnodes_reindex(COMPS_RadixNodes *rn, unsigned from) {
+    char *keys = COMPS_RADIXNODES_KEYS(rn);
+    for (; from < rn->len; from++)
+        rn->index[(unsigned char)keys[from]] = from + 1;
+}
+
+int comps_radixnodes_find(const COMPS_RadixNodes *rn, char c) {
+    const char *keys;
+    unsigned x;
+
+    if (rn->index)
+        return (int)rn->index[(unsigned char)c] - 1;
+    keys = COMPS_RADIXNODES_KEYS(rn);
+    for (x = 0; x < rn->len; x++) {
+        if (keys[x] == c)
+            return x;
+    }
+    return -1;
+}
+
+unsigned comps_radixnodes_lower(const COMPS_RadixNodes *rn, char c) {
+    const char *keys = COMPS_RADIXNODES_KEYS(rn);
+    unsigned lo = 0, hi = rn->len, mid;
+
+    while (lo < hi) {
+        mid = (lo + hi) / 2;
+        if (keys[mid] < c)
+            lo = mid + 1;
+        else
+            hi = mid;
+    }
+    return lo;
+}
+
+int comps_radixnodes_insert(COMPS_RadixNodes *rn, unsigned pos, char c,
+                            void *node) {
+    void **nodes;
+    char *keys;
+    unsigned size;
+
+    if (rn->len == rn->size) {
+        size = rn->size ? rn->size * 2 : 1;
+        nodes = realloc(rn->nodes, __COMPS_RADIXNODES_BYTES(size));
+        if (!nodes)
+            return -1;
+        /* move keys behind enlarged nodes array */
+        memmove(nodes + size, nodes + rn->size, rn->len);
+        rn->nodes = nodes;
+        rn->size = size;
+    }
+    keys = COMPS_RADIXNODES_KEYS(rn);
+    memmove(rn->nodes + pos + 1, rn->nodes + pos,
+            sizeof(void*) * (rn->len - pos));
+    memmove(keys + pos + 1, keys + pos, rn->len - pos);
+    rn->nodes[pos] = node;
+    keys[pos] = c;
+    rn->len++;
+
+    if (rn->index) {
+        __comps_radixnodes_reindex(rn, pos);
+    } else if (rn->len > COMPS_RADIXNODES_INDEX_MIN) {
+        if ((rn->index = calloc(256, sizeof(unsigned char))) != NULL)
+            __comps_radixnodes_reindex(rn, 0);
+    }
+    return 0;
+}
+
+void comps_radixnodes_remove(COMPS_RadixNodes *rn, unsigned pos) {
+    char *keys = COMPS_RADIXNODES_KEYS(rn);
+
+    if (rn->index)
+        rn->index[(unsigned char)keys[pos]] = 0;
+    rn->len--;
+    memmove(rn->nodes + pos, rn->nodes + pos + 1,
+            sizeof(void*) * (rn->len - pos));
+    memmove(keys + pos, keys + pos + 1, rn->len - pos);
+
+    if (rn->len == 0) {
+        comps_radixnodes_clear(rn, NULL);
+    } else if (rn->index && rn->len <= COMPS_RADIXNODES_INDEX_MIN) {
+        free(rn->index);
+        rn->index = NULL;
+    } else if (rn->index) {
+        __comps_radixnodes_reindex(rn, pos);
+    }
+}
+
+int comps_radixnodes_copy(COMPS_RadixNodes *dst, const COMPS_RadixNodes *src) {
+    comps_radixnodes_init(dst);
+    if (src->len == 0)
+        return 0;
+    if ((dst->nodes = malloc(__COMPS_RADIXNODES_BYTES(src->len))) == NULL)
+        return -1;
+    if (src->index) {
+        if ((dst->index = malloc(sizeof(unsigned char) * 256)) == NULL) {
+            free(dst->nodes);
+            dst->nodes = NULL;
+            return -1;
+        }
+        memcpy(dst->index, src->index, sizeof(unsigned char) * 256);
+    }
+    dst->len = dst->size = src->len;
+    memcpy(dst->nodes, src->nodes, sizeof(void*) * src->len);
+    memcpy(COMPS_RADIXNODES_KEYS(dst), COMPS_RADIXNODES_KEYS(src), src->len);
+    return 0;
+}
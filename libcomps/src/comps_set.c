@@ -32,6 +32,8 @@ void* comps_set_index_clone(void *item) {
     return ret;
 }
 
+#define COMPS_SET_INIT_SIZE 16
+
 COMPS_Set * comps_set_create()
 {
     COMPS_Set *ret;
@@ -43,16 +45,83 @@ COMPS_Set * comps_set_create()
         free(ret);
         return NULL;
     }
+    ret->hashf = NULL;
+    ret->table = NULL;
+    ret->table_size = 0;
+    ret->count = 0;
     return ret;
 }
 
+static void __comps_set_table_free(COMPS_Set *set) {
+    COMPS_SetEntry *entry, *next;
+    unsigned int x;
+    if (!set->table) return;
+    for (x = 0; x < set->table_size; x++) {
+        for (entry = set->table[x]; entry != NULL; entry = next) {
+            next = entry->next;
+            free(entry);
+        }
+    }
+    free(set->table);
+    set->table = NULL;
+    set->table_size = 0;
+    set->count = 0;
+}
+
+static char __comps_set_table_grow(COMPS_Set *set) {
+    COMPS_SetEntry **table, *entry, *next;
+    unsigned int x, size;
+
+    size = set->table_size ? set->table_size * 2 : COMPS_SET_INIT_SIZE;
+    if ((table = calloc(size, sizeof(COMPS_SetEntry*))) == NULL)
+        return 0;
+    for (x = 0; x < set->table_size; x++) {
+        for (entry = set->table[x]; entry != NULL; entry = next) {
+            next = entry->next;
+            entry->next = table[entry->hash & (size - 1)];
+            table[entry->hash & (size - 1)] = entry;
+        }
+    }
+    free(set->table);
+    set->table = table;
+    set->table_size = size;
+    return 1;
+}
+
+static COMPS_SetEntry* __comps_set_lookup(COMPS_Set *set, void *item,
+                                          unsigned int hash) {
+    COMPS_SetEntry *entry;
+    if (!set->table) return NULL;
+    for (entry = set->table[hash & (set->table_size - 1)]; entry != NULL;
+         entry = entry->next) {
+        if (entry->hash == hash && set->eqf(entry->item->data, item))
+            return entry;
+    }
+    return NULL;
+}
+
+/* find entry owning list item. Used for fixing prev pointers after removal */
+static COMPS_SetEntry* __comps_set_item_entry(COMPS_Set *set,
+                                              COMPS_HSListItem *item) {
+    COMPS_SetEntry *entry;
+    unsigned int hash = set->hashf(item->data);
+    for (entry = set->table[hash & (set->table_size - 1)]; entry != NULL;
+         entry = entry->next) {
+        if (entry->item == item)
+            return entry;
+    }
+    return NULL;
+}
+
 void comps_set_destroy(COMPS_Set **set) {
+    __comps_set_table_free(*set);
     comps_hslist_destroy(&(*set)->data);
     free(*set);
     *set = NULL;
 }
 
 inline void comps_set_destroy_v(void *set) {
+    __comps_set_table_free((COMPS_Set*)set);
     comps_hslist_destroy(&((COMPS_Set*)set)->data);
     free((COMPS_Set*)set);
 }
@@ -67,11 +136,26 @@ void comps_set_init(COMPS_Set * set, void* (*data_constructor)(void*),
     set->data_destructor = data_destructor;
     set->data_cloner = data_cloner;
     set->eqf = eqf;
+    set->hashf = NULL;
+    __comps_set_table_free(set);
     comps_hslist_init(set->data, data_constructor, data_cloner, data_destructor);
 }
 
+void comps_set_init_hashed(COMPS_Set * set, void* (*data_constructor)(void*),
+                                            void* (*data_cloner)(void*),
+                                            void (*data_destructor)(void*),
+                                            char (*eqf)(void*, void*),
+                                            unsigned int (*hashf)(void*)) {
+    if (set == NULL)
+        return;
+    comps_set_init(set, data_constructor, data_cloner, data_destructor, eqf);
+    set->hashf = hashf;
+}
+
 char comps_set_in(COMPS_Set * set, void * item) {
     COMPS_HSListItem * it;
+    if (set->hashf)
+        return __comps_set_lookup(set, item, set->hashf(item)) != NULL;
     for (it = set->data->first; it != NULL; it = it->next) {
         if (set->eqf(it->data, item))
             return 1;
@@ -92,6 +176,11 @@ int comps_set_at(COMPS_Set * set, void * item) {
 
 void* comps_set_data_at(COMPS_Set * set, void * item) {
     COMPS_HSListItem * it;
+    COMPS_SetEntry *entry;
+    if (set->hashf) {
+        entry = __comps_set_lookup(set, item, set->hashf(item));
+        return entry ? entry->item->data : NULL;
+    }
     for (it = set->data->first; it != NULL; it = it->next) {
         if (set->eqf(it->data, item)) {
             return it->data;
@@ -100,9 +189,40 @@ void* comps_set_data_at(COMPS_Set * set, void * item) {
     return NULL;
 }
 
+static char __comps_set_add_hashed(COMPS_Set *set, void *item) {
+    COMPS_SetEntry *entry;
+    COMPS_HSListItem *prev;
+    unsigned int hash;
+
+    hash = set->hashf(item);
+    if (__comps_set_lookup(set, item, hash))
+        return 0;
+    if (set->count >= set->table_size / 4 * 3) {
+        if (!__comps_set_table_grow(set))
+            return 0;
+    }
+    if ((entry = malloc(sizeof(*entry))) == NULL)
+        return 0;
+    prev = set->data->last;
+    comps_hslist_append(set->data, item, 1);
+    if (set->data->last == prev) {
+        free(entry);
+        return 0;
+    }
+    entry->item = set->data->last;
+    entry->prev = prev;
+    entry->hash = hash;
+    entry->next = set->table[hash & (set->table_size - 1)];
+    set->table[hash & (set->table_size - 1)] = entry;
+    set->count++;
+    return 1;
+}
+
 char comps_set_add(COMPS_Set * set, void *item) {
     COMPS_HSListItem * it;
 
+    if (set->hashf)
+        return __comps_set_add_hashed(set, item);
     for (it = set->data->first; it != NULL; it = it->next) {
         if (set->eqf(it->data, item)) {
             return 0;
@@ -115,9 +235,47 @@ char comps_set_add(COMPS_Set * set, void *item) {
     return 1;
 }
 
+static void* __comps_set_remove_hashed(COMPS_Set *set, void *item) {
+    COMPS_SetEntry *entry, **entryp, *next_entry;
+    COMPS_HSListItem *it;
+    unsigned int hash;
+    void *ret;
+
+    if (!set->table) return NULL;
+    hash = set->hashf(item);
+    for (entryp = &set->table[hash & (set->table_size - 1)]; *entryp != NULL;
+         entryp = &(*entryp)->next) {
+        if ((*entryp)->hash == hash && set->eqf((*entryp)->item->data, item))
+            break;
+    }
+    if ((entry = *entryp) == NULL)
+        return NULL;
+    *entryp = entry->next;
+
+    it = entry->item;
+    if (it->next) {
+        next_entry = __comps_set_item_entry(set, it->next);
+        if (next_entry)
+            next_entry->prev = entry->prev;
+    }
+    if (entry->prev)
+        entry->prev->next = it->next;
+    else
+        set->data->first = it->next;
+    if (set->data->last == it)
+        set->data->last = entry->prev;
+    set->count--;
+    ret = it->data;
+    free(it);
+    free(entry);
+    return ret;
+}
+
 void* comps_set_remove(COMPS_Set *set, void *item) {
     void * ret;
     COMPS_HSListItem * it;
+    if (set->hashf)
+        return __comps_set_remove_hashed(set, item);
     for (it = set->data->first; it != NULL; it = it->next) {
         if (set->eqf(it->data, item)) {
             comps_hslist_remove(set->data, it);
@@ -195,6 +353,7 @@ char comps_set_cmp(COMPS_Set *set1, COMPS_Set *set2) {
 }
 
 inline void comps_set_clear(COMPS_Set *set) {
+    __comps_set_table_free(set);
     comps_hslist_clear(set->data);
 }
 
@@ -22,12 +22,25 @@
 
 #include "comps_hslist.h"
 
+struct _COMPS_SetEntry {
+    struct _COMPS_SetEntry *next; /**< next entry in same bucket */
+    COMPS_HSListItem *item; /**< item holding data in COMPS_Set data list */
+    COMPS_HSListItem *prev; /**< item preceding item in data list or NULL */
+    unsigned int hash;
+};
+typedef struct _COMPS_SetEntry COMPS_SetEntry;
+
 typedef struct {
     char (*eqf)(void*, void*);
     void (*data_destructor)(void*);
     void* (*data_cloner)(void*);
     void* (*data_constructor)(void*);
-    COMPS_HSList *data;
+    COMPS_HSList *data; /**< set items in insertion order */
+    unsigned int (*hashf)(void*);
+    /**< hash function, if set, lookups are done through hash table */
+    COMPS_SetEntry **table;
+    unsigned int table_size;
+    unsigned int count;
 } COMPS_Set;
 
 void* comps_set_index_clone(void *item);
@@ -38,6 +51,15 @@ void comps_set_init(COMPS_Set *set,  void* (*data_constructor)(void*),
                                      void* (*data_cloner)(void*),
                                      void (*data_destructor)(void*),
                                      char (*eqf)(void*, void*));
+/** Same as comps_set_init, but set will be indexed by hashes from hashf.
+ * hashf must return same hash for all items equal by eqf. Insertion order
+ * of items in set->data is kept in the same way as with unhashed set
+ */
+void comps_set_init_hashed(COMPS_Set *set, void* (*data_constructor)(void*),
+                                           void* (*data_cloner)(void*),
+                                           void (*data_destructor)(void*),
+                                           char (*eqf)(void*, void*),
+                                           unsigned int (*hashf)(void*));
 
 char comps_set_in(COMPS_Set *set, void *item);
 char comps_set_add(COMPS_Set *set, void *item);
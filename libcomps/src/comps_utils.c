@@ -83,6 +83,28 @@ bool __comps_objlist_intersected(COMPS_ObjList *list1, COMPS_ObjList *list2) {
     return false;
 }
 
+COMPS_Object* __comps_prop_union(COMPS_Object *prop1, COMPS_Object *prop2) {
+    return comps_object_share(prop2 ? prop2 : prop1);
+}
+
+COMPS_ObjList* __comps_list_union(COMPS_ObjList *list1, COMPS_ObjList *list2) {
+    if (!list2 || !list2->len || list1 == list2)
+        return (COMPS_ObjList*)comps_object_share((COMPS_Object*)
+                                                  (list1 ? list1 : list2));
+    /* equal items of second list replace items of first one */
+    if (!list1 || !list1->len ||
+        comps_object_cmp((COMPS_Object*)list1, (COMPS_Object*)list2))
+        return (COMPS_ObjList*)comps_object_share((COMPS_Object*)list2);
+    return NULL;
+}
+
+COMPS_Object* __comps_prop_intersect(COMPS_Object *prop1,
+                                     COMPS_Object *prop2) {
+    if (prop1 && comps_object_cmp(prop1, prop2))
+        return comps_object_share(prop2);
+    return NULL;
+}
+
 char* __comps_xml_arch_str(COMPS_Object *archlist) {
     size_t x, total_len = 0;
     COMPS_ObjListIt *it;
@@ -144,3 +166,98 @@ inline int __comps_check_xml_get(int retcode, COMPS_Object * log) {
         return -1;
     } return 0;
 }
+
+void comps_idrev_bump(COMPS_IdRev *rev) {
+    if (rev)
+        __sync_fetch_and_add(&rev->rev, 1);
+}
+
+static COMPS_IdRev* __comps_idrev_incref(COMPS_IdRev *rev) {
+    __sync_fetch_and_add(&rev->refc, 1);
+    return rev;
+}
+
+void comps_idrev_release(COMPS_IdRev *rev) {
+    if (rev && __sync_sub_and_fetch(&rev->refc, 1) == 0)
+        free(rev);
+}
+
+void comps_idrev_watch_init(COMPS_IdRevWatch *watch) {
+    watch->own = NULL;
+    watch->foreign = NULL;
+    watch->foreign_len = 0;
+    watch->foreign_size = 0;
+    watch->failed = 0;
+}
+
+void comps_idrev_watch_clear(COMPS_IdRevWatch *watch) {
+    unsigned int i;
+    for (i = 0; i < watch->foreign_len; i++)
+        comps_idrev_release(watch->foreign[i]);
+    watch->foreign_len = 0;
+    watch->failed = 0;
+}
+
+void comps_idrev_watch_destroy(COMPS_IdRevWatch *watch) {
+    comps_idrev_watch_clear(watch);
+    free(watch->foreign);
+    comps_idrev_release(watch->own);
+    comps_idrev_watch_init(watch);
+}
+
+void comps_idrev_watch_add(COMPS_IdRevWatch *watch, COMPS_IdRev **rev) {
+    COMPS_IdRev *cur, **foreign;
+    unsigned int i, size;
+
+    if (!watch->own) {
+        if ((watch->own = malloc(sizeof(COMPS_IdRev))) == NULL) {
+            watch->failed = 1;
+            return;
+        }
+        watch->own->refc = 1;
+        watch->own->rev = 0;
+    }
+    /* object shared with other document could get revision from index
+     * built in other thread meanwhile */
+    if (!*rev) {
+        __comps_idrev_incref(watch->own);
+        if (__sync_bool_compare_and_swap(rev, NULL, watch->own))
+            return;
+        comps_idrev_release(watch->own);
+    }
+    /* revision of object doesn't change until object is destroyed */
+    cur = *rev;
+    if (cur == watch->own)
+        return;
+    /* objects from the same source come together, look from the end */
+    for (i = watch->foreign_len; i > 0; i--) {
+        if (watch->foreign[i - 1] == cur)
+            return;
+    }
+    if (watch->foreign_len == watch->foreign_size) {
+        size = watch->foreign_size ? watch->foreign_size * 2 : 4;
+        foreign = realloc(watch->foreign, sizeof(COMPS_IdRev*) * size);
+        if (!foreign) {
+            watch->failed = 1;
+            return;
+        }
+        watch->foreign = foreign;
+        watch->foreign_size = size;
+    }
+    watch->foreign[watch->foreign_len++] = __comps_idrev_incref(cur);
+}
+
+unsigned long comps_idrev_watch_rev(COMPS_IdRevWatch *watch) {
+    unsigned long ret = 0;
+    unsigned int i;
+
+    if (watch->own)
+        ret = __sync_fetch_and_add(&watch->own->rev, 0);
+    for (i = 0; i < watch->foreign_len; i++)
+        ret += __sync_fetch_and_add(&watch->foreign[i]->rev, 0);
+    return ret;
+}
+
+char comps_idrev_watch_check(COMPS_IdRevWatch *watch, unsigned long rev) {
+    return !watch->failed && comps_idrev_watch_rev(watch) == rev;
+}
@@ -55,9 +55,95 @@ inline void CONCAT(CONCAT(CONCAT(comps_doc, OBJNAME), _set_), PROPNAME)(OBJTYPE
                                                                         char copy) {\
     (void)copy;\
     if (PROPNAME) {\
-        COMPS_Object *str;\
-        str = (COMPS_Object*)comps_str(PROPNAME);\
-        comps_objdict_set_x(OBJNAME->properties, #PROPNAME, str);\
+        COMPS_Str *str;\
+        str = comps_str(PROPNAME);\
+        COMPS_OBJECT_DESTROY(OBJNAME->PROPNAME);\
+        OBJNAME->PROPNAME = str;\
+    }\
+}
+
+/** Revision of ids and names of objects indexed together
+ *
+ * Index or cache gives its own revision to every object it's built from,
+ * unless the object already has one from other index. Setters of id, name
+ * or package type bump revision of changed object, so only indexes and
+ * caches built from that object become out of date.
+ * @see COMPS_IDPROP_SETTER
+ */
+typedef struct {
+    unsigned int refc; /**< number of objects and watches holding revision */
+    unsigned long rev;
+} COMPS_IdRev;
+
+/** Revisions of objects index or cache was built from */
+typedef struct {
+    COMPS_IdRev *own;
+    /**< revision given to objects without revision, NULL until first use */
+    COMPS_IdRev **foreign;
+    /**< revisions objects got from other indexes */
+    unsigned int foreign_len;
+    unsigned int foreign_size;
+    char failed; /**< some revision couldn't be recorded */
+} COMPS_IdRevWatch;
+
+/** Increment revision of changed object. Objects can be shared by
+ * documents used in several threads, so increment is atomic
+ * @param rev object's revision or NULL if object wasn't indexed yet
+ */
+void comps_idrev_bump(COMPS_IdRev *rev);
+
+/** Release object's revision when object is destroyed */
+void comps_idrev_release(COMPS_IdRev *rev);
+
+void comps_idrev_watch_init(COMPS_IdRevWatch *watch);
+
+/** Forget recorded revisions before index is built again. Own revision
+ * is kept, objects could still hold it */
+void comps_idrev_watch_clear(COMPS_IdRevWatch *watch);
+void comps_idrev_watch_destroy(COMPS_IdRevWatch *watch);
+
+/** Record revision of object, give object watch's own revision if it
+ * has none yet
+ * @param watch COMPS_IdRevWatch of index
+ * @param rev revision member of indexed object
+ */
+void comps_idrev_watch_add(COMPS_IdRevWatch *watch, COMPS_IdRev **rev);
+
+/** Return current state of all recorded revisions. State only grows, so
+ * index is up to date while state equals the one read after build
+ * @param watch COMPS_IdRevWatch object
+ * @return state to be compared by comps_idrev_watch_check
+ */
+unsigned long comps_idrev_watch_rev(COMPS_IdRevWatch *watch);
+
+/** Return nonzero if no recorded object changed since state was read */
+char comps_idrev_watch_check(COMPS_IdRevWatch *watch, unsigned long rev);
+
+#define COMPS_IDPROP_SETTER(OBJNAME, OBJTYPE)\
+inline void CONCAT(CONCAT(comps_doc, OBJNAME), _set_id)(OBJTYPE *OBJNAME,\
+                                                        char *id,\
+                                                        char copy) {\
+    (void)copy;\
+    if (id) {\
+        COMPS_Str *str;\
+        str = comps_str_intern(id);\
+        COMPS_OBJECT_DESTROY(OBJNAME->id);\
+        OBJNAME->id = str;\
+        comps_idrev_bump(OBJNAME->id_rev);\
+    }\
+}
+
+#define COMPS_NAMEPROP_SETTER(OBJNAME, OBJTYPE)\
+inline void CONCAT(CONCAT(comps_doc, OBJNAME), _set_name)(OBJTYPE *OBJNAME,\
+                                                          char *name,\
+                                                          char copy) {\
+    (void)copy;\
+    if (name) {\
+        COMPS_Str *str;\
+        str = comps_str(name);\
+        COMPS_OBJECT_DESTROY(OBJNAME->name);\
+        OBJNAME->name = str;\
+        comps_idrev_bump(OBJNAME->id_rev);\
     }\
 }
 
@@ -70,13 +156,8 @@ void CONCAT(CONCAT(CONCAT(comps_doc, OBJNAME), _set_), PROPNAME)(OBJTYPE *OBJNAM
 inline void CONCAT(CONCAT(CONCAT(comps_doc, OBJNAME), _set_), PROPNAME)(OBJTYPE *OBJNAME,\
                                                                         int PROPNAME,\
                                                                         bool unset){\
-        if (unset) {\
-            comps_objdict_set_x(OBJNAME->properties, #PROPNAME, NULL);\
-            return;\
-        } \
-        COMPS_Object *num;\
-        num = (COMPS_Object*)comps_num(PROPNAME);\
-        comps_objdict_set_x(OBJNAME->properties, #PROPNAME, num);\
+    COMPS_OBJECT_DESTROY(OBJNAME->PROPNAME);\
+    OBJNAME->PROPNAME = (unset) ? NULL : comps_num(PROPNAME);\
 }
 #define HEAD_COMPS_NUMPROP_SETTER(OBJNAME, OBJTYPE, PROPNAME)\
 void CONCAT(CONCAT(CONCAT(comps_doc, OBJNAME), _set_), PROPNAME)(OBJTYPE *OBJNAME,\
@@ -87,7 +168,7 @@ void CONCAT(CONCAT(CONCAT(comps_doc, OBJNAME), _set_), PROPNAME)(OBJTYPE *OBJNAM
 #define COMPS_PROP_GETTER(OBJNAME, OBJTYPE, PROPNAME)\
 inline COMPS_Object* CONCAT(CONCAT(CONCAT(comps_doc, OBJNAME), _get_), PROPNAME)\
                                                          (OBJTYPE *OBJNAME){\
-    return comps_objdict_get(OBJNAME->properties, #PROPNAME);\
+    return comps_object_incref((COMPS_Object*)OBJNAME->PROPNAME);\
 }
 #define HEAD_COMPS_PROP_GETTER(OBJNAME, OBJTYPE, PROPNAME)\
 COMPS_Object* CONCAT(CONCAT(CONCAT(comps_doc, OBJNAME), _get_), PROPNAME)\
@@ -140,7 +221,7 @@ static void CONCAT(CONCAT(comps_, NAME), _destroy_u)(COMPS_Object* obj);
 
 #define COMPS_DOCOBJ_GETOBJLIST(OBJ, OBJTYPE, MEMBER, OBJS)\
 COMPS_ObjList* CONCAT(CONCAT(CONCAT(comps_, OBJ), _), OBJS) (OBJTYPE *obj){\
-    return obj->MEMBER;\
+    return (COMPS_ObjList*)comps_object_expose((COMPS_Object**)&obj->MEMBER);\
 }
 #define HEAD_COMPS_DOCOBJ_GETOBJLIST(OBJ, OBJTYPE, MEMBER, OBJS)\
 COMPS_ObjList* CONCAT(CONCAT(CONCAT(comps_, OBJ), _), OBJS) (OBJTYPE *obj);
@@ -150,6 +231,7 @@ void CONCAT(CONCAT(CONCAT(comps_, OBJ), _set_), OBJS) (OBJTYPE *obj,\
                                                    COMPS_ObjList *list){\
     COMPS_OBJECT_DESTROY(obj->MEMBER);\
     obj->MEMBER = (COMPS_ObjList*)comps_object_incref((COMPS_Object*)list);\
+    comps_object_expose((COMPS_Object**)&obj->MEMBER);\
 }
 #define HEAD_COMPS_DOCOBJ_SETOBJLIST(OBJ, OBJTYPE, MEMBER, OBJS)\
 void CONCAT(CONCAT(CONCAT(comps_, OBJ), _set_), OBJS) (OBJTYPE *obj,\
@@ -157,7 +239,7 @@ void CONCAT(CONCAT(CONCAT(comps_, OBJ), _set_), OBJS) (OBJTYPE *obj,\
 
 #define COMPS_DOCOBJ_GETARCHES(OBJ, OBJTYPE)\
 COMPS_ObjList* CONCAT(CONCAT(comps_, OBJ), _arches) (OBJTYPE *obj){\
-    return (COMPS_ObjList*)comps_objdict_get(obj->properties, "arches");\
+    return (COMPS_ObjList*)comps_object_incref((COMPS_Object*)obj->arches);\
 }
 #define HEAD_COMPS_DOCOBJ_GETARCHES(OBJ, OBJTYPE)\
 COMPS_ObjList* CONCAT(CONCAT(comps_, OBJ), _arches)(OBJTYPE *obj);
@@ -165,7 +247,8 @@ COMPS_ObjList* CONCAT(CONCAT(comps_, OBJ), _arches)(OBJTYPE *obj);
 #define COMPS_DOCOBJ_SETARCHES(OBJ, OBJTYPE)\
 void CONCAT(CONCAT(comps_, OBJ), _set_arches)(OBJTYPE *obj,\
                                               COMPS_ObjList *list){\
-    comps_objdict_set_x(obj->properties, "arches", (COMPS_Object*)list);\
+    COMPS_OBJECT_DESTROY(obj->arches);\
+    obj->arches = list;\
 }
 #define HEAD_COMPS_DOCOBJ_SETARCHES(OBJ, OBJTYPE)\
 void CONCAT(CONCAT(comps_, OBJ), _set_arches)(OBJTYPE *obj,\
@@ -185,6 +268,31 @@ int __comps_xml_prop(char *key, char *val, xmlTextWriterPtr writer);
 char* __comps_num2boolstr(COMPS_Object* obj);
 unsigned int digits_count(unsigned int x);
 bool __comps_objlist_intersected(COMPS_ObjList *list1, COMPS_ObjList *list2);
+
+/** Return union of two values of the same property. Value of second object
+ * wins, value of first one is used when second one is not set. Value is
+ * shared, not copied
+ * @param prop1 property value of first object or NULL
+ * @param prop2 property value of second object or NULL
+ * @return new reference of property value or NULL
+ */
+COMPS_Object* __comps_prop_union(COMPS_Object *prop1, COMPS_Object *prop2);
+
+/** Return shared list if union of two lists of the same property is one of
+ * them
+ * @param list1 list of first object or NULL
+ * @param list2 list of second object or NULL
+ * @return new reference of shared list or NULL if lists have to be merged
+ * @see comps_object_share
+ */
+COMPS_ObjList* __comps_list_union(COMPS_ObjList *list1, COMPS_ObjList *list2);
+
+/** Return value of property if it's set and equal in both objects
+ * @param prop1 property value of first object or NULL
+ * @param prop2 property value of second object or NULL
+ * @return new reference of property value or NULL
+ */
+COMPS_Object* __comps_prop_intersect(COMPS_Object *prop1, COMPS_Object *prop2);
 char* __comps_xml_arch_str(COMPS_Object *arches);
 int __comps_xml_arch(COMPS_Object *archlist, xmlTextWriterPtr writer);
 
@@ -174,7 +174,8 @@ COMPS_ValGenResult* comps_objlist_unique_check(COMPS_Object *object,
     const char *msg_fmt = "Duplicate items at %d and %d";
 
     COMPS_Set *set = comps_set_create();
-    comps_set_init(set, NULL, NULL, NULL, &comps_object_cmp_v);
+    comps_set_init_hashed(set, NULL, NULL, NULL, &comps_object_cmp_v,
+                               &comps_object_hash_v);
     x = 0;
     for (COMPS_ObjListIt *it = _objlist_->first;
          it != NULL;
@@ -0,0 +1,838 @@
+/* libcomps - C alternative to yum.comps library
+ * Copyright (C) 2013 Jindrich Luza
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * any later version.
+ *
+ * This program is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to  Free Software
+ * Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301,
+ * USA
+ */
+
+#ifndef COMPS_DOC_H
+#define COMPS_DOC_H
+
+#include "comps_obj.h"
+#include "comps_objdict.h"
+#include "comps_objlist.h"
+#include "comps_log.h"
+#include "comps_types.h"
+#include "comps_docgroup.h"
+#include "comps_doccategory.h"
+#include "comps_docenv.h"
+#include "comps_validate.h"
+#include "comps_default.h"
+#include "comps_match.h"
+
+#include <pthread.h>
+
+/** \file comps_doc.h
+ * \brief COMPS_Doc header file
+ *
+ * COMPS_Doc object support union operation. Read more about
+ * @link doc_unioning Libcomps objects unioning
+ * @endlink
+ * @see COMPS_Doc_getters @see COMPS_Doc_setters @see COMPS_Doc_adders
+ */
+
+/** @cond NOTMET */
+#define COMPS_DOC_GETOBJLIST(OBJS) COMPS_ObjList* CONCAT(comps_doc_, OBJS)\
+                                                           (COMPS_Doc *doc){\
+    if (!doc->OBJS)\
+        doc->OBJS = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);\
+    return (COMPS_ObjList*)comps_object_incref((COMPS_Object*)doc->OBJS);\
+}
+/** <@hideinititalizer */
+
+#define HEAD_COMPS_DOC_GETOBJLIST(OBJS) COMPS_ObjList* CONCAT(comps_doc_, OBJS)\
+                                                           (COMPS_Doc *doc);
+/** <@hideinititalizer */
+
+#define COMPS_DOC_SETOBJLIST(OBJS) void CONCAT(comps_doc_set_, OBJS)\
+                                                       (COMPS_Doc *doc,\
+                                                        COMPS_ObjList *list){\
+    COMPS_Object *old = (COMPS_Object*)doc->OBJS;\
+    doc->OBJS = (void*)comps_object_incref((COMPS_Object*)list);\
+    COMPS_OBJECT_DESTROY(old);\
+}
+/** <@hideinititalizer */
+#define HEAD_COMPS_DOC_SETOBJLIST(OBJS) void CONCAT(comps_doc_set_, OBJS)\
+                                                   (COMPS_Doc *doc,\
+                                                    COMPS_ObjList *list);
+/** <@hideinititalizer */
+
+#define COMPS_DOC_GETOBJDICT(OBJNAME) COMPS_ObjDict* CONCAT(comps_doc_, OBJNAME)\
+                                                           (COMPS_Doc *doc){\
+    if (!doc->OBJNAME)\
+        doc->OBJNAME = COMPS_OBJECT_CREATE(COMPS_ObjDict, NULL);\
+    return (COMPS_ObjDict*)comps_object_incref((COMPS_Object*)doc->OBJNAME);\
+}
+/** <@hideinititalizer */
+#define HEAD_COMPS_DOC_GETOBJDICT(OBJNAME) COMPS_ObjDict* CONCAT(comps_doc_, OBJNAME)\
+                                                           (COMPS_Doc *doc);
+/** <@hideinititalizer */
+
+#define COMPS_DOC_GETOBJMDICT(OBJNAME) COMPS_ObjMDict* CONCAT(comps_doc_, OBJNAME)\
+                                                           (COMPS_Doc *doc){\
+    if (!doc->OBJNAME)\
+        doc->OBJNAME = COMPS_OBJECT_CREATE(COMPS_ObjMDict, NULL);\
+    return (COMPS_ObjMDict*)comps_object_incref((COMPS_Object*)doc->OBJNAME);\
+}
+/** <@hideinititalizer */
+#define HEAD_COMPS_DOC_GETOBJMDICT(OBJNAME) COMPS_ObjMDict* CONCAT(comps_doc_, OBJNAME)\
+                                                           (COMPS_Doc *doc);
+/** <@hideinititalizer */
+
+#define COMPS_DOC_SETOBJDICT(OBJS) void CONCAT(comps_doc_set_, OBJS)\
+                                                       (COMPS_Doc *doc,\
+                                                        COMPS_ObjDict *dict){\
+    COMPS_Object *old = (COMPS_Object*)doc->OBJS;\
+    doc->OBJS = (void*)comps_object_incref((COMPS_Object*)dict);\
+    COMPS_OBJECT_DESTROY(old);\
+}
+/** <@hideinititalizer */
+#define HEAD_COMPS_DOC_SETOBJDICT(OBJS) void CONCAT(comps_doc_set_, OBJS)\
+                                                   (COMPS_Doc *doc,\
+                                                    COMPS_ObjDict *dict);
+/** <@hideinititalizer */
+
+#define COMPS_DOC_SETOBJMDICT(OBJS) void CONCAT(comps_doc_set_, OBJS)\
+                                                       (COMPS_Doc *doc,\
+                                                        COMPS_ObjMDict *dict){\
+    COMPS_Object *old = (COMPS_Object*)doc->OBJS;\
+    doc->OBJS = (void*)comps_object_incref((COMPS_Object*)dict);\
+    COMPS_OBJECT_DESTROY(old);\
+}
+/** <@hideinititalizer */
+#define HEAD_COMPS_DOC_SETOBJMDICT(OBJS) void CONCAT(comps_doc_set_, OBJS)\
+                                                   (COMPS_Doc *doc,\
+                                                    COMPS_ObjMDict *dict);
+/** <@hideinititalizer */
+
+
+#define COMPS_DOC_ADDOBJLIST(OBJS, OBJNAME, OBJTYPE) void CONCAT(comps_doc_add_,\
+                                                           OBJNAME)\
+                                                           (COMPS_Doc *doc,\
+                                                            OBJTYPE *obj){\
+    if (!doc->OBJS)\
+        doc->OBJS = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);\
+    comps_objlist_append_x(doc->OBJS, (COMPS_Object*)obj);\
+}
+/** <@hideinititalizer */
+#define HEAD_COMPS_DOC_ADDOBJLIST(OBJNAME, OBJTYPE) void CONCAT(comps_doc_add_,\
+                                                           OBJNAME)\
+                                                           (COMPS_Doc *doc,\
+                                                            OBJTYPE *obj);
+/** <@hideinititalizer */
+
+#define COMPS_DOC_ADDOBJDICT(OBJS, OBJNAME) void CONCAT(comps_doc_add_,\
+                                                           OBJNAME)\
+                                                           (COMPS_Doc *doc,\
+                                                            char *key,\
+                                                            COMPS_Str *obj){\
+    if (!doc->OBJS)\
+        doc->OBJS = COMPS_OBJECT_CREATE(COMPS_ObjDict, NULL);\
+    comps_objdict_set_x(doc->OBJS, key, (COMPS_Object*)obj);\
+}
+/** <@hideinititalizer */
+#define HEAD_COMPS_DOC_ADDOBJDICT(OBJNAME) void CONCAT(comps_doc_add_,\
+                                                           OBJNAME)\
+                                                           (COMPS_Doc *doc,\
+                                                            char *key,\
+                                                            COMPS_Str *obj);
+/** <@hideinititalizer */
+
+
+#define COMPS_DOC_ADDOBJMDICT(OBJS, OBJNAME) void CONCAT(comps_doc_add_,\
+                                                           OBJNAME)\
+                                                           (COMPS_Doc *doc,\
+                                                            char *key,\
+                                                            COMPS_Str *obj){\
+    if (!doc->OBJS)\
+        doc->OBJS = COMPS_OBJECT_CREATE(COMPS_ObjMDict, NULL);\
+    comps_objmdict_set_x(doc->OBJS, key, (COMPS_Object*)obj);\
+}
+/** <@hideinititalizer */
+#define HEAD_COMPS_DOC_ADDOBJMDICT(OBJNAME) void CONCAT(comps_doc_add_,\
+                                                           OBJNAME)\
+                                                           (COMPS_Doc *doc,\
+                                                            char *key,\
+                                                            COMPS_Str *obj);
+/** <@hideinititalizer */
+
+#define COMPS_DOC_GETPROP(OBJ,TYPE) CONCAT(TYPE,CONCAT(* ,CONCAT(comps_doc_, OBJ)))\
+                                                           (COMPS_Doc *doc){\
+    if (!doc->OBJ)\
+        doc->OBJ = COMPS_OBJECT_CREATE(TYPE, NULL);\
+    return (TYPE*)comps_object_incref((COMPS_Object*)doc->OBJ);\
+}
+/** <@hideinititalizer */
+
+#define HEAD_COMPS_DOC_GETPROP(OBJ, TYPE) CONCAT(TYPE,CONCAT(*,CONCAT(comps_doc_, OBJS)))\
+                                                           (COMPS_Doc *doc);
+/** <@hideinititalizer */
+
+
+#define COMPS_DOC_SETPROP(OBJ, TYPE) void CONCAT(comps_doc_set_, OBJ)\
+                                                       (COMPS_Doc *doc,\
+                                                        TYPE *value){\
+    COMPS_Object *old = (COMPS_Object*)doc->OBJ;\
+    doc->OBJ = (void*)comps_object_incref((COMPS_Object*)value);\
+    COMPS_OBJECT_DESTROY(old);\
+}
+
+/** <@hideinititalizer */
+
+
+#define HEAD_COMPS_DOC_SETPROP(OBJ, TYPE) void CONCAT(comps_doc_set_, OBJ)\
+                                                   (COMPS_Doc *doc,\
+                                                    TYPE *value);
+
+/** <@hideinititalizer */
+/** @endcond*/
+
+/** COMPS_Object derivate containing whole comps.xml document.
+ */
+typedef struct COMPS_DocIdIndexItem COMPS_DocIdIndexItem;
+
+struct COMPS_DocIdIndexItem {
+    COMPS_Object *obj;
+    unsigned int hash;
+    COMPS_DocIdIndexItem *next;
+};
+
+/** Compiled query of comps_doc_get_groups and similar functions
+ *
+ * Object matches query if all given patterns match its properties
+ */
+typedef struct {
+    COMPS_Pattern *id; /**< id pattern, NULL matches any id */
+    COMPS_Pattern *name; /**< name pattern, NULL matches any name */
+    COMPS_Pattern *desc;
+    /**< description pattern, NULL matches any description */
+    char *lang;
+    /**< name and description are matched in this language if not NULL */
+} COMPS_DocMatch;
+
+/** Hash index of objects in COMPS_ObjList by their 'id' property
+ *
+ * Index is built lazily on first lookup and rebuilt when indexed list
+ * is modified or id of some indexed object is changed.
+ */
+typedef struct COMPS_DocIdIndex {
+    size_t id_offset;
+    /**< offset of COMPS_Str id in indexed objects */
+    COMPS_ObjList *list; /**< indexed list */
+    unsigned long list_rev; /**< revision of list when index was built */
+    COMPS_IdRevWatch watch; /**< revisions of indexed objects */
+    unsigned long id_rev; /**< state of watch when index was built */
+    COMPS_DocIdIndexItem **table;
+    COMPS_DocIdIndexItem *items;
+    unsigned int table_size;
+} COMPS_DocIdIndex;
+
+typedef struct COMPS_DocPkgIndexItem COMPS_DocPkgIndexItem;
+
+/** Occurrence of package in group */
+struct COMPS_DocPkgIndexItem {
+    COMPS_DocGroup *group; /**< group containing package */
+    COMPS_DocGroupPackage *package; /**< packagereq of group */
+    unsigned int hash; /**< hash of package name */
+    COMPS_DocPkgIndexItem *next;
+};
+
+/** State of group's packages list when COMPS_DocPkgIndex was built */
+typedef struct {
+    COMPS_DocGroup *group;
+    COMPS_ObjList *packages; /**< group's packages list */
+    unsigned long rev; /**< revision of packages list */
+} COMPS_DocPkgIndexGroup;
+
+/** Hash index mapping package name to groups containing package
+ *
+ * Index is built lazily on first lookup and rebuilt when groups list,
+ * packages list of any group or name of indexed package is changed.
+ */
+typedef struct COMPS_DocPkgIndex {
+    COMPS_ObjList *groups; /**< indexed groups list */
+    unsigned long groups_rev; /**< revision of groups list */
+    COMPS_IdRevWatch watch; /**< revisions of indexed packages */
+    unsigned long id_rev; /**< state of watch when index was built */
+    COMPS_DocPkgIndexGroup *snapshot; /**< state of indexed groups */
+    unsigned int groups_len; /**< number of indexed groups */
+    COMPS_DocPkgIndexItem **table;
+    COMPS_DocPkgIndexItem *items;
+    unsigned int table_size;
+} COMPS_DocPkgIndex;
+
+/** List closure was resolved from */
+typedef struct {
+    COMPS_ObjList **slot; /**< member of document object holding list */
+    COMPS_ObjList *list; /**< list held by slot at resolution time */
+    unsigned long rev; /**< revision of list at resolution time */
+} COMPS_DocClosureDep;
+
+typedef struct COMPS_DocClosure COMPS_DocClosure;
+
+/** Memoized package set of environment or category */
+struct COMPS_DocClosure {
+    char *key; /**< kind, id, package types and options of closure */
+    unsigned int hash; /**< hash of key */
+    COMPS_ObjList *packages; /**< package names */
+    COMPS_DocClosureDep *deps;
+    /**< lists closure was resolved from, in order of resolution */
+    unsigned int deps_len;
+    unsigned int deps_size;
+    unsigned long id_rev;
+    /**< state of revisions closure depends on at resolution time */
+    COMPS_DocClosure *next;
+};
+
+/** Cache of package sets of environments and categories
+ *
+ * Closure is valid while none of lists it was resolved from is replaced
+ * or modified and no id, name or type of object in those lists is changed.
+ * Objects which aren't in id indexes of document are watched by cache
+ * itself. Dependencies are checked
+ * in order they were recorded, so list owners are checked to be still
+ * referenced from document before their lists are touched.
+ */
+typedef struct {
+    COMPS_DocClosure **table;
+    unsigned int table_size;
+    unsigned int count;
+    COMPS_IdRevWatch watch;
+    /**< revisions of environments, categories, group ids and packages */
+} COMPS_DocClosureCache;
+
+typedef struct {
+    COMPS_Object_HEAD;
+    COMPS_ObjList *groups; /**< list of groups, NULL until first use */
+    COMPS_ObjList *categories; /**< list of categories, NULL until first use */
+    COMPS_ObjList *environments;
+    /**< list of environments, NULL until first use */
+    COMPS_ObjDict *langpacks; /**< langpacks, NULL until first use */
+    COMPS_ObjMDict *blacklist; /**< blacklist, NULL until first use */
+    COMPS_ObjMDict *whiteout; /**< whiteout, NULL until first use */
+    COMPS_Log *log;
+    /**< COMPS_Log object to store log messages evoked
+     * by parsing and xml generating */
+    COMPS_Str *encoding;   /**< comps.xml document encoding */
+    COMPS_Str *doctype_name;
+    COMPS_Str *doctype_sysid;
+    COMPS_Str *doctype_pubid;
+    COMPS_Str *lang;
+    COMPS_DocIdIndex *groups_index; /**< id index of groups */
+    COMPS_DocIdIndex *categories_index; /**< id index of categories */
+    COMPS_DocIdIndex *envs_index; /**< id index of environments */
+    COMPS_DocIdIndex *groups_name_index; /**< name index of groups */
+    COMPS_DocIdIndex *categories_name_index;
+    /**< name index of categories */
+    COMPS_DocIdIndex *envs_name_index; /**< name index of environments */
+    COMPS_DocPkgIndex *packages_index;
+    /**< index of groups by names of their packages */
+    COMPS_DocClosureCache *closures;
+    /**< package sets of environments and categories */
+    pthread_mutex_t lock;
+    /**< serializes lazy building of indexes and closures */
+    } COMPS_Doc;
+COMPS_Object_TAIL(COMPS_Doc);
+
+//HEAD_COMPS_CREATE_u(doc, COMPS_Doc)  /*comps_utils.h macro*/
+//HEAD_COMPS_COPY_u(doc, COMPS_Doc)  /*comps_utils.h macro*/
+//HEAD_COMPS_DESTROY_u(doc, COMPS_Doc)  /*comps_utils.h macro*/
+
+/** constructor callback for COMPS_Doc object. COMPS_Doc is COMPS_Object
+ * derivate. Use comps_object_create() or COMPS_OBJECT_CREATE for construction
+ * instead
+ *
+ * @param doc allocated COMPS_Doc object
+ * @param args array of constructor arguments. COMPS_Doc constructor accepts
+ * encoding argument as COMPS_Str object only so array need not end with
+ * sentinel item*/
+void comps_doc_create(COMPS_Doc* doc, COMPS_Object **args);
+
+/** copy callback for COMPS_Doc object*/
+void comps_doc_copy(COMPS_Doc *doc_dst, COMPS_Doc *doc_src);
+
+/** destructor callback for COMPS_Doc object. COMPS_Doc is COMPS_Object
+ * derivate. Use comps_object_create() for construction instead*/
+void comps_doc_destroy(COMPS_Doc *doc);
+
+/** comparator callback for COMPS_Doc object */
+signed char comps_doc_cmp_u(COMPS_Object *obj1, COMPS_Object *obj2);
+
+/** \defgroup COMPS_Doc_getters COMPS_Doc getters
+ * @{
+ */
+
+/** comps group list getter
+ * @param doc COMPS_Doc instance
+ * @return COMPS_ObjList object of COMPS_DocGroup*/
+HEAD_COMPS_DOC_GETOBJLIST(groups) /*comps_doc.h macro*/
+
+/** comps category list getter
+ * @param doc COMPS_Doc instance
+ * @return COMPS_ObjList object of COMPS_DocCategory*/
+HEAD_COMPS_DOC_GETOBJLIST(categories) /*comps_doc.h macro*/
+
+/** comps environment list getter
+ * @param doc COMPS_Doc instance
+ * @return COMPS_ObjList object of COMPS_DocEnv*/
+HEAD_COMPS_DOC_GETOBJLIST(environments) /*comps_doc.h macro*/
+
+/** comps langpack dictionary getter
+ * @param doc COMPS_Doc instance
+ * @return COMPS_ObjDict object of COMPS_Str*/
+HEAD_COMPS_DOC_GETOBJDICT(langpacks) /*comps_doc.h macro*/
+
+/** comps blacklist dictionary getter
+ * @param doc COMPS_Doc instance
+ * @return COMPS_ObjMDict object of COMPS_Str*/
+HEAD_COMPS_DOC_GETOBJMDICT(blacklist) /*comps_doc.h macro*/
+
+/** comps whiteout dictionary getter
+ * @param doc COMPS_Doc instance
+ * @return COMPS_ObjMDict object of COMPS_Str*/
+HEAD_COMPS_DOC_GETOBJMDICT(whiteout) /*comps_doc.h macro*/
+
+/**@}*/
+
+/** \defgroup COMPS_Doc_setters COMPS_Doc setters
+ * @{
+ */
+
+/** comps group list setter
+ * @param doc COMPS_Doc instance
+ * @param list COMPS_ObjList of COMPS_DocGroup items
+ * \warning make sure of correct items type. Setter doesn't provide any
+ * additional control routines
+ */
+HEAD_COMPS_DOC_SETOBJLIST(groups) /*comps_doc.h macro*/
+
+/** comps category list setter
+ * @param doc COMPS_Doc instance
+ * @param list COMPS_ObjList of COMPS_DocCategory items
+ * \warning make sure of correct items type. Setter doesn't provide any
+ * additional control routines
+ */
+HEAD_COMPS_DOC_SETOBJLIST(categories) /*comps_doc.h macro*/
+
+/** comps environments list setter
+ * @param doc COMPS_Doc instance
+ * @param list COMPS_ObjList of COMPS_DocEnv items
+ * \warning make sure of correct items type. Setter doesn't provide any
+ * additional control routines
+ */
+HEAD_COMPS_DOC_SETOBJLIST(environments) /*comps_doc.h macro*/
+
+/** comps lankpack dict setter
+ * @param doc COMPS_Doc instance
+ * @param dict COMPS_ObjDict of COMPS_Str items
+ * \warning make sure of correct items type. Setter doesn't provide any
+ * additional control routines
+ */
+HEAD_COMPS_DOC_SETOBJDICT(langpacks) /*comps_doc.h macro*/
+
+/** comps blacklist multi-dict setter
+ * @param doc COMPS_Doc instance
+ * @param dict COMPS_ObjMDict of COMPS_Str items
+ * \warning make sure of correct items type. Setter doesn't provide any
+ * additional control routines
+ */
+HEAD_COMPS_DOC_SETOBJMDICT(blacklist) /*comps_doc.h macro*/
+
+/** comps whiteout multi-dict setter
+ * @param doc COMPS_Doc instance
+ * @param dict COMPS_ObjMDict of COMPS_Str items
+ * \warning make sure of correct items type. Setter doesn't provide any
+ * additional control routines
+ */
+HEAD_COMPS_DOC_SETOBJMDICT(whiteout) /*comps_doc.h macro*/
+
+/**@}*/
+
+/** \defgroup COMPS_Doc_adders COMPS_Doc adders
+ * @{
+ */
+
+/** COMPS_DocGroup adder to group list in COMPS_Doc
+ * @param doc COMPS_Doc instance
+ * @param obj COMPS_DocGroup object
+ * append COMPS_DocGroup object to group list in COMPS_Doc structure
+ * \warning function doesn't increment COMPS_DocGroup object reference count.
+ */
+HEAD_COMPS_DOC_ADDOBJLIST(group, COMPS_DocGroup) /*comps_doc.h macro*/
+
+/** COMPS_DocCategory adder to category list in COMPS_Doc
+ * @param doc COMPS_Doc instance
+ * @param obj COMPS_DocCategory object
+ * append COMPS_DocCategory object to category list in COMPS_Doc structure
+ * \warning function doesn't increment COMPS_DocCategory object reference count.
+ */
+HEAD_COMPS_DOC_ADDOBJLIST(category, COMPS_DocCategory) /*comps_doc.h macro*/
+
+/** COMPS_DocEnv adder to environment list in COMPS_Doc
+ * @param doc COMPS_Doc instance
+ * @param obj COMPS_DocEnv object
+ * append COMPS_DocEnv object to environment list in COMPS_Doc structure
+ * \warning function doesn't increment COMPS_DocEnv object reference count.
+ */
+HEAD_COMPS_DOC_ADDOBJLIST(environment, COMPS_DocEnv) /*comps_doc.h macro*/
+
+/** Langpack adder to langpack dict in COMPS_Doc
+ * @param doc COMPS_Doc instance
+ * @param key COMPS_Str dictionary key of langpack
+ * @param obj COMPS_Str langpack
+ * add langpack string to langpack dict in COMPS_Doc structure. If There's
+ * allready langpack string with same key, will be overwritten.
+ * \warning function doesn't increment obj param reference count.
+ */
+HEAD_COMPS_DOC_ADDOBJDICT(langpack) /*comps_doc.h macro*/
+
+/** Blacklist adder to blacklist multi-dict in COMPS_Doc
+ * @param doc COMPS_Doc instance
+ * @param key COMPS_Str dictionary key of blacklist
+ * @param obj COMPS_Str blacklist item
+ * append blacklist item object to blacklist in COMPS_Doc structure. Items 
+ * with same key are grouped in COMPS_ObjList object.
+ * \warning function doesn't increment obj param reference count.
+ */
+HEAD_COMPS_DOC_ADDOBJMDICT(blacklist) /*comps_doc.h macro*/
+
+/** whiteout adder to whitetout multi-dict in COMPS_Doc
+ * @param doc COMPS_Doc instance
+ * @param key COMPS_Str dictionary key of whiteout
+ * @param obj COMPS_Str whiteout item
+ * append whiteout item object to blacklist in COMPS_Doc structure. Items 
+ * with same key are grouped in COMPS_ObjList object.
+ * \warning function doesn't increment obj param reference count.
+ */
+HEAD_COMPS_DOC_ADDOBJMDICT(whiteout) /*comps_doc.h macro*/
+
+
+
+/** whiteout adder to whitetout multi-dict in COMPS_Doc
+ * @param doc COMPS_Doc instance
+ * @param obj COMPS_Str language value
+ * Set language to comps object and all subobjects
+ */
+
+HEAD_COMPS_DOC_SETPROP(lang, COMPS_Str) /*comps_doc.h macro*/
+
+/**@}*/
+
+/** \defgroup COMPS_Doc_filters COMPS_Doc filters
+ * @{
+ */
+
+COMPS_ObjList* comps_doc_get_groups(COMPS_Doc *doc, char *id, char *name,
+                                    char *desc, char *lang, int flags);
+COMPS_ObjList* comps_doc_get_categories(COMPS_Doc *doc, char *id, char *name,
+                                        char *desc, char *lang, int flags);
+COMPS_ObjList* comps_doc_get_envs(COMPS_Doc *doc, char *id, char *name,
+                                  char *desc, char *lang, int flags);
+
+/** Compile query for comps_doc_match_groups and similar functions
+ * @param id pattern of id or NULL
+ * @param name pattern of name or NULL
+ * @param desc pattern of description or NULL
+ * @param lang language of name and description or NULL
+ * @param flags fnmatch flags of patterns
+ * @return new COMPS_DocMatch or NULL if memory allocation failed
+ */
+COMPS_DocMatch* comps_doc_match_create(const char *id, const char *name,
+                                       const char *desc, const char *lang,
+                                       int flags);
+void comps_doc_match_destroy(COMPS_DocMatch *match);
+
+/** Return groups matching each of queries
+ *
+ * Queries with exact id or (untranslated) name are answered through hash
+ * index of document. Other queries are evaluated together in single pass
+ * over groups.
+ * @param doc COMPS_Doc object
+ * @param matches array of compiled queries
+ * @param count number of queries
+ * @return new COMPS_ObjList containing COMPS_ObjList of matching groups for
+ * every query, in order of queries
+ */
+COMPS_ObjList* comps_doc_match_groups(COMPS_Doc *doc, COMPS_DocMatch **matches,
+                                      unsigned int count);
+
+/** Return categories matching each of queries
+ * @see comps_doc_match_groups
+ */
+COMPS_ObjList* comps_doc_match_categories(COMPS_Doc *doc,
+                                          COMPS_DocMatch **matches,
+                                          unsigned int count);
+
+/** Return environments matching each of queries
+ * @see comps_doc_match_groups
+ */
+COMPS_ObjList* comps_doc_match_envs(COMPS_Doc *doc, COMPS_DocMatch **matches,
+                                    unsigned int count);
+
+/** Return group with specified id
+ *
+ * Lookup is done through id index of document, so it takes constant time
+ * (except the first lookup after groups list was changed, which rebuilds
+ * the index). Returned object has incremented reference counter.
+ * @param doc COMPS_Doc object
+ * @param id group id
+ * @return group with matching id or NULL if there's no such group
+ */
+COMPS_DocGroup* comps_doc_group_by_id(COMPS_Doc *doc, const char *id);
+
+/** Return category with specified id
+ * @see comps_doc_group_by_id
+ */
+COMPS_DocCategory* comps_doc_category_by_id(COMPS_Doc *doc, const char *id);
+
+/** Return environment with specified id
+ * @see comps_doc_group_by_id
+ */
+COMPS_DocEnv* comps_doc_environment_by_id(COMPS_Doc *doc, const char *id);
+
+/** Return list of groups containing package with specified name
+ *
+ * Lookup is done through package index of document, which is built on first
+ * lookup and rebuilt only after groups or their packages were changed.
+ * @param doc COMPS_Doc object
+ * @param name package name
+ * @return new COMPS_ObjList with groups in document order. List is empty
+ * if there's no such package
+ */
+COMPS_ObjList* comps_doc_groups_by_package(COMPS_Doc *doc, const char *name);
+
+/** Return first occurrence of package with specified name in groups of
+ * document
+ *
+ * Next occurrences are returned by comps_doc_pkgindex_next. Items are
+ * valid only until groups of document or their packages are modified.
+ * If document is used by more threads, items have to be iterated with
+ * document locked by comps_doc_lock.
+ * @param doc COMPS_Doc object
+ * @param name package name
+ * @return found item or NULL
+ */
+COMPS_DocPkgIndexItem* comps_doc_package_lookup(COMPS_Doc *doc,
+                                                const char *name);
+
+/** Return package with specified name from group
+ *
+ * Same as searching group's packages list, but takes constant time.
+ * Returned object has incremented reference counter.
+ * @param doc COMPS_Doc object
+ * @param group COMPS_DocGroup object from document's groups list
+ * @param name package name
+ * @return first package with matching name or NULL if group doesn't
+ * contain such package
+ */
+COMPS_DocGroupPackage* comps_doc_group_package(COMPS_Doc *doc,
+                                               COMPS_DocGroup *group,
+                                               const char *name);
+
+/** Return names of packages installed by environment
+ *
+ * Packages of environment's groups and of chosen optional groups are
+ * filtered by type and deduplicated. Result is cached in document and it's
+ * resolved again only after document objects it depends on were changed.
+ * @param doc COMPS_Doc object
+ * @param id environment id
+ * @param options list of COMPS_Str ids of chosen optional groups, could be
+ * NULL. Ids missing in environment's option list are ignored
+ * @param types mask of package types, @see COMPS_PACKAGE_TYPE_MASK
+ * @return shared COMPS_ObjList of COMPS_Str package names in order of
+ * first occurrence or NULL if there's no such environment. List has to be
+ * unshared with comps_object_unshare before modification
+ */
+COMPS_ObjList* comps_doc_environment_packages(COMPS_Doc *doc, const char *id,
+                                              COMPS_ObjList *options,
+                                              int types);
+
+/** Return names of packages of all groups in category
+ * @see comps_doc_environment_packages
+ */
+COMPS_ObjList* comps_doc_category_packages(COMPS_Doc *doc, const char *id,
+                                           int types);
+
+/** Lock document's indexes and caches
+ *
+ * Lookups lock document themselves while indexes and caches are built and
+ * searched, so document which isn't modified can be searched from more
+ * threads. Lock is recursive, lookups can be called while it's held.
+ * @param doc COMPS_Doc object
+ */
+void comps_doc_lock(COMPS_Doc *doc);
+void comps_doc_unlock(COMPS_Doc *doc);
+
+/**@}*/
+
+/** Create new id index for objects with COMPS_Str id
+ *
+ * Index isn't locked, it has to be used by one thread at a time.
+ * @param id_offset offset of id in indexed objects
+ */
+COMPS_DocIdIndex* comps_doc_idindex_create(size_t id_offset);
+void comps_doc_idindex_destroy(COMPS_DocIdIndex *index);
+
+/** Return first object with specified id from list
+ *
+ * (Re)build the index if it doesn't match current state of the list.
+ * Returned object HASN'T incremented reference counter.
+ * @param index COMPS_DocIdIndex object
+ * @param list COMPS_ObjList object
+ * @param id searched id
+ * @return found object or NULL
+ */
+COMPS_Object* comps_doc_idindex_get(COMPS_DocIdIndex *index,
+                                    COMPS_ObjList *list, const char *id);
+
+/** Return position of first object with specified id in list
+ *
+ * (Re)build the index if it doesn't match current state of the list.
+ * @param index COMPS_DocIdIndex object
+ * @param list COMPS_ObjList object
+ * @param id searched id
+ * @return position of found object or -1
+ */
+int comps_doc_idindex_pos(COMPS_DocIdIndex *index, COMPS_ObjList *list,
+                          const char *id);
+
+COMPS_DocPkgIndex* comps_doc_pkgindex_create();
+void comps_doc_pkgindex_destroy(COMPS_DocPkgIndex *index);
+
+/** Return first occurrence of package with specified name in groups
+ *
+ * (Re)build the index if it doesn't match current state of groups.
+ * Items follow order of groups in list, next occurrence is returned by
+ * comps_doc_pkgindex_next. Items are valid only until groups or their
+ * packages are modified.
+ * @param index COMPS_DocPkgIndex object
+ * @param groups list of COMPS_DocGroup objects
+ * @param name package name
+ * @return found item or NULL
+ */
+COMPS_DocPkgIndexItem* comps_doc_pkgindex_get(COMPS_DocPkgIndex *index,
+                                              COMPS_ObjList *groups,
+                                              const char *name);
+
+/** Return next occurrence of same package as item or NULL
+ * @see comps_doc_pkgindex_get
+ */
+COMPS_DocPkgIndexItem* comps_doc_pkgindex_next(COMPS_DocPkgIndexItem *item);
+
+//char* comps_doc_xml_str(COMPS_Doc* doc, char *enc, COMPS_Log *log);
+
+
+//static signed char comps_doc_xml(COMPS_Doc *doc, xmlTextWriterPtr writer);
+
+/** Write XML representation to file
+ * @param doc COMPS_Doc object
+ * @param filename filename where to write
+ * @param stdoutredirect in non-zero all warning and error messages will
+ * be redirected to stdout, otherwise will be stored in doc->log only
+ * @return 0 if there wasn't any errors, 1 if there was non-fatal errors
+ * -1 if fatal error emerge during xml generation
+ *
+ * Function doesn't clean up libxml2 global state, so it can run in several
+ * threads at once (on different documents). Call xmlCleanupParser() once at
+ * exit if needed
+ */
+signed char comps2xml_f(COMPS_Doc * doc, char *filename, char stdoutredirect,
+                        COMPS_XMLOptions *xml_options,
+                        COMPS_DefaultsOptions *def_options);
+
+/** Generate XML string representating COMPS_Doc structure
+ * @param doc COMPS_Doc object
+ * @return XML string
+ * @see comps2xml_f
+ */
+char* comps2xml_str(COMPS_Doc *doc, COMPS_XMLOptions *options,
+                    COMPS_DefaultsOptions *def_options);
+
+/** Union two COMPS_Doc structures
+ * COMPS_Doc structures are unioned as unioning it's subparts
+ * (group, categories, environments). Object with same 'id' attribute
+ * are regarded as equal and unioned by with each other
+ *
+ * @param c1 COMPS_Doc object
+ * @param c2 COMPS_Doc object
+ */
+COMPS_Doc* comps_doc_union(COMPS_Doc *c1, COMPS_Doc *c2);
+
+/** Union many COMPS_Doc structures at once
+ *
+ * Result is same as of comps_doc_union applied on documents one after
+ * another from left to right, but objects are collected only once in one
+ * accumulator instead of building intermediate document for every pair
+ * @param docs array of COMPS_Doc objects
+ * @param count number of documents in docs
+ * @return new COMPS_Doc object with encoding of first document or NULL if
+ * count is 0
+ */
+COMPS_Doc* comps_doc_union_many(COMPS_Doc **docs, unsigned int count);
+
+/** Union COMPS_Doc into existing one in place
+ *
+ * Groups, categories and environments with id present in src are
+ * replaced by their union and moved to the end of list, new objects from
+ * src are appended. Other objects of dst, including ones with duplicate
+ * id, aren't touched. Langpacks of src overwrite the ones of dst. Unlike
+ * comps_doc_union, which returns document with default doctype and
+ * without blacklist and whiteout, doctype, blacklist and whiteout of dst
+ * are kept
+ * @param dst COMPS_Doc object modified in place
+ * @param src COMPS_Doc object
+ */
+void comps_doc_merge_into(COMPS_Doc *dst, COMPS_Doc *src);
+COMPS_Doc* comps_doc_intersect(COMPS_Doc *c1, COMPS_Doc *c2);
+
+/** Return copy of document with objects limited to arches
+ *
+ * Categories, groups and environments without arches or with arches not
+ * intersecting \a arches are left out. Packages with arches not
+ * intersecting \a arches are removed from groups, group ids without arches
+ * or with arches not intersecting \a arches are removed from categories
+ * and environments
+ * @param source COMPS_Doc object
+ * @param arches COMPS_ObjList of arches
+ * @return new COMPS_Doc object
+ */
+COMPS_Doc* comps_doc_arch_filter(COMPS_Doc *source, COMPS_ObjList *arches);
+
+/** Filter document by several arch sets at once
+ *
+ * Result is the same as calling comps_doc_arch_filter for each set, but
+ * document is traversed once. Arches are mapped to bits, so arches of each
+ * object are looked up once and tested against all sets by masks
+ * @param source COMPS_Doc object
+ * @param arches array of COMPS_ObjList objects with arches
+ * @param count number of arch sets
+ * @return COMPS_ObjList of new COMPS_Doc objects, one for each arch set
+ */
+COMPS_ObjList* comps_doc_arch_filter_multi(COMPS_Doc *source,
+                                           COMPS_ObjList **arches,
+                                           unsigned int count);
+
+COMPS_Str* comps_doc_doctype_name_get(COMPS_Doc* doc);
+COMPS_Str* comps_doc_doctype_pubid_get(COMPS_Doc* doc);
+COMPS_Str* comps_doc_doctype_sysid_get(COMPS_Doc* doc);
+void comps_doc_doctype_name_set(COMPS_Doc* doc, COMPS_Str *val);
+void comps_doc_doctype_sysid_set(COMPS_Doc* doc, COMPS_Str *val);
+void comps_doc_doctype_pubid_set(COMPS_Doc* doc, COMPS_Str *val);
+
+//extern COMPS_ObjectInfo COMPS_Doc_ObjInfo;
+extern COMPS_ValRuleGeneric* COMPS_Doc_ValidateRules[];
+
+#endif //COMPS_DOC_H
+
@@ -0,0 +1,66 @@
+/* libcomps - C alternative to yum.comps library
+ * Copyright (C) 2013 Jindrich Luza
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * any later version.
+ *
+ * This program is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to  Free Software
+ * Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301,
+ * USA
+ */
+
+#ifndef COMPS_DOCBIN_H
+#define COMPS_DOCBIN_H
+
+#include "comps_doc.h"
+
+/** \file comps_docbin.h
+ * \brief Binary snapshot of COMPS_Doc object
+ *
+ * Snapshot is compact serialization of whole document which is loaded
+ * without xml parsing. File starts with header holding format version,
+ * byte order mark and checksum of the rest of file. Header is followed by
+ * table of unique strings, records of objects referring strings by their
+ * offsets in the table and indexes of offsets of group, category and
+ * environment records. Snapshots are meant as cache of parsed xml, they
+ * are written in native byte order and aren't portable between
+ * architectures.
+ *
+ * Loading maps file to memory, checks it and materializes objects with
+ * string values copied straight from the mapped string table. Ids, package
+ * names, arches and other values parser interns are interned once for
+ * every string in the table. Objects are allocated from current arena
+ * if there's one @see comps_arena_set_current
+ */
+
+/** version of snapshot format written by comps_doc_save_bin */
+#define COMPS_DOCBIN_VERSION 1
+
+/** Save binary snapshot of document to file
+ *
+ * Only values of COMPS_Str and COMPS_Num type can be stored in dictionaries
+ * of document
+ * @param doc COMPS_Doc object
+ * @param filename path to file
+ * @return 0 on success, -1 on error. errno is set to EINVAL if document
+ * contains values which can't be stored, otherwise by failed I/O
+ */
+signed char comps_doc_save_bin(COMPS_Doc *doc, const char *filename);
+
+/** Load document from binary snapshot made by comps_doc_save_bin
+ * @param filename path to file
+ * @return new COMPS_Doc object or NULL on error. errno is set to EINVAL if
+ * file isn't valid snapshot (different format version or byte order,
+ * checksum mismatch), otherwise by failed I/O
+ */
+COMPS_Doc* comps_doc_load_bin(const char *filename);
+
+#endif
@@ -0,0 +1,129 @@
+/* libcomps - C alternative to yum.comps library
+ * Copyright (C) 2013 Jindrich Luza
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * any later version.
+ *
+ * This program is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to  Free Software
+ * Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301,
+ * USA
+ */
+
+#ifndef COMPS_DOCDIFF_H
+#define COMPS_DOCDIFF_H
+
+#include "comps_doc.h"
+
+/** \file comps_docdiff.h
+ * \brief Structural difference of two COMPS_Doc objects
+ *
+ * comps_doc_diff compares groups, categories and environments of two
+ * documents by their ids and describes added, removed, changed and moved
+ * objects. Langpacks, blacklist, whiteout and doctype are compared too.
+ * Encoding and language of document aren't part of difference.
+ * comps_doc_patch applies such difference to document in place,
+ * so patching old document with comps_doc_diff(old, new) results in
+ * document equal to new. Objects in difference are copies, difference
+ * stays valid after compared documents are modified or destroyed.
+ *
+ * Objects without id are ignored, only first object with same id is
+ * compared.
+ */
+
+/** kind of change of one group, category or environment */
+typedef enum {
+    COMPS_DIFF_ADDED, /**< object is only in new document */
+    COMPS_DIFF_REMOVED, /**< object is only in old document */
+    COMPS_DIFF_CHANGED, /**< object differs in some properties */
+    COMPS_DIFF_MOVED /**< object is the same, but its position changed */
+} COMPS_DocDiffType;
+
+/** name changed */
+#define COMPS_DIFF_NAME 0x01
+/** description changed */
+#define COMPS_DIFF_DESC 0x02
+/** translations of name or description changed */
+#define COMPS_DIFF_LANG 0x04
+/** other property changed (display order, arches, default, ...) */
+#define COMPS_DIFF_ATTRS 0x08
+/** packages of group, group ids of category or environment or option ids
+ * of environment changed. Added and removed lists of change are empty when
+ * only order of them changed */
+#define COMPS_DIFF_CONTENT 0x10
+
+/** change of one group, category or environment */
+typedef struct {
+    COMPS_DocDiffType type;
+    int props; /**< COMPS_DIFF_NAME... flags of changed properties */
+    int pos;
+    /**< position in list of new document, -1 if object stays in place */
+    COMPS_Object *obj;
+    /**< new version of object, old one for removed object */
+    COMPS_ObjList *added;
+    /**< packages or group ids added to object, NULL if content is same */
+    COMPS_ObjList *removed;
+    /**< packages or group ids removed from object, NULL if content is
+     * same */
+    COMPS_ObjList *options_added; /**< option ids added to environment */
+    COMPS_ObjList *options_removed;
+    /**< option ids removed from environment */
+} COMPS_DocDiffItem;
+
+/** Structural difference of two COMPS_Doc objects
+ *
+ * Changes of every list are ordered so, that changes with position are
+ * in ascending order of positions. Removed objects go first
+ */
+typedef struct {
+    COMPS_DocDiffItem *groups;
+    unsigned int groups_len;
+    COMPS_DocDiffItem *categories;
+    unsigned int categories_len;
+    COMPS_DocDiffItem *envs;
+    unsigned int envs_len;
+    COMPS_ObjDict *langpacks; /**< added and changed langpacks */
+    COMPS_ObjList *langpacks_removed; /**< names of removed langpacks */
+    COMPS_ObjMDict *blacklist; /**< new blacklist if changed or NULL */
+    COMPS_ObjMDict *whiteout; /**< new whiteout if changed or NULL */
+    char doctype_changed; /**< doctype_* members are set */
+    COMPS_Str *doctype_name; /**< new doctype name */
+    COMPS_Str *doctype_sysid; /**< new doctype system id */
+    COMPS_Str *doctype_pubid; /**< new doctype public id */
+} COMPS_DocDiff;
+
+/** Compare two documents and return their structural difference
+ *
+ * Objects are paired by ids through hash index, so comparison takes
+ * linear time
+ * @param old_doc COMPS_Doc object
+ * @param new_doc COMPS_Doc object
+ * @return new COMPS_DocDiff object or NULL if memory allocation failed
+ */
+COMPS_DocDiff* comps_doc_diff(COMPS_Doc *old_doc, COMPS_Doc *new_doc);
+
+void comps_doc_diff_destroy(COMPS_DocDiff *diff);
+
+/** Return number of changes in difference, 0 for equal documents */
+unsigned int comps_doc_diff_len(const COMPS_DocDiff *diff);
+
+/** Apply difference to document in place
+ *
+ * Document doesn't have to be the one difference was made from. Removal of
+ * object which isn't in document is skipped, changed or moved object which
+ * isn't in document is added and added object which is already in document
+ * replaces it. All these are counted as conflicts.
+ * @param doc COMPS_Doc object
+ * @param diff COMPS_DocDiff object
+ * @return number of conflicts
+ */
+unsigned int comps_doc_patch(COMPS_Doc *doc, const COMPS_DocDiff *diff);
+
+#endif
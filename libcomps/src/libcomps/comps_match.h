@@ -0,0 +1,67 @@
+/* libcomps - C alternative to yum.comps library
+ * Copyright (C) 2013 Jindrich Luza
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * any later version.
+ *
+ * This program is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to  Free Software
+ * Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301,
+ * USA
+ */
+
+#ifndef COMPS_MATCH_H
+#define COMPS_MATCH_H
+
+#include "comps_obj.h"
+
+/** \file comps_match.h
+ * \brief Compiled fnmatch patterns
+ *
+ * Pattern is analyzed once and then matched by cheapest method giving
+ * the same result as fnmatch. Patterns without wildcards are compared as
+ * plain strings, patterns with single trailing asterisk as prefixes and
+ * patterns with asterisks only are matched segment by segment. Other
+ * patterns and patterns with flags other than FNM_NOESCAPE, FNM_PERIOD and
+ * FNM_PATHNAME are passed to fnmatch.
+ */
+
+typedef enum {
+    COMPS_PATTERN_EXACT, /**< pattern without wildcards */
+    COMPS_PATTERN_PREFIX, /**< literal followed by single asterisk */
+    COMPS_PATTERN_GLOB, /**< literal segments separated by asterisks */
+    COMPS_PATTERN_FNMATCH /**< pattern matched by fnmatch */
+} COMPS_PatternType;
+
+typedef struct {
+    COMPS_PatternType type;
+    int flags; /**< fnmatch flags */
+    char *pattern; /**< original pattern */
+    char *literal;
+    /**< literal part of exact and prefix pattern, first segment of glob */
+    unsigned int len; /**< length of literal */
+    char **segments; /**< segments of glob pattern */
+    unsigned int *lens; /**< lengths of segments */
+    unsigned int segments_len; /**< number of segments */
+} COMPS_Pattern;
+
+/** Compile pattern
+ * @param pattern fnmatch pattern
+ * @param flags fnmatch flags
+ * @return new COMPS_Pattern or NULL if memory allocation failed
+ */
+COMPS_Pattern* comps_pattern_compile(const char *pattern, int flags);
+
+void comps_pattern_destroy(COMPS_Pattern *pattern);
+
+/** Return non-zero if str matches pattern, same as comps_str_fnmatch */
+int comps_pattern_match(const COMPS_Pattern *pattern, const COMPS_Str *str);
+
+#endif
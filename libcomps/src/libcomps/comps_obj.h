@@ -0,0 +1,366 @@
+/* libcomps - C alternative to yum.comps library
+ * Copyright (C) 2013 Jindrich Luza
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * any later version.
+ *
+ * This program is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to  Free Software
+ * Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301,
+ * USA
+ */
+
+#ifndef COMPS_OBJECT_H
+#define COMPS_OBJECT_H
+
+#include "comps_mm.h"
+#include "comps_arena.h"
+
+/** \file comps_obj.h
+ * \brief COMPS_Object header file
+ *
+ */
+
+/** \def COMPS_OBJECT_CREATE(obj_type, args)
+ * \brief macro for create object by choosen type without explicit needs
+ * of typecast. Macro returns concrete type of object not
+ * COMPS_Object type. If you want use this macro, you have to declare
+ * COMPS_ObjectInfo object exactly as <YourObject>_ObjInfo
+ * @see COMPS_Object_TAIL
+ */
+
+/** \def COMPS_OBJECT_CMP(obj1, obj2)
+ * \brief macro for compare two COMPS_Object derivates without typecasting to
+ *  COMPS_Object pointer
+ */
+
+/** \def COMPS_OBJECT_DESTROY(obj1)
+ * \brief macro for call comps_object_destroy without typecasting to
+ *  COMPS_Object pointer
+ */
+
+/** \def COMPS_OBJECT_COPY(obj)
+ * \brief macro for call comps_object_copy without typecasting to
+ *  COMPS_Object pointer
+ */
+
+/** \def COMPS_Object_TAIL(obj)
+ * \brief insert "extern COMPS_ObjectInfo <obj>_ObjInfo" statement. Use this
+ * macro in combination with COMPS_OBJECT_CREATE
+ * @see COMPS_OBJECT_CREATE
+ */
+
+#define COMPS_OBJECT_CREATE(objtype, args)\
+    (objtype*)comps_object_create(&objtype##_ObjInfo, args)
+
+
+#define COMPS_OBJECT_CMP(obj1,obj2)\
+    comps_object_cmp((COMPS_Object*)obj1, (COMPS_Object*)obj2)
+
+#define COMPS_OBJECT_DESTROY(obj1)\
+    comps_object_destroy((COMPS_Object*)obj1)
+
+#define COMPS_OBJECT_COPY(obj)\
+    comps_object_copy(((COMPS_Object*)obj))
+
+#define COMPS_OBJECT_INCREF(obj)\
+    comps_object_incref(((COMPS_Object*)obj))
+
+#define COMPS_OBJECT_REPLACE(oldobj, TYPE, new_obj)\
+    COMPS_OBJECT_DESTROY(oldobj);\
+    oldobj = (TYPE*)COMPS_OBJECT_INCREF(new_obj);
+
+
+#define COMPS_CAST_CONSTR void (*)(COMPS_Object*, COMPS_Object**)
+#define COMPS_CAST_DESTR void (*)(COMPS_Object*)
+
+/** ensure that COMPS_Object derivate has need struct members for properly
+ * behaviour
+ */
+#define COMPS_Object_HEAD unsigned int refc;\
+                         unsigned int flags;\
+                         COMPS_ObjectInfo *obj_info
+
+/** object is allocated from arena @see comps_object_arena */
+#define COMPS_OBJ_ARENA 1
+/** object is followed by data allocated together with it (string value of
+ * COMPS_Str) */
+#define COMPS_OBJ_INLINE 2
+/** object is interned string shared by all its users
+ * @see comps_str_intern */
+#define COMPS_OBJ_INTERNED 4
+/** hash of COMPS_Str value is computed and cached in object */
+#define COMPS_OBJ_HASHED 8
+/** object is shared copy-on-write by several owners. Its reference counter
+ * is changed atomically @see comps_object_share */
+#define COMPS_OBJ_SHARED 16
+/** reference of object was handed out for modification, so object is never
+ * shared @see comps_object_expose */
+#define COMPS_OBJ_EXPOSED 32
+
+#define COMPS_Object_TAIL(obj) extern COMPS_ObjectInfo obj##_ObjInfo
+
+typedef struct COMPS_Object COMPS_Object;
+typedef struct COMPS_ObjectInfo COMPS_ObjectInfo;
+typedef struct COMPS_Packed COMPS_Packed;
+typedef struct COMPS_Num COMPS_Num;
+typedef struct COMPS_Str COMPS_Str;
+
+
+/** Structure holding all importating callback functions supporting
+ * COMPS_Object derivate proper behavior. All callbacks except constructor
+ * and destructor are optional @see comps_object_create
+ */
+struct COMPS_ObjectInfo {
+    size_t obj_size; /**< size of derivate object which is sizeof(obj) */
+    void (*constructor)(COMPS_Object*, COMPS_Object **);
+    /**< pointer to derivate object constructor @see comps_object_create*/
+    void (*destructor)(COMPS_Object*);
+    /**< pointer to derivate objects destructor @see comps_object_destroy*/
+    void (*copy)(COMPS_Object*, COMPS_Object*);
+    /**< pointer to derivate object copy function @see comps_object_copy*/
+    COMPS_Object* (*deep_copy)(COMPS_Object*, COMPS_Object*);
+    /**< currently unused*/
+    signed char (*obj_cmp)(COMPS_Object*, COMPS_Object*);
+    /**< pointer to comparator function*/
+    char* (*to_str)(COMPS_Object*);
+    /**< pointer to string representation convert function */
+    unsigned int (*hash)(COMPS_Object*);
+    /**< pointer to hash function. Objects equal by obj_cmp must have
+     * equal hashes @see comps_object_hash*/
+};
+
+/** COMPS Object structure
+ * COMPS_Object is basic structure from which are derived concrete COMPS
+ * structure. Using COMPS Object as bootstrap of concrete object ensure
+ * eventuality of creating and destroying with reference counting, copying,
+ * comparing with other object, string representation
+*/
+struct COMPS_Object {
+    unsigned int refc; /**< number of references besides the first one.
+                            Object is destroyed when it's released with
+                            zero refc */
+    unsigned int flags; /**< COMPS_OBJ_ARENA, COMPS_OBJ_INLINE,
+                             COMPS_OBJ_INTERNED, COMPS_OBJ_HASHED,
+                             COMPS_OBJ_SHARED, COMPS_OBJ_EXPOSED flags */
+    COMPS_ObjectInfo *obj_info; /**< pointer to COMPS_ObjectInfo struct*/
+};
+
+/** COMPS Object derivate representing number
+ *
+ * COMPS_Num represents integer (signer or unsigned) number as COMPS Object
+*/
+struct COMPS_Num {
+    COMPS_Object_HEAD; /** \n */
+    int val; /**< value of represented number*/
+};
+COMPS_Object_TAIL(COMPS_Num);
+
+/** COMPS Object derivate representing string
+ *
+ * COMPS_Str represents string as COMPS Object. Value created by comps_str is
+ * allocated together with object. Length is kept with value and hash is
+ * computed at first use, so string is scanned only once
+*/
+struct COMPS_Str {
+    COMPS_Object_HEAD; /** \n */
+    char *val; /**< holds reprezented string, freed at destruction time*/
+    unsigned int len; /**< length of val without terminating NUL */
+    unsigned int hash; /**< hash of val, valid if COMPS_OBJ_HASHED flag is
+                            set @see comps_str_hash */
+};
+COMPS_Object_TAIL(COMPS_Str);
+
+
+/** Create COMPS_Object derivate and pass \a args arguments to its constructor
+ * @param obj_info pointer to COMPS_ObjectInfo structure
+ * @param args array of arguments passed to derivate constructor. Array doesn't
+ * have to end with NULL sentinel.
+ * Processing args attribute passed to contructor
+ * is completely in programmer's care
+ * @return COMPS_Object derivate typecasted as general COMPS_Object
+ */
+COMPS_Object* comps_object_create(COMPS_ObjectInfo *obj_info, COMPS_Object **args);
+
+/** Destroy passed COMPS_Object derivate if its reference counter is zero
+ * if not, only decrement reference counter
+ */
+void comps_object_destroy(COMPS_Object *comps_obj);
+void comps_object_destroy_v(void *comps_obj);
+/** Return whole new copy of COMPS_Object derivate.
+ *
+ * Function create new allocation of derivate and call obj_copy callback with
+ * old instance and new instance of derivate. Copying inner structure members
+ * are in programmers care
+ * @param comps_obj derivate object want to be copied
+ * @return new copy of derivate object
+ * @see COMPS_ObjectInfo
+ */
+COMPS_Object* comps_object_copy(COMPS_Object *comps_obj);
+
+/** Return copy of COMPS_Object derivate which shares object itself
+ *
+ * Object is marked as shared and its reference counter is incremented, so
+ * copy costs nothing. Owners of shared object must not modify it, they
+ * replace it with private copy first by comps_object_unshare. Object which
+ * was exposed for modification is copied by comps_object_copy instead
+ * @param comps_obj derivate object want to be copied or NULL
+ * @return new reference of shared object or new copy of object
+ * @see comps_object_unshare
+ * @see comps_object_expose
+ */
+COMPS_Object* comps_object_share(COMPS_Object *comps_obj);
+
+/** Make object referenced from \a comps_obj private to its owner
+ *
+ * If object is shared with other owner, it's replaced with its copy and
+ * reference of shared object is released
+ * @param comps_obj pointer to owner's reference of object
+ * @return private object or NULL if referenced object is NULL
+ * @see comps_object_share
+ */
+COMPS_Object* comps_object_unshare(COMPS_Object **comps_obj);
+
+/** Make object referenced from \a comps_obj private to its owner and mark
+ * it as exposed
+ *
+ * Call this function before reference of object is handed out to code which
+ * could modify object. Exposed object is never shared by comps_object_share
+ * @param comps_obj pointer to owner's reference of object
+ * @return private object or NULL if referenced object is NULL
+ * @see comps_object_unshare
+ */
+COMPS_Object* comps_object_expose(COMPS_Object **comps_obj);
+
+/** Compare two COMPS_Object derivates and return non-zero value if equals
+ *
+ * \warning Function doen't check equality of derivate types (COMPS_ObjectInfo)!!
+ *
+ * @param obj1 first derivate
+ * @param obj2 second derivate
+ * @return non-zero value if equals, zero otherwise
+*/
+signed char comps_object_cmp(COMPS_Object *obj1, COMPS_Object *obj2);
+char comps_object_cmp_v(void *obj1, void *obj2);
+
+/** Return string representation of COMPS_Object derivate
+ *
+ * \warning
+ * Returned string is new allocation which needs to be freed manualy
+ *
+ * @param obj1 COMPS_Object derivate
+ * @return new alllocation of string representation of concrete object
+ */
+char* comps_object_tostr(COMPS_Object *obj1);
+
+/** Return hash of COMPS_Object derivate
+ *
+ * Objects which are equal by comps_object_cmp have equal hashes. If object
+ * type doesn't provide hash function, zero is returned
+ *
+ * @param obj COMPS_Object derivate
+ * @return hash value
+ */
+unsigned int comps_object_hash(COMPS_Object *obj);
+unsigned int comps_object_hash_v(void *obj);
+
+/** Increment COMPS_Object derivate reference counter
+ */
+COMPS_Object* comps_object_incref(COMPS_Object *obj);
+
+/** Return arena object is allocated from
+ * @param obj COMPS_Object derivate
+ * @return arena or NULL if object is allocated on heap
+ * @see comps_arena.h
+ */
+COMPS_Arena* comps_object_arena(COMPS_Object *obj);
+
+/** Directly construct COMPS_Num derivate from passed argument
+ * @param n value of COMPS_Num
+ */
+COMPS_Num* comps_num(int n);
+
+/** Directly construct COMPS_Str derivate from passed argument
+ *
+ * passed argument is copied as new allocation
+ * @param s string value of derivate
+ */
+COMPS_Str* comps_str(const char *s);
+
+/** Directly construct COMPS_Str derivate from passed argument
+ *
+ * \warning
+ * passed argument is not copied. COMPS_Str derivate use same memory place as
+ * \a s argument and during destruction of derivate this memory place is freed
+ * @param s string value of derivate
+ */
+COMPS_Str* comps_str_x(char *s);
+
+/** Return interned COMPS_Str with value \a s
+ *
+ * All interned strings with the same value which exist at the same time are
+ * one shared object, so they take memory only once and are equal only if
+ * they are the same object. Copy of interned string is the string itself
+ * with incremented reference counter. Parser and setters intern ids, package
+ * names, requires and arches, which repeat across documents. Interning is
+ * thread safe
+ * @param s string value
+ * @return interned string with incremented reference counter
+ */
+COMPS_Str* comps_str_intern(const char *s);
+
+/** Directly construct COMPS_Str derivate from first \a len bytes of \a s
+ *
+ * \a s doesn't have to be NUL terminated. Value is allocated together with
+ * object
+ * @param s string value of derivate
+ * @param len length of value
+ */
+COMPS_Str* comps_str_n(const char *s, size_t len);
+
+/** Set memory copy of passed argument as COMPS_Str value
+ *
+ * If new value isn't longer than current value allocated together with
+ * object, it's stored in place
+ * \warning \a str->val mustn't be changed by other way, because it would
+ * invalidate length and hash of string
+ * \warning interned strings are shared, so they must not be changed
+ * @see comps_str_intern
+ * @param str COMPS_Str object
+ * @param s desired new COMPS_Str object value
+ */
+void comps_str_set(COMPS_Str *str, char *s);
+
+/** Return hash of plain C string
+ *
+ * Returned value is the same as comps_object_hash returns for COMPS_Str
+ * object with same value
+ * @param s string
+ */
+unsigned int comps_str_hash(const char *s);
+
+//extern COMPS_ObjectInfo COMPS_Num_ObjInfo;
+//extern COMPS_ObjectInfo COMPS_Str_ObjInfo;
+
+/** Return non-zero if str match the pattern by fnmatch
+ *
+ * @param str source string. COMPS_Str object
+ * @param pattern match pattern
+ */
+signed char comps_str_fnmatch(COMPS_Str *str, char *pattern, int flags);
+
+/** Return non-zero if str match the pattern by fnmatch
+ *
+ * @param str source string. COMPS_Str object
+ * @param pattern COMPS_Str match pattern
+ */
+signed char comps_str_fnmatch_o(COMPS_Str *str, COMPS_Str *pattern, int flags);
+
+#endif
@@ -0,0 +1,162 @@
+/* libcomps - C alternative to yum.comps library
+ * Copyright (C) 2013 Jindrich Luza
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * any later version.
+ *
+ * This program is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to  Free Software
+ * Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301,
+ * USA
+ */
+
+#ifndef COMPS_PARSE_H
+#define COMPS_PARSE_H
+#include <stdio.h>
+#include <signal.h>
+
+#include "comps_hslist.h"
+#include "comps_obj.h"
+#include "comps_doc.h"
+#include "comps_types.h"
+#include "comps_log.h"
+#include "comps_default.h"
+
+#include <expat.h>
+#include <libxml/parser.h>
+
+typedef struct COMPS_Parsed COMPS_Parsed;
+
+/** Handler of finished group, category or environment.
+ * @see COMPS_Parsed
+ * @param obj COMPS_DocGroup, COMPS_DocCategory or COMPS_DocEnv object. Object
+ * is removed from parsed document after handler returns, so handler has to
+ * increment its reference counter to keep it
+ * @param data obj_handler_data member of COMPS_Parsed
+ */
+typedef void (*COMPS_ParseObjHandler)(COMPS_Object *obj, void *data);
+
+struct COMPS_Parsed {
+    COMPS_HSList *elem_stack;
+    COMPS_Doc *comps_doc;
+    char *text_buffer; /**< text data of currently parsed element. Buffer
+                            is reused for all elements */
+    size_t text_buffer_len; /**< length of text data in text_buffer */
+    size_t text_buffer_size; /**< allocated size of text_buffer */
+    size_t text_first_len; /**< length of first text piece in text_buffer */
+    size_t text_ws_len; /**< length of whitespace kept after text data in
+                             text_buffer, waiting for rest of the text line */
+    char text_line; /**< non-whitespace text found on current line */
+    unsigned skip_depth; /**< depth of currently skipped section subtree */
+    char *tmp_buffer;
+    COMPS_Log *log;
+    char fatal_error;
+    XML_Parser parser;
+    const char *enc;
+    COMPS_DefaultsOptions *def_options;
+
+    COMPS_Str *doctype_name;
+    COMPS_Str *doctype_sysid;
+    COMPS_Str *doctype_pubid;
+
+    COMPS_ParseObjHandler obj_handler;
+    /**< if set, groups, categories and environments are passed to handler
+     * as soon as their end tag is parsed instead of being kept in comps_doc,
+     * so memory usage doesn't grow with size of input */
+    void *obj_handler_data; /**< data passed to obj_handler */
+    COMPS_Arena *arena;
+    /**< arena parsed objects are allocated from if def_options->arena
+     * is set. @see comps_arena.h */
+};
+
+COMPS_Parsed* comps_parse_parsed_create();
+void comps_parse_parsed_reinit(COMPS_Parsed *parsed);
+void comps_parse_parsed_destroy(COMPS_Parsed *parsed);
+unsigned comps_parse_parsed_init(COMPS_Parsed * parsed, const char * encoding,
+                                 char log_stdout);
+
+unsigned __comps_is_whitespace_only(const char * s, int len);
+
+void comps_parse_end_elem_handler(void *userData, const XML_Char *s);
+void comps_parse_def_handler(void *userData, const XML_Char *s, int len);
+void comps_parse_start_elem_handler(void *userData,
+                              const XML_Char *s,
+                              const XML_Char **attrs);
+void comps_parse_char_data_handler(void *userData,
+                            const XML_Char *s,
+                            int len);
+void comps_parse_start_doctype(void *userData,
+                               const XML_Char *doctypeName,
+                               const XML_Char *sysid,
+                               const XML_Char *pubid,
+                               int standalone);
+
+/** Parse comps xml from opened file. Regular files are mapped to memory
+ * and passed to parser at once, other streams are read by chunks.
+ * gzip, xz and zstd compressed input is detected by magic bytes and
+ * decompressed by chunks straight into parser buffer (support for each format
+ * depends on libraries found at build time). File is closed after parsing
+ */
+signed char comps_parse_file(COMPS_Parsed *parsed, FILE *f,
+                             COMPS_DefaultsOptions *options);
+signed char comps_parse_str(COMPS_Parsed *parsed, char *str,
+                            COMPS_DefaultsOptions *options);
+/** Parse comps xml from memory block of \a len bytes. \a str doesn't have to
+ * be NUL terminated and isn't copied. Compressed block is decompressed the same
+ * way as in comps_parse_file
+ */
+signed char comps_parse_str_n(COMPS_Parsed *parsed, const char *str,
+                              size_t len, COMPS_DefaultsOptions *options);
+
+/** Parse next chunk of comps xml. Chunks can be split at any byte position,
+ * so data can be passed to parser as it arrives (from pipe, network...).
+ * Data aren't kept after call returns. Parsing is finished by
+ * comps_parse_close. Input isn't decompressed, chunks have to form plain xml.
+ * Options used for missing attributes can be set to \a parsed->def_options
+ * before first chunk is passed
+ * @param parsed initialized COMPS_Parsed
+ * @param data chunk of xml
+ * @param len length of chunk
+ * @return -1 if fatal error occured (parser is stopped then), 1 if some
+ * non-fatal error occured, 0 otherwise
+ */
+signed char comps_parse_feed(COMPS_Parsed *parsed, const char *data,
+                             size_t len);
+
+/** Finish parsing of chunks passed by comps_parse_feed
+ * @param parsed COMPS_Parsed chunks were passed to
+ * @return same values as comps_parse_feed
+ */
+signed char comps_parse_close(COMPS_Parsed *parsed);
+
+/** Parse \a count comps xml files on pool of \a workers threads. Each worker
+ * keeps one COMPS_Parsed (and expat parser, which is reset between files)
+ * for all files it processes.
+ * @param paths names of files
+ * @param count number of files
+ * @param workers number of threads. 0 means number of online processors.
+ * Pool never has more threads than files
+ * @param options options used for each file, NULL for defaults
+ * @param rets array of \a count return values of comps_parse_file, may be
+ * NULL. File which can't be opened gets -1
+ * @return COMPS_ObjList of \a count COMPS_Doc in order of \a paths or NULL if
+ * threads can't be started. Log of each document contains messages of its
+ * parse
+ */
+COMPS_ObjList* comps_parse_many(const char **paths, size_t count,
+                                unsigned workers,
+                                COMPS_DefaultsOptions *options,
+                                signed char *rets);
+
+unsigned comps_parse_init_parser(XML_Parser *p);
+void comps_parse_parsed_destroy(COMPS_Parsed *parsed);
+int comps_parse_validate_dtd(char *filename, char *dtd_file);
+
+#endif
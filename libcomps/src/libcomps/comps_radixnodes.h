@@ -0,0 +1,90 @@
+/* libcomps - C alternative to yum.comps library
+ * Copyright (C) 2013 Jindrich Luza
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * any later version.
+ *
+ * This program is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to  Free Software
+ * Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301,
+ * USA
+ */
+
+#ifndef COMPS_RADIXNODES_H
+#define COMPS_RADIXNODES_H
+
+/** \file comps_radixnodes.h
+ * \brief Compact children container of COMPS_ObjRTree and COMPS_ObjMRTree
+ * nodes
+ *
+ * Children are kept in one array of node pointers followed by array of
+ * first characters of children keys, so lookup scans few contiguous bytes
+ * without touching children nodes. Nodes with more than
+ * COMPS_RADIXNODES_INDEX_MIN children get additional 256 bytes table
+ * mapping first character to position in array. Node without children
+ * doesn't allocate anything.
+ */
+
+/** number of children above which children are looked up through index */
+#define COMPS_RADIXNODES_INDEX_MIN 16
+
+typedef struct {
+    void **nodes;
+    /**< children nodes followed by first characters of their keys */
+    unsigned char *index;
+    /**< position+1 of child by first character of key, NULL for small nodes*/
+    unsigned short len; /**< number of children */
+    unsigned short size; /**< allocated capacity of nodes array */
+} COMPS_RadixNodes;
+
+/** first characters of children keys, item at position x belongs to
+ * rn->nodes[x] */
+#define COMPS_RADIXNODES_KEYS(rn) ((char*)((rn)->nodes + (rn)->size))
+
+/** initialize empty children container */
+void comps_radixnodes_init(COMPS_RadixNodes *rn);
+
+/** destroy all children with destructor and free container arrays. Container
+ * is left empty
+ * @param rn children container
+ * @param destructor child destructor, could be NULL
+ */
+void comps_radixnodes_clear(COMPS_RadixNodes *rn, void (*destructor)(void*));
+
+/** return position of child with key starting with character c or -1
+ * if there's no such child
+ */
+int comps_radixnodes_find(const COMPS_RadixNodes *rn, char c);
+
+/** return position where child with key starting with c should be inserted
+ * to keep children sorted by first key character
+ */
+unsigned comps_radixnodes_lower(const COMPS_RadixNodes *rn, char c);
+
+/** insert child at position pos
+ * @param rn children container
+ * @param pos position of new child, at most rn->len
+ * @param c first character of child key
+ * @param node child node
+ * @return 0 on success, -1 if memory allocation failed
+ */
+int comps_radixnodes_insert(COMPS_RadixNodes *rn, unsigned pos, char c,
+                            void *node);
+
+/** remove child at position pos. Child itself isn't destroyed */
+void comps_radixnodes_remove(COMPS_RadixNodes *rn, unsigned pos);
+
+/** make dst exact copy of src container. Children nodes aren't copied, dst
+ * holds same node pointers as src and caller is expected to replace them
+ * @return 0 on success, -1 if memory allocation failed
+ */
+int comps_radixnodes_copy(COMPS_RadixNodes *dst, const COMPS_RadixNodes *src);
+
+#endif
@@ -0,0 +1,300 @@
+/* libcomps - C alternative to yum.comps library
+ * Copyright (C) 2013 Jindrich Luza
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * any later version.
+ *
+ * This program is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to  Free Software
+ * Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301,
+ * USA
+ */
+
+#ifndef COMPS_UTILS_H
+#define COMPS_UTILS_H
+
+#include <stdlib.h>
+#include <string.h>
+#include <stdbool.h>
+
+#include "comps_obj.h"
+#include "comps_objlist.h"
+#include "comps_set.h"
+
+#include <libxml/encoding.h>
+#include <libxml/xmlwriter.h>
+#include <libxml/tree.h>
+
+
+#define CONCAT(A,B) CONCAT2(A, B)
+#define CONCAT2(A, B) A ## B
+
+#define COMPS_PROP_CMP(OBJNAME, PROPNAME, GETTER)\
+char CONCAT(CONCAT(CONCAT(CONCAT(__comps_, OBJNAME),_),PROPNAME),cmp) (void *obj1,\
+                                                                       void *obj2){\
+    COMPS_Prop *prop1, *prop2;\
+    prop1 = GETTER(obj1, #PROPNAME);\
+    prop2 = GETTER(obj2, #PROPNAME);\
+    if (prop1 == NULL && prop2 == NULL) return 1;\
+    if (prop1 == NULL || prop2 == NULL) return 0;\
+    if (prop1->prop_type != COMPS_PROP_STR ||\
+        prop2->prop_type != COMPS_PROP_STR) return 0;\
+    return __comps_strcmp(prop1->prop.str, prop2->prop.str);\
+}
+
+#define COMPS_STRPROP_SETTER(OBJNAME, OBJTYPE, PROPNAME)\
+inline void CONCAT(CONCAT(CONCAT(comps_doc, OBJNAME), _set_), PROPNAME)(OBJTYPE *OBJNAME,\
+                                                                        char *PROPNAME,\
+                                                                        char copy) {\
+    (void)copy;\
+    if (PROPNAME) {\
+        COMPS_Str *str;\
+        str = comps_str(PROPNAME);\
+        COMPS_OBJECT_DESTROY(OBJNAME->PROPNAME);\
+        OBJNAME->PROPNAME = str;\
+    }\
+}
+
+/** Revision of ids and names of objects indexed together
+ *
+ * Index or cache gives its own revision to every object it's built from,
+ * unless the object already has one from other index. Setters of id, name
+ * or package type bump revision of changed object, so only indexes and
+ * caches built from that object become out of date.
+ * @see COMPS_IDPROP_SETTER
+ */
+typedef struct {
+    unsigned int refc; /**< number of objects and watches holding revision */
+    unsigned long rev;
+} COMPS_IdRev;
+
+/** Revisions of objects index or cache was built from */
+typedef struct {
+    COMPS_IdRev *own;
+    /**< revision given to objects without revision, NULL until first use */
+    COMPS_IdRev **foreign;
+    /**< revisions objects got from other indexes */
+    unsigned int foreign_len;
+    unsigned int foreign_size;
+    char failed; /**< some revision couldn't be recorded */
+} COMPS_IdRevWatch;
+
+/** Increment revision of changed object. Objects can be shared by
+ * documents used in several threads, so increment is atomic
+ * @param rev object's revision or NULL if object wasn't indexed yet
+ */
+void comps_idrev_bump(COMPS_IdRev *rev);
+
+/** Release object's revision when object is destroyed */
+void comps_idrev_release(COMPS_IdRev *rev);
+
+void comps_idrev_watch_init(COMPS_IdRevWatch *watch);
+
+/** Forget recorded revisions before index is built again. Own revision
+ * is kept, objects could still hold it */
+void comps_idrev_watch_clear(COMPS_IdRevWatch *watch);
+void comps_idrev_watch_destroy(COMPS_IdRevWatch *watch);
+
+/** Record revision of object, give object watch's own revision if it
+ * has none yet
+ * @param watch COMPS_IdRevWatch of index
+ * @param rev revision member of indexed object
+ */
+void comps_idrev_watch_add(COMPS_IdRevWatch *watch, COMPS_IdRev **rev);
+
+/** Return current state of all recorded revisions. State only grows, so
+ * index is up to date while state equals the one read after build
+ * @param watch COMPS_IdRevWatch object
+ * @return state to be compared by comps_idrev_watch_check
+ */
+unsigned long comps_idrev_watch_rev(COMPS_IdRevWatch *watch);
+
+/** Return nonzero if no recorded object changed since state was read */
+char comps_idrev_watch_check(COMPS_IdRevWatch *watch, unsigned long rev);
+
+#define COMPS_IDPROP_SETTER(OBJNAME, OBJTYPE)\
+inline void CONCAT(CONCAT(comps_doc, OBJNAME), _set_id)(OBJTYPE *OBJNAME,\
+                                                        char *id,\
+                                                        char copy) {\
+    (void)copy;\
+    if (id) {\
+        COMPS_Str *str;\
+        str = comps_str_intern(id);\
+        COMPS_OBJECT_DESTROY(OBJNAME->id);\
+        OBJNAME->id = str;\
+        comps_idrev_bump(OBJNAME->id_rev);\
+    }\
+}
+
+#define COMPS_NAMEPROP_SETTER(OBJNAME, OBJTYPE)\
+inline void CONCAT(CONCAT(comps_doc, OBJNAME), _set_name)(OBJTYPE *OBJNAME,\
+                                                          char *name,\
+                                                          char copy) {\
+    (void)copy;\
+    if (name) {\
+        COMPS_Str *str;\
+        str = comps_str(name);\
+        COMPS_OBJECT_DESTROY(OBJNAME->name);\
+        OBJNAME->name = str;\
+        comps_idrev_bump(OBJNAME->id_rev);\
+    }\
+}
+
+#define HEAD_COMPS_STRPROP_SETTER(OBJNAME, OBJTYPE, PROPNAME)\
+void CONCAT(CONCAT(CONCAT(comps_doc, OBJNAME), _set_), PROPNAME)(OBJTYPE *OBJNAME,\
+                                                                 char *PROPNAME,\
+                                                                 char copy);
+
+#define COMPS_NUMPROP_SETTER(OBJNAME, OBJTYPE, PROPNAME)\
+inline void CONCAT(CONCAT(CONCAT(comps_doc, OBJNAME), _set_), PROPNAME)(OBJTYPE *OBJNAME,\
+                                                                        int PROPNAME,\
+                                                                        bool unset){\
+    COMPS_OBJECT_DESTROY(OBJNAME->PROPNAME);\
+    OBJNAME->PROPNAME = (unset) ? NULL : comps_num(PROPNAME);\
+}
+#define HEAD_COMPS_NUMPROP_SETTER(OBJNAME, OBJTYPE, PROPNAME)\
+void CONCAT(CONCAT(CONCAT(comps_doc, OBJNAME), _set_), PROPNAME)(OBJTYPE *OBJNAME,\
+                                                                 int PROPNAME,\
+                                                                 bool unset);
+
+
+#define COMPS_PROP_GETTER(OBJNAME, OBJTYPE, PROPNAME)\
+inline COMPS_Object* CONCAT(CONCAT(CONCAT(comps_doc, OBJNAME), _get_), PROPNAME)\
+                                                         (OBJTYPE *OBJNAME){\
+    return comps_object_incref((COMPS_Object*)OBJNAME->PROPNAME);\
+}
+#define HEAD_COMPS_PROP_GETTER(OBJNAME, OBJTYPE, PROPNAME)\
+COMPS_Object* CONCAT(CONCAT(CONCAT(comps_doc, OBJNAME), _get_), PROPNAME)\
+                                                            (OBJTYPE *OBJNAME);
+#define COMPS_PROP_GETTER_OBJ(OBJNAME, OBJTYPE, PROPNAME)\
+inline COMPS_Object* CONCAT(CONCAT(CONCAT(CONCAT(comps_doc, OBJNAME),\
+                                           _get_), PROPNAME), _obj)\
+                                                      (COMPS_Object *OBJNAME){\
+    return CONCAT(CONCAT(CONCAT(comps_doc, OBJNAME), _get_), PROPNAME)\
+                                                        ((OBJTYPE*)OBJNAME);\
+}
+#define HEAD_COMPS_PROP_GETTER_OBJ(OBJNAME, PROPNAME)\
+COMPS_Object* CONCAT(CONCAT(CONCAT(CONCAT(comps_doc, OBJNAME),\
+                                   _get_), PROPNAME), _obj)\
+                                                        (COMPS_Object *OBJNAME);
+
+
+#define COMPS_CREATE_u(NAME, TYPE) void CONCAT(CONCAT(comps_, NAME), _create_u)\
+                                                        (COMPS_Object *uobj,\
+                                                         COMPS_Object **args) {\
+    CONCAT(CONCAT(comps_, NAME),_create)((TYPE*)uobj, args);\
+}
+#define HEAD_COMPS_CREATE_u(NAME, TYPE) void CONCAT(CONCAT(comps_, NAME), _create_u)\
+                                                        (COMPS_Object *uobj,\
+                                                         COMPS_Object **args);
+
+#define COMPS_COPY_u(NAME, TYPE) void CONCAT(CONCAT(comps_,NAME),_copy_u)\
+                                                            (COMPS_Object* obj_dst,\
+                                                             COMPS_Object* obj_src){\
+    CONCAT(CONCAT(comps_, NAME),_copy) ((TYPE*)obj_dst, (TYPE*)obj_src);\
+}
+#define HEAD_COMPS_COPY_u(NAME, TYPE) void CONCAT(CONCAT(comps_,NAME),_copy_u)\
+                                                        (COMPS_Object* obj_dst,\
+                                                         COMPS_Object* obj_src);
+
+#define COMPS_DESTROY_u(NAME, TYPE)\
+static void CONCAT(CONCAT(comps_, NAME), _destroy_u)(COMPS_Object* obj){\
+    CONCAT(CONCAT(comps_, NAME),_destroy) ((TYPE*)obj);\
+}
+#define HEAD_COMPS_DESTROY_u(NAME, TYPE)\
+static void CONCAT(CONCAT(comps_, NAME), _destroy_u)(COMPS_Object* obj);
+
+#define COMPS_CMP_u(NAME, TYPE) signed char CONCAT(CONCAT(comps_,NAME),_cmp_u)\
+                                                            (COMPS_Object* obj_dst,\
+                                                             COMPS_Object* obj_src){\
+    return CONCAT(CONCAT(comps_, NAME),_cmp) ((TYPE*)obj_dst, (TYPE*)obj_src);\
+}
+#define HEAD_COMPS_CMP_u(NAME, TYPE) void CONCAT(CONCAT(comps_,NAME),_cmp_u)\
+
+
+#define COMPS_DOCOBJ_GETOBJLIST(OBJ, OBJTYPE, MEMBER, OBJS)\
+COMPS_ObjList* CONCAT(CONCAT(CONCAT(comps_, OBJ), _), OBJS) (OBJTYPE *obj){\
+    return (COMPS_ObjList*)comps_object_expose((COMPS_Object**)&obj->MEMBER);\
+}
+#define HEAD_COMPS_DOCOBJ_GETOBJLIST(OBJ, OBJTYPE, MEMBER, OBJS)\
+COMPS_ObjList* CONCAT(CONCAT(CONCAT(comps_, OBJ), _), OBJS) (OBJTYPE *obj);
+
+#define COMPS_DOCOBJ_SETOBJLIST(OBJ, OBJTYPE, MEMBER, OBJS)\
+void CONCAT(CONCAT(CONCAT(comps_, OBJ), _set_), OBJS) (OBJTYPE *obj,\
+                                                   COMPS_ObjList *list){\
+    COMPS_OBJECT_DESTROY(obj->MEMBER);\
+    obj->MEMBER = (COMPS_ObjList*)comps_object_incref((COMPS_Object*)list);\
+    comps_object_expose((COMPS_Object**)&obj->MEMBER);\
+}
+#define HEAD_COMPS_DOCOBJ_SETOBJLIST(OBJ, OBJTYPE, MEMBER, OBJS)\
+void CONCAT(CONCAT(CONCAT(comps_, OBJ), _set_), OBJS) (OBJTYPE *obj,\
+                                                   COMPS_ObjList *list);
+
+#define COMPS_DOCOBJ_GETARCHES(OBJ, OBJTYPE)\
+COMPS_ObjList* CONCAT(CONCAT(comps_, OBJ), _arches) (OBJTYPE *obj){\
+    return (COMPS_ObjList*)comps_object_incref((COMPS_Object*)obj->arches);\
+}
+#define HEAD_COMPS_DOCOBJ_GETARCHES(OBJ, OBJTYPE)\
+COMPS_ObjList* CONCAT(CONCAT(comps_, OBJ), _arches)(OBJTYPE *obj);
+
+#define COMPS_DOCOBJ_SETARCHES(OBJ, OBJTYPE)\
+void CONCAT(CONCAT(comps_, OBJ), _set_arches)(OBJTYPE *obj,\
+                                              COMPS_ObjList *list){\
+    COMPS_OBJECT_DESTROY(obj->arches);\
+    obj->arches = list;\
+}
+#define HEAD_COMPS_DOCOBJ_SETARCHES(OBJ, OBJTYPE)\
+void CONCAT(CONCAT(comps_, OBJ), _set_arches)(OBJTYPE *obj,\
+                                              COMPS_ObjList *list);
+
+
+#define COMPS_XMLRET_CHECK if (ret == -1) {\
+    comps_log_error(log, COMPS_ERR_XMLGEN, 0);\
+    return -1;\
+}
+
+char __comps_strcmp(void *s1, void *s2);
+char* __comps_strcpy(char *str);
+char* __comps_strcat(char *str1, char *str2);
+void* __comps_str_clone(void *str);
+int __comps_xml_prop(char *key, char *val, xmlTextWriterPtr writer);
+char* __comps_num2boolstr(COMPS_Object* obj);
+unsigned int digits_count(unsigned int x);
+bool __comps_objlist_intersected(COMPS_ObjList *list1, COMPS_ObjList *list2);
+
+/** Return union of two values of the same property. Value of second object
+ * wins, value of first one is used when second one is not set. Value is
+ * shared, not copied
+ * @param prop1 property value of first object or NULL
+ * @param prop2 property value of second object or NULL
+ * @return new reference of property value or NULL
+ */
+COMPS_Object* __comps_prop_union(COMPS_Object *prop1, COMPS_Object *prop2);
+
+/** Return shared list if union of two lists of the same property is one of
+ * them
+ * @param list1 list of first object or NULL
+ * @param list2 list of second object or NULL
+ * @return new reference of shared list or NULL if lists have to be merged
+ * @see comps_object_share
+ */
+COMPS_ObjList* __comps_list_union(COMPS_ObjList *list1, COMPS_ObjList *list2);
+
+/** Return value of property if it's set and equal in both objects
+ * @param prop1 property value of first object or NULL
+ * @param prop2 property value of second object or NULL
+ * @return new reference of property value or NULL
+ */
+COMPS_Object* __comps_prop_intersect(COMPS_Object *prop1, COMPS_Object *prop2);
+char* __comps_xml_arch_str(COMPS_Object *arches);
+int __comps_xml_arch(COMPS_Object *archlist, xmlTextWriterPtr writer);
+
+int __comps_check_xml_get(int retcode, COMPS_Object * log);
+#endif
@@ -24,11 +24,14 @@
  */
 
 #include <stdbool.h>
+#include <errno.h>
 
 #include "pycomps_23macros.h"
 #include "pycomps.h"
 #include "pycomps_exc.h"
 
+#include <libxml/parser.h>
+
 #if PY_MAJOR_VERSION >= 3
     #define MODINIT_RET_NONE return NULL
     #define PY_OBJ_HEAD_INIT PyVarObject_HEAD_INIT(NULL, 0)
@@ -92,12 +95,13 @@ char __pycomps_dict_to_def_opts(PyObject* pobj, void *cobj) {
     int x;
     long tmp;
     const char *keys2[] = {"default_uservisible", "default_biarchonly",
-                           "default_default", NULL};
+                           "default_default", "arena", NULL};
     const char *keys1[] = {"default_pkgtype", NULL};
     *options = malloc(sizeof(COMPS_DefaultsOptions));
     bool *props2[] = {&(*options)->default_uservisible,
                       &(*options)->default_biarchonly,
-                      &(*options)->default_default};
+                      &(*options)->default_default,
+                      &(*options)->arena};
     int *props1[] = {&(*options)->default_pkgtype};
     **options = COMPS_DDefaultsOptions;
 
@@ -133,6 +137,70 @@ char __pycomps_dict_to_def_opts(PyObject* pobj, void *cobj) {
     return 1;
 }
 
+/* Set sections which aren't listed in sections sequence to be skipped by
+ * parser. Options are allocated if needed. Return -1 and set exception on
+ * error */
+static int __pycomps_sections_to_def_opts(PyObject *sections,
+                                          COMPS_DefaultsOptions **options) {
+    const char *names[] = {"groups", "categories", "environments",
+                           "langpacks", "blacklist", "whiteout", NULL};
+    const int flags[] = {COMPS_SECTION_GROUPS, COMPS_SECTION_CATEGORIES,
+                         COMPS_SECTION_ENVIRONMENTS, COMPS_SECTION_LANGPACKS,
+                         COMPS_SECTION_BLACKLIST, COMPS_SECTION_WHITEOUT};
+    PyObject *it, *item;
+    char *name;
+    int wanted = 0, x;
+
+    if (!sections || sections == Py_None)
+        return 0;
+    if (PyUnicode_Check(sections) || PyBytes_Check(sections)) {
+        PyErr_SetString(PyExc_TypeError,
+                        "sections has to be sequence of section names");
+        return -1;
+    }
+    if (!(it = PyObject_GetIter(sections)))
+        return -1;
+    while ((item = PyIter_Next(it)) != NULL) {
+        x = __pycomps_arg_to_char(item, &name);
+        Py_DECREF(item);
+        if (x) {
+            Py_DECREF(it);
+            return -1;
+        }
+        for (x = 0; names[x] != NULL && strcmp(names[x], name) != 0; x++);
+        if (!names[x]) {
+            PyErr_Format(PyExc_ValueError, "Unknown section '%s'", name);
+            free(name);
+            Py_DECREF(it);
+            return -1;
+        }
+        wanted |= flags[x];
+        free(name);
+    }
+    Py_DECREF(it);
+    if (PyErr_Occurred())
+        return -1;
+    if (!*options) {
+        *options = malloc(sizeof(COMPS_DefaultsOptions));
+        **options = COMPS_DDefaultsOptions;
+    }
+    (*options)->skip_sections = COMPS_SECTION_ALL & ~wanted;
+    return 0;
+}
+
+/* Serialization runs without the GIL on private copy of the document, so
+ * other threads can't modify it in the meantime. Messages logged during
+ * serialization are moved back to the document log afterwards */
+static COMPS_Doc* __pycomps_doc_snapshot(PyCOMPS *self) {
+    return (COMPS_Doc*)comps_object_copy((COMPS_Object*)self->comps_doc);
+}
+
+static void __pycomps_log_take(COMPS_Log *dst, COMPS_Log *src) {
+    void *entry;
+    while ((entry = comps_hslist_shift(src->entries)) != NULL)
+        comps_hslist_append(dst->entries, entry, 0);
+}
+
 PyObject* PyCOMPS_toxml_f(PyObject *self, PyObject *args, PyObject *kwds) {
     const char *errors = NULL;
     char *tmps, *fname = NULL;
@@ -141,6 +209,7 @@ PyObject* PyCOMPS_toxml_f(PyObject *self, PyObject *args, PyObject *kwds) {
     COMPS_XMLOptions *xml_options = NULL;
     COMPS_DefaultsOptions *def_options = NULL;
     COMPS_HSListItem *it;
+    COMPS_Doc *doc;
     PyObject *ret, *tmp;
     char* keywords[] = {"fname", "xml_options", "def_options", NULL};
     PyCOMPS *self_comps = (PyCOMPS*)self;
@@ -159,8 +228,12 @@ PyObject* PyCOMPS_toxml_f(PyObject *self, PyObject *args, PyObject *kwds) {
        self_comps->comps_doc->encoding = comps_str("UTF-8");
     comps_hslist_clear(self_comps->comps_doc->log->entries);
 
-    genret = comps2xml_f(self_comps->comps_doc, fname,
-                         0, xml_options, def_options);
+    doc = __pycomps_doc_snapshot(self_comps);
+    Py_BEGIN_ALLOW_THREADS
+    genret = comps2xml_f(doc, fname, 0, xml_options, def_options);
+    Py_END_ALLOW_THREADS
+    __pycomps_log_take(self_comps->comps_doc->log, doc->log);
+    COMPS_OBJECT_DESTROY(doc);
     if (xml_options)
         free(xml_options);
     if (def_options)
@@ -188,6 +261,8 @@ PyObject* PyCOMPS_toxml_str(PyObject *self, PyObject *args, PyObject *kwds) {
     const char *errors = NULL;
     COMPS_XMLOptions *xml_options = NULL;
     COMPS_DefaultsOptions *def_options = NULL;
+    COMPS_Doc *doc;
+    char *s;
     char* keywords[] = {"xml_options", "def_options",NULL};
     if (PyArg_ParseTupleAndKeywords(args, kwds, "|O&O&", keywords,
                                     __pycomps_dict_to_xml_opts, &xml_options,
@@ -197,7 +272,12 @@ PyObject* PyCOMPS_toxml_str(PyObject *self, PyObject *args, PyObject *kwds) {
         return NULL;
     }
 
-    char *s = comps2xml_str(((PyCOMPS*)self)->comps_doc, xml_options, def_options);
+    doc = __pycomps_doc_snapshot((PyCOMPS*)self);
+    Py_BEGIN_ALLOW_THREADS
+    s = comps2xml_str(doc, xml_options, def_options);
+    Py_END_ALLOW_THREADS
+    __pycomps_log_take(((PyCOMPS*)self)->comps_doc->log, doc->log);
+    COMPS_OBJECT_DESTROY(doc);
     if (xml_options)
         free(xml_options);
     if (def_options)
@@ -223,22 +303,60 @@ PyObject* PyCOMPS_clear(PyObject *self) {
     Py_RETURN_NONE;
 }
 
+/* replace document of self, cached wrappers of its lists are dropped */
+static void __pycomps_take_doc(PyCOMPS *self_comps, COMPS_Doc *doc) {
+    Py_CLEAR(self_comps->p_groups);
+    Py_CLEAR(self_comps->p_categories);
+    Py_CLEAR(self_comps->p_environments);
+    Py_CLEAR(self_comps->p_langpacks);
+    Py_CLEAR(self_comps->p_blacklist);
+    Py_CLEAR(self_comps->p_whiteout);
+    COMPS_OBJECT_DESTROY(self_comps->comps_doc);
+    self_comps->comps_doc = doc;
+}
+
+/* Replace document of self by parsed one and take parser log. Parsed
+ * structure is destroyed */
+static void __pycomps_take_parsed(PyCOMPS *self_comps, COMPS_Parsed *parsed) {
+    COMPS_Object *tmpstr;
+
+    if (parsed->comps_doc) {
+        __pycomps_take_doc(self_comps, parsed->comps_doc);
+    } else {
+        tmpstr = (COMPS_Object*)comps_str("UTF-8");
+        __pycomps_take_doc(self_comps, COMPS_OBJECT_CREATE(COMPS_Doc,
+                                                (COMPS_Object*[]){tmpstr}));
+        COMPS_OBJECT_DESTROY(tmpstr);
+    }
+    COMPS_OBJECT_DESTROY(self_comps->comps_doc->log);
+    self_comps->comps_doc->log = parsed->log;
+    parsed->log = NULL;
+    parsed->comps_doc = NULL;
+    comps_parse_parsed_destroy(parsed);
+}
+
 PyObject* PyCOMPS_fromxml_f(PyObject *self, PyObject *args, PyObject* kwds) {
     FILE *f;
     COMPS_Parsed *parsed;
     char *fname = NULL;
     signed char parsed_ret;
     PyCOMPS *self_comps = (PyCOMPS*)self;
-    COMPS_Object *tmpstr;
     COMPS_DefaultsOptions *options = NULL;
 
-    char* keywords[] = {"fname", "options", NULL};
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "s|O&", keywords, &fname,
-                                    __pycomps_dict_to_def_opts, &options)) {
+    PyObject *sections = NULL;
+
+    char* keywords[] = {"fname", "options", "sections", NULL};
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "s|O&O", keywords, &fname,
+                                    __pycomps_dict_to_def_opts, &options,
+                                    &sections)) {
         PyErr_SetString(PyExc_TypeError,
                     "function accept string and optional xml_options dict");
         return NULL;
     }
+    if (__pycomps_sections_to_def_opts(sections, &options)) {
+        free(options);
+        return NULL;
+    }
 
     parsed = comps_parse_parsed_create();
     comps_parse_parsed_init(parsed, "UTF-8", 0);
@@ -251,34 +369,14 @@ PyObject* PyCOMPS_fromxml_f(PyObject *self, PyObject *args, PyObject* kwds) {
             free(options);
         return NULL;
     }
+    /* parser works only with its own COMPS_Parsed, document is swapped
+     * into self after the GIL is acquired again */
+    Py_BEGIN_ALLOW_THREADS
     parsed_ret = comps_parse_file(parsed, f, options);
-    Py_CLEAR(self_comps->p_groups);
-    Py_CLEAR(self_comps->p_categories);
-    Py_CLEAR(self_comps->p_environments);
-    Py_CLEAR(self_comps->p_langpacks);
-    Py_CLEAR(self_comps->p_blacklist);
-    Py_CLEAR(self_comps->p_whiteout);
-
-
-    COMPS_OBJECT_DESTROY(self_comps->comps_doc);
+    Py_END_ALLOW_THREADS
     if (options)
         free(options);
-
-    if (parsed->comps_doc) {
-        self_comps->comps_doc = parsed->comps_doc;
-    } else {
-        tmpstr = (COMPS_Object*)comps_str("UTF-8");
-        self_comps->comps_doc = COMPS_OBJECT_CREATE(COMPS_Doc,
-                                                    (COMPS_Object*[]){tmpstr});
-        COMPS_OBJECT_DESTROY(tmpstr);
-    }
-    COMPS_OBJECT_DESTROY(self_comps->comps_doc->log);
-    self_comps->comps_doc->log = parsed->log;
-    parsed->log = NULL;
-
-    //free(fname);
-    parsed->comps_doc = NULL;
-    comps_parse_parsed_destroy(parsed);
+    __pycomps_take_parsed(self_comps, parsed);
 
     if (parsed_ret == -1) {
         PyErr_SetString(PyCOMPSExc_ParserError, "Fatal parser error");
@@ -287,6 +385,54 @@ PyObject* PyCOMPS_fromxml_f(PyObject *self, PyObject *args, PyObject* kwds) {
     return PyINT_FROM_LONG((long)parsed_ret);
 }
 
+PyObject* PyCOMPS_to_binary(PyObject *self, PyObject *args) {
+    char *fname = NULL;
+    COMPS_Doc *doc;
+    signed char ret;
+    int err;
+
+    if (!PyArg_ParseTuple(args, "s", &fname))
+        return NULL;
+    doc = __pycomps_doc_snapshot((PyCOMPS*)self);
+    Py_BEGIN_ALLOW_THREADS
+    ret = comps_doc_save_bin(doc, fname);
+    err = errno;
+    COMPS_OBJECT_DESTROY(doc);
+    Py_END_ALLOW_THREADS
+    if (ret == -1 && err == EINVAL) {
+        PyErr_SetString(PyExc_ValueError, "Comps contains values which "
+                        "can't be stored in binary snapshot");
+        return NULL;
+    } else if (ret == -1) {
+        errno = err;
+        return PyErr_SetFromErrnoWithFilename(PyExc_IOError, fname);
+    }
+    Py_RETURN_NONE;
+}
+
+PyObject* PyCOMPS_from_binary(PyObject *self, PyObject *args) {
+    char *fname = NULL;
+    COMPS_Doc *doc;
+    int err;
+
+    if (!PyArg_ParseTuple(args, "s", &fname))
+        return NULL;
+    Py_BEGIN_ALLOW_THREADS
+    doc = comps_doc_load_bin(fname);
+    err = errno;
+    Py_END_ALLOW_THREADS
+    if (!doc && err == EINVAL) {
+        PyErr_Format(PyExc_ValueError, "%s isn't valid binary snapshot of "
+                     "Comps", fname);
+        return NULL;
+    } else if (!doc) {
+        errno = err;
+        return PyErr_SetFromErrnoWithFilename(PyExc_IOError, fname);
+    }
+    __pycomps_take_doc((PyCOMPS*)self, doc);
+    Py_RETURN_NONE;
+}
+
 PyObject* PyCOMPS_get_last_errors(PyObject *self, void *closure)
 {
     PyObject *ret;
@@ -338,41 +484,127 @@ PyObject* PyCOMPS_fromxml_str(PyObject *self, PyObject *args, PyObject *kwds) {
     char *tmps;
     signed char parsed_ret;
     PyCOMPS *self_comps = (PyCOMPS*)self;
-    char* keywords[] = {"str", "options", NULL};
+    char* keywords[] = {"str", "options", "sections", NULL};
     COMPS_DefaultsOptions *options = NULL;
+    PyObject *sections = NULL;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "s|O&", keywords, &tmps,
-                                    __pycomps_dict_to_def_opts, &options)) {
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "s|O&O", keywords, &tmps,
+                                    __pycomps_dict_to_def_opts, &options,
+                                    &sections)) {
         PyErr_SetString(PyExc_TypeError,
                     "function accept optional xml_options dict");
         return NULL;
     }
+    if (__pycomps_sections_to_def_opts(sections, &options)) {
+        free(options);
+        return NULL;
+    }
 
     COMPS_Parsed *parsed;
     parsed = comps_parse_parsed_create();
     comps_parse_parsed_init(parsed, "UTF-8", 0);
+    Py_BEGIN_ALLOW_THREADS
     parsed_ret = comps_parse_str(parsed, tmps, options);
+    Py_END_ALLOW_THREADS
     if (options)
         free(options);
-    Py_CLEAR(self_comps->p_groups);
-    Py_CLEAR(self_comps->p_categories);
-    Py_CLEAR(self_comps->p_environments);
-    Py_CLEAR(self_comps->p_langpacks);
-    Py_CLEAR(self_comps->p_blacklist);
-    Py_CLEAR(self_comps->p_whiteout);
-    COMPS_OBJECT_DESTROY(self_comps->comps_doc);
+    __pycomps_take_parsed(self_comps, parsed);
+    if (parsed_ret == -1) {
+        PyErr_SetString(PyCOMPSExc_ParserError, "Fatal parser error");
+        return NULL;
+    }
 
-    self_comps->comps_doc = parsed->comps_doc;
-    COMPS_OBJECT_DESTROY(self_comps->comps_doc->log);
-    self_comps->comps_doc->log = parsed->log;
-    parsed->log = NULL;
-    parsed->comps_doc = NULL;
-    comps_parse_parsed_destroy(parsed);
+    return PyINT_FROM_LONG((long)parsed_ret);
+}
+
+PyObject* PyCOMPS_fromxml_buffer(PyObject *self, PyObject *args,
+                                 PyObject *kwds) {
+    Py_buffer buffer;
+    Py_ssize_t length = -1;
+    signed char parsed_ret;
+    COMPS_Parsed *parsed;
+    COMPS_DefaultsOptions *options = NULL;
+    PyObject *sections = NULL;
+    char* keywords[] = {"buffer", "length", "options", "sections", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, PYCOMPS_BUFFER_FMT "|nO&O",
+                                     keywords, &buffer, &length,
+                                     __pycomps_dict_to_def_opts, &options,
+                                     &sections)) {
+        return NULL;
+    }
+    if (__pycomps_sections_to_def_opts(sections, &options)) {
+        PyBuffer_Release(&buffer);
+        free(options);
+        return NULL;
+    }
+    if (length < 0) {
+        length = buffer.len;
+    } else if (length > buffer.len) {
+        PyErr_Format(PyExc_ValueError, "length %zd exceeds buffer size %zd",
+                     length, buffer.len);
+        PyBuffer_Release(&buffer);
+        if (options)
+            free(options);
+        return NULL;
+    }
+
+    parsed = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed, "UTF-8", 0);
+    /* exported buffer can't be resized or freed until it's released */
+    Py_BEGIN_ALLOW_THREADS
+    parsed_ret = comps_parse_str_n(parsed, buffer.buf, (size_t)length, options);
+    Py_END_ALLOW_THREADS
+    PyBuffer_Release(&buffer);
+    if (options)
+        free(options);
+    __pycomps_take_parsed((PyCOMPS*)self, parsed);
     if (parsed_ret == -1) {
         PyErr_SetString(PyCOMPSExc_ParserError, "Fatal parser error");
         return NULL;
     }
+    return PyINT_FROM_LONG((long)parsed_ret);
+}
 
+PyObject* PyCOMPS_feed(PyObject *self, PyObject *args) {
+    Py_buffer buffer;
+    signed char parsed_ret;
+    PyCOMPS *self_comps = (PyCOMPS*)self;
+
+    if (!PyArg_ParseTuple(args, PYCOMPS_BUFFER_FMT, &buffer))
+        return NULL;
+    if (!self_comps->p_parsed) {
+        self_comps->p_parsed = comps_parse_parsed_create();
+        comps_parse_parsed_init(self_comps->p_parsed, "UTF-8", 0);
+    }
+    /* GIL is kept, so feed() from other thread can't interleave chunks */
+    parsed_ret = comps_parse_feed(self_comps->p_parsed, buffer.buf,
+                                  (size_t)buffer.len);
+    PyBuffer_Release(&buffer);
+    if (parsed_ret == -1) {
+        __pycomps_take_parsed(self_comps, self_comps->p_parsed);
+        self_comps->p_parsed = NULL;
+        PyErr_SetString(PyCOMPSExc_ParserError, "Fatal parser error");
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+PyObject* PyCOMPS_close(PyObject *self) {
+    signed char parsed_ret;
+    PyCOMPS *self_comps = (PyCOMPS*)self;
+
+    if (!self_comps->p_parsed) {
+        self_comps->p_parsed = comps_parse_parsed_create();
+        comps_parse_parsed_init(self_comps->p_parsed, "UTF-8", 0);
+    }
+    parsed_ret = comps_parse_close(self_comps->p_parsed);
+    __pycomps_take_parsed(self_comps, self_comps->p_parsed);
+    self_comps->p_parsed = NULL;
+    if (parsed_ret == -1) {
+        PyErr_SetString(PyCOMPSExc_ParserError, "Fatal parser error");
+        return NULL;
+    }
     return PyINT_FROM_LONG((long)parsed_ret);
 }
 
@@ -501,41 +733,82 @@ int PyCOMPS_mdset_(PyCOMPS *self, PyObject *val, void *closure) {
     #undef _closure_
 }
 
-PyObject* PyCOMPS_filter_arches(PyObject *self, PyObject *other) {
-    COMPS_ObjList * arches;
-    PyCOMPS *doc;
-    COMPS_Doc *comps_doc;
+static COMPS_ObjList* __pycomps_arches_list(PyObject *other) {
+    COMPS_ObjList *arches;
     PyObject *item;
     char *str;
-    char created = 0;
+
     if ((Py_TYPE(other) != &PyCOMPS_StrSeqType) &&
         (Py_TYPE(other) != &PyList_Type)) {
         PyErr_Format(PyExc_TypeError, "Not %s or %s instance",
                      PyCOMPS_StrSeqType.tp_name, PyList_Type.tp_name);
         return NULL;
     }
-    if (Py_TYPE(other) == &PyList_Type) {
-        created = 1;
-        arches = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
-        for (Py_ssize_t x=0; x < PyList_Size(other); x++) {
-            item = PyList_GetItem(other, x);
-            __pycomps_arg_to_char(item, &str);
-            comps_objlist_append_x(arches, (COMPS_Object*)comps_str(str));
-            free(str);
-        }
-    } else {
-        arches = ((PyCOMPS_Sequence*)other)->list;
+    if (Py_TYPE(other) == &PyCOMPS_StrSeqType) {
+        return (COMPS_ObjList*)comps_object_incref(
+                                (COMPS_Object*)((PyCOMPS_Sequence*)other)->list);
+    }
+    arches = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+    for (Py_ssize_t x=0; x < PyList_Size(other); x++) {
+        item = PyList_GetItem(other, x);
+        __pycomps_arg_to_char(item, &str);
+        comps_objlist_append_x(arches, (COMPS_Object*)comps_str(str));
+        free(str);
     }
+    return arches;
+}
+
+static PyObject* __pycomps_doc_wrap(COMPS_Doc *comps_doc) {
+    PyCOMPS *doc;
+
     doc = (PyCOMPS*)PyCOMPS_new(&PyCOMPS_Type, NULL, NULL);
     PyCOMPS_init(doc, NULL, NULL);
     COMPS_OBJECT_DESTROY(doc->comps_doc);
+    doc->comps_doc = comps_doc;
+    return (PyObject*)doc;
+}
+
+PyObject* PyCOMPS_filter_arches(PyObject *self, PyObject *other) {
+    COMPS_ObjList * arches;
+    COMPS_Doc *comps_doc;
 
+    if (!(arches = __pycomps_arches_list(other)))
+        return NULL;
     comps_doc = comps_doc_arch_filter(((PyCOMPS*)self)->comps_doc, arches);
-    if (created) {
-        COMPS_OBJECT_DESTROY(arches);
+    COMPS_OBJECT_DESTROY(arches);
+    return __pycomps_doc_wrap(comps_doc);
+}
+
+PyObject* PyCOMPS_filter_arches_many(PyObject *self, PyObject *other) {
+    COMPS_ObjList **arches, *docs;
+    COMPS_ObjListIt *it;
+    PyObject *seq, *ret = NULL, *doc;
+    Py_ssize_t x, count;
+
+    if (!(seq = PySequence_Fast(other, "arch lists have to be sequence")))
+        return NULL;
+    count = PySequence_Fast_GET_SIZE(seq);
+    arches = calloc(count + 1, sizeof(COMPS_ObjList*));
+    for (x = 0; x < count; x++) {
+        arches[x] = __pycomps_arches_list(PySequence_Fast_GET_ITEM(seq, x));
+        if (!arches[x])
+            goto out;
     }
-    doc->comps_doc = comps_doc;
-    return (PyObject*)doc;
+    docs = comps_doc_arch_filter_multi(((PyCOMPS*)self)->comps_doc, arches,
+                                       (unsigned int)count);
+    ret = PyList_New(0);
+    for (it = docs->first; it != NULL; it = it->next) {
+        doc = __pycomps_doc_wrap((COMPS_Doc*)comps_object_incref(it->comps_obj));
+        PyList_Append(ret, doc);
+        Py_DECREF(doc);
+    }
+    COMPS_OBJECT_DESTROY(docs);
+    out:
+    for (x = 0; x < count; x++)
+        COMPS_OBJECT_DESTROY(arches[x]);
+    free(arches);
+    Py_DECREF(seq);
+    return ret;
 }
 
 PyObject* PyCOMPS_groups_match(PyObject *self, PyObject *args, PyObject *kwds) {
@@ -604,6 +877,225 @@ PyObject* PyCOMPS_envs_match(PyObject *self, PyObject *args, PyObject *kwds) {
     return ret;
 }
 
+static COMPS_DocMatch* __pycomps_match_query(PyObject *query, int flags) {
+    const char *keys[] = {"id", "name", "desc", "lang"};
+    char *vals[] = {NULL, NULL, NULL, NULL};
+    COMPS_DocMatch *match = NULL;
+    PyObject *item;
+    int x;
+
+    if (!PyDict_Check(query)) {
+        if (__pycomps_arg_to_char(query, &vals[0]))
+            return NULL;
+    } else {
+        for (x = 0; x < 4; x++) {
+            item = PyDict_GetItemString(query, keys[x]);
+            if (item && item != Py_None && __pycomps_arg_to_char(item, &vals[x]))
+                goto out;
+        }
+    }
+    match = comps_doc_match_create(vals[0], vals[1], vals[2], vals[3], flags);
+    if (!match)
+        PyErr_SetString(PyExc_ValueError, "invalid match query");
+    out:
+    for (x = 0; x < 4; x++)
+        free(vals[x]);
+    return match;
+}
+
+static PyObject* __pycomps_match_many(PyObject *self, PyObject *args,
+                                      PyObject *kwds, PyTypeObject *type,
+                                      COMPS_ObjList* (*matchf)(COMPS_Doc*,
+                                                        COMPS_DocMatch**,
+                                                        unsigned int)) {
+    PyObject *queries, *seq, *ret = NULL, *pylist;
+    COMPS_DocMatch **matches;
+    COMPS_ObjList *results;
+    COMPS_ObjListIt *it;
+    char *keywords[] = {"queries", "flags", NULL};
+    Py_ssize_t x, count;
+    int flags = 0;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|i", keywords, &queries,
+                                     &flags)) {
+        return NULL;
+    }
+    if (!(seq = PySequence_Fast(queries, "queries has to be sequence")))
+        return NULL;
+    count = PySequence_Fast_GET_SIZE(seq);
+    matches = calloc(count + 1, sizeof(COMPS_DocMatch*));
+    for (x = 0; x < count; x++) {
+        matches[x] = __pycomps_match_query(PySequence_Fast_GET_ITEM(seq, x),
+                                           flags);
+        if (!matches[x])
+            goto out;
+    }
+    results = matchf(((PyCOMPS*)self)->comps_doc, matches,
+                     (unsigned int)count);
+    ret = PyList_New(0);
+    for (it = results->first; it != NULL; it = it->next) {
+        pylist = PyCOMPSSeq_new(type, NULL, NULL);
+        Py_TYPE(pylist)->tp_init(pylist, NULL, NULL);
+        COMPS_OBJECT_DESTROY(((PyCOMPS_Sequence*)pylist)->list);
+        ((PyCOMPS_Sequence*)pylist)->list =
+                (COMPS_ObjList*)comps_object_incref(it->comps_obj);
+        PyList_Append(ret, pylist);
+        Py_DECREF(pylist);
+    }
+    COMPS_OBJECT_DESTROY(results);
+    out:
+    for (x = 0; x < count; x++)
+        comps_doc_match_destroy(matches[x]);
+    free(matches);
+    Py_DECREF(seq);
+    return ret;
+}
+
+PyObject* PyCOMPS_groups_match_many(PyObject *self, PyObject *args,
+                                    PyObject *kwds) {
+    return __pycomps_match_many(self, args, kwds, &PyCOMPS_GroupsType,
+                                &comps_doc_match_groups);
+}
+
+PyObject* PyCOMPS_categories_match_many(PyObject *self, PyObject *args,
+                                        PyObject *kwds) {
+    return __pycomps_match_many(self, args, kwds, &PyCOMPS_CatsType,
+                                &comps_doc_match_categories);
+}
+
+PyObject* PyCOMPS_envs_match_many(PyObject *self, PyObject *args,
+                                  PyObject *kwds) {
+    return __pycomps_match_many(self, args, kwds, &PyCOMPS_EnvsType,
+                                &comps_doc_match_envs);
+}
+
+PyObject* PyCOMPS_groups_by_package(PyObject *self, PyObject *args) {
+    PyObject *ret, *pair;
+    char *name;
+    COMPS_DocPkgIndexItem *item;
+
+    if (!PyArg_ParseTuple(args, "s", &name)) {
+        return NULL;
+    }
+    ret = PyList_New(0);
+    comps_doc_lock(((PyCOMPS*)self)->comps_doc);
+    for (item = comps_doc_package_lookup(((PyCOMPS*)self)->comps_doc, name);
+         item != NULL; item = comps_doc_pkgindex_next(item)) {
+        pair = Py_BuildValue("(NN)",
+                  comps_groups_out(comps_object_incref(
+                                            (COMPS_Object*)item->group)),
+                  comps_pkgs_out(comps_object_incref(
+                                            (COMPS_Object*)item->package)));
+        PyList_Append(ret, pair);
+        Py_DECREF(pair);
+    }
+    comps_doc_unlock(((PyCOMPS*)self)->comps_doc);
+    return ret;
+}
+
+static int __pycomps_types_mask(PyObject *types, int *mask) {
+    PyObject *seq, *item;
+    Py_ssize_t x;
+    long type;
+
+    *mask = COMPS_PACKAGE_TYPE_MASK(COMPS_PACKAGE_MANDATORY)
+            | COMPS_PACKAGE_TYPE_MASK(COMPS_PACKAGE_DEFAULT);
+    if (!types || types == Py_None)
+        return 0;
+    if (!(seq = PySequence_Fast(types, "types has to be sequence")))
+        return -1;
+    *mask = 0;
+    for (x = 0; x < PySequence_Fast_GET_SIZE(seq); x++) {
+        item = PySequence_Fast_GET_ITEM(seq, x);
+        type = PyLong_AsLong(item);
+        if ((type == -1 && PyErr_Occurred()) || type < COMPS_PACKAGE_DEFAULT
+            || type > COMPS_PACKAGE_UNKNOWN) {
+            PyErr_Clear();
+            PyErr_SetString(PyExc_TypeError,
+                            "types has to contain package types");
+            Py_DECREF(seq);
+            return -1;
+        }
+        *mask |= COMPS_PACKAGE_TYPE_MASK(type);
+    }
+    Py_DECREF(seq);
+    return 0;
+}
+
+static PyObject* __pycomps_closure_list(COMPS_ObjList *packages,
+                                        const char *what, const char *id) {
+    COMPS_ObjListIt *it;
+    PyObject *ret, *name;
+
+    if (!packages) {
+        PyErr_Format(PyExc_KeyError, "There's no %s with id '%s'", what, id);
+        return NULL;
+    }
+    ret = PyList_New(0);
+    for (it = packages->first; it != NULL; it = it->next) {
+        name = PyUnicode_FromString(((COMPS_Str*)it->comps_obj)->val);
+        PyList_Append(ret, name);
+        Py_DECREF(name);
+    }
+    COMPS_OBJECT_DESTROY(packages);
+    return ret;
+}
+
+PyObject* PyCOMPS_env_packages(PyObject *self, PyObject *args,
+                               PyObject *kwds) {
+    PyObject *pyoptions = NULL, *pytypes = NULL, *seq, *item;
+    COMPS_ObjList *options = NULL, *packages;
+    char *id, *str;
+    char *keywords[] = {"id", "options", "types", NULL};
+    Py_ssize_t x;
+    int types;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "s|OO", keywords, &id,
+                                     &pyoptions, &pytypes)) {
+        return NULL;
+    }
+    if (__pycomps_types_mask(pytypes, &types))
+        return NULL;
+    if (pyoptions && pyoptions != Py_None) {
+        if (!(seq = PySequence_Fast(pyoptions, "options has to be sequence")))
+            return NULL;
+        options = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+        for (x = 0; x < PySequence_Fast_GET_SIZE(seq); x++) {
+            item = PySequence_Fast_GET_ITEM(seq, x);
+            if (__pycomps_arg_to_char(item, &str)) {
+                Py_DECREF(seq);
+                COMPS_OBJECT_DESTROY(options);
+                return NULL;
+            }
+            comps_objlist_append_x(options, (COMPS_Object*)comps_str_x(str));
+        }
+        Py_DECREF(seq);
+    }
+    packages = comps_doc_environment_packages(((PyCOMPS*)self)->comps_doc,
+                                              id, options, types);
+    COMPS_OBJECT_DESTROY(options);
+    return __pycomps_closure_list(packages, "environment", id);
+}
+
+PyObject* PyCOMPS_cat_packages(PyObject *self, PyObject *args,
+                               PyObject *kwds) {
+    PyObject *pytypes = NULL;
+    COMPS_ObjList *packages;
+    char *id;
+    char *keywords[] = {"id", "types", NULL};
+    int types;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "s|O", keywords, &id,
+                                     &pytypes)) {
+        return NULL;
+    }
+    if (__pycomps_types_mask(pytypes, &types))
+        return NULL;
+    packages = comps_doc_category_packages(((PyCOMPS*)self)->comps_doc,
+                                           id, types);
+    return __pycomps_closure_list(packages, "category", id);
+}
+
 PyObject* PyCOMPS_validate(PyCOMPS *comps) {
     #define _result_ ((COMPS_ValErrResult*)result)
     COMPS_ValGenResult *result;
@@ -680,13 +1172,13 @@ PyGetSetDef PyCOMPS_getset[] = {
      (getter)PyCOMPS_get_, (setter)PyCOMPS_set_,
      ":py:class:`libcomps.EnvList` of environments", &envs_closure},
     {"langpacks",
-     (getter)PyCOMPS_get_, (setter)PyCOMPS_set_,
+     (getter)PyCOMPS_dget_, (setter)PyCOMPS_dset_,
      ":py:class:`libcomps.StrDict` of langpacks", &langpacks_closure},
     {"blacklist",
-     (getter)PyCOMPS_get_, (setter)PyCOMPS_set_,
+     (getter)PyCOMPS_mdget_, (setter)PyCOMPS_mdset_,
      ":py:class:`libcomps.MDict` of blacklist", &blacklist_closure},
     {"whiteout",
-     (getter)PyCOMPS_get_, (setter)PyCOMPS_set_,
+     (getter)PyCOMPS_mdget_, (setter)PyCOMPS_mdset_,
      ":py:class:`libcomps.MDict` of whiteout", &whiteout_closure},
     {NULL}  /* Sentinel */
 };
@@ -724,6 +1216,24 @@ PyDoc_STRVAR(PyCOMPS_xml_str__doc__,
              "default values of missing attributes of objects\n"
              "\n"
              ":return: string containing xml output");
+PyDoc_STRVAR(PyCOMPS_to_binary__doc__,
+             "to_binary(fname)\n"
+             "Save Comps to binary snapshot, which is loaded much faster "
+             "than xml. Snapshot is written in native byte order, so it's "
+             "meant as local cache of parsed xml\n"
+             "\n"
+             ":param str fname: filename to be written\n"
+             ":raises ValueError: if some dictionary contains values other "
+             "than strings and numbers\n"
+             ":raises IOError: if file can't be written");
+PyDoc_STRVAR(PyCOMPS_from_binary__doc__,
+             "from_binary(fname)\n"
+             "Load Comps from binary snapshot made by :py:meth:`to_binary`\n"
+             "\n"
+             ":param str fname: filename to be readed\n"
+             ":raises ValueError: if file isn't valid snapshot, was made by "
+             "other version of libcomps or on other architecture\n"
+             ":raises IOError: if file can't be read");
 PyDoc_STRVAR(PyCOMPS_toxml_f__doc__,
              "toxml_f(fname,[xml_options,[def_options]])->int\n"
              "alias for :py:meth:`Comps.xml_f`");
@@ -731,24 +1241,83 @@ PyDoc_STRVAR(PyCOMPS_toxml_str__doc__,
              "toxml_str([xml_options,[def_options]])->str\n"
              "alias for :py:meth:`Comps.xml_str`");
 PyDoc_STRVAR(PyCOMPS_fromxml_str__doc__,
-             "fromxml_str(xml_str, [def_options])->int\n"
+             "fromxml_str(xml_str, [def_options, [sections]])->int\n"
              "Load COMPS from xml string\n"
              "\n"
              ":param str xml_str: string containing comps xml representation\n"
              ":param dict def_options: dictionary containing options used for"
-             "specify values of missing objects attributes in xml_str string\n"
+             "specify values of missing objects attributes in xml_str string. "
+             "'arena': True option allocates document from memory region "
+             "released at once\n"
+             ":param sections: sequence of top-level sections to be loaded "
+             "('groups', 'categories', 'environments', 'langpacks', "
+             "'blacklist', 'whiteout'). Other sections are skipped without "
+             "any processing. All sections are loaded by default\n"
              "\n"
              ":returns: 1 if some non-fatal error occured during parsing\n\n"
              "          0 if parsing ended without any error\n"
              ":raises libcomps.ParserError: if some fatal error "
              "occured during parsing\n");
+PyDoc_STRVAR(PyCOMPS_fromxml_buffer__doc__,
+             "fromxml_buffer(buffer, [length, [def_options, [sections]]])->int\n"
+             "Load COMPS from object supporting buffer protocol (bytes, "
+             "bytearray, memoryview, mmap...) without copying its content. "
+             "Compressed content is decompressed the same way as in "
+             "fromxml_f\n"
+             "\n"
+             ":param buffer: object containing comps xml representation\n"
+             ":param int length: number of bytes from start of buffer to be "
+             "parsed. Whole buffer is parsed by default\n"
+             ":param dict def_options: dictionary containing options used for"
+             "specify values of missing objects attributes in buffer. "
+             "'arena': True option allocates document from memory region "
+             "released at once\n"
+             ":param sections: sequence of top-level sections to be loaded "
+             "('groups', 'categories', 'environments', 'langpacks', "
+             "'blacklist', 'whiteout'). Other sections are skipped without "
+             "any processing. All sections are loaded by default\n"
+             "\n"
+             ":returns: 1 if some non-fatal error occured during parsing\n\n"
+             "          0 if parsing ended without any error\n"
+             ":raises libcomps.ParserError: if some fatal error "
+             "occured during parsing\n"
+             ":raises ValueError: if length exceeds buffer size or section "
+             "is unknown\n");
+PyDoc_STRVAR(PyCOMPS_feed__doc__,
+             "feed(data)\n"
+             "Pass next chunk of comps xml to incremental parser. Chunk can "
+             "end at any position in xml, so data can be passed as they "
+             "arrive. COMPS content is replaced after close() is called\n"
+             "\n"
+             ":param data: bytes-like object containing part of comps xml\n"
+             "\n"
+             ":raises libcomps.ParserError: if fatal error occured. Parsing "
+             "is aborted then\n");
+
+PyDoc_STRVAR(PyCOMPS_close__doc__,
+             "close()->int\n"
+             "Finish parsing of chunks passed by feed() and load them as "
+             "COMPS content\n"
+             "\n"
+             ":returns: 1 if some non-fatal error occured during parsing\n\n"
+             "          0 if parsing ended without any error\n"
+             "\n"
+             ":raises libcomps.ParserError: if fatal error occured\n");
+
 PyDoc_STRVAR(PyCOMPS_fromxml_f__doc__,
-             "fromxml_f(fname, [def_options])->int\n"
-             "Load COMPS from xml file\n"
+             "fromxml_f(fname, [def_options, [sections]])->int\n"
+             "Load COMPS from xml file. gzip, xz and zstd compressed files "
+             "are decompressed on the fly\n"
              "\n"
              ":param str fname: filename to be readed\n"
              ":param dict def_options: dictionary containing options used for"
-             "specify values of missing objects attributes in xml_str string\n"
+             "specify values of missing objects attributes in xml_str string. "
+             "'arena': True option allocates document from memory region "
+             "released at once\n"
+             ":param sections: sequence of top-level sections to be loaded "
+             "('groups', 'categories', 'environments', 'langpacks', "
+             "'blacklist', 'whiteout'). Other sections are skipped without "
+             "any processing. All sections are loaded by default\n"
              "\n"
              ":returns: 1 if some non-fatal error occured during parsing\n\n"
              "          0 if parsing ended without any error\n"
@@ -766,6 +1335,129 @@ PyDoc_STRVAR(PyCOMPS_arch_filter__doc__,
              "\n"
              ":return: new :py:class:`libcomps.Comps` instace");
 
+PyObject* PyCOMPS_update(PyObject *self, PyObject *other) {
+    if (Py_TYPE(other) != &PyCOMPS_Type) {
+        PyErr_SetString(PyExc_TypeError, "Not COMPS instance");
+        return NULL;
+    }
+    comps_doc_merge_into(((PyCOMPS*)self)->comps_doc,
+                         ((PyCOMPS*)other)->comps_doc);
+    Py_RETURN_NONE;
+}
+
+PyDoc_STRVAR(PyCOMPS_update__doc__,
+             "update(other)\n"
+             "Union other Comps object into this one in place. Same as "
+             "self += other. Groups, categories and environments with id "
+             "contained in other are replaced by their union and moved to "
+             "the end, new ones are appended and the rest is kept untouched. "
+             "Langpacks of other overwrite the ones of this object. Unlike "
+             "self + other, which creates new object with default doctype "
+             "and without blacklist and whiteout, doctype, blacklist and "
+             "whiteout of this object are kept\n"
+             "\n"
+             ":param other: :py:class:`libcomps.Comps` object\n");
+
+PyObject* PyCOMPS_diff(PyObject *self, PyObject *other) {
+    if (Py_TYPE(other) != &PyCOMPS_Type) {
+        PyErr_SetString(PyExc_TypeError, "Not COMPS instance");
+        return NULL;
+    }
+    return PyCOMPSDocDiff_out(comps_doc_diff(((PyCOMPS*)self)->comps_doc,
+                                             ((PyCOMPS*)other)->comps_doc));
+}
+
+PyDoc_STRVAR(PyCOMPS_diff__doc__,
+             "diff(other)->libcomps.DocDiff\n"
+             "Compare groups, categories and environments with other Comps "
+             "object by their ids. Patching copy of this object with result "
+             "makes it equal to other\n"
+             "\n"
+             ":param other: :py:class:`libcomps.Comps` object\n"
+             "\n"
+             ":return: new :py:class:`libcomps.DocDiff` instance");
+
+PyObject* PyCOMPS_patch(PyObject *self, PyObject *diff) {
+    if (Py_TYPE(diff) != &PyCOMPS_DocDiffType) {
+        PyErr_SetString(PyExc_TypeError, "Not DocDiff instance");
+        return NULL;
+    }
+    return PyINT_FROM_LONG(comps_doc_patch(((PyCOMPS*)self)->comps_doc,
+                                           ((PyCOMPS_DocDiff*)diff)->diff));
+}
+
+PyDoc_STRVAR(PyCOMPS_patch__doc__,
+             "patch(diff)->int\n"
+             "Apply difference made by :py:meth:`diff` in place. Removal of "
+             "missing object is skipped, missing changed object is added and "
+             "added object already present replaces existing one\n"
+             "\n"
+             ":param diff: :py:class:`libcomps.DocDiff` object\n"
+             "\n"
+             ":return: number of such conflicts");
+
+PyDoc_STRVAR(PyCOMPS_arch_filter_many__doc__,
+             "arch_filter_many(arch_lists)->list\n"
+             "Filter Comps object content by several lists of architectures\n"
+             "at once. Result is the same as calling arch_filter for every\n"
+             "list, but content is traversed only once\n"
+             "\n"
+             ":param arch_lists: sequence of architectures lists\n"
+             ":type arch_lists: sequence of lists of strings or libcomps.StrSeq\n"
+             "\n"
+             ":return: list of new :py:class:`libcomps.Comps` instances, one\n"
+             "    for each list of architectures");
+
+PyDoc_STRVAR(PyCOMPS_match_many__doc__,
+             "groups_match_many(queries, flags=0)->list\n"
+             "categories_match_many(queries, flags=0)->list\n"
+             "environments_match_many(queries, flags=0)->list\n"
+             "Evaluate several match queries at once. Queries without exact\n"
+             "id or name are resolved by single pass over objects\n"
+             "\n"
+             ":param queries: sequence of queries. Query is either id pattern\n"
+             "    or dict with optional 'id', 'name', 'desc' and 'lang' keys\n"
+             "    with same meaning as arguments of groups_match\n"
+             ":param int flags: fnmatch flags used for all patterns\n"
+             "\n"
+             ":return: list of matched objects lists, one for each query\n"
+             "    in same order as queries");
+
+PyDoc_STRVAR(PyCOMPS_groups_by_package__doc__,
+             "groups_by_package(name)->list\n"
+             "Return groups containing package with specified name\n"
+             "\n"
+             ":param str name: package name\n"
+             "\n"
+             ":return: list of (:py:class:`libcomps.Group`, "
+             ":py:class:`libcomps.Package`) tuples in document order");
+
+PyDoc_STRVAR(PyCOMPS_env_packages__doc__,
+             "environment_packages(id, options=None, types=None)->list\n"
+             "Return names of packages installed by environment\n"
+             "\n"
+             "Result is cached and computed again only after document "
+             "was changed\n"
+             "\n"
+             ":param str id: environment id\n"
+             ":param options: ids of chosen optional groups of environment\n"
+             ":type options: list of str\n"
+             ":param types: package types, mandatory and default by default\n"
+             ":type types: list of libcomps.PACKAGE_TYPE_* constants\n"
+             "\n"
+             ":return: list of unique package names\n"
+             ":raises KeyError: if there's no such environment");
+PyDoc_STRVAR(PyCOMPS_cat_packages__doc__,
+             "category_packages(id, types=None)->list\n"
+             "Return names of packages of groups in category\n"
+             "\n"
+             ":param str id: category id\n"
+             ":param types: package types, mandatory and default by default\n"
+             ":type types: list of libcomps.PACKAGE_TYPE_* constants\n"
+             "\n"
+             ":return: list of unique package names\n"
+             ":raises KeyError: if there's no such category");
+
 static PyMethodDef PyCOMPS_methods[] = {
     {"groups_match", (PyCFunction)PyCOMPS_groups_match, METH_VARARGS | METH_KEYWORDS,
     PyCOMPS_validate__doc__},
@@ -773,6 +1465,18 @@ static PyMethodDef PyCOMPS_methods[] = {
     PyCOMPS_validate__doc__},
     {"environments_match", (PyCFunction)PyCOMPS_envs_match, METH_KEYWORDS,
     PyCOMPS_validate__doc__},
+    {"groups_match_many", (PyCFunction)PyCOMPS_groups_match_many,
+    METH_VARARGS | METH_KEYWORDS, PyCOMPS_match_many__doc__},
+    {"categories_match_many", (PyCFunction)PyCOMPS_categories_match_many,
+    METH_VARARGS | METH_KEYWORDS, PyCOMPS_match_many__doc__},
+    {"environments_match_many", (PyCFunction)PyCOMPS_envs_match_many,
+    METH_VARARGS | METH_KEYWORDS, PyCOMPS_match_many__doc__},
+    {"groups_by_package", (PyCFunction)PyCOMPS_groups_by_package, METH_VARARGS,
+    PyCOMPS_groups_by_package__doc__},
+    {"environment_packages", (PyCFunction)PyCOMPS_env_packages,
+    METH_VARARGS | METH_KEYWORDS, PyCOMPS_env_packages__doc__},
+    {"category_packages", (PyCFunction)PyCOMPS_cat_packages,
+    METH_VARARGS | METH_KEYWORDS, PyCOMPS_cat_packages__doc__},
     {"validate", (PyCFunction)PyCOMPS_validate, METH_NOARGS,
     PyCOMPS_validate__doc__},
     {"validate_nf", (PyCFunction)PyCOMPS_validate_nf, METH_NOARGS,
@@ -789,6 +1493,14 @@ static PyMethodDef PyCOMPS_methods[] = {
     PyCOMPS_fromxml_f__doc__},
     {"fromxml_str", (PyCFunction)PyCOMPS_fromxml_str, METH_VARARGS | METH_KEYWORDS,
     PyCOMPS_fromxml_str__doc__},
+    {"to_binary", (PyCFunction)PyCOMPS_to_binary, METH_VARARGS,
+    PyCOMPS_to_binary__doc__},
+    {"from_binary", (PyCFunction)PyCOMPS_from_binary, METH_VARARGS,
+    PyCOMPS_from_binary__doc__},
+    {"fromxml_buffer", (PyCFunction)PyCOMPS_fromxml_buffer,
+    METH_VARARGS | METH_KEYWORDS, PyCOMPS_fromxml_buffer__doc__},
+    {"feed", (PyCFunction)PyCOMPS_feed, METH_VARARGS, PyCOMPS_feed__doc__},
+    {"close", (PyCFunction)PyCOMPS_close, METH_NOARGS, PyCOMPS_close__doc__},
     {"clear", (PyCFunction)PyCOMPS_clear, METH_NOARGS,
     "Clear Comps"},
     {"get_last_errors", (PyCFunction)PyCOMPS_get_last_errors,
@@ -798,6 +1510,11 @@ static PyMethodDef PyCOMPS_methods[] = {
      METH_NOARGS,"return list of messages from log of last parse action."},
     {"arch_filter", (PyCFunction)PyCOMPS_filter_arches, METH_O,
     PyCOMPS_arch_filter__doc__},
+    {"arch_filter_many", (PyCFunction)PyCOMPS_filter_arches_many, METH_O,
+    PyCOMPS_arch_filter_many__doc__},
+    {"update", (PyCFunction)PyCOMPS_update, METH_O, PyCOMPS_update__doc__},
+    {"diff", (PyCFunction)PyCOMPS_diff, METH_O, PyCOMPS_diff__doc__},
+    {"patch", (PyCFunction)PyCOMPS_patch, METH_O, PyCOMPS_patch__doc__},
     {NULL}  /* Sentinel */
 };
 
@@ -807,6 +1524,8 @@ static void PyCOMPS_dealloc(PyCOMPS* self)
     Py_XDECREF(self->p_categories);
     Py_XDECREF(self->p_environments);
     COMPS_OBJECT_DESTROY(self->comps_doc);
+    if (self->p_parsed)
+        comps_parse_parsed_destroy(self->p_parsed);
     Py_TYPE(self)->tp_free((PyObject*)self);
 }
 
@@ -821,6 +1540,7 @@ static PyObject* PyCOMPS_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
         self->p_groups = NULL;
         self->p_categories = NULL;
         self->p_environments = NULL;
+        self->p_parsed = NULL;
     }
     return (PyObject*) self;
 }
@@ -873,8 +1593,19 @@ PyObject* PyCOMPS_cmp(PyObject *self, PyObject *other, int op) {
     }
 }
 
+static PyObject* PyCOMPS_inplace_union(PyObject *self, PyObject *other) {
+    PyObject *ret;
+
+    if (!(ret = PyCOMPS_update(self, other)))
+        return NULL;
+    Py_DECREF(ret);
+    Py_INCREF(self);
+    return self;
+}
+
 PyNumberMethods PyCOMPS_Nums = {
-    .nb_add = PyCOMPS_union
+    .nb_add = PyCOMPS_union,
+    .nb_inplace_add = PyCOMPS_inplace_union
 };
 
 /*! \class Comps class.h "inc/class.h"
@@ -965,13 +1696,153 @@ PyObject* Libcomps_xml_default(PyObject *self) {
     return ret;
 }
 
+PyObject* PyCOMPS_parse_many(PyObject *self, PyObject *args, PyObject *kwds) {
+    PyObject *paths, *seq, *ret = NULL;
+    PyCOMPS *comps;
+    COMPS_DefaultsOptions *options = NULL;
+    COMPS_ObjList *docs = NULL;
+    COMPS_ObjListIt *it;
+    PyObject *sections = NULL;
+    char **fnames = NULL;
+    Py_ssize_t count = 0, i;
+    int workers = 0;
+    char* keywords[] = {"paths", "workers", "options", "sections", NULL};
+    (void)self;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|iO&O", keywords, &paths,
+                                     &workers,
+                                     __pycomps_dict_to_def_opts, &options,
+                                     &sections))
+        return NULL;
+    if (workers < 0) {
+        PyErr_SetString(PyExc_ValueError, "workers can't be negative");
+        goto out;
+    }
+    if (__pycomps_sections_to_def_opts(sections, &options))
+        goto out;
+    if (!(seq = PySequence_Fast(paths, "paths has to be iterable")))
+        goto out;
+    count = PySequence_Fast_GET_SIZE(seq);
+    fnames = calloc(count ? count : 1, sizeof(char*));
+    for (i = 0; i < count; i++) {
+        if (__pycomps_arg_to_char(PySequence_Fast_GET_ITEM(seq, i),
+                                  &fnames[i])) {
+            Py_DECREF(seq);
+            goto out;
+        }
+    }
+    Py_DECREF(seq);
+
+    Py_BEGIN_ALLOW_THREADS
+    docs = comps_parse_many((const char**)fnames, (size_t)count,
+                            (unsigned)workers, options, NULL);
+    Py_END_ALLOW_THREADS
+    if (!docs) {
+        PyErr_SetString(PyExc_RuntimeError, "Can't start parser threads");
+        goto out;
+    }
+    ret = PyList_New(count);
+    for (i = 0, it = docs->first; it != NULL; it = it->next, i++) {
+        comps = (PyCOMPS*)PyCOMPS_new(&PyCOMPS_Type, NULL, NULL);
+        COMPS_OBJECT_DESTROY(comps->comps_doc);
+        comps->comps_doc = (COMPS_Doc*)comps_object_incref(it->comps_obj);
+        PyList_SET_ITEM(ret, i, (PyObject*)comps);
+    }
+    COMPS_OBJECT_DESTROY(docs);
+
+    out:
+    if (fnames) {
+        for (i = 0; i < count; i++)
+            free(fnames[i]);
+        free(fnames);
+    }
+    free(options);
+    return ret;
+}
+
+PyObject* PyCOMPS_union_all(PyObject *self, PyObject *other) {
+    PyObject *seq, *item;
+    COMPS_Doc **docs;
+    Py_ssize_t count, i;
+    PyCOMPS *ret;
+    (void)self;
+
+    if (!(seq = PySequence_Fast(other, "argument has to be iterable")))
+        return NULL;
+    count = PySequence_Fast_GET_SIZE(seq);
+    if (!count) {
+        Py_DECREF(seq);
+        ret = (PyCOMPS*)PyCOMPS_new(&PyCOMPS_Type, NULL, NULL);
+        PyCOMPS_init(ret, NULL, NULL);
+        return (PyObject*)ret;
+    }
+    docs = malloc(sizeof(COMPS_Doc*) * count);
+    for (i = 0; i < count; i++) {
+        item = PySequence_Fast_GET_ITEM(seq, i);
+        if (Py_TYPE(item) != &PyCOMPS_Type) {
+            PyErr_SetString(PyExc_TypeError, "Not COMPS instance");
+            free(docs);
+            Py_DECREF(seq);
+            return NULL;
+        }
+        docs[i] = ((PyCOMPS*)item)->comps_doc;
+    }
+    ret = (PyCOMPS*)__pycomps_doc_wrap(comps_doc_union_many(docs,
+                                                          (unsigned)count));
+    free(docs);
+    Py_DECREF(seq);
+    return (PyObject*)ret;
+}
+
 /*void pycomps_atexit() {
     PyCOMPS_DECREF()
 }*/
 
+PyDoc_STRVAR(PyCOMPS_iterparse__doc__,
+             "iterparse(source, [kinds])->iterator\n"
+             "Iterate over groups, categories and environments of comps xml "
+             "without loading whole document. Each object is yielded as soon "
+             "as its end tag is parsed, so memory usage doesn't depend on "
+             "size of input\n"
+             "\n"
+             ":param source: name of xml file or file-like object with read() "
+             "method returning bytes\n"
+             ":param kinds: iterable of yielded kinds of objects - 'group', "
+             "'category' or 'environment'. All kinds are yielded by default\n"
+             "\n"
+             ":raises libcomps.ParserError: if fatal error occured during "
+             "parsing\n");
+
+PyDoc_STRVAR(PyCOMPS_parse_many__doc__,
+             "parse_many(paths, [workers, options, sections])->list\n"
+             "Parse comps xml files on pool of native threads and return list "
+             "of Comps objects in order of paths. Parser log of each file is "
+             "kept with its Comps object (see get_last_errors()). File which "
+             "can't be read results in empty Comps object with error logged\n"
+             "\n"
+             ":param paths: list of xml file names\n"
+             ":param int workers: number of threads, number of processors by "
+             "default\n"
+             ":param dict options: same as in Comps.fromxml_f\n"
+             ":param sections: same as in Comps.fromxml_f\n");
+
+PyDoc_STRVAR(PyCOMPS_union_all__doc__,
+             "union_all(docs)->Comps\n"
+             "Union all Comps objects at once. Result is same as of "
+             "docs[0] + docs[1] + ... , but without intermediate Comps "
+             "objects. Empty Comps object is returned for empty iterable\n"
+             "\n"
+             ":param docs: iterable of Comps objects\n");
+
 static PyMethodDef LibcompsMethods[] = {
     {"get_xml_default_options", (PyCFunction)Libcomps_xml_default, METH_NOARGS,
      "Return xml output default options"},
+    {"iterparse", (PyCFunction)PyCOMPS_iterparse, METH_VARARGS | METH_KEYWORDS,
+     PyCOMPS_iterparse__doc__},
+    {"parse_many", (PyCFunction)PyCOMPS_parse_many,
+     METH_VARARGS | METH_KEYWORDS, PyCOMPS_parse_many__doc__},
+    {"union_all", (PyCFunction)PyCOMPS_union_all, METH_O,
+     PyCOMPS_union_all__doc__},
     {NULL, NULL, 0, NULL}        /* Sentinel */
 };
 #if PY_MAJOR_VERSION >= 3
@@ -1058,6 +1929,15 @@ PYINIT_FUNC(void) {
     if (PyType_Ready(&PyCOMPS_StrSeqType) < 0 ) {
         MODINIT_RET_NONE;
     }
+    if (PyType_Ready(&PyCOMPS_IterParseType) < 0 ) {
+        MODINIT_RET_NONE;
+    }
+    if (PyType_Ready(&PyCOMPS_DocDiffType) < 0 ) {
+        MODINIT_RET_NONE;
+    }
+    /* libxml2 has to be initialized before it's used from several threads
+     * at once */
+    xmlInitParser();
     #if PY_MAJOR_VERSION >= 3
         m = PyModule_Create(&moduledef);
     #else
@@ -1106,6 +1986,12 @@ PYINIT_FUNC(void) {
 
     PyModule_AddIntConstant(m, "MATCH_IGNORECASE", FNM_CASEFOLD);
 
+    PyModule_AddIntConstant(m, "DIFF_NAME", COMPS_DIFF_NAME);
+    PyModule_AddIntConstant(m, "DIFF_DESC", COMPS_DIFF_DESC);
+    PyModule_AddIntConstant(m, "DIFF_LANG", COMPS_DIFF_LANG);
+    PyModule_AddIntConstant(m, "DIFF_ATTRS", COMPS_DIFF_ATTRS);
+    PyModule_AddIntConstant(m, "DIFF_CONTENT", COMPS_DIFF_CONTENT);
+
     init_exceptions();
     Py_INCREF(PyCOMPSExc_ParserError);
     PyModule_AddObject(m, "ParserError", PyCOMPSExc_ParserError);
@@ -25,6 +25,7 @@
 
 #include "libcomps/comps_doc.h"
 #include "libcomps/comps_parse.h"
+#include "libcomps/comps_docbin.h"
 #include "libcomps/comps_dict.h"
 #include "libcomps/comps_log.h"
 
@@ -39,6 +40,8 @@
 #include "pycomps_gids.h"
 #include "pycomps_exc.h"
 #include "pycomps_lbw.h"
+#include "pycomps_iterparse.h"
+#include "pycomps_docdiff.h"
 
 
 typedef struct {
@@ -71,6 +74,7 @@ typedef struct {
     PyObject *p_langpacks;
     PyObject *p_blacklist;
     PyObject *p_whiteout;
+    COMPS_Parsed *p_parsed; /* pending feed() parsing, NULL if none */
 } PyCOMPS;
 
 PyCOMPS_GetSetClosure * get_closure(void * closure);
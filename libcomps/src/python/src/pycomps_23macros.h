@@ -43,6 +43,7 @@
     #define PYCOMPS_DICT_ITERITEMS "items"
     #define PYCOMPS_DICT_ITERVALUES "values"
     #define PYCOMPS_DICT_ITERKEYS "keys"
+    #define PYCOMPS_BUFFER_FMT "y*"
 #else
     #define MODINIT_RET_NONE return
     #define PY_OBJ_HEAD_INIT PyObject_HEAD_INIT(NULL)\
@@ -55,6 +56,7 @@
     #define PYCOMPS_DICT_ITERITEMS "iteritems"
     #define PYCOMPS_DICT_ITERVALUES "itervalues"
     #define PYCOMPS_DICT_ITERKEYS "iterkeys"
+    #define PYCOMPS_BUFFER_FMT "s*"
 #endif
 
 
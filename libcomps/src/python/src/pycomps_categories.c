@@ -373,7 +373,8 @@ PyCOMPS_ItemInfo PyCOMPS_CatsInfo = {
                         {&comps_cats_in},
     .out_convert_func = &comps_cats_out,
     .item_types_len = 1,
-    .props_offset = offsetof(COMPS_DocCategory, properties),
+    .id_offset = offsetof(COMPS_DocCategory, id),
+    .id_indexed = 1,
     .pre_checker = &pycomps_category_validate
 };
 
@@ -396,8 +397,9 @@ COMPS_ObjList* comps_cats_union(COMPS_ObjList *cats1, COMPS_ObjList *cats2) {
     ret = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
 
     set = comps_set_create();
-    comps_set_init(set, NULL, NULL, &comps_object_destroy_v,
-                                    &__comps_doccategory_idcmp);
+    comps_set_init_hashed(set, NULL, NULL, &comps_object_destroy_v,
+                               &__comps_doccategory_idcmp,
+                               &__comps_doccategory_idhash);
     for (it = cats1 ? cats1->first : NULL; it != NULL; it = it->next) {
         tmpcat = (COMPS_DocCategory*) comps_object_copy(it->comps_obj);
         comps_set_add(set, tmpcat);
@@ -463,7 +465,7 @@ PyTypeObject PyCOMPS_CatsType = {
     0, //&PyCOMPSCats_cmp,          /*tp_compare*/
     0,                         /*tp_repr*/
     &PyCOMPSCats_Nums,         /*tp_as_number*/
-    0,//&PyCOMPSCat_sequence,       /*tp_as_sequence*/
+    &PyCOMPSSeq_sequence_extra, /*tp_as_sequence*/
     &PyCOMPSSeq_mapping_extra, /*tp_as_mapping*/
     0,                         /*tp_hash */
     0,                         /*tp_call*/
@@ -50,6 +50,7 @@ PyObject* PyCOMPSCat_convert(void *c);
 void PyCOMPSCat_dealloc(PyObject *self);
 PyObject * PyCOMPSCat_new(PyTypeObject *type, PyObject *args, PyObject *kwds);
 int PyCOMPSCat_init(PyCOMPS_Category *self, PyObject *args, PyObject *kwds);
+PyObject* comps_cats_out(COMPS_Object *cobj);
 
 PyObject* PyCOMPSCats_append(PyObject * self, PyObject *item);
 
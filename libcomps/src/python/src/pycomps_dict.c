@@ -21,21 +21,14 @@
 #include "pycomps_dict.h"
 
 PyObject* __pycomps_dict_val_out(COMPS_HSListItem *hsit) {
-    char *str = comps_object_tostr((COMPS_Object*)hsit->data);
-    PyObject *ret;
-    ret = PyUnicode_FromString(str);
-    free(str);
-    return ret;
+    return __pycomps_str_out((COMPS_Object*)hsit->data);
 }
 
 PyObject* __pycomps_dict_pair_out(COMPS_HSListItem *hsit) {
     PyObject *key, *val, *tuple;
-    char *x;
 
     key = PyUnicode_FromString((char*) ((COMPS_ObjRTreePair*)hsit->data)->key);
-    x = comps_object_tostr(((COMPS_ObjRTreePair*)hsit->data)->data);
-    val = PyUnicode_FromString(x);
-    free(x);
+    val = __pycomps_str_out(((COMPS_ObjRTreePair*)hsit->data)->data);
     tuple = PyTuple_Pack(2, key, val);
     Py_DECREF(key);
     Py_DECREF(val);
@@ -554,12 +547,12 @@ PyTypeObject PyCOMPS_DictIterType = {
     0,                          /* tp_clear */
     0,                          /* tp_richcompare */
     0,                          /* tp_weaklistoffset */
-    0,         /* tp_iter */
+    PyObject_SelfIter,          /* tp_iter */
     PyCOMPSDict_iternext,         /* tp_iternext */
     PyCOMPSDictIter_methods,         /* tp_methods */
     PyCOMPSDictIter_members,         /* tp_members */
     0,                          /* tp_getset */
-    &PySeqIter_Type,                          /* tp_base */
+    0,                          /* tp_base */
     0,                          /* tp_dict */
     0,                          /* tp_descr_get */
     0,                          /* tp_descr_set */
@@ -0,0 +1,306 @@
+/* libcomps - C alternative to yum.comps library
+ * Copyright (C) 2013 Jindrich Luza
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * any later version.
+ *
+ * This program is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to  Free Software
+ * Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301,
+ * USA
+ */
+
+#include "pycomps_docdiff.h"
+#include "pycomps_groups.h"
+#include "pycomps_categories.h"
+#include "pycomps_envs.h"
+#include "pycomps_utils.h"
+
+#define _diff_ (((PyCOMPS_DocDiff*)self)->diff)
+
+static const char *__pycomps_docdiff_types[] = {"added", "removed",
+                                                "changed", "moved"};
+
+/* names of packages or group ids, None if content didn't change */
+static PyObject* __pycomps_docdiff_names(COMPS_ObjList *list) {
+    COMPS_ObjListIt *it;
+    COMPS_Str *cname;
+    PyObject *ret, *name;
+
+    if (!list)
+        Py_RETURN_NONE;
+    if (!(ret = PyList_New(0)))
+        return NULL;
+    for (it = list->first; it != NULL; it = it->next) {
+        if (it->comps_obj->obj_info == &COMPS_DocGroupPackage_ObjInfo)
+            cname = ((COMPS_DocGroupPackage*)it->comps_obj)->name;
+        else
+            cname = ((COMPS_DocGroupId*)it->comps_obj)->name;
+        name = __pycomps_str_out((COMPS_Object*)cname);
+        if (!name || PyList_Append(ret, name)) {
+            Py_XDECREF(name);
+            Py_DECREF(ret);
+            return NULL;
+        }
+        Py_DECREF(name);
+    }
+    return ret;
+}
+
+static int __pycomps_docdiff_setitem(PyObject *dict, const char *key,
+                                     PyObject *val) {
+    int ret;
+
+    if (!val)
+        return -1;
+    ret = PyDict_SetItemString(dict, key, val);
+    Py_DECREF(val);
+    return ret;
+}
+
+static PyObject* __pycomps_docdiff_item(const COMPS_DocDiffItem *item,
+                                        PyObject* (*out)(COMPS_Object*)) {
+    PyObject *ret;
+
+    if (!(ret = PyDict_New()))
+        return NULL;
+    if (__pycomps_docdiff_setitem(ret, "type", PyUnicode_FromString(
+                                    __pycomps_docdiff_types[item->type])) ||
+        __pycomps_docdiff_setitem(ret, "object",
+                                  out(comps_object_copy(item->obj))) ||
+        __pycomps_docdiff_setitem(ret, "flags",
+                                  PyINT_FROM_LONG(item->props)) ||
+        __pycomps_docdiff_setitem(ret, "position", (item->pos < 0)
+                                  ? (Py_INCREF(Py_None), Py_None)
+                                  : PyINT_FROM_LONG(item->pos)) ||
+        __pycomps_docdiff_setitem(ret, "added",
+                                  __pycomps_docdiff_names(item->added)) ||
+        __pycomps_docdiff_setitem(ret, "removed",
+                                  __pycomps_docdiff_names(item->removed))) {
+        Py_DECREF(ret);
+        return NULL;
+    }
+    if (out == &comps_envs_out &&
+        (__pycomps_docdiff_setitem(ret, "options_added",
+                              __pycomps_docdiff_names(item->options_added)) ||
+         __pycomps_docdiff_setitem(ret, "options_removed",
+                          __pycomps_docdiff_names(item->options_removed)))) {
+        Py_DECREF(ret);
+        return NULL;
+    }
+    return ret;
+}
+
+static PyObject* __pycomps_docdiff_items(const COMPS_DocDiffItem *items,
+                                         unsigned int len,
+                                         PyObject* (*out)(COMPS_Object*)) {
+    PyObject *ret, *item;
+    unsigned int i;
+
+    if (!(ret = PyList_New(len)))
+        return NULL;
+    for (i = 0; i < len; i++) {
+        if (!(item = __pycomps_docdiff_item(&items[i], out))) {
+            Py_DECREF(ret);
+            return NULL;
+        }
+        PyList_SET_ITEM(ret, i, item);
+    }
+    return ret;
+}
+
+static PyObject* PyCOMPSDocDiff_get_groups(PyObject *self, void *closure) {
+    (void)closure;
+    return __pycomps_docdiff_items(_diff_->groups, _diff_->groups_len,
+                                   &comps_groups_out);
+}
+
+static PyObject* PyCOMPSDocDiff_get_categories(PyObject *self,
+                                               void *closure) {
+    (void)closure;
+    return __pycomps_docdiff_items(_diff_->categories, _diff_->categories_len,
+                                   &comps_cats_out);
+}
+
+static PyObject* PyCOMPSDocDiff_get_envs(PyObject *self, void *closure) {
+    (void)closure;
+    return __pycomps_docdiff_items(_diff_->envs, _diff_->envs_len,
+                                   &comps_envs_out);
+}
+
+static PyObject* PyCOMPSDocDiff_get_langpacks(PyObject *self, void *closure) {
+    COMPS_HSList *pairs;
+    COMPS_HSListItem *hsit;
+    PyObject *ret, *key, *val;
+    int err = 0;
+    (void)closure;
+
+    if (!(ret = PyDict_New()))
+        return NULL;
+    if (!_diff_->langpacks)
+        return ret;
+    pairs = comps_objdict_pairs(_diff_->langpacks);
+    for (hsit = pairs->first; hsit != NULL && !err; hsit = hsit->next) {
+        key = PyUnicode_FromString(((COMPS_ObjRTreePair*)hsit->data)->key);
+        val = __pycomps_str_out(((COMPS_ObjRTreePair*)hsit->data)->data);
+        err = (!key || !val || PyDict_SetItem(ret, key, val));
+        Py_XDECREF(key);
+        Py_XDECREF(val);
+    }
+    comps_hslist_destroy(&pairs);
+    if (err) {
+        Py_DECREF(ret);
+        return NULL;
+    }
+    return ret;
+}
+
+static PyObject* PyCOMPSDocDiff_get_langpacks_removed(PyObject *self,
+                                                      void *closure) {
+    COMPS_ObjListIt *it;
+    PyObject *ret, *name;
+    (void)closure;
+
+    if (!(ret = PyList_New(0)))
+        return NULL;
+    for (it = _diff_->langpacks_removed ? _diff_->langpacks_removed->first
+                                        : NULL; it != NULL; it = it->next) {
+        name = __pycomps_str_out(it->comps_obj);
+        if (!name || PyList_Append(ret, name)) {
+            Py_XDECREF(name);
+            Py_DECREF(ret);
+            return NULL;
+        }
+        Py_DECREF(name);
+    }
+    return ret;
+}
+
+static PyObject* PyCOMPSDocDiff_get_changed(PyObject *self, void *closure) {
+    COMPS_ObjMDict *dict;
+
+    dict = *(COMPS_ObjMDict**)((char*)_diff_ + (size_t)closure);
+    return PyBool_FromLong(dict != NULL);
+}
+
+static PyObject* PyCOMPSDocDiff_get_doctype_changed(PyObject *self,
+                                                    void *closure) {
+    (void)closure;
+    return PyBool_FromLong(_diff_->doctype_changed);
+}
+
+static Py_ssize_t PyCOMPSDocDiff_len(PyObject *self) {
+    return comps_doc_diff_len(_diff_);
+}
+
+static void PyCOMPSDocDiff_dealloc(PyObject *self) {
+    comps_doc_diff_destroy(((PyCOMPS_DocDiff*)self)->diff);
+    Py_TYPE(self)->tp_free(self);
+}
+
+PyObject* PyCOMPSDocDiff_out(COMPS_DocDiff *diff) {
+    PyCOMPS_DocDiff *ret;
+
+    if (!diff)
+        return PyErr_NoMemory();
+    ret = (PyCOMPS_DocDiff*)PyCOMPS_DocDiffType.tp_alloc(&PyCOMPS_DocDiffType,
+                                                        0);
+    if (!ret) {
+        comps_doc_diff_destroy(diff);
+        return NULL;
+    }
+    ret->diff = diff;
+    return (PyObject*)ret;
+}
+
+static PyGetSetDef PyCOMPSDocDiff_getset[] = {
+    {"groups", (getter)PyCOMPSDocDiff_get_groups, NULL,
+     "list of changes of groups", NULL},
+    {"categories", (getter)PyCOMPSDocDiff_get_categories, NULL,
+     "list of changes of categories", NULL},
+    {"environments", (getter)PyCOMPSDocDiff_get_envs, NULL,
+     "list of changes of environments", NULL},
+    {"langpacks", (getter)PyCOMPSDocDiff_get_langpacks, NULL,
+     "dict of added and changed langpacks", NULL},
+    {"langpacks_removed", (getter)PyCOMPSDocDiff_get_langpacks_removed, NULL,
+     "list of names of removed langpacks", NULL},
+    {"blacklist_changed", (getter)PyCOMPSDocDiff_get_changed, NULL,
+     "True if blacklist changed",
+     (void*)offsetof(COMPS_DocDiff, blacklist)},
+    {"whiteout_changed", (getter)PyCOMPSDocDiff_get_changed, NULL,
+     "True if whiteout changed",
+     (void*)offsetof(COMPS_DocDiff, whiteout)},
+    {"doctype_changed", (getter)PyCOMPSDocDiff_get_doctype_changed, NULL,
+     "True if doctype changed", NULL},
+    {NULL}  /* Sentinel */
+};
+
+static PySequenceMethods PyCOMPSDocDiff_sequence = {
+    .sq_length = &PyCOMPSDocDiff_len
+};
+
+PyDoc_STRVAR(PyCOMPSDocDiff__doc__,
+             "Structural difference of two Comps objects made by "
+             ":py:meth:`libcomps.Comps.diff`\n"
+             "\n"
+             "Changes of groups, categories and environments are dicts with "
+             "keys:\n"
+             "\n"
+             "* type - 'added', 'removed', 'changed' or 'moved'\n"
+             "* object - new version of object, old one if removed\n"
+             "* flags - DIFF_NAME, DIFF_DESC, DIFF_LANG, DIFF_ATTRS and "
+             "DIFF_CONTENT flags of changed properties\n"
+             "* position - index in new list, None if object stays in place\n"
+             "* added, removed - names of added and removed packages or group "
+             "ids, None if they didn't change\n"
+             "* options_added, options_removed - same for environment "
+             "options\n"
+             "\n"
+             "len() of difference is number of changes, 0 for equal objects");
+
+PyTypeObject PyCOMPS_DocDiffType = {
+    PY_OBJ_HEAD_INIT
+    "libcomps.DocDiff",        /*tp_name*/
+    sizeof(PyCOMPS_DocDiff),   /*tp_basicsize*/
+    0,                         /*tp_itemsize*/
+    &PyCOMPSDocDiff_dealloc,   /*tp_dealloc*/
+    0,                         /*tp_print*/
+    0,                         /*tp_getattr*/
+    0,                         /*tp_setattr*/
+    0,                         /*tp_compare*/
+    0,                         /*tp_repr*/
+    0,                         /*tp_as_number*/
+    &PyCOMPSDocDiff_sequence,  /*tp_as_sequence*/
+    0,                         /*tp_as_mapping*/
+    0,                         /*tp_hash */
+    0,                         /*tp_call*/
+    0,                         /*tp_str*/
+    0,                         /*tp_getattro*/
+    0,                         /*tp_setattro*/
+    0,                         /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT,        /*tp_flags*/
+    PyCOMPSDocDiff__doc__,      /* tp_doc */
+    0,                          /* tp_traverse */
+    0,                          /* tp_clear */
+    0,                          /* tp_richcompare */
+    0,                          /* tp_weaklistoffset */
+    0,                          /* tp_iter */
+    0,                          /* tp_iternext */
+    0,                          /* tp_methods */
+    0,                          /* tp_members */
+    PyCOMPSDocDiff_getset,      /* tp_getset */
+    0,                          /* tp_base */
+    0,                          /* tp_dict */
+    0,                          /* tp_descr_get */
+    0,                          /* tp_descr_set */
+    0,                          /* tp_dictoffset */
+    0,                          /* tp_init */
+    0,                          /* tp_alloc */
+    0,                          /* tp_new */};
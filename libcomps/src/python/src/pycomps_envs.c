@@ -407,7 +407,8 @@ PyCOMPS_ItemInfo PyCOMPS_EnvsInfo = {
                         {&comps_envs_in},
     .out_convert_func = &comps_envs_out,
     .item_types_len = 1,
-    .props_offset = offsetof(COMPS_DocEnv, properties),
+    .id_offset = offsetof(COMPS_DocEnv, id),
+    .id_indexed = 1,
     .pre_checker = &pycomps_env_validate
 };
 
@@ -430,8 +431,8 @@ COMPS_ObjList* comps_envs_union(COMPS_ObjList *envs1, COMPS_ObjList *envs2) {
     ret = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
 
     set = comps_set_create();
-    comps_set_init(set, NULL, NULL, &comps_object_destroy_v,
-                                    &__comps_docenv_idcmp);
+    comps_set_init_hashed(set, NULL, NULL, &comps_object_destroy_v,
+                               &__comps_docenv_idcmp, &__comps_docenv_idhash);
     for (it = envs1 ? envs1->first : NULL; it != NULL; it = it->next) {
         tmpenv = (COMPS_DocEnv*) comps_object_copy(it->comps_obj);
         comps_set_add(set, tmpenv);
@@ -501,7 +502,7 @@ PyTypeObject PyCOMPS_EnvsType = {
     0, //&PyCOMPSEnvs_cmp,          /*tp_compare*/
     0,                         /*tp_repr*/
     &PyCOMPSEnvs_Nums,         /*tp_as_number*/
-    0,//&PyCOMPSEnv_sequence,       /*tp_as_sequence*/
+    &PyCOMPSSeq_sequence_extra, /*tp_as_sequence*/
     &PyCOMPSSeq_mapping_extra, /*tp_as_mapping*/
     0,                         /*tp_hash */
     0,                         /*tp_call*/
@@ -58,6 +58,7 @@ PyObject* PyCOMPSEnv_new(PyTypeObject *type, PyObject *args, PyObject *kwds);
 int PyCOMPSEnvs_init(PyCOMPS_Sequence *self, PyObject *args, PyObject *kwds);
 
 int PyCOMPSEnv_init(PyCOMPS_Env *self, PyObject *args, PyObject *kwds);
+PyObject* comps_envs_out(COMPS_Object *cobj);
 
 PyObject* PyCOMPSEnv_get_name_by_lang(PyObject *self, void *closure);
 int PyCOMPSEnv_set_name_by_lang(PyObject *self, PyObject *value, void *closure);
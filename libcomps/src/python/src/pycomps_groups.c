@@ -247,38 +247,6 @@ PyObject* PyCOMPSGroup_cmp(PyObject *self, PyObject *other, int op) {
     Py_RETURN_TRUE;
 }
 
-int pycomps_group_boolattr_setter(PyObject *self, PyObject *val, void *closure) {
-    long tmp;
-    COMPS_Object *tmp_prop;
-    if (!val) {
-        PyErr_Format(PyExc_TypeError, "Can't delete %s", (char*)closure);
-        return -1;
-    }
-    if (!PyBool_Check(val)) {
-        PyErr_SetString(PyExc_TypeError, "Not bool object");
-        return -1;
-    }
-    tmp = (val == Py_True)?1:0;
-    tmp_prop = (COMPS_Object*) comps_num(tmp);
-    comps_objdict_set_x(((PyCOMPS_Group*)self)->c_obj->properties,
-                   (char*)closure, tmp_prop);
-    return 0;
-}
-
-PyObject* pycomps_group_boolattr_getter(PyObject *self, void *closure) {
-
-    COMPS_Object *tmp_prop;
-    PyObject *ret;
-    tmp_prop = comps_objdict_get(((PyCOMPS_Group*)self)->c_obj->properties,
-                                 (char*)closure);
-    if (tmp_prop) {
-        ret = PyBool_FromLong(((COMPS_Num*)tmp_prop)->val);
-        COMPS_OBJECT_DESTROY(tmp_prop);
-        return ret;
-    } else
-        Py_RETURN_NONE;
-}
-
 int pycomps_group_validate(COMPS_Object *obj) {
     COMPS_ValGenResult *result = comps_validate_execute(obj,
                                         COMPS_DocGroup_ValidateRules);
@@ -342,6 +310,21 @@ __COMPS_NUMPROP_GETSET_CLOSURE(COMPS_DocGroup) DocGroup_DispOrdClosure = {
     .set_f = &comps_docgroup_set_display_order,
 };
 
+__COMPS_NUMPROP_GETSET_CLOSURE(COMPS_DocGroup) DocGroup_UserVisibleClosure = {
+    .get_f = &comps_docgroup_get_uservisible,
+    .set_f = &comps_docgroup_set_uservisible,
+};
+
+__COMPS_NUMPROP_GETSET_CLOSURE(COMPS_DocGroup) DocGroup_BiarchOnlyClosure = {
+    .get_f = &comps_docgroup_get_biarchonly,
+    .set_f = &comps_docgroup_set_biarchonly,
+};
+
+__COMPS_NUMPROP_GETSET_CLOSURE(COMPS_DocGroup) DocGroup_DefaultClosure = {
+    .get_f = &comps_docgroup_get_def,
+    .set_f = &comps_docgroup_set_def,
+};
+
 __COMPS_DICT_GETSET_CLOSURE(COMPS_DocGroup) DocGroup_NameByLangClosure = {
     .p_offset = offsetof(PyCOMPS_Group, p_name_by_lang),
     .dict_offset = offsetof(COMPS_DocGroup, name_by_lang),
@@ -380,14 +363,14 @@ PyGetSetDef PyCOMPSGroup_getset[] = {
      (getter)__PyCOMPS_get_numattr, (setter)__PyCOMPS_set_numattr,
      "Group display order attribute", (void*)&DocGroup_DispOrdClosure},
     {"uservisible",
-     (getter)pycomps_group_boolattr_getter, (setter)pycomps_group_boolattr_setter,
-     "Group uservisible attribute", "uservisible"},
+     (getter)__PyCOMPS_get_boolattr, (setter)__PyCOMPS_set_boolattr,
+     "Group uservisible attribute", (void*)&DocGroup_UserVisibleClosure},
     {"biarchonly",
-     (getter)pycomps_group_boolattr_getter, (setter)pycomps_group_boolattr_setter,
-     "Group uservisible attribute", "biarchonly"},
+     (getter)__PyCOMPS_get_boolattr, (setter)__PyCOMPS_set_boolattr,
+     "Group uservisible attribute", (void*)&DocGroup_BiarchOnlyClosure},
     {"default",
-     (getter)pycomps_group_boolattr_getter, (setter)pycomps_group_boolattr_setter,
-     "Group default attribute", "def"},
+     (getter)__PyCOMPS_get_boolattr, (setter)__PyCOMPS_set_boolattr,
+     "Group default attribute", (void*)&DocGroup_DefaultClosure},
     {"packages",
     (getter)__PyCOMPS_get_ids, (setter)__PyCOMPS_set_ids,
      ":py:class:`libcomps.PackageList` of :py:class:`libcomps.Package`",
@@ -465,7 +448,8 @@ PyCOMPS_ItemInfo PyCOMPS_GroupsInfo = {
                         {&comps_groups_in},
     .out_convert_func = &comps_groups_out,
     .item_types_len = 1,
-    .props_offset = offsetof(COMPS_DocGroup, properties),
+    .id_offset = offsetof(COMPS_DocGroup, id),
+    .id_indexed = 1,
     .pre_checker = &pycomps_group_validate
 };
 
@@ -489,8 +473,9 @@ COMPS_ObjList* comps_groups_union(COMPS_ObjList *groups1,
     ret = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
 
     set = comps_set_create();
-    comps_set_init(set, NULL, NULL, &comps_object_destroy_v,
-                                    &__comps_docgroup_idcmp);
+    comps_set_init_hashed(set, NULL, NULL, &comps_object_destroy_v,
+                               &__comps_docgroup_idcmp,
+                               &__comps_docgroup_idhash);
     for (it = groups1 ? groups1->first : NULL; it != NULL; it = it->next) {
         tmpgroup = (COMPS_DocGroup*) comps_object_copy(it->comps_obj);
         comps_set_add(set, tmpgroup);
@@ -615,7 +600,7 @@ PyTypeObject PyCOMPS_GroupsType = {
     0,//&PyCOMPSGroups_cmp,          /*tp_compare*/
     0,                         /*tp_repr*/
     &PyCOMPSGroups_Nums,         /*tp_as_number*/
-    0,//&PyCOMPSGroup_sequence,       /*tp_as_sequence*/
+    &PyCOMPSSeq_sequence_extra, /*tp_as_sequence*/
     &PyCOMPSSeq_mapping_extra, /*tp_as_mapping*/
     0,                         /*tp_hash */
     0,                         /*tp_call*/
@@ -682,8 +667,9 @@ COMPS_ObjList* comps_pkgs_union(COMPS_ObjList *pkgs1, COMPS_ObjList *pkgs2) {
     ret = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
 
     set = comps_set_create();
-    comps_set_init(set, NULL, NULL, &comps_object_destroy_v,
-                                    &__comps_docpackage_idcmp);
+    comps_set_init_hashed(set, NULL, NULL, &comps_object_destroy_v,
+                               &__comps_docpackage_idcmp,
+                               &comps_docpackage_hash_set);
     for (it = pkgs1 ? pkgs1->first : NULL; it != NULL; it = it->next) {
         tmppkg = (COMPS_DocGroupPackage*)comps_object_copy(it->comps_obj);
         comps_set_add(set, tmppkg);
@@ -726,7 +712,8 @@ PyCOMPS_ItemInfo PyCOMPS_PkgsInfo = {
                         {&comps_pkgs_in},
     .out_convert_func = &comps_pkgs_out,
     .item_types_len = 1,
-    .props_offset = offsetof(COMPS_DocGroupPackage, name),
+    .id_offset = offsetof(COMPS_DocGroupPackage, name),
+    .id_indexed = 1,
     .pre_checker = &pycomps_package_validate,
 };
 
@@ -761,7 +748,7 @@ PyTypeObject PyCOMPS_PacksType = {
     0,                         /*tp_compare*/
     0,                         /*tp_repr*/
     &PyCOMPSPacks_Nums,        /*tp_as_number*/
-    0,//&PyCOMPSPack_sequence,       /*tp_as_sequence*/
+    &PyCOMPSSeq_sequence_extra, /*tp_as_sequence*/
     &PyCOMPSSeq_mapping_extra, /*tp_as_mapping*/
     0,                         /*tp_hash */
     0,                         /*tp_call*/
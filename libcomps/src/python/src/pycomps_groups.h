@@ -59,6 +59,7 @@ COMPS_ObjList* comps_groups_union(COMPS_ObjList *groups1,
 void PyCOMPSGroup_dealloc(PyObject *self);
 PyObject * PyCOMPSGroup_new(PyTypeObject *type, PyObject *args, PyObject *kwds);
 int PyCOMPSGroup_init(PyCOMPS_Group *self, PyObject *args, PyObject *kwds);
+PyObject* comps_groups_out(COMPS_Object *cobj);
 PyObject* PyCOMPSGroup_get_name_by_lang(PyCOMPS_Group *self, void *closure);
 int PyCOMPSGroup_set_name_by_lang(PyCOMPS_Group *self, PyObject *value,
                                                        void *closure);
@@ -80,6 +81,7 @@ COMPS_DocGroupPackage* pycomps_pkg_get(PyObject *pypkg);
 PyObject* PyCOMPSPack_new(PyTypeObject *type, PyObject *args, PyObject *kwds);
 int PyCOMPSPack_init(PyCOMPS_Package *self, PyObject *args, PyObject *kwds);
 PyObject* PyCOMPSPack_convert(void *p);
+PyObject* comps_pkgs_out(COMPS_Object *cobj);
 
 int PyCOMPSPacks_init(PyCOMPS_Sequence *self, PyObject *args, PyObject *kwds);
 
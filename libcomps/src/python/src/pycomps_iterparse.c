@@ -0,0 +1,277 @@
+/* libcomps - C alternative to yum.comps library
+ * Copyright (C) 2013 Jindrich Luza
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * any later version.
+ *
+ * This program is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to  Free Software
+ * Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301,
+ * USA
+ */
+
+#include "pycomps_iterparse.h"
+#include "pycomps_groups.h"
+#include "pycomps_categories.h"
+#include "pycomps_envs.h"
+#include "pycomps_exc.h"
+#include "pycomps_utils.h"
+
+#define ITERPARSE_BUFF_SIZE 65536
+
+static void __pycomps_iterparse_handler(COMPS_Object *obj, void *data) {
+    #define _iter_ ((PyCOMPS_IterParse*)data)
+    int kind;
+
+    if (obj->obj_info == &COMPS_DocGroup_ObjInfo)
+        kind = PYCOMPS_ITERPARSE_GROUPS;
+    else if (obj->obj_info == &COMPS_DocCategory_ObjInfo)
+        kind = PYCOMPS_ITERPARSE_CATEGORIES;
+    else
+        kind = PYCOMPS_ITERPARSE_ENVS;
+    if (_iter_->kinds & kind)
+        comps_hslist_append(_iter_->pending, comps_object_incref(obj), 0);
+    #undef _iter_
+}
+
+static int __pycomps_iterparse_kinds(PyObject *kinds) {
+    PyObject *it, *item;
+    char *kind;
+    int ret = 0;
+
+    if (!kinds || kinds == Py_None)
+        return PYCOMPS_ITERPARSE_GROUPS | PYCOMPS_ITERPARSE_CATEGORIES |
+               PYCOMPS_ITERPARSE_ENVS;
+    if (!(it = PyObject_GetIter(kinds)))
+        return -1;
+    while ((item = PyIter_Next(it)) != NULL) {
+        if (__pycomps_arg_to_char(item, &kind)) {
+            Py_DECREF(item);
+            Py_DECREF(it);
+            return -1;
+        }
+        Py_DECREF(item);
+        if (strcmp(kind, "group") == 0)
+            ret |= PYCOMPS_ITERPARSE_GROUPS;
+        else if (strcmp(kind, "category") == 0)
+            ret |= PYCOMPS_ITERPARSE_CATEGORIES;
+        else if (strcmp(kind, "environment") == 0)
+            ret |= PYCOMPS_ITERPARSE_ENVS;
+        else {
+            PyErr_Format(PyExc_ValueError, "Unknown kind '%s'. Use 'group', "
+                         "'category' or 'environment'", kind);
+            free(kind);
+            Py_DECREF(it);
+            return -1;
+        }
+        free(kind);
+    }
+    Py_DECREF(it);
+    if (PyErr_Occurred())
+        return -1;
+    return ret;
+}
+
+static void __pycomps_iterparse_error(PyCOMPS_IterParse *self) {
+    COMPS_HSListItem *it;
+    COMPS_LogEntry *entry = NULL;
+    char *msg;
+
+    for (it = self->parsed->log->entries->first; it != NULL; it = it->next) {
+        if (((COMPS_LogEntry*)it->data)->type == COMPS_LOG_ENTRY_ERR)
+            entry = it->data;
+    }
+    if (!entry) {
+        PyErr_SetString(PyCOMPSExc_ParserError, "Fatal parser error");
+        return;
+    }
+    msg = comps_log_entry_str(entry);
+    PyErr_SetString(PyCOMPSExc_ParserError, msg);
+    free(msg);
+}
+
+/* Parse next chunk of input. Return -1 and set exception on error */
+static int __pycomps_iterparse_step(PyCOMPS_IterParse *self) {
+    PyObject *chunk = NULL;
+    Py_buffer view;
+    const char *data;
+    size_t len;
+    signed char ret;
+
+    if (self->f) {
+        len = fread(self->buff, sizeof(char), ITERPARSE_BUFF_SIZE, self->f);
+        if (ferror(self->f)) {
+            PyErr_SetString(PyExc_IOError, "Error while reading input");
+            self->done = 1;
+            return -1;
+        }
+        data = self->buff;
+    } else {
+        chunk = PyObject_CallMethod(self->source, "read", "n",
+                                    (Py_ssize_t)ITERPARSE_BUFF_SIZE);
+        if (!chunk)
+            return -1;
+        if (PyObject_GetBuffer(chunk, &view, PyBUF_SIMPLE)) {
+            Py_DECREF(chunk);
+            return -1;
+        }
+        data = view.buf;
+        len = (size_t)view.len;
+    }
+    if (len) {
+        ret = comps_parse_feed(self->parsed, data, len);
+    } else {
+        ret = comps_parse_close(self->parsed);
+        self->done = 1;
+    }
+    if (chunk) {
+        PyBuffer_Release(&view);
+        Py_DECREF(chunk);
+    }
+    if (ret == -1) {
+        self->done = 1;
+        __pycomps_iterparse_error(self);
+        return -1;
+    }
+    return 0;
+}
+
+static PyObject* PyCOMPSIterParse_iternext(PyObject *self) {
+    #define _iter_ ((PyCOMPS_IterParse*)self)
+    COMPS_Object *obj;
+
+    while ((obj = comps_hslist_shift(_iter_->pending)) == NULL) {
+        if (_iter_->done)
+            return NULL;
+        if (__pycomps_iterparse_step(_iter_))
+            return NULL;
+    }
+    if (obj->obj_info == &COMPS_DocGroup_ObjInfo)
+        return comps_groups_out(obj);
+    else if (obj->obj_info == &COMPS_DocCategory_ObjInfo)
+        return comps_cats_out(obj);
+    else
+        return comps_envs_out(obj);
+    #undef _iter_
+}
+
+static void PyCOMPSIterParse_dealloc(PyObject *self) {
+    #define _iter_ ((PyCOMPS_IterParse*)self)
+    if (_iter_->parsed)
+        comps_parse_parsed_destroy(_iter_->parsed);
+    if (_iter_->pending)
+        comps_hslist_destroy(&_iter_->pending);
+    if (_iter_->f)
+        fclose(_iter_->f);
+    Py_XDECREF(_iter_->source);
+    free(_iter_->buff);
+    Py_TYPE(self)->tp_free(self);
+    #undef _iter_
+}
+
+PyObject* PyCOMPS_iterparse(PyObject *self, PyObject *args, PyObject *kwds) {
+    PyObject *source, *kinds = NULL;
+    PyCOMPS_IterParse *ret;
+    char *fname = NULL;
+    int kinds_mask;
+    char* keywords[] = {"source", "kinds", NULL};
+    (void)self;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|O", keywords,
+                                     &source, &kinds))
+        return NULL;
+    if ((kinds_mask = __pycomps_iterparse_kinds(kinds)) < 0)
+        return NULL;
+
+    ret = (PyCOMPS_IterParse*)PyCOMPS_IterParseType.tp_alloc(
+                                                &PyCOMPS_IterParseType, 0);
+    if (!ret)
+        return NULL;
+    ret->kinds = kinds_mask;
+    if (PyObject_HasAttrString(source, "read")) {
+        Py_INCREF(source);
+        ret->source = source;
+    } else {
+        if (__pycomps_arg_to_char(source, &fname)) {
+            Py_DECREF(ret);
+            return NULL;
+        }
+        ret->f = fopen(fname, "r");
+        if (!ret->f) {
+            PyErr_Format(PyExc_IOError, "Cannot open %s for reading", fname);
+            free(fname);
+            Py_DECREF(ret);
+            return NULL;
+        }
+        free(fname);
+        ret->buff = malloc(sizeof(char) * ITERPARSE_BUFF_SIZE);
+        if (!ret->buff) {
+            Py_DECREF(ret);
+            return PyErr_NoMemory();
+        }
+    }
+    ret->pending = comps_hslist_create();
+    comps_hslist_init(ret->pending, NULL, NULL, &comps_object_destroy_v);
+    ret->parsed = comps_parse_parsed_create();
+    comps_parse_parsed_init(ret->parsed, "UTF-8", 0);
+    ret->options = COMPS_DDefaultsOptions;
+    ret->options.skip_sections = COMPS_SECTION_ALL;
+    if (kinds_mask & PYCOMPS_ITERPARSE_GROUPS)
+        ret->options.skip_sections &= ~COMPS_SECTION_GROUPS;
+    if (kinds_mask & PYCOMPS_ITERPARSE_CATEGORIES)
+        ret->options.skip_sections &= ~COMPS_SECTION_CATEGORIES;
+    if (kinds_mask & PYCOMPS_ITERPARSE_ENVS)
+        ret->options.skip_sections &= ~COMPS_SECTION_ENVIRONMENTS;
+    ret->parsed->def_options = &ret->options;
+    ret->parsed->obj_handler = &__pycomps_iterparse_handler;
+    ret->parsed->obj_handler_data = ret;
+    return (PyObject*)ret;
+}
+
+PyTypeObject PyCOMPS_IterParseType = {
+    PY_OBJ_HEAD_INIT
+    "libcomps.IterParse",   /*tp_name*/
+    sizeof(PyCOMPS_IterParse), /*tp_basicsize*/
+    0,                         /*tp_itemsize*/
+    &PyCOMPSIterParse_dealloc, /*tp_dealloc*/
+    0,                         /*tp_print*/
+    0,                         /*tp_getattr*/
+    0,                         /*tp_setattr*/
+    0,                         /*tp_compare*/
+    0,                         /*tp_repr*/
+    0,                         /*tp_as_number*/
+    0,                         /*tp_as_sequence*/
+    0,                         /*tp_as_mapping*/
+    0,                         /*tp_hash */
+    0,                         /*tp_call*/
+    0,                         /*tp_str*/
+    0,                         /*tp_getattro*/
+    0,                         /*tp_setattro*/
+    0,                         /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT,        /*tp_flags*/
+    "Iterator over groups, categories and environments of comps xml",
+                                /* tp_doc */
+    0,                          /* tp_traverse */
+    0,                          /* tp_clear */
+    0,                          /* tp_richcompare */
+    0,                          /* tp_weaklistoffset */
+    PyObject_SelfIter,          /* tp_iter */
+    PyCOMPSIterParse_iternext,  /* tp_iternext */
+    0,                          /* tp_methods */
+    0,                          /* tp_members */
+    0,                          /* tp_getset */
+    0,                          /* tp_base */
+    0,                          /* tp_dict */
+    0,                          /* tp_descr_get */
+    0,                          /* tp_descr_set */
+    0,                          /* tp_dictoffset */
+    0,                          /* tp_init */
+    0,                          /* tp_alloc */
+    0,                          /* tp_new */};
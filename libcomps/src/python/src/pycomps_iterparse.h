@@ -0,0 +1,52 @@
+/* libcomps - C alternative to yum.comps library
+ * Copyright (C) 2013 Jindrich Luza
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * any later version.
+ *
+ * This program is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to  Free Software
+ * Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301,
+ * USA
+ */
+
+#ifndef PYCOMPS_ITERPARSE_H
+#define PYCOMPS_ITERPARSE_H
+
+#include <Python.h>
+#include "structmember.h"
+
+#include "libcomps/comps_parse.h"
+#include "libcomps/comps_default.h"
+#include "libcomps/comps_hslist.h"
+
+#include "pycomps_23macros.h"
+
+#define PYCOMPS_ITERPARSE_GROUPS 1
+#define PYCOMPS_ITERPARSE_CATEGORIES 2
+#define PYCOMPS_ITERPARSE_ENVS 4
+
+typedef struct {
+    PyObject_HEAD
+    COMPS_Parsed *parsed;
+    COMPS_DefaultsOptions options; /* skips sections not iterated over */
+    COMPS_HSList *pending; /* parsed objects not yielded yet */
+    FILE *f;
+    PyObject *source; /* file-like object if not parsing file by name */
+    char *buff;
+    int kinds;
+    char done;
+} PyCOMPS_IterParse;
+
+PyObject* PyCOMPS_iterparse(PyObject *self, PyObject *args, PyObject *kwds);
+
+extern PyTypeObject PyCOMPS_IterParseType;
+
+#endif
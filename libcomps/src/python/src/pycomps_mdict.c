@@ -299,11 +299,11 @@ PyObject* PyCOMPSMDict_keys(PyObject * self, PyObject *args) {
 PyObject* PyCOMPSMDict_values(PyObject * self, PyObject *args) {
     (void)args;
     PyObject *ret, *item;
-    COMPS_HSList *list = comps_objmrtree_values(_DICT_->dict);
+    COMPS_HSList *list = comps_objmrtree_pairs(_DICT_->dict);
 
     ret = PyList_New(0);
     for (COMPS_HSListItem *it = list->first; it != NULL; it = it->next) {
-        item = _INFO_->out_convert_func(it->data);
+        item = __pycomps_mdict_val_out(it);
         PyList_Append(ret, item);
         Py_DECREF(item);
     }
@@ -313,16 +313,12 @@ PyObject* PyCOMPSMDict_values(PyObject * self, PyObject *args) {
 
 PyObject* PyCOMPSMDict_items(PyObject * self, PyObject *args) {
     (void)args;
-    PyObject *ret, *k, *v, *tp;
-    COMPS_HSList *list = comps_objrtree_pairs(((PyCOMPS_Dict*)self)->dict);
+    PyObject *ret, *tp;
+    COMPS_HSList *list = comps_objmrtree_pairs(_DICT_->dict);
 
     ret = PyList_New(0);
     for (COMPS_HSListItem *it = list->first; it != NULL; it = it->next) {
-        k = PyUnicode_FromString(((COMPS_ObjRTreePair*)it->data)->key);
-        v = _INFO_->out_convert_func(((COMPS_ObjRTreePair*)it->data)->data);
-        tp = PyTuple_Pack(2, k, v);
-        Py_DECREF(k);
-        Py_DECREF(v);
+        tp = __pycomps_mdict_pair_out(it);
         PyList_Append(ret, tp);
         Py_DECREF(tp);
     }
@@ -369,7 +365,7 @@ PyObject* PyCOMPSMDict_getitervalues(PyObject *self) {
     PyObject *res;
     res = PyCOMPSMDictIter_new(&PyCOMPS_MDictIterType, NULL, NULL);
     PyCOMPSMDictIter_init((PyCOMPS_MDictIter*)res, NULL, NULL);
-    ((PyCOMPS_MDictIter*)res)->hslist = comps_objmdict_values(((PyCOMPS_MDict*)self)->dict);
+    ((PyCOMPS_MDictIter*)res)->hslist = comps_objmdict_pairs(((PyCOMPS_MDict*)self)->dict);
     ((PyCOMPS_MDictIter*)res)->hsit = ((PyCOMPS_MDictIter*)res)->hslist->first;
     ((PyCOMPS_MDictIter*)res)->out_func = &__pycomps_mdict_val_out;
     return res;
@@ -603,12 +599,12 @@ PyTypeObject PyCOMPS_MDictIterType = {
     0,                          /* tp_clear */
     0,                          /* tp_richcompare */
     0,                          /* tp_weaklistoffset */
-    0,         /* tp_iter */
+    PyObject_SelfIter,          /* tp_iter */
     PyCOMPSMDict_iternext,         /* tp_iternext */
     PyCOMPSMDictIter_methods,         /* tp_methods */
     PyCOMPSMDictIter_members,         /* tp_members */
     0,                          /* tp_getset */
-    &PySeqIter_Type,                          /* tp_base */
+    0,                          /* tp_base */
     0,                          /* tp_dict */
     0,                          /* tp_descr_get */
     0,                          /* tp_descr_set */
@@ -47,13 +47,38 @@ inline PyObject* list_getitem(PyObject *self, Py_ssize_t index) {
     return ret;
 }
 
-inline PyObject* list_getitem_byid(PyObject *self, PyObject *id) {
+static COMPS_Object* list_find_byid(PyObject *self, char *strid) {
     #define _seq_ ((PyCOMPS_Sequence*)self)
-    char *strid=NULL;
     COMPS_ObjListIt *it;
-    COMPS_Object *props, *oid;
+    COMPS_Object *oid, *tmpstr, *ret = NULL;
+
+    if (!_seq_->list->first)
+        return NULL;
+    if (_seq_->it_info->id_indexed) {
+        if (!_seq_->id_index) {
+            _seq_->id_index = comps_doc_idindex_create(
+                                                _seq_->it_info->id_offset);
+        }
+        return comps_doc_idindex_get(_seq_->id_index, _seq_->list, strid);
+    }
+    tmpstr = (COMPS_Object*)comps_str(strid);
+    for (it = _seq_->list->first; it != NULL; it = it->next) {
+        oid = (COMPS_Object*)GET_FROM(it->comps_obj,
+                                      _seq_->it_info->id_offset);
+        if (comps_object_cmp(oid, tmpstr)) {
+            ret = it->comps_obj;
+            break;
+        }
+    }
+    COMPS_OBJECT_DESTROY(tmpstr);
+    return ret;
+    #undef _seq_
+}
+
+inline PyObject* list_getitem_byid(PyObject *self, PyObject *id) {
+    char *strid=NULL;
+    COMPS_Object *obj;
     PyObject *ret = NULL;
-    COMPS_Object *tmpstr;
 
     if (PyUnicode_Check(id)) {
         if (__pycomps_stringable_to_char(id, &strid)) {
@@ -63,29 +88,42 @@ inline PyObject* list_getitem_byid(PyObject *self, PyObject *id) {
     } else if (PyBytes_Check(id)){
         strid = PyBytes_AsString(id);
     }
-    tmpstr = (COMPS_Object*)comps_str(strid);
-    for (it = ((PyCOMPS_Sequence*)self)->list->first; it != NULL;
-         it = it->next) {
-        props = (COMPS_Object*)GET_FROM(it->comps_obj,
-                                         _seq_->it_info->props_offset);
-        if (props->obj_info == &COMPS_ObjDict_ObjInfo) {
-            oid = comps_objdict_get_x((COMPS_ObjDict*)props, "id");
-        } else {
-            oid = props;
-        }
-        if (comps_object_cmp(oid, tmpstr)) {
-            comps_object_incref(it->comps_obj);
-            ret = ((PyCOMPS_Sequence*)self)->it_info->out_convert_func(it->comps_obj);
-            break;
-        }
-    }
-    if (!ret) {
+    obj = list_find_byid(self, strid);
+    if (obj) {
+        comps_object_incref(obj);
+        ret = ((PyCOMPS_Sequence*)self)->it_info->out_convert_func(obj);
+    } else {
         PyErr_Format(PyExc_KeyError, "Object with id '%s' is not in list", strid);
     }
     if (PyUnicode_Check(id)) {
         free(strid);
     }
-    COMPS_OBJECT_DESTROY(tmpstr);
+    return ret;
+}
+
+int PyCOMPSSeq_id_contains(PyObject *self, PyObject *item) {
+    #define _seq_ ((PyCOMPS_Sequence*)self)
+    char *strid = NULL;
+    COMPS_ObjListIt *it;
+    PyObject *pyobj;
+    int ret = 0;
+
+    if (PyUnicode_Check(item)) {
+        if (__pycomps_stringable_to_char(item, &strid)) {
+            return -1;
+        }
+        ret = list_find_byid(self, strid) != NULL;
+        free(strid);
+        return ret;
+    } else if (PyBytes_Check(item)) {
+        return list_find_byid(self, PyBytes_AsString(item)) != NULL;
+    }
+    for (it = _seq_->list->first; it != NULL && !ret; it = it->next) {
+        comps_object_incref(it->comps_obj);
+        pyobj = _seq_->it_info->out_convert_func(it->comps_obj);
+        ret = PyObject_RichCompareBool(pyobj, item, Py_EQ);
+        Py_DECREF(pyobj);
+    }
     return ret;
     #undef _seq_
 }
@@ -137,17 +175,13 @@ inline int list_setitem(PyObject *self, Py_ssize_t index, PyObject *item) {
 
 int list_unique_id_check(PyObject *self, COMPS_Object *converted) {
     #define _seq_ ((PyCOMPS_Sequence*)self)
-    COMPS_ObjDict *props1, *props2;
     COMPS_Object *strid1, *strid2;
 
-    props1 = (COMPS_ObjDict*)GET_FROM(converted,
-                                     _seq_->it_info->props_offset);
-    strid1 = comps_objdict_get_x(props1, "id");
+    strid1 = (COMPS_Object*)GET_FROM(converted, _seq_->it_info->id_offset);
     for (COMPS_ObjListIt *it = _seq_->list->first; it != NULL;
          it = it->next) {
-        props2 = (COMPS_ObjDict*)GET_FROM(it->comps_obj,
-                                          _seq_->it_info->props_offset);
-        strid2 = comps_objdict_get_x(props2, "id");
+        strid2 = (COMPS_Object*)GET_FROM(it->comps_obj,
+                                         _seq_->it_info->id_offset);
 
         if (comps_object_cmp(strid1, strid2)) {
             char *cstrid;
@@ -238,10 +272,8 @@ PyObject* list_repeat(PyObject *self, Py_ssize_t count) {
 
 PyObject* list_get_slice(PyObject *self, PyObject *key) {
     PyCOMPS_Sequence *result;
-    COMPS_ObjListIt *it;
-    int i;
     unsigned int n, uret;
-    Py_ssize_t istart, istop, istep, ilen, clen;
+    Py_ssize_t istart, istop, istep, ilen, clen, i;
 
     n = ((PyCOMPS_Sequence*)self)->list->len;
     result = (PyCOMPS_Sequence*)Py_TYPE((PyCOMPS_Sequence*)self)->tp_new(
@@ -255,15 +287,9 @@ PyObject* list_get_slice(PyObject *self, PyObject *key) {
         return NULL;
     }
 
-    clen = 0;
-    it = ((PyCOMPS_Sequence*)self)->list->first;
-    for (i=0 ; i<istart; it=it->next, i++);
-    while (clen != ilen) {
-        comps_objlist_append(result->list, it->comps_obj);
-        clen+=1;
-        for (i=0 ; i<istep && it != NULL; it=it->next,  i++);
-        if (!it) it = ((PyCOMPS_Sequence*)self)->list->first;
-        for (; i<istep; it=it->next, i++);
+    for (clen = 0, i = istart; clen != ilen; clen++, i += istep) {
+        comps_objlist_append(result->list,
+                        comps_objlist_get_x(((PyCOMPS_Sequence*)self)->list, i));
     }
     return (PyObject*)result;
 }
@@ -295,7 +321,7 @@ PyObject* PyCOMPSSeq_id_get(PyObject *self, PyObject *key) {
 
 int list_set_slice(PyObject *self, PyObject *key, PyObject *val) {
     #define _seq_ ((PyCOMPS_Sequence*)self)
-    COMPS_ObjListIt *it, *it2;
+    COMPS_ObjListIt *it2;
 
     unsigned int n, uret;
     Py_ssize_t istart, istop, istep, ilen, i, c, clen;
@@ -329,72 +355,48 @@ int list_set_slice(PyObject *self, PyObject *key, PyObject *val) {
                 }
             }
 
-
-            clen = 0;
-            it = _seq_->list->first;
-            it2 = ((PyCOMPS_Sequence*)val)->list->first;
-            for (i=0 ; i<istart && it != NULL; it=it->next, i++);
             if (istep != 1) {
-                while (clen != ilen) {
-                    COMPS_OBJECT_DESTROY(it->comps_obj);
-                    it->comps_obj = comps_object_incref(it2->comps_obj);
-                    clen += 1;
-                    it2 = it2->next;
-                    for (i=0 ; i<istep && it != NULL; it=it->next,  i++);
-                    if (!it) it = ((PyCOMPS_Sequence*)self)->list->first;
-                    for (; i<istep; it=it->next, i++);
+                it2 = ((PyCOMPS_Sequence*)val)->list->first;
+                for (clen = 0, i = istart; clen != ilen && it2 != NULL;
+                     clen++, i += istep, it2 = it2->next) {
+                    comps_objlist_set(_seq_->list, i, it2->comps_obj);
                 }
             } else {
-                if (istart < 0) istart += n;
-                if (istop < 0) istop += n;
-
-                for (; it2 != NULL && it != NULL;
-                       it2 = it2->next, it = it->next, i++) {
-                    COMPS_OBJECT_DESTROY(it->comps_obj);
-                    it->comps_obj = comps_object_incref(it2->comps_obj);
+                it2 = ((PyCOMPS_Sequence*)val)->list->first;
+                for (i = istart; it2 != NULL && i < (Py_ssize_t)_seq_->list->len;
+                     it2 = it2->next, i++) {
+                    comps_objlist_set(_seq_->list, i, it2->comps_obj);
                 }
-                if (it == NULL) {
+                if (i >= (Py_ssize_t)_seq_->list->len) {
                     for (;it2 != NULL; it2 = it2->next) {
-                        comps_objlist_append(((PyCOMPS_Sequence*)self)->list,
-                                          it2->comps_obj);
+                        comps_objlist_append(_seq_->list, it2->comps_obj);
                     }
-                }
-                if (it != NULL) {
+                } else {
                     for (c = i; c < istop; c++) {
-                        comps_objlist_remove_at(((PyCOMPS_Sequence*)self)->list,
-                                              i);
+                        comps_objlist_remove_at(_seq_->list, i);
                     }
                 }
             }
             return 0;
         } else {
-            clen = 0;
-            it = ((PyCOMPS_Sequence*)self)->list->first;
-            for (i=0 ; i<istart && it != NULL; it=it->next, i++);
-            while (clen != ilen) {
-                if (it->comps_obj) {
-                    COMPS_OBJECT_DESTROY(it->comps_obj);
-                    it->comps_obj = NULL;
+            /* remove from the end, so indexes of not yet removed items
+             * don't shift */
+            if (istep > 0) {
+                for (clen = ilen - 1; clen >= 0; clen--) {
+                    comps_objlist_remove_at(_seq_->list,
+                                            istart + clen * istep);
                 }
-                clen+=1;
-                for (i=0 ; i<istep && it != NULL; it=it->next,  i++);
-                if (!it) it = ((PyCOMPS_Sequence*)self)->list->first;
-                for (; i<istep; it=it->next, i++);
-            }
-            it2 = NULL;
-            for (i=0, it = ((PyCOMPS_Sequence*)self)->list->first;
-                 it != NULL; it2 = it, it = it->next, i++) {
-                if (it2 && !it2->comps_obj) {
-                    comps_objlist_remove_at(((PyCOMPS_Sequence*)self)->list, i);
+            } else {
+                for (clen = 0; clen != ilen; clen++) {
+                    comps_objlist_remove_at(_seq_->list,
+                                            istart + clen * istep);
                 }
             }
-            if (it2 && !it2->comps_obj) {
-                comps_objlist_remove_at(((PyCOMPS_Sequence*)self)->list, i);
-            }
             return 0;
         }
     }
     return 0;
+    #undef _seq_
 }
 
 int __PyCOMPSSeq_set(PyObject *self, PyObject *key, PyObject *val,
@@ -516,6 +518,7 @@ PyObject* PyCOMPSSeq_remove(PyObject * self, PyObject *item) {
 void PyCOMPSSeq_dealloc(PyCOMPS_Sequence *self)
 {
     COMPS_OBJECT_DESTROY(self->list);
+    comps_doc_idindex_destroy(self->id_index);
     Py_TYPE(self)->tp_free((PyObject*)self);
 }
 
@@ -531,6 +534,7 @@ PyObject* PyCOMPSSeq_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
         self->list = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
     } else return NULL;
     self->it_info = NULL;
+    self->id_index = NULL;
     return (PyObject*) self;
 }
 
@@ -612,6 +616,10 @@ PyMappingMethods PyCOMPSSeq_mapping_extra = {
     PyCOMPSSeq_set_unique
 };
 
+PySequenceMethods PyCOMPSSeq_sequence_extra = {
+    .sq_contains = PyCOMPSSeq_id_contains
+};
+
 
 PyMemberDef PyCOMPSSeq_members[] = {
     {NULL}};
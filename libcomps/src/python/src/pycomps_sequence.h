@@ -32,6 +32,7 @@
 Py_ssize_t list_len(PyObject *self);
 PyObject *list_getitem(PyObject *self, Py_ssize_t index);
 PyObject* list_getitem_byid(PyObject *self, PyObject *id);
+int PyCOMPSSeq_id_contains(PyObject *self, PyObject *item);
 PyObject* list_get_slice(PyObject *self, PyObject *key);
 
 int list_setitem_id_unique(PyObject *self, Py_ssize_t index, PyObject *item);
@@ -62,5 +63,6 @@ PyObject* PyCOMPSSeqIter_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
 int PyCOMPSSeqIter_init(PyCOMPS_SeqIter *self, PyObject *args, PyObject *kwds);
 
 extern PyMappingMethods PyCOMPSSeq_mapping_extra;
+extern PySequenceMethods PyCOMPSSeq_sequence_extra;
 
 #endif
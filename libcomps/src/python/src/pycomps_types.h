@@ -22,6 +22,7 @@
 
 #include "libcomps/comps_objlist.h"
 #include "libcomps/comps_objdict.h"
+#include "libcomps/comps_doc.h"
 
 typedef COMPS_Object* (*PyCOMPS_in_itemconvert)(PyObject*);
 typedef PyObject* (*PyCOMPS_out_itemconvert)(COMPS_Object*);
@@ -32,13 +33,15 @@ typedef struct PyCOMPS_ItemInfo {
     PyCOMPS_out_itemconvert out_convert_func;
     int (*pre_checker)(COMPS_Object*);
     unsigned item_types_len;
-    size_t props_offset;
+    size_t id_offset;
+    char id_indexed;
 } PyCOMPS_ItemInfo;
 
 typedef struct PyCOMPS_Sequence {
     PyObject_HEAD
     COMPS_ObjList *list;
     PyCOMPS_ItemInfo *it_info;
+    COMPS_DocIdIndex *id_index;
 } PyCOMPS_Sequence;
 
 typedef struct PyCOMPS_SeqIter{
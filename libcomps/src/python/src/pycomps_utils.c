@@ -42,6 +42,10 @@ COMPS_Object* __pycomps_bytes_in(PyObject *pobj) {
 PyObject* __pycomps_str_out(COMPS_Object *obj) {
     char *tmp;
     PyObject *ret;
+    /* string knows its length, so it doesn't need to be copied */
+    if (obj->obj_info == &COMPS_Str_ObjInfo && ((COMPS_Str*)obj)->val)
+        return PyUnicode_FromStringAndSize(((COMPS_Str*)obj)->val,
+                                           ((COMPS_Str*)obj)->len);
     tmp = comps_object_tostr(obj);
     ret = PyUnicode_FromString(tmp);
     free(tmp);
@@ -208,9 +212,10 @@ PyObject* __PyCOMPS_get_ids(PyObject *self, void *closure) {
         c_obj = ((PyCompsObject*)self)->c_obj;
         ret->list = (COMPS_ObjList*)
                     comps_object_incref((COMPS_Object*)_closure_->get_f(c_obj));
-    } else {
-        Py_INCREF(ret);
+        /* keep wrapper, so its id index survives between accesses */
+        SET_TO(self, _closure_->p_offset, ret);
     }
+    Py_INCREF(ret);
     return  (PyObject*)ret;
     #undef _closure_
 }
@@ -235,7 +240,7 @@ int __PyCOMPS_set_ids(PyObject *self, PyObject *value, void *closure) {
     pobj = (PyCOMPS_Sequence*)GET_FROM(self, _closure_->p_offset);
     Py_XDECREF(pobj);
     Py_INCREF(value);
-    SET_TO(self, _closure_->p_offset, pobj);
+    SET_TO(self, _closure_->p_offset, value);
     return 0;
     #undef _closure_
 }
@@ -253,7 +258,9 @@ PyObject* __PyCOMPS_get_dict(PyObject *self, void *closure) {
         //_closure_->dict_type->tp_init((PyObject*)ret, NULL, NULL);
         COMPS_OBJECT_DESTROY(ret->dict);
         c_obj = ((PyCompsObject*)self)->c_obj;
-        dict = (COMPS_ObjDict*) GET_FROM(c_obj, _closure_->dict_offset);
+        /* dict could be shared with copies of object */
+        dict = (COMPS_ObjDict*)comps_object_expose((COMPS_Object**)
+                            ((char*)c_obj + _closure_->dict_offset));
         ret->dict = (COMPS_ObjDict*)comps_object_incref((COMPS_Object*)dict);
     } else {
         Py_INCREF(ret);
@@ -289,6 +296,8 @@ int __PyCOMPS_set_dict(PyObject *self, PyObject *value, void *closure) {
     COMPS_OBJECT_DESTROY(dict);
     comps_object_incref((COMPS_Object*)((PyCOMPS_Dict*)value)->dict);
     SET_TO(c_obj, _closure_->dict_offset, ((PyCOMPS_Dict*)value)->dict);
+    comps_object_expose((COMPS_Object**)
+                        ((char*)c_obj + _closure_->dict_offset));
 
     pobj = (PyCOMPS_Dict*)GET_FROM(self, _closure_->p_offset);
     Py_XDECREF(pobj);
@@ -319,15 +328,12 @@ PyObject* __PyCOMPS_get_strattr(PyObject *self, void *closure) {
     #define _closure_ ((__PyCOMPS_StrPropGetSetClosure*)closure)
     COMPS_Object* tmp_prop, *obj;
     PyObject *ret;
-    char *x;
 
     obj = ((PyCompsObject*)self)->c_obj;
     tmp_prop = _closure_->get_f(obj);
 
     if (tmp_prop) {
-        x = comps_object_tostr(tmp_prop);
-        ret = PyUnicode_FromString(x);
-        free(x);
+        ret = __pycomps_str_out(tmp_prop);
         COMPS_OBJECT_DESTROY(tmp_prop);
         return ret;
     } else
@@ -372,6 +378,10 @@ PyObject* __PyCOMPS_get_numattr(PyObject *self, void *closure) {
 int __PyCOMPS_set_boolattr(PyObject *self, PyObject *val, void *closure) {
     #define _closure_ ((__PyCOMPS_NumPropGetSetClosure*)closure)
     COMPS_Object *obj;
+    if (!val) {
+        PyErr_SetString(PyExc_TypeError, "Can't delete attribute");
+        return -1;
+    }
     if (!PyBool_Check(val)) {
         PyErr_SetString(PyExc_TypeError, "Not bool object");
         return -1;
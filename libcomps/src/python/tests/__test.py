@@ -27,8 +27,13 @@ import sys
 import unittest
 import tempfile
 import os
+import struct
+import zlib
 import traceback
 import inspect
+import mmap
+import threading
+import time
 
 import utest
 
@@ -867,6 +872,24 @@ class COMPSTest(unittest.TestCase):
         self.assertTrue(cids3_set == cids_set)
         self.assertTrue(eids3_set == eids_set)
 
+    #@unittest.skip("")
+    def test_doc_dicts(self):
+        comps = libcomps.Comps()
+        self.assertEqual(len(comps.langpacks), 0)
+        self.assertEqual(len(comps.blacklist), 0)
+        self.assertEqual(len(comps.whiteout), 0)
+
+        comps.fromxml_f("comps/f21-rawhide-comps.xml")
+        self.assertEqual(comps.langpacks["aspell"], "aspell-%s")
+        blacklist = dict(comps.blacklist.items())
+        self.assertEqual(list(blacklist["dbus"]), ["i386", "ppc64"])
+        self.assertEqual(len(list(comps.blacklist.items())), len(blacklist))
+        self.assertEqual(list(comps.blacklist.values())[0],
+                         blacklist[list(comps.blacklist.keys())[0]])
+        whiteout = dict(comps.whiteout.items())
+        self.assertTrue(len(whiteout) > 0)
+        self.assertEqual(len(list(comps.whiteout.items())), len(whiteout))
+
     #@unittest.skip("")
     def test_gz(self):
         comps = libcomps.Comps()
@@ -1061,6 +1084,208 @@ class COMPSTest(unittest.TestCase):
         comps5.fromxml_str(s)
         self.assertTrue(comps == comps5)
 
+    def test_arches_many(self):
+        comps = libcomps.Comps()
+        comps.fromxml_f("comps/main_arches.xml")
+        unknown = libcomps.StrSeq()
+        unknown.append("unknown")
+        arches = [["x86"], ["x86_64", "s390"], ["x86", "x86_64", "s390"],
+                  unknown, []]
+        filtered = comps.arch_filter_many(arches)
+        self.assertEqual(len(filtered), len(arches))
+        for arch_list, comps2 in zip(arches, filtered):
+            self.assertTrue(comps.arch_filter(arch_list) == comps2)
+        self.assertTrue(filtered[3] == libcomps.Comps())
+        self.assertEqual(comps.arch_filter_many([]), [])
+        self.assertRaises(TypeError, comps.arch_filter_many, [["x86"], 1])
+
+    def test_union_all(self):
+        comps = libcomps.Comps()
+        comps.fromxml_f("comps/main_arches.xml")
+        comps2 = libcomps.Comps()
+        comps2.fromxml_f("comps/f21-rawhide-comps.xml")
+        docs = [comps.arch_filter(["x86"]), comps2,
+                comps.arch_filter(["x86_64", "s390"]), comps]
+        fold = docs[0]
+        for doc in docs[1:]:
+            fold = fold + doc
+        self.assertTrue(libcomps.union_all(docs) == fold)
+        self.assertTrue(libcomps.union_all(iter(docs[:2])) ==
+                        docs[0] + docs[1])
+        self.assertEqual([g.id for g in libcomps.union_all(docs).groups],
+                         [g.id for g in fold.groups])
+        self.assertTrue(libcomps.union_all([comps]) == comps)
+        self.assertTrue(libcomps.union_all([]) == libcomps.Comps())
+        self.assertRaises(TypeError, libcomps.union_all, [comps, 1])
+
+    def test_update(self):
+        comps = libcomps.Comps()
+        comps.fromxml_f("comps/main_arches.xml")
+        comps2 = libcomps.Comps()
+        comps2.fromxml_f("comps/f21-rawhide-comps.xml")
+        dst = comps.arch_filter(["x86"])
+        groups = dst.groups
+        res = dst + comps.arch_filter(["x86_64", "s390"])
+        dst.update(comps.arch_filter(["x86_64", "s390"]))
+        self.assertTrue(dst == res)
+        res = dst + comps2
+        dst += comps2
+        self.assertTrue(dst == res)
+        self.assertEqual(len(groups), len(res.groups))
+        self.assertEqual([g.id for g in dst.groups],
+                         [g.id for g in res.groups])
+        orig = dst
+        dst += dst
+        self.assertTrue(dst is orig)
+        self.assertTrue(dst == res)
+        self.assertRaises(TypeError, dst.update, 1)
+
+    #@unittest.skip("")
+    def test_diff(self):
+        old = libcomps.Comps()
+        old.fromxml_f("comps/f21-rawhide-comps.xml")
+        new = libcomps.Comps()
+        new.fromxml_f("comps/f21-rawhide-comps.xml")
+        self.assertEqual(len(old.diff(new)), 0)
+
+        new.groups[0].name = "renamed"
+        new.groups[1].packages.append(libcomps.Package("pkg-added"))
+        removed = new.categories[0].id
+        del new.categories[0]
+        env = new.environments[0]
+        del new.environments[0]
+        new.environments.append(env)
+        new.langpacks["pkg-added"] = "pkg-added-%s"
+
+        diff = old.diff(new)
+        self.assertEqual(len(diff), 5)
+        changes = diff.groups
+        self.assertEqual([c["type"] for c in changes], ["changed", "changed"])
+        self.assertEqual(changes[0]["flags"], libcomps.DIFF_NAME)
+        self.assertEqual(changes[0]["object"].name, "renamed")
+        self.assertEqual(changes[0]["position"], None)
+        self.assertEqual(changes[0]["added"], None)
+        self.assertEqual(changes[1]["flags"], libcomps.DIFF_CONTENT)
+        self.assertEqual(changes[1]["added"], ["pkg-added"])
+        self.assertEqual(changes[1]["removed"], [])
+        self.assertEqual(diff.categories[0]["type"], "removed")
+        self.assertEqual(diff.categories[0]["object"].id, removed)
+        env = diff.environments[0]
+        self.assertEqual(env["type"], "moved")
+        self.assertEqual(env["position"], len(new.environments) - 1)
+        self.assertEqual(env["options_added"], None)
+        self.assertEqual(diff.langpacks, {"pkg-added": "pkg-added-%s"})
+        self.assertEqual(diff.langpacks_removed, [])
+        self.assertFalse(diff.blacklist_changed)
+
+        del new
+        self.assertEqual(old.patch(diff), 0)
+        self.assertEqual(len(diff), 5)
+        new = libcomps.Comps()
+        new.fromxml_f("comps/f21-rawhide-comps.xml")
+        self.assertEqual(len(new.diff(old)), 5)
+        # removed category is already missing
+        self.assertEqual(old.patch(diff), 1)
+        self.assertRaises(TypeError, old.patch, old)
+        self.assertRaises(TypeError, old.diff, diff)
+
+        # only value of whiteout differs
+        old = libcomps.Comps()
+        old.fromxml_f("comps/comps-f21.xml.in")
+        new = libcomps.Comps()
+        new.fromxml_f("comps/fedora_comps.xml")
+        diff = old.diff(new)
+        self.assertTrue(diff.whiteout_changed)
+        self.assertEqual(old.patch(diff), 0)
+        self.assertEqual(list(old.whiteout["perl-DBD-MySQL"]),
+                         list(new.whiteout["perl-DBD-MySQL"]))
+        self.assertEqual(len(old.diff(new)), 0)
+
+    #@unittest.skip("")
+    def test_binary(self):
+        comps = libcomps.Comps()
+        comps.fromxml_f("comps/f21-rawhide-comps.xml")
+        (h, fname) = tempfile.mkstemp()
+        os.close(h)
+        comps.to_binary(fname)
+        comps2 = libcomps.Comps()
+        groups = comps2.groups
+        comps2.from_binary(fname)
+        self.assertTrue(comps == comps2)
+        self.assertEqual(len(groups), 0)
+        self.assertEqual(comps.xml_str(), comps2.xml_str())
+        self.assertEqual(comps2.langpacks["aspell"], "aspell-%s")
+
+        with open(fname, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            last = f.read(1)
+            f.seek(-1, os.SEEK_END)
+            f.write(bytearray([bytearray(last)[0] ^ 1]))
+        self.assertRaises(ValueError, comps2.from_binary, fname)
+        self.assertRaises(ValueError, comps2.from_binary,
+                          "comps/f21-rawhide-comps.xml")
+        self.assertTrue(comps == comps2)
+
+        # doctype without public id
+        comps = libcomps.Comps()
+        comps.fromxml_str('<?xml version="1.0" encoding="UTF-8"?>\n'
+                          '<!DOCTYPE comps SYSTEM "comps.dtd">\n<comps/>')
+        comps.to_binary(fname)
+        comps2.from_binary(fname)
+        self.assertEqual(comps.xml_str(), comps2.xml_str())
+        os.remove(fname)
+        self.assertRaises(IOError, comps2.from_binary, fname)
+
+    #@unittest.skip("")
+    def test_binary_invalid(self):
+        # snapshot of document with one group or category made by hand,
+        # see comps_docbin.c for format
+        def snapshot(fname, doctype=1, langpack=(1, 1), kind=0, items=1):
+            strings = struct.pack("=I6s2x", 5, b"comps") # reference 1
+            # langpacks hold one pair, its value is tagged string
+            doc = [0, doctype, 1, 1, 0, 2, 1] + list(langpack) + [0, 0]
+            # id, name, desc, display_order, arches, properties,
+            # name_by_lang, desc_by_lang
+            obj = [1, 0, 0, 0, 0, 0, 1, 1]
+            if kind == 0:
+                # def, uservisible, biarchonly, langonly, packages
+                obj += [0, 0, 0, 0, items]
+            else:
+                obj += [items] # group_ids
+            records = struct.pack("=%dI" % (len(doc) + len(obj)), *(doc + obj))
+            index = struct.pack("=I", len(doc) * 4)
+            data = strings + records + index
+            counts = [0, 0, 0]
+            counts[kind] = 2
+            header = struct.pack("=8s8I", b"COMPSBIN", 1, 0x01020304,
+                                 zlib.adler32(data) & 0xffffffff,
+                                 len(strings), len(records), *counts)
+            with open(fname, "wb") as f:
+                f.write(header + data)
+
+        (h, fname) = tempfile.mkstemp()
+        os.close(h)
+        comps = libcomps.Comps()
+        snapshot(fname)
+        comps.from_binary(fname)
+        self.assertEqual(comps.groups[0].id, "comps")
+        self.assertEqual(comps.langpacks["comps"], "comps")
+        snapshot(fname, kind=1)
+        comps.from_binary(fname)
+        self.assertEqual(comps.categories[0].id, "comps")
+        self.assertTrue(comps.xml_str())
+
+        # missing doctype, group packages, category group ids and NULL
+        # dictionary value
+        for args in [{"doctype": 0}, {"items": 0}, {"kind": 1, "items": 0},
+                     {"langpack": (0,)}]:
+            snapshot(fname, **args)
+            comps = libcomps.Comps()
+            self.assertRaises(ValueError, comps.from_binary, fname)
+            self.assertEqual(len(comps.groups), 0)
+            self.assertEqual(len(comps.categories), 0)
+        os.remove(fname)
+
     #@unittest.skip("")
     def test_validate(self):
         c = libcomps.Comps()
@@ -1204,6 +1429,462 @@ class COMPSTest(unittest.TestCase):
         for x in conditional_packages:
             self.assertTrue(x.type == libcomps.PACKAGE_TYPE_CONDITIONAL)
 
+    def test_id_index(self):
+        comps = libcomps.Comps()
+        comps.fromxml_f("comps/comps-rawhide.xml")
+        groups = comps.groups
+        self.assertTrue("assamese-support" in groups)
+        self.assertTrue(groups["assamese-support"].id == "assamese-support")
+        self.assertFalse("notid" in groups)
+        self.assertTrue(groups[0] in groups)
+
+        groups.append(libcomps.Group("new-group", "new group", "desc", 0))
+        self.assertTrue("new-group" in groups)
+        self.assertTrue(groups["new-group"].name == "new group")
+        index = len(groups) - 1
+        del groups[index]
+        self.assertFalse("new-group" in groups)
+        self.assertRaises(KeyError, groups.__getitem__, "new-group")
+
+        groups["assamese-support"].id = "renamed-support"
+        self.assertFalse("assamese-support" in groups)
+        self.assertTrue(groups["renamed-support"].id == "renamed-support")
+
+        self.assertTrue("minimal-environment" in comps.environments)
+        cat_id = comps.categories[0].id
+        self.assertTrue(cat_id in comps.categories)
+        comps.categories = libcomps.CategoryList()
+        self.assertFalse(cat_id in comps.categories)
+
+    def test_package_index(self):
+        comps = libcomps.Comps()
+        comps.fromxml_f("comps/comps-rawhide.xml")
+        expected = [(g.id, p.type) for g in comps.groups for p in g.packages
+                    if p.name == "ibus-m17n"]
+        found = comps.groups_by_package("ibus-m17n")
+        self.assertEqual(len(found), 27)
+        self.assertEqual([(g.id, p.type) for g, p in found], expected)
+        self.assertEqual(comps.groups_by_package("notpackage"), [])
+
+        group, pkg = found[0]
+        self.assertTrue("ibus-m17n" in group.packages)
+        self.assertTrue(pkg in group.packages)
+        self.assertFalse("notpackage" in group.packages)
+        pkg.name = "renamed"
+        self.assertFalse("ibus-m17n" in group.packages)
+        self.assertTrue("renamed" in group.packages)
+        self.assertEqual(len(comps.groups_by_package("ibus-m17n")), 26)
+        self.assertEqual(comps.groups_by_package("renamed")[0][0].id,
+                         group.id)
+
+        group.packages.append(libcomps.Package("added",
+                                               libcomps.PACKAGE_TYPE_DEFAULT))
+        self.assertTrue("added" in group.packages)
+        self.assertEqual(len(comps.groups_by_package("added")), 1)
+        group.packages = libcomps.PackageList()
+        self.assertFalse("added" in group.packages)
+        self.assertEqual(comps.groups_by_package("added"), [])
+        ids = [g.id for g in comps.groups]
+        del comps.groups[ids.index(found[1][0].id)]
+        self.assertEqual(len(comps.groups_by_package("ibus-m17n")), 25)
+
+    def test_closure(self):
+        comps = libcomps.Comps()
+        comps.fromxml_f("comps/comps-rawhide.xml")
+        types = (libcomps.PACKAGE_TYPE_MANDATORY,
+                 libcomps.PACKAGE_TYPE_DEFAULT)
+
+        def resolve(gids):
+            ret = []
+            for gid in gids:
+                if gid.name not in comps.groups:
+                    continue
+                for p in comps.groups[gid.name].packages:
+                    if p.type in types and p.name not in ret:
+                        ret.append(p.name)
+            return ret
+
+        env = comps.environments["kde-desktop-environment"]
+        option = env.option_ids[0].name
+        self.assertEqual(comps.environment_packages(env.id),
+                         resolve(env.group_ids))
+        self.assertEqual(comps.environment_packages(env.id,
+                                                    options=[option]),
+                         resolve(list(env.group_ids) + [env.option_ids[0]]))
+        self.assertEqual(comps.environment_packages(env.id, ["notgroup"],
+                                                    types),
+                         resolve(env.group_ids))
+        cat = comps.categories[0]
+        self.assertEqual(comps.category_packages(cat.id, types=types),
+                         resolve(cat.group_ids))
+        self.assertRaises(KeyError, comps.environment_packages, "notenv")
+        self.assertRaises(KeyError, comps.category_packages, "notcategory")
+
+        group = comps.groups[env.group_ids[0].name]
+        group.packages.append(libcomps.Package("added",
+                                               libcomps.PACKAGE_TYPE_DEFAULT))
+        self.assertTrue("added" in comps.environment_packages(env.id))
+        group.packages[-1].type = libcomps.PACKAGE_TYPE_OPTIONAL
+        self.assertFalse("added" in comps.environment_packages(env.id))
+        self.assertTrue("added" in comps.environment_packages(env.id,
+                        types=[libcomps.PACKAGE_TYPE_OPTIONAL]))
+        env.group_ids = libcomps.IdList()
+        self.assertEqual(comps.environment_packages(env.id), [])
+
+    def test_match_many(self):
+        comps = libcomps.Comps()
+        comps.fromxml_f("comps/comps-rawhide.xml")
+        fnmatch_casefold = 1 << 4
+        queries = [{"id": "base-x"},
+                   {"name": "base-x"},
+                   {"id": "base*"},
+                   {"id": "*-desktop"},
+                   {"id": "*x*", "name": "*X*"},
+                   {"name": "Base"},
+                   {"desc": "Lokaler X.org-Displayserver", "lang": "de"},
+                   {"name": "*", "lang": "cs"},
+                   {"id": "[ab]*"},
+                   {"id": "ba?e"},
+                   {"id": "notgroup"},
+                   "base-x",
+                   {}]
+        found = comps.groups_match_many(queries)
+        self.assertEqual(len(found), len(queries))
+        for query, groups in zip(queries, found):
+            if not isinstance(query, dict):
+                query = {"id": query}
+            self.assertEqual(groups, comps.groups_match(**query))
+        self.assertEqual(len(found[0]), 1)
+        self.assertEqual(len(found[-1]), len(comps.groups))
+        self.assertEqual(len(found[-3]), 0)
+
+        queries = [{"id": "gnome-desktop-environment"},
+                   {"name": "GNOME Desktop"},
+                   {"name": "Escritorio GNOME", "lang": "es"},
+                   {"id": "*-environment", "desc": "*GNOME*"}]
+        found = comps.categories_match_many(queries)
+        for query, cats in zip(queries, found):
+            self.assertEqual(cats, comps.categories_match(**query))
+        self.assertEqual(len(found[2]), 1)
+        found = comps.environments_match_many(["minimal-environment",
+                                               {"name": "*Install"},
+                                               {"id": "*DESKTOP*"}],
+                                              flags=fnmatch_casefold)
+        self.assertEqual(found[0], comps.environments_match(
+                                                    id="minimal-environment"))
+        self.assertEqual(found[1], comps.environments_match(name="*Install"))
+        self.assertEqual(found[2], comps.environments_match(
+                                    id="*DESKTOP*", flags=fnmatch_casefold))
+        self.assertTrue(len(found[2]) > 0)
+        self.assertRaises(TypeError, comps.groups_match_many, 1)
+
+    def test_fromxml_buffer(self):
+        comps = libcomps.Comps()
+        comps.fromxml_f("comps/main_comps.xml")
+        with open("comps/main_comps.xml", "rb") as f:
+            data = f.read()
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        for buff in [data, bytearray(data), memoryview(data), mapped]:
+            comps2 = libcomps.Comps()
+            self.assertEqual(comps2.fromxml_buffer(buff), 0)
+            self.assertTrue(comps == comps2)
+        mapped.close()
+
+        comps2 = libcomps.Comps()
+        comps2.fromxml_buffer(data + b"garbage", len(data))
+        self.assertTrue(comps == comps2)
+        self.assertRaises(ValueError, comps2.fromxml_buffer, data,
+                          len(data) + 1)
+        self.assertRaises(libcomps.ParserError, comps2.fromxml_buffer,
+                          data, len(data) // 2)
+        self.assertRaises(TypeError, comps2.fromxml_buffer, 1)
+
+    def test_compressed(self):
+        import gzip
+        comps = libcomps.Comps()
+        ret = comps.fromxml_f("comps/sample_comps2.xml")
+        comps2 = libcomps.Comps()
+        self.assertEqual(comps2.fromxml_f("comps/sample_comps2.xml.gz"), ret)
+        self.assertTrue(comps == comps2)
+        self.assertEqual(comps.get_last_errors(), comps2.get_last_errors())
+
+        with open("comps/sample_comps2.xml", "rb") as f:
+            data = f.read()
+        compressed = [gzip.compress(data),
+                      # concatenated gzip members form one stream
+                      gzip.compress(data[:1000]) + gzip.compress(data[1000:])]
+        try:
+            import lzma
+            compressed.append(lzma.compress(data))
+        except ImportError:
+            pass
+        for cdata in compressed:
+            comps2 = libcomps.Comps()
+            self.assertEqual(comps2.fromxml_buffer(cdata), ret)
+            self.assertTrue(comps == comps2)
+            (h, fname) = tempfile.mkstemp()
+            os.write(h, cdata)
+            os.close(h)
+            comps2 = libcomps.Comps()
+            self.assertEqual(comps2.fromxml_f(fname), ret)
+            self.assertTrue(comps == comps2)
+            os.remove(fname)
+
+            comps2 = libcomps.Comps()
+            self.assertRaises(libcomps.ParserError, comps2.fromxml_buffer,
+                              cdata[:len(cdata) // 2])
+            corrupted = bytearray(cdata)
+            corrupted[len(cdata) // 2] ^= 0xff
+            self.assertRaises(libcomps.ParserError, comps2.fromxml_buffer,
+                              bytes(corrupted))
+
+    def test_feed(self):
+        comps = libcomps.Comps()
+        ret = comps.fromxml_f("comps/main_comps.xml")
+        with open("comps/main_comps.xml", "rb") as f:
+            data = f.read()
+        for size in [1, 7, 4096, len(data)]:
+            comps2 = libcomps.Comps()
+            for x in range(0, len(data), size):
+                self.assertEqual(comps2.feed(data[x:x + size]), None)
+                # content is replaced only after close
+                self.assertEqual(len(comps2.groups), 0)
+            self.assertEqual(comps2.close(), ret)
+            self.assertTrue(comps == comps2)
+            self.assertEqual(comps.get_last_errors(),
+                             comps2.get_last_errors())
+
+        # parser can be used again after close
+        comps2.feed(data)
+        self.assertEqual(comps2.close(), ret)
+        self.assertTrue(comps == comps2)
+
+        comps2 = libcomps.Comps()
+        comps2.feed(data[:len(data) // 2])
+        self.assertRaises(libcomps.ParserError, comps2.close)
+        self.assertRaises(libcomps.ParserError, comps2.feed, b"<comps><</")
+        self.assertTrue(len(comps2.get_last_errors()) > 0)
+        self.assertRaises(libcomps.ParserError, libcomps.Comps().close)
+        self.assertRaises(TypeError, comps2.feed, 1)
+
+    def test_iterparse(self):
+        import gzip
+        comps = libcomps.Comps()
+        comps.fromxml_f("comps/comps-rawhide.xml")
+        objs = list(libcomps.iterparse("comps/comps-rawhide.xml"))
+        for kind, seq in [(libcomps.Group, comps.groups),
+                          (libcomps.Category, comps.categories),
+                          (libcomps.Environment, comps.environments)]:
+            self.assertEqual([o for o in objs if isinstance(o, kind)],
+                             list(seq))
+        self.assertEqual(len(objs), len(comps.groups) +
+                         len(comps.categories) + len(comps.environments))
+
+        groups = list(libcomps.iterparse("comps/comps-rawhide.xml",
+                                         kinds=("group",)))
+        self.assertEqual(groups, list(comps.groups))
+        envs = list(libcomps.iterparse("comps/comps-rawhide.xml",
+                                       kinds=["environment"]))
+        self.assertEqual(envs, list(comps.environments))
+        # objects are yielded while parsing, before the end of input
+        it = libcomps.iterparse("comps/comps-rawhide.xml")
+        self.assertEqual(next(it).id, comps.groups[0].id)
+
+        comps = libcomps.Comps()
+        comps.fromxml_f("comps/sample_comps2.xml")
+        with gzip.open("comps/sample_comps2.xml.gz") as f:
+            self.assertEqual(list(libcomps.iterparse(f, kinds=["group"])),
+                             list(comps.groups))
+
+        self.assertRaises(ValueError, libcomps.iterparse,
+                          "comps/main_comps.xml", kinds=["packages"])
+        self.assertRaises(IOError, libcomps.iterparse, "comps/nothing.xml")
+        (h, fname) = tempfile.mkstemp()
+        with open("comps/main_comps.xml", "rb") as f:
+            os.write(h, f.read(1000))
+        os.close(h)
+        it = libcomps.iterparse(fname)
+        self.assertEqual(next(it).id, "base")
+        self.assertRaises(libcomps.ParserError, list, it)
+        os.remove(fname)
+
+    def test_sections(self):
+        comps = libcomps.Comps()
+        comps.fromxml_f("comps/comps-rawhide.xml")
+        comps2 = libcomps.Comps()
+        comps2.fromxml_f("comps/comps-rawhide.xml", sections=["groups"])
+        self.assertEqual(list(comps2.groups), list(comps.groups))
+        self.assertEqual(len(comps2.categories), 0)
+        self.assertEqual(len(comps2.environments), 0)
+        self.assertEqual(len(comps2.langpacks), 0)
+
+        comps2 = libcomps.Comps()
+        comps2.fromxml_f("comps/comps-rawhide.xml",
+                         sections=("categories", "environments", "langpacks"))
+        self.assertEqual(len(comps2.groups), 0)
+        self.assertEqual(list(comps2.categories), list(comps.categories))
+        self.assertEqual(list(comps2.environments), list(comps.environments))
+        self.assertEqual(comps2.langpacks, comps.langpacks)
+
+        # skipped sections aren't checked at all
+        comps = libcomps.Comps()
+        self.assertEqual(comps.fromxml_f("comps/sample_comps2.xml"), 1)
+        self.assertTrue(len(comps.get_last_errors()) > 0)
+        comps2 = libcomps.Comps()
+        self.assertEqual(comps2.fromxml_f("comps/sample_comps2.xml",
+                                          sections=["blacklist"]), 0)
+        self.assertEqual(comps2.get_last_errors(), [])
+        self.assertEqual(comps2.blacklist, comps.blacklist)
+
+        with open("comps/sample_comps.xml", "rb") as f:
+            data = f.read()
+        comps = libcomps.Comps()
+        comps.fromxml_str(data.decode("utf-8"), sections=["environments"])
+        self.assertEqual(len(comps.groups), 0)
+        self.assertTrue(len(comps.environments) > 0)
+        comps2 = libcomps.Comps()
+        comps2.fromxml_buffer(data, sections=["environments"])
+        self.assertTrue(comps == comps2)
+        comps2 = libcomps.Comps()
+        comps2.fromxml_buffer(data, options={"default_biarchonly": True},
+                              sections=[])
+        self.assertEqual(len(comps2.groups), 0)
+        self.assertEqual(len(comps2.environments), 0)
+
+        self.assertRaises(ValueError, comps.fromxml_f, "comps/main_comps.xml",
+                          sections=["packages"])
+        self.assertRaises(TypeError, comps.fromxml_f, "comps/main_comps.xml",
+                          sections="groups")
+
+    def test_arena(self):
+        comps = libcomps.Comps()
+        ret = comps.fromxml_f("comps/comps-rawhide.xml")
+        comps2 = libcomps.Comps()
+        self.assertEqual(comps2.fromxml_f("comps/comps-rawhide.xml",
+                                          options={"arena": True}), ret)
+        self.assertTrue(comps == comps2)
+        self.assertEqual(comps.xml_str(), comps2.xml_str())
+
+        # objects outliving their document keep arena alive
+        group = comps2.groups[0]
+        packages = comps2.groups[1].packages
+        env = comps2.environments[-1]
+        del comps2
+        self.assertEqual(group, comps.groups[0])
+        self.assertEqual(packages, comps.groups[1].packages)
+        self.assertEqual(env.name, comps.environments[-1].name)
+        group.name = "changed"
+        self.assertEqual(group.name, "changed")
+
+        with open("comps/sample_comps.xml", "rb") as f:
+            data = f.read()
+        comps = libcomps.Comps()
+        comps.fromxml_buffer(data)
+        comps2 = libcomps.Comps()
+        comps2.fromxml_buffer(data, options={"arena": True})
+        self.assertTrue(comps == comps2)
+        comps2.groups[0].desc = "changed"
+        del comps2.groups[1]
+        comps2.groups.append(comps.groups[1])
+        self.assertFalse(comps == comps2)
+        comps3 = comps2 + comps
+        del comps2
+        self.assertEqual(len(comps3.groups), len(comps.groups))
+
+    def test_threads(self):
+        # GIL is released while parsing, so python code in other thread
+        # can run in the meantime
+        ticks = [0]
+        stop = threading.Event()
+        def ticker():
+            while not stop.is_set():
+                ticks[0] += 1
+        t = threading.Thread(target=ticker)
+        t.start()
+        progressed = False
+        try:
+            for x in range(3):
+                before = ticks[0]
+                libcomps.Comps().fromxml_f("comps/comps-rawhide.xml")
+                progressed = progressed or ticks[0] > before
+        finally:
+            stop.set()
+            t.join()
+        self.assertTrue(progressed)
+
+        def parse(results, index):
+            start = time.time()
+            comps = libcomps.Comps()
+            for x in range(3):
+                comps.fromxml_f("comps/comps-rawhide.xml")
+            results[index] = (start, time.time(), comps.toxml_str())
+
+        results = [None, None]
+        threads = [threading.Thread(target=parse, args=(results, x))
+                   for x in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # both threads were running at once
+        self.assertTrue(results[0][0] < results[1][1] and
+                        results[1][0] < results[0][1])
+        self.assertEqual(results[0][2], results[1][2])
+
+    def test_parse_many(self):
+        paths = ["comps/comps_part1.xml", "comps/comps_part2.xml",
+                 "comps/sample_comps.xml", "comps/not_existing.xml",
+                 "comps/sample_comps2.xml.gz", "comps/main_comps.xml"]
+        for workers in (1, 2, 0):
+            result = libcomps.parse_many(paths, workers=workers)
+            self.assertEqual(len(result), len(paths))
+            for path, comps in zip(paths, result):
+                if path == "comps/not_existing.xml":
+                    self.assertEqual(len(comps.groups), 0)
+                    self.assertTrue(comps.get_last_errors())
+                    continue
+                single = libcomps.Comps()
+                single.fromxml_f(path)
+                self.assertTrue(comps == single)
+                self.assertEqual(comps.get_last_log(), single.get_last_log())
+
+        result = libcomps.parse_many(paths[:3], sections=["groups"],
+                                     options={"default_uservisible": False})
+        self.assertEqual(len(result[2].categories), 0)
+        self.assertTrue(len(result[2].groups) > 0)
+        self.assertEqual(libcomps.parse_many([]), [])
+        self.assertRaises(ValueError, libcomps.parse_many, paths, workers=-1)
+        self.assertRaises(TypeError, libcomps.parse_many, [1])
+
+    #@unittest.skip("")
+    def test_shared_copies(self):
+        comps = libcomps.Comps()
+        comps.fromxml_f("comps/sample_comps.xml")
+        orig = comps.xml_str()
+        comps2 = comps + libcomps.Comps()
+        comps3 = comps.arch_filter(["x86", "x86_64", "s390"])
+        self.assertTrue(comps == comps2)
+
+        # modifying copy doesn't change source and vice versa
+        g = comps2.groups[0]
+        g.packages.append(libcomps.Package("added",
+                                           libcomps.PACKAGE_TYPE_DEFAULT))
+        g.name_by_lang["xx"] = "added"
+        comps2.categories[0].group_ids.append(libcomps.GroupId("added"))
+        comps2.environments[0].option_ids.append(libcomps.GroupId("added"))
+        self.assertEqual(comps.xml_str(), orig)
+        self.assertFalse(comps == comps2)
+        self.assertEqual(g.packages[-1].name, "added")
+
+        packages = comps.groups[0].packages
+        comps4 = comps + libcomps.Comps()
+        packages.append(libcomps.Package("added2",
+                                         libcomps.PACKAGE_TYPE_DEFAULT))
+        self.assertEqual(len(comps4.groups[0].packages), len(packages) - 1)
+        for c in (comps3, comps4):
+            for g in c.groups:
+                self.assertFalse("added" in [p.name for p in g.packages])
+
 if __name__ == "__main__":
     if len(sys.argv)>1:
         suite = unittest.TestSuite()
@@ -0,0 +1,188 @@
+/* libcomps - C alternative to yum.comps library
+ * Copyright (C) 2013 Jindrich Luza
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * any later version.
+ *
+ * This program is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to  Free Software
+ * Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301,
+ * USA
+ */
+
+/* Parse benchmark. Prints average time and number of heap allocations
+ * needed to parse comps file, heap memory held by parsed document and time
+ * and number of frees needed to destroy it. Time, allocations and memory
+ * of copy of document and of union of document with its copy are printed
+ * too, as well as time of saving document to binary snapshot and time and
+ * allocations needed to load it back.
+ *
+ * usage: bench_parse [FILE [ITERATIONS]]
+ */
+
+#define _POSIX_C_SOURCE 199309L
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <time.h>
+
+#include "../src/comps_parse.h"
+#include "../src/comps_docbin.h"
+
+static size_t allocs = 0;
+static size_t frees = 0;
+static size_t heap = 0;
+
+#ifdef __GLIBC__
+#include <malloc.h>
+
+/* allocations of whole process are counted by wrapping glibc allocator */
+extern void *__libc_malloc(size_t size);
+extern void *__libc_calloc(size_t nmemb, size_t size);
+extern void *__libc_realloc(void *ptr, size_t size);
+extern void __libc_free(void *ptr);
+
+void *malloc(size_t size) {
+    void *ret = __libc_malloc(size);
+    allocs++;
+    heap += malloc_usable_size(ret);
+    return ret;
+}
+
+void *calloc(size_t nmemb, size_t size) {
+    void *ret = __libc_calloc(nmemb, size);
+    allocs++;
+    heap += malloc_usable_size(ret);
+    return ret;
+}
+
+void *realloc(void *ptr, size_t size) {
+    void *ret;
+    heap -= malloc_usable_size(ptr);
+    ret = __libc_realloc(ptr, size);
+    allocs++;
+    heap += malloc_usable_size(ret);
+    return ret;
+}
+
+void free(void *ptr) {
+    if (ptr)
+        frees++;
+    heap -= malloc_usable_size(ptr);
+    __libc_free(ptr);
+}
+#endif
+
+static double elapsed(struct timespec *start) {
+    struct timespec end;
+    clock_gettime(CLOCK_MONOTONIC, &end);
+    return (end.tv_sec - start->tv_sec) +
+           (end.tv_nsec - start->tv_nsec) / 1e9;
+}
+
+int main(int argc, char *argv[]) {
+    const char *fname = (argc > 1) ? argv[1] : "fedora_comps.xml";
+    const char *bname = "bench_parse.bin";
+    int iterations = (argc > 2) ? atoi(argv[2]) : 20;
+    double parse_time = 0, destroy_time = 0, copy_time = 0, union_time = 0;
+    double save_time = 0, load_time = 0;
+    size_t parse_allocs = 0, destroy_frees = 0, doc_heap = 0, heap_start;
+    size_t copy_allocs = 0, copy_heap = 0, union_allocs = 0, union_heap = 0;
+    size_t load_allocs = 0;
+    struct timespec start;
+    COMPS_Parsed *parsed;
+    COMPS_Doc *doc, *doc2, *doc3;
+    FILE *fp;
+    int i;
+
+    if (iterations < 1)
+        iterations = 1;
+    for (i = 0; i < iterations; i++) {
+        parsed = comps_parse_parsed_create();
+        comps_parse_parsed_init(parsed, "UTF-8", 0);
+        if (!(fp = fopen(fname, "r"))) {
+            fprintf(stderr, "Cannot open %s\n", fname);
+            comps_parse_parsed_destroy(parsed);
+            return EXIT_FAILURE;
+        }
+        allocs = 0;
+        heap_start = heap;
+        clock_gettime(CLOCK_MONOTONIC, &start);
+        comps_parse_file(parsed, fp, NULL);
+        parse_time += elapsed(&start);
+        parse_allocs += allocs;
+
+        doc = parsed->comps_doc;
+        parsed->comps_doc = NULL;
+        comps_parse_parsed_destroy(parsed);
+        doc_heap += heap - heap_start;
+
+        clock_gettime(CLOCK_MONOTONIC, &start);
+        if (comps_doc_save_bin(doc, bname)) {
+            fprintf(stderr, "Cannot save %s\n", bname);
+            COMPS_OBJECT_DESTROY(doc);
+            return EXIT_FAILURE;
+        }
+        save_time += elapsed(&start);
+
+        allocs = 0;
+        clock_gettime(CLOCK_MONOTONIC, &start);
+        doc2 = comps_doc_load_bin(bname);
+        load_time += elapsed(&start);
+        load_allocs += allocs;
+        remove(bname);
+        if (!doc2) {
+            fprintf(stderr, "Cannot load %s\n", bname);
+            COMPS_OBJECT_DESTROY(doc);
+            return EXIT_FAILURE;
+        }
+        COMPS_OBJECT_DESTROY(doc2);
+
+        allocs = 0;
+        heap_start = heap;
+        clock_gettime(CLOCK_MONOTONIC, &start);
+        doc2 = (COMPS_Doc*)comps_object_copy((COMPS_Object*)doc);
+        copy_time += elapsed(&start);
+        copy_allocs += allocs;
+        copy_heap += heap - heap_start;
+
+        allocs = 0;
+        heap_start = heap;
+        clock_gettime(CLOCK_MONOTONIC, &start);
+        doc3 = comps_doc_union(doc, doc2);
+        union_time += elapsed(&start);
+        union_allocs += allocs;
+        union_heap += heap - heap_start;
+        COMPS_OBJECT_DESTROY(doc3);
+        COMPS_OBJECT_DESTROY(doc2);
+
+        frees = 0;
+        clock_gettime(CLOCK_MONOTONIC, &start);
+        COMPS_OBJECT_DESTROY(doc);
+        destroy_time += elapsed(&start);
+        destroy_frees += frees;
+    }
+    printf("%s, %d iterations\n", fname, iterations);
+    printf("parse:   %8.3f ms %10zu allocations\n",
+           parse_time * 1000 / iterations, parse_allocs / iterations);
+    printf("memory:              %10zu bytes\n", doc_heap / iterations);
+    printf("save:    %8.3f ms\n", save_time * 1000 / iterations);
+    printf("load:    %8.3f ms %10zu allocations\n",
+           load_time * 1000 / iterations, load_allocs / iterations);
+    printf("destroy: %8.3f ms %10zu frees\n",
+           destroy_time * 1000 / iterations, destroy_frees / iterations);
+    printf("copy:    %8.3f ms %10zu allocations %10zu bytes\n",
+           copy_time * 1000 / iterations, copy_allocs / iterations,
+           copy_heap / iterations);
+    printf("union:   %8.3f ms %10zu allocations %10zu bytes\n",
+           union_time * 1000 / iterations, union_allocs / iterations,
+           union_heap / iterations);
+    return EXIT_SUCCESS;
+}
@@ -19,10 +19,13 @@
 
 #include <check.h>
 #include <stdio.h>
+#include <fnmatch.h>
+#include <pthread.h>
 
 #include "../src/comps_doc.h"
 #include "../src/comps_parse.h"
 #include "../src/comps_validate.h"
+#include "../src/comps_set.h"
 
 #include "check_utils.h"
 
@@ -611,6 +614,865 @@ START_TEST(test_doc_defaults) {
 
 }END_TEST
 
+START_TEST(test_comps_set_hashed) {
+    COMPS_Set *set;
+    COMPS_Object *str, *removed;
+    COMPS_HSListItem *it;
+    char buffer[16];
+    int i;
+
+    set = comps_set_create();
+    comps_set_init_hashed(set, NULL, NULL, &comps_object_destroy_v,
+                               &comps_object_cmp_v, &comps_object_hash_v);
+    for (i = 0; i < 100; i++) {
+        snprintf(buffer, 16, "item%d", i);
+        ck_assert(comps_set_add(set, comps_str(buffer)) == 1);
+    }
+    str = (COMPS_Object*)comps_str("item42");
+    ck_assert(comps_set_in(set, str));
+    ck_assert(comps_set_add(set, str) == 0);
+    COMPS_OBJECT_DESTROY(str);
+
+    for (i = 0; i < 100; i += 2) {
+        snprintf(buffer, 16, "item%d", i);
+        str = (COMPS_Object*)comps_str(buffer);
+        removed = comps_set_remove(set, str);
+        ck_assert(removed != NULL);
+        ck_assert(!comps_set_in(set, str));
+        COMPS_OBJECT_DESTROY(removed);
+        COMPS_OBJECT_DESTROY(str);
+    }
+    i = 1;
+    for (it = set->data->first; it != NULL; it = it->next, i += 2) {
+        snprintf(buffer, 16, "item%d", i);
+        ck_assert_str_eq(((COMPS_Str*)it->data)->val, buffer);
+    }
+    ck_assert(i == 101);
+    comps_set_destroy(&set);
+}END_TEST
+
+START_TEST(test_comps_doc_by_id) {
+    COMPS_Doc *doc;
+    COMPS_DocGroup *g, *found;
+    COMPS_ObjList *groups;
+    COMPS_Object *enc;
+    char buffer[16];
+    int i;
+
+    enc = (COMPS_Object*)comps_str("UTF-8");
+    doc = (COMPS_Doc*)comps_object_create(&COMPS_Doc_ObjInfo,
+                                          (COMPS_Object*[]){enc});
+    COMPS_OBJECT_DESTROY(enc);
+    ck_assert(comps_doc_group_by_id(doc, "group1") == NULL);
+    for (i = 0; i < 50; i++) {
+        g = COMPS_OBJECT_CREATE(COMPS_DocGroup, NULL);
+        snprintf(buffer, 16, "group%d", i);
+        comps_docgroup_set_id(g, buffer, 0);
+        comps_doc_add_group(doc, g);
+    }
+    found = comps_doc_group_by_id(doc, "group42");
+    groups = comps_doc_groups(doc);
+    ck_assert(found == (COMPS_DocGroup*)comps_objlist_get_x(groups, 42));
+    ck_assert(comps_doc_group_by_id(doc, "group50") == NULL);
+
+    comps_docgroup_set_id(found, "renamed", 0);
+    ck_assert(comps_doc_group_by_id(doc, "group42") == NULL);
+    COMPS_OBJECT_DESTROY(found);
+    found = comps_doc_group_by_id(doc, "renamed");
+    ck_assert(found != NULL);
+    COMPS_OBJECT_DESTROY(found);
+
+    comps_objlist_remove_at(groups, 0);
+    ck_assert(comps_doc_group_by_id(doc, "group0") == NULL);
+    found = comps_doc_group_by_id(doc, "group1");
+    ck_assert(found == (COMPS_DocGroup*)groups->first->comps_obj);
+    COMPS_OBJECT_DESTROY(found);
+
+    COMPS_OBJECT_DESTROY(groups);
+    COMPS_OBJECT_DESTROY(doc);
+}END_TEST
+
+static COMPS_Doc* __test_doc_groups(const char *prefix, int count) {
+    COMPS_Doc *doc;
+    COMPS_DocGroup *g;
+    COMPS_DocGroupPackage *pkg;
+    char buffer[16];
+    int i;
+
+    doc = COMPS_OBJECT_CREATE(COMPS_Doc, NULL);
+    for (i = 0; i < count; i++) {
+        g = COMPS_OBJECT_CREATE(COMPS_DocGroup, NULL);
+        snprintf(buffer, 16, "%s%d", prefix, i);
+        comps_docgroup_set_id(g, buffer, 0);
+        pkg = COMPS_OBJECT_CREATE(COMPS_DocGroupPackage, NULL);
+        snprintf(buffer, 16, "p%d", i);
+        comps_docpackage_set_name(pkg, buffer, 0);
+        comps_docgroup_add_package(g, pkg);
+        comps_doc_add_group(doc, g);
+    }
+    return doc;
+}
+
+/* items of package index aren't referenced, unlike objects returned by
+ * other lookups */
+static void* __test_doc_lookups(void *data) {
+    char buffer[16];
+    long failed = 0;
+    int i;
+
+    for (i = 0; i < 1000; i++) {
+        snprintf(buffer, 16, "p%d", i % 100);
+        failed += (comps_doc_package_lookup((COMPS_Doc*)data, buffer) == NULL);
+    }
+    return (void*)failed;
+}
+
+START_TEST(test_comps_doc_id_rev) {
+    COMPS_Doc *doc1, *doc2, *copy;
+    COMPS_DocGroup *g;
+    COMPS_DocIdIndex *index;
+    COMPS_ObjList *found;
+    pthread_t threads[4];
+    void *failed;
+    int i;
+
+    doc1 = __test_doc_groups("g", 100);
+    doc2 = __test_doc_groups("g", 100);
+    g = comps_doc_group_by_id(doc1, "g1");
+    COMPS_OBJECT_DESTROY(g);
+    index = doc1->groups_index;
+    ck_assert(comps_idrev_watch_check(&index->watch, index->id_rev));
+
+    /* ids of other document don't invalidate the index */
+    g = comps_doc_group_by_id(doc2, "g1");
+    comps_docgroup_set_id(g, "renamed", 0);
+    COMPS_OBJECT_DESTROY(g);
+    ck_assert(comps_idrev_watch_check(&index->watch, index->id_rev));
+    g = comps_doc_group_by_id(doc2, "renamed");
+    ck_assert(g != NULL);
+    COMPS_OBJECT_DESTROY(g);
+    ck_assert(comps_doc_group_by_id(doc2, "g1") == NULL);
+
+    /* neither do ids of copy, which has its own objects */
+    copy = (COMPS_Doc*)comps_object_copy((COMPS_Object*)doc1);
+    g = comps_doc_group_by_id(copy, "g2");
+    comps_docgroup_set_id(g, "renamed", 0);
+    COMPS_OBJECT_DESTROY(g);
+    ck_assert(comps_idrev_watch_check(&index->watch, index->id_rev));
+    g = comps_doc_group_by_id(doc1, "g2");
+    ck_assert(g != NULL);
+    COMPS_OBJECT_DESTROY(g);
+    ck_assert(comps_doc_group_by_id(copy, "g2") == NULL);
+
+    /* group indexed by both id and name index is watched by both */
+    g = comps_doc_group_by_id(doc1, "g3");
+    comps_docgroup_set_name(g, "name", 0);
+    COMPS_OBJECT_DESTROY(g);
+    found = comps_doc_get_groups(doc1, NULL, "name", NULL, NULL, 0);
+    ck_assert(found->len == 1);
+    COMPS_OBJECT_DESTROY(found);
+    g = comps_doc_group_by_id(doc1, "g3");
+    comps_docgroup_set_name(g, "other", 0);
+    COMPS_OBJECT_DESTROY(g);
+    index = doc1->groups_name_index;
+    ck_assert(!comps_idrev_watch_check(&index->watch, index->id_rev));
+
+    /* index invalidated by rename is rebuilt by one of concurrent
+     * lookups */
+    ck_assert(comps_doc_package_lookup(doc2, "p4") != NULL);
+    g = comps_doc_group_by_id(doc2, "g4");
+    comps_docpackage_set_name((COMPS_DocGroupPackage*)g->packages->first
+                              ->comps_obj, "renamed", 0);
+    COMPS_OBJECT_DESTROY(g);
+    for (i = 0; i < 4; i++)
+        pthread_create(&threads[i], NULL, &__test_doc_lookups, doc2);
+    for (i = 0; i < 4; i++) {
+        pthread_join(threads[i], &failed);
+        ck_assert((long)failed == 10);
+    }
+
+    COMPS_OBJECT_DESTROY(copy);
+    COMPS_OBJECT_DESTROY(doc2);
+    COMPS_OBJECT_DESTROY(doc1);
+}END_TEST
+
+static char __test_num_odd(COMPS_Object *obj, void *data) {
+    (void)data;
+    return ((COMPS_Num*)obj)->val % 2 != 0;
+}
+
+static char __test_any(COMPS_Object *obj, void *data) {
+    (void)obj;
+    return data != NULL;
+}
+
+START_TEST(test_comps_objlist) {
+    COMPS_ObjList *list, *list2;
+    COMPS_ObjListIt *it;
+    COMPS_Object *num;
+    int i;
+
+    list = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+    for (i = 0; i < 100; i++) {
+        comps_objlist_append_x(list, (COMPS_Object*)comps_num(i));
+    }
+    ck_assert(list->len == 100);
+    ck_assert(((COMPS_Num*)comps_objlist_get_x(list, 57))->val == 57);
+    ck_assert(comps_objlist_get_x(list, 100) == NULL);
+
+    ck_assert(comps_objlist_remove_at(list, 0));
+    ck_assert(comps_objlist_remove_at(list, 98));
+    ck_assert(!comps_objlist_remove_at(list, 98));
+    comps_objlist_insert_at_x(list, 10, (COMPS_Object*)comps_num(-1));
+    num = comps_objlist_get_x(list, 20);
+    ck_assert(comps_objlist_index(list, num) == 20);
+    comps_objlist_remove(list, num);
+    ck_assert(list->len == 98);
+    ck_assert(((COMPS_Num*)list->first->comps_obj)->val == 1);
+    ck_assert(((COMPS_Num*)list->last->comps_obj)->val == 98);
+    ck_assert(((COMPS_Num*)comps_objlist_get_x(list, 10))->val == -1);
+
+    list2 = (COMPS_ObjList*)comps_object_copy((COMPS_Object*)list);
+    for (i = 0, it = list2->first; it != NULL; it = it->next, i++) {
+        ck_assert(comps_object_cmp(it->comps_obj,
+                                   comps_objlist_get_x(list, i)));
+    }
+    ck_assert(i == 98);
+    comps_objlist_clear(list2);
+    ck_assert(list2->len == 0 && list2->first == NULL && list2->last == NULL);
+    comps_objlist_append_x(list2, (COMPS_Object*)comps_num(1));
+    ck_assert(list2->first == list2->last);
+
+    /* odd numbers 1..97 and -1 */
+    ck_assert(comps_objlist_remove_if(list, &__test_num_odd, NULL) == 50);
+    ck_assert(list->len == 48);
+    ck_assert(((COMPS_Num*)list->first->comps_obj)->val == 2);
+    ck_assert(((COMPS_Num*)list->last->comps_obj)->val == 98);
+    ck_assert(list->last->next == NULL);
+    ck_assert(((COMPS_Num*)comps_objlist_get_x(list, 9))->val == 22);
+    for (i = 0, it = list->first; it != NULL; it = it->next, i++)
+        ck_assert(list->items[i] == it);
+    ck_assert(i == 48);
+    ck_assert(comps_objlist_remove_if(list, &__test_any, NULL) == 0);
+    ck_assert(comps_objlist_remove_if(list, &__test_any, list) == 48);
+    ck_assert(list->len == 0 && list->first == NULL && list->last == NULL);
+    comps_objlist_append_x(list, (COMPS_Object*)comps_num(1));
+    ck_assert(list->first == list->last);
+
+    COMPS_OBJECT_DESTROY(list);
+    COMPS_OBJECT_DESTROY(list2);
+}END_TEST
+
+START_TEST(test_comps_doc_copy) {
+    COMPS_Doc *doc, *doc2;
+    COMPS_DocGroup *g;
+    COMPS_DocGroupPackage *p;
+    COMPS_Object *enc;
+    char *str, *str2;
+
+    enc = (COMPS_Object*)comps_str("UTF-8");
+    doc = COMPS_OBJECT_CREATE(COMPS_Doc, (COMPS_Object*[]){enc});
+    COMPS_OBJECT_DESTROY(enc);
+    g = COMPS_OBJECT_CREATE(COMPS_DocGroup, NULL);
+    comps_docgroup_set_id(g, "group1", 0);
+    comps_docgroup_set_name(g, "group 1", 0);
+    p = COMPS_OBJECT_CREATE(COMPS_DocGroupPackage, NULL);
+    comps_docpackage_set_name(p, "package1", 0);
+    comps_docgroup_add_package(g, p);
+    comps_doc_add_group(doc, g);
+    comps_doc_add_langpack(doc, "firefox", comps_str("firefox-langpack-%s"));
+    comps_doc_add_langpack(doc, "aspell", comps_str("aspell-%s"));
+    comps_doc_add_blacklist(doc, "package2", comps_str("x86_64"));
+    comps_doc_add_whiteout(doc, "package1", comps_str("package2"));
+
+    doc2 = (COMPS_Doc*)comps_object_copy((COMPS_Object*)doc);
+    ck_assert(comps_object_cmp((COMPS_Object*)doc, (COMPS_Object*)doc2));
+    str = comps2xml_str(doc, NULL, NULL);
+    str2 = comps2xml_str(doc2, NULL, NULL);
+    ck_assert_msg(strcmp(str, str2) == 0, "%s\n!=\n%s", str, str2);
+    free(str);
+    free(str2);
+
+    COMPS_OBJECT_DESTROY(doc);
+    COMPS_OBJECT_DESTROY(doc2);
+}END_TEST
+
+START_TEST(test_comps_str_intern) {
+    COMPS_Str *s1, *s2, *s3, *copy;
+    COMPS_DocGroup *g1, *g2;
+    COMPS_Object *id1, *id2;
+
+    s1 = comps_str_intern("x86_64");
+    s2 = comps_str_intern("x86_64");
+    s3 = comps_str_intern("i686");
+    ck_assert(s1 == s2);
+    ck_assert(s1 != s3);
+    ck_assert(strcmp(s1->val, "x86_64") == 0);
+    ck_assert(comps_object_cmp((COMPS_Object*)s1, (COMPS_Object*)s2));
+    ck_assert(!comps_object_cmp((COMPS_Object*)s1, (COMPS_Object*)s3));
+    copy = (COMPS_Str*)comps_object_copy((COMPS_Object*)s1);
+    ck_assert(copy == s1);
+    COMPS_OBJECT_DESTROY(copy);
+    /* plain string compares equal to interned one */
+    copy = comps_str("x86_64");
+    ck_assert(comps_object_cmp((COMPS_Object*)s1, (COMPS_Object*)copy));
+    ck_assert(comps_object_hash((COMPS_Object*)s1) ==
+              comps_object_hash((COMPS_Object*)copy));
+    COMPS_OBJECT_DESTROY(copy);
+    COMPS_OBJECT_DESTROY(s1);
+    COMPS_OBJECT_DESTROY(s2);
+    COMPS_OBJECT_DESTROY(s3);
+
+    /* setters share equal values */
+    g1 = COMPS_OBJECT_CREATE(COMPS_DocGroup, NULL);
+    g2 = COMPS_OBJECT_CREATE(COMPS_DocGroup, NULL);
+    comps_docgroup_set_id(g1, "core", 0);
+    comps_docgroup_set_id(g2, "core", 0);
+    id1 = comps_docgroup_get_id(g1);
+    id2 = comps_docgroup_get_id(g2);
+    ck_assert(id1 == id2);
+    COMPS_OBJECT_DESTROY(id1);
+    COMPS_OBJECT_DESTROY(id2);
+    COMPS_OBJECT_DESTROY(g1);
+    id1 = comps_docgroup_get_id(g2);
+    ck_assert(strcmp(((COMPS_Str*)id1)->val, "core") == 0);
+    COMPS_OBJECT_DESTROY(id1);
+    COMPS_OBJECT_DESTROY(g2);
+}END_TEST
+
+START_TEST(test_comps_str_len) {
+    COMPS_Str *s1, *s2, *s3;
+    unsigned int hash;
+    char *tmp;
+
+    s1 = comps_str("mandatory");
+    s2 = comps_str_n("mandatory-optional", 9);
+    ck_assert(s1->len == 9);
+    ck_assert(s2->len == 9);
+    ck_assert(strcmp(s2->val, "mandatory") == 0);
+    ck_assert(comps_object_cmp((COMPS_Object*)s1, (COMPS_Object*)s2));
+    hash = comps_object_hash((COMPS_Object*)s1);
+    ck_assert(hash == comps_str_hash("mandatory"));
+    ck_assert(comps_object_hash((COMPS_Object*)s1) == hash);
+
+    /* set invalidates cached hash and shorter value is kept in place */
+    comps_str_set(s1, "default");
+    ck_assert(s1->len == 7);
+    ck_assert(strcmp(s1->val, "default") == 0);
+    ck_assert(comps_object_hash((COMPS_Object*)s1) == comps_str_hash("default"));
+    ck_assert(!comps_object_cmp((COMPS_Object*)s1, (COMPS_Object*)s2));
+    comps_str_set(s1, "conditional");
+    ck_assert(s1->len == 11);
+    ck_assert(strcmp(s1->val, "conditional") == 0);
+
+    s3 = (COMPS_Str*)comps_object_copy((COMPS_Object*)s1);
+    ck_assert(s3->len == 11);
+    ck_assert(comps_object_cmp((COMPS_Object*)s1, (COMPS_Object*)s3));
+    COMPS_OBJECT_DESTROY(s3);
+    tmp = malloc(sizeof(char) * 9);
+    strcpy(tmp, "optional");
+    s3 = comps_str_x(tmp);
+    ck_assert(s3->len == 8);
+    COMPS_OBJECT_DESTROY(s3);
+    COMPS_OBJECT_DESTROY(s1);
+    COMPS_OBJECT_DESTROY(s2);
+}END_TEST
+
+START_TEST(test_comps_group_fields) {
+    COMPS_DocGroup *g1, *g2, *g3;
+    COMPS_Object *prop;
+
+    g1 = COMPS_OBJECT_CREATE(COMPS_DocGroup, NULL);
+    ck_assert(g1->properties == NULL);
+    ck_assert(comps_docgroup_get_name(g1) == NULL);
+    comps_docgroup_set_id(g1, "core", 0);
+    comps_docgroup_set_name(g1, "Core", 0);
+    comps_docgroup_set_uservisible(g1, 1, false);
+    comps_docgroup_set_display_order(g1, 5, false);
+    ck_assert(strcmp(g1->name->val, "Core") == 0);
+    ck_assert(g1->uservisible->val == 1);
+    prop = comps_docgroup_get_display_order(g1);
+    ck_assert(prop == (COMPS_Object*)g1->display_order);
+    COMPS_OBJECT_DESTROY(prop);
+    comps_docgroup_set_display_order(g1, 0, true);
+    ck_assert(g1->display_order == NULL);
+    ck_assert(g1->properties == NULL);
+
+    g2 = COMPS_OBJECT_CREATE(COMPS_DocGroup, NULL);
+    comps_docgroup_set_id(g2, "core", 0);
+    comps_docgroup_set_desc(g2, "Smallest possible installation", 0);
+    comps_docgroup_set_uservisible(g2, 0, false);
+
+    /* properties of second group win, missing ones are taken from first */
+    g3 = comps_docgroup_union(g1, g2);
+    ck_assert(strcmp(g3->name->val, "Core") == 0);
+    ck_assert(strcmp(g3->desc->val, "Smallest possible installation") == 0);
+    ck_assert(g3->uservisible->val == 0);
+    ck_assert(g3->properties == NULL);
+    COMPS_OBJECT_DESTROY(g3);
+
+    g3 = comps_docgroup_intersect(g1, g2);
+    ck_assert(g3->id == g1->id);
+    ck_assert(g3->name == NULL);
+    ck_assert(g3->uservisible == NULL);
+    COMPS_OBJECT_DESTROY(g3);
+
+    g3 = (COMPS_DocGroup*)comps_object_copy((COMPS_Object*)g1);
+    ck_assert(comps_object_cmp((COMPS_Object*)g1, (COMPS_Object*)g3));
+    /* empty dictionary of other properties equals missing one */
+    g3->properties = COMPS_OBJECT_CREATE(COMPS_ObjDict, NULL);
+    ck_assert(comps_object_cmp((COMPS_Object*)g1, (COMPS_Object*)g3));
+    comps_objdict_set_x(g3->properties, "extra", (COMPS_Object*)comps_num(1));
+    ck_assert(!comps_object_cmp((COMPS_Object*)g1, (COMPS_Object*)g3));
+    COMPS_OBJECT_DESTROY(g3);
+
+    COMPS_OBJECT_DESTROY(g1);
+    COMPS_OBJECT_DESTROY(g2);
+}END_TEST
+
+START_TEST(test_comps_group_share) {
+    COMPS_DocGroup *g1, *g2, *g3, *g4;
+    COMPS_DocGroupPackage *pkg;
+    COMPS_ObjList *arches, *list;
+
+    g1 = COMPS_OBJECT_CREATE(COMPS_DocGroup, NULL);
+    comps_docgroup_set_id(g1, "core", 0);
+    comps_docgroup_set_name(g1, "Core", 0);
+    comps_objdict_set_x(g1->name_by_lang, "cs",
+                        (COMPS_Object*)comps_str("Jadro"));
+    pkg = COMPS_OBJECT_CREATE(COMPS_DocGroupPackage, NULL);
+    comps_docpackage_set_name(pkg, "bash", 0);
+    arches = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+    comps_objlist_append_x(arches, (COMPS_Object*)comps_str("x86_64"));
+    comps_docpackage_set_arches(pkg, arches);
+    comps_docgroup_add_package(g1, pkg);
+
+    /* copy shares members */
+    g2 = (COMPS_DocGroup*)comps_object_copy((COMPS_Object*)g1);
+    ck_assert(g2->name == g1->name);
+    ck_assert(g2->name_by_lang == g1->name_by_lang);
+    ck_assert(g2->packages == g1->packages);
+
+    /* list is cloned when it's modified through owner */
+    pkg = COMPS_OBJECT_CREATE(COMPS_DocGroupPackage, NULL);
+    comps_docpackage_set_name(pkg, "glibc", 0);
+    list = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+    comps_objlist_append_x(list, (COMPS_Object*)comps_str("ppc64"));
+    comps_docpackage_set_arches(pkg, list);
+    comps_docgroup_add_package(g2, pkg);
+    ck_assert(g2->packages != g1->packages);
+    ck_assert(g1->packages->len == 1);
+    ck_assert(g2->packages->len == 2);
+    ck_assert(g2->name_by_lang == g1->name_by_lang);
+
+    /* union shares list of group if other one is empty or equal */
+    g3 = COMPS_OBJECT_CREATE(COMPS_DocGroup, NULL);
+    comps_docgroup_set_id(g3, "core", 0);
+    g4 = comps_docgroup_union(g2, g3);
+    ck_assert(g4->packages == g2->packages);
+    ck_assert(g4->name_by_lang == g2->name_by_lang);
+    COMPS_OBJECT_DESTROY(g3);
+    g3 = comps_docgroup_union(g4, g2);
+    ck_assert(g3->packages == g2->packages);
+    COMPS_OBJECT_DESTROY(g3);
+    COMPS_OBJECT_DESTROY(g4);
+    g3 = comps_docgroup_union(g1, g2);
+    ck_assert(g3->packages != g2->packages);
+    ck_assert(comps_object_cmp((COMPS_Object*)g3->packages,
+                               (COMPS_Object*)g2->packages));
+    COMPS_OBJECT_DESTROY(g3);
+
+    /* arch filter shares package list if every package passes */
+    g3 = comps_docgroup_arch_filter(g1, arches);
+    ck_assert(g3->packages == g1->packages);
+    ck_assert(comps_object_cmp((COMPS_Object*)g1, (COMPS_Object*)g3));
+    COMPS_OBJECT_DESTROY(g3);
+    g3 = comps_docgroup_arch_filter(g2, arches);
+    ck_assert(g3->packages != g2->packages);
+    ck_assert(g3->packages->len == 1);
+    COMPS_OBJECT_DESTROY(g3);
+
+    /* exposed list is private and it's copied by next copy */
+    list = comps_docgroup_packages(g1);
+    g3 = (COMPS_DocGroup*)comps_object_copy((COMPS_Object*)g1);
+    ck_assert(g3->packages != list);
+    ck_assert(comps_object_cmp((COMPS_Object*)g3->packages,
+                               (COMPS_Object*)list));
+    comps_objlist_remove_at(list, 0);
+    ck_assert(g3->packages->len == 1);
+    COMPS_OBJECT_DESTROY(g3);
+
+    /* package copy shares arches until they're requested for change */
+    pkg = (COMPS_DocGroupPackage*)comps_object_copy(
+                                        g2->packages->first->comps_obj);
+    ck_assert(pkg->arches == arches);
+    list = comps_docpackage_arches(pkg);
+    ck_assert(list != arches);
+    comps_objlist_append_x(list, (COMPS_Object*)comps_str("s390x"));
+    ck_assert(arches->len == 1);
+    COMPS_OBJECT_DESTROY(list);
+    COMPS_OBJECT_DESTROY(pkg);
+
+    COMPS_OBJECT_DESTROY(g1);
+    COMPS_OBJECT_DESTROY(g2);
+}END_TEST
+
+START_TEST(test_comps_doc_by_package) {
+    COMPS_Doc *doc, *doc2;
+    COMPS_DocGroup *g;
+    COMPS_DocGroupPackage *pkg, *found;
+    COMPS_ObjList *groups, *list;
+    COMPS_Object *enc;
+    char buffer[16];
+    int i, x;
+
+    enc = (COMPS_Object*)comps_str("UTF-8");
+    doc = (COMPS_Doc*)comps_object_create(&COMPS_Doc_ObjInfo,
+                                          (COMPS_Object*[]){enc});
+    COMPS_OBJECT_DESTROY(enc);
+    list = comps_doc_groups_by_package(doc, "bash");
+    ck_assert(list->len == 0);
+    COMPS_OBJECT_DESTROY(list);
+
+    /* group i contains packages pkg<i>...pkg<i+9> */
+    for (i = 0; i < 20; i++) {
+        g = COMPS_OBJECT_CREATE(COMPS_DocGroup, NULL);
+        snprintf(buffer, 16, "group%d", i);
+        comps_docgroup_set_id(g, buffer, 0);
+        for (x = i; x < i + 10; x++) {
+            pkg = COMPS_OBJECT_CREATE(COMPS_DocGroupPackage, NULL);
+            snprintf(buffer, 16, "pkg%d", x);
+            comps_docpackage_set_name(pkg, buffer, 0);
+            comps_docpackage_set_type(pkg, COMPS_PACKAGE_MANDATORY, false);
+            comps_docgroup_add_package(g, pkg);
+        }
+        comps_doc_add_group(doc, g);
+    }
+    groups = comps_doc_groups(doc);
+
+    list = comps_doc_groups_by_package(doc, "pkg12");
+    ck_assert(list->len == 10);
+    ck_assert(list->first->comps_obj == comps_objlist_get_x(groups, 3));
+    ck_assert(list->last->comps_obj == comps_objlist_get_x(groups, 12));
+    COMPS_OBJECT_DESTROY(list);
+    list = comps_doc_groups_by_package(doc, "pkg28");
+    ck_assert(list->len == 1);
+    COMPS_OBJECT_DESTROY(list);
+    list = comps_doc_groups_by_package(doc, "pkg29");
+    ck_assert(list->len == 0);
+    COMPS_OBJECT_DESTROY(list);
+
+    g = (COMPS_DocGroup*)comps_objlist_get_x(groups, 5);
+    found = comps_doc_group_package(doc, g, "pkg7");
+    ck_assert(found == (COMPS_DocGroupPackage*)
+                       comps_objlist_get_x(g->packages, 2));
+    ck_assert(comps_doc_group_package(doc, g, "pkg4") == NULL);
+
+    /* index follows changes of package names and packages lists */
+    comps_docpackage_set_name(found, "renamed", 0);
+    COMPS_OBJECT_DESTROY(found);
+    list = comps_doc_groups_by_package(doc, "pkg7");
+    ck_assert(list->len == 7);
+    COMPS_OBJECT_DESTROY(list);
+    list = comps_doc_groups_by_package(doc, "renamed");
+    ck_assert(list->len == 1 && list->first->comps_obj == (COMPS_Object*)g);
+    COMPS_OBJECT_DESTROY(list);
+
+    pkg = COMPS_OBJECT_CREATE(COMPS_DocGroupPackage, NULL);
+    comps_docpackage_set_name(pkg, "bash", 0);
+    comps_docgroup_add_package(g, pkg);
+    list = comps_doc_groups_by_package(doc, "bash");
+    ck_assert(list->len == 1);
+    COMPS_OBJECT_DESTROY(list);
+    list = comps_docgroup_packages(g);
+    comps_objlist_remove_at(list, 0);
+    ck_assert(comps_doc_group_package(doc, g, "pkg5") == NULL);
+
+    comps_objlist_remove_at(groups, 0);
+    list = comps_doc_groups_by_package(doc, "pkg0");
+    ck_assert(list->len == 0);
+    COMPS_OBJECT_DESTROY(list);
+
+    /* copy has its own index, changes of copy don't affect original */
+    doc2 = (COMPS_Doc*)comps_object_copy((COMPS_Object*)doc);
+    list = comps_doc_groups_by_package(doc2, "bash");
+    ck_assert(list->len == 1);
+    g = (COMPS_DocGroup*)list->first->comps_obj;
+    COMPS_OBJECT_DESTROY(list);
+    list = comps_docgroup_packages(g);
+    comps_objlist_clear(list);
+    list = comps_doc_groups_by_package(doc2, "bash");
+    ck_assert(list->len == 0);
+    COMPS_OBJECT_DESTROY(list);
+    list = comps_doc_groups_by_package(doc, "bash");
+    ck_assert(list->len == 1);
+    COMPS_OBJECT_DESTROY(list);
+
+    COMPS_OBJECT_DESTROY(doc2);
+    COMPS_OBJECT_DESTROY(groups);
+    COMPS_OBJECT_DESTROY(doc);
+}END_TEST
+
+static COMPS_DocGroupId* __gid(const char *name) {
+    COMPS_DocGroupId *gid = COMPS_OBJECT_CREATE(COMPS_DocGroupId, NULL);
+    comps_docgroupid_set_name(gid, (char*)name, 0);
+    return gid;
+}
+
+START_TEST(test_comps_doc_closure) {
+    COMPS_Doc *doc, *doc2;
+    COMPS_DocGroup *g;
+    COMPS_DocGroupPackage *pkg;
+    COMPS_DocEnv *env;
+    COMPS_DocCategory *cat;
+    COMPS_ObjList *list, *list2, *options, *groups;
+    COMPS_Object *enc;
+    const int types = COMPS_PACKAGE_TYPE_MASK(COMPS_PACKAGE_MANDATORY)
+                      | COMPS_PACKAGE_TYPE_MASK(COMPS_PACKAGE_DEFAULT);
+    char buffer[16];
+    int i, x;
+
+    enc = (COMPS_Object*)comps_str("UTF-8");
+    doc = (COMPS_Doc*)comps_object_create(&COMPS_Doc_ObjInfo,
+                                          (COMPS_Object*[]){enc});
+    COMPS_OBJECT_DESTROY(enc);
+    ck_assert(comps_doc_environment_packages(doc, "env", NULL, types) == NULL);
+
+    /* group i contains mandatory pkg<i>, pkg<i+1> and optional opt<i> */
+    for (i = 0; i < 5; i++) {
+        g = COMPS_OBJECT_CREATE(COMPS_DocGroup, NULL);
+        snprintf(buffer, 16, "g%d", i);
+        comps_docgroup_set_id(g, buffer, 0);
+        for (x = i; x < i + 2; x++) {
+            pkg = COMPS_OBJECT_CREATE(COMPS_DocGroupPackage, NULL);
+            snprintf(buffer, 16, "pkg%d", x);
+            comps_docpackage_set_name(pkg, buffer, 0);
+            comps_docpackage_set_type(pkg, COMPS_PACKAGE_MANDATORY, false);
+            comps_docgroup_add_package(g, pkg);
+        }
+        pkg = COMPS_OBJECT_CREATE(COMPS_DocGroupPackage, NULL);
+        snprintf(buffer, 16, "opt%d", i);
+        comps_docpackage_set_name(pkg, buffer, 0);
+        comps_docpackage_set_type(pkg, COMPS_PACKAGE_OPTIONAL, false);
+        comps_docgroup_add_package(g, pkg);
+        comps_doc_add_group(doc, g);
+    }
+    env = COMPS_OBJECT_CREATE(COMPS_DocEnv, NULL);
+    comps_docenv_set_id(env, "env", 0);
+    comps_docenv_add_groupid(env, __gid("g0"));
+    comps_docenv_add_groupid(env, __gid("g1"));
+    comps_docenv_add_groupid(env, __gid("missing"));
+    comps_docenv_add_optionid(env, __gid("g3"));
+    comps_docenv_add_optionid(env, __gid("g4"));
+    comps_doc_add_environment(doc, env);
+    cat = COMPS_OBJECT_CREATE(COMPS_DocCategory, NULL);
+    comps_doccategory_set_id(cat, "cat", 0);
+    comps_doccategory_add_groupid(cat, __gid("g2"));
+    comps_doccategory_add_groupid(cat, __gid("g4"));
+    comps_doc_add_category(doc, cat);
+
+    list = comps_doc_environment_packages(doc, "env", NULL, types);
+    ck_assert(list->len == 3);
+    ck_assert(strcmp(((COMPS_Str*)list->first->comps_obj)->val, "pkg0") == 0);
+    ck_assert(strcmp(((COMPS_Str*)list->last->comps_obj)->val, "pkg2") == 0);
+    /* result is cached */
+    list2 = comps_doc_environment_packages(doc, "env", NULL, types);
+    ck_assert(list2 == list);
+    COMPS_OBJECT_DESTROY(list2);
+    COMPS_OBJECT_DESTROY(list);
+
+    options = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+    comps_objlist_append_x(options, (COMPS_Object*)comps_str("g4"));
+    comps_objlist_append_x(options, (COMPS_Object*)comps_str("g2"));
+    list = comps_doc_environment_packages(doc, "env", options,
+                        types | COMPS_PACKAGE_TYPE_MASK(COMPS_PACKAGE_OPTIONAL));
+    ck_assert(list->len == 8);
+    COMPS_OBJECT_DESTROY(list);
+    list = comps_doc_environment_packages(doc, "env", options, types);
+    ck_assert(list->len == 5);
+    COMPS_OBJECT_DESTROY(list);
+
+    list = comps_doc_category_packages(doc, "cat", types);
+    ck_assert(list->len == 4);
+    COMPS_OBJECT_DESTROY(list);
+    ck_assert(comps_doc_category_packages(doc, "env", types) == NULL);
+
+    /* changes of document objects invalidate cached results */
+    g = comps_doc_group_by_id(doc, "g1");
+    pkg = (COMPS_DocGroupPackage*)comps_objlist_get_x(g->packages, 2);
+    comps_docpackage_set_type(pkg, COMPS_PACKAGE_DEFAULT, false);
+    list = comps_doc_environment_packages(doc, "env", NULL, types);
+    ck_assert(list->len == 4);
+    COMPS_OBJECT_DESTROY(list);
+
+    pkg = COMPS_OBJECT_CREATE(COMPS_DocGroupPackage, NULL);
+    comps_docpackage_set_name(pkg, "added", 0);
+    comps_docpackage_set_type(pkg, COMPS_PACKAGE_DEFAULT, false);
+    comps_docgroup_add_package(g, pkg);
+    list = comps_doc_environment_packages(doc, "env", NULL, types);
+    ck_assert(list->len == 5);
+    COMPS_OBJECT_DESTROY(list);
+
+    comps_docgroup_set_id(g, "missing", 0);
+    COMPS_OBJECT_DESTROY(g);
+    list = comps_doc_environment_packages(doc, "env", NULL, types);
+    ck_assert(list->len == 5);
+    COMPS_OBJECT_DESTROY(list);
+    list = comps_docenv_group_list(env);
+    comps_objlist_remove_at(list, 2);
+    list = comps_doc_environment_packages(doc, "env", NULL, types);
+    ck_assert(list->len == 2);
+    COMPS_OBJECT_DESTROY(list);
+
+    groups = comps_doc_groups(doc);
+    comps_objlist_remove_at(groups, 0);
+    list = comps_doc_environment_packages(doc, "env", NULL, types);
+    ck_assert(list->len == 0);
+    COMPS_OBJECT_DESTROY(list);
+    COMPS_OBJECT_DESTROY(groups);
+
+    /* copy has its own cache */
+    doc2 = (COMPS_Doc*)comps_object_copy((COMPS_Object*)doc);
+    list = comps_doc_category_packages(doc2, "cat", types);
+    ck_assert(list->len == 4);
+    COMPS_OBJECT_DESTROY(list);
+    groups = comps_doc_groups(doc2);
+    comps_objlist_clear(groups);
+    COMPS_OBJECT_DESTROY(groups);
+    list = comps_doc_category_packages(doc2, "cat", types);
+    ck_assert(list->len == 0);
+    COMPS_OBJECT_DESTROY(list);
+    list = comps_doc_category_packages(doc, "cat", types);
+    ck_assert(list->len == 4);
+    /* shared result is copied before modification */
+    list2 = list;
+    comps_object_unshare((COMPS_Object**)&list);
+    ck_assert(list != list2);
+    comps_objlist_clear(list);
+    COMPS_OBJECT_DESTROY(list);
+    list = comps_doc_category_packages(doc, "cat", types);
+    ck_assert(list == list2 && list->len == 4);
+    COMPS_OBJECT_DESTROY(list);
+
+    COMPS_OBJECT_DESTROY(options);
+    COMPS_OBJECT_DESTROY(doc2);
+    COMPS_OBJECT_DESTROY(doc);
+}END_TEST
+
+START_TEST(test_comps_doc_match) {
+    const char *patterns[] = {"base", "base*", "*-desktop", "*x*o*", "*",
+                              "a*b*a", "*.*", "ba?e", "[ab]*", "b\\*se",
+                              "**e", NULL};
+    const char *strings[] = {"base", "base-x", "kde-desktop", "xorg", "",
+                             "aba", "ab", ".hidden", "a.b", "b*se", NULL};
+    const int flags[] = {0, FNM_PERIOD, FNM_NOESCAPE, FNM_PATHNAME, -1};
+    COMPS_Doc *doc;
+    COMPS_DocGroup *g;
+    COMPS_DocMatch *matches[5];
+    COMPS_Pattern *pattern;
+    COMPS_ObjList *results, *list;
+    COMPS_ObjListIt *it;
+    COMPS_Object *enc;
+    COMPS_Str *str;
+    char buffer[16];
+    int i, x, f;
+
+    /* compiled patterns agree with fnmatch */
+    for (f = 0; flags[f] != -1; f++) {
+        for (i = 0; patterns[i]; i++) {
+            pattern = comps_pattern_compile(patterns[i], flags[f]);
+            for (x = 0; strings[x]; x++) {
+                str = comps_str(strings[x]);
+                ck_assert_msg(!comps_pattern_match(pattern, str)
+                              == !!fnmatch(patterns[i], strings[x], flags[f]),
+                              "'%s' '%s' %d", patterns[i], strings[x],
+                              flags[f]);
+                COMPS_OBJECT_DESTROY(str);
+            }
+            comps_pattern_destroy(pattern);
+        }
+    }
+    pattern = comps_pattern_compile("base", 0);
+    ck_assert(pattern->type == COMPS_PATTERN_EXACT);
+    comps_pattern_destroy(pattern);
+    pattern = comps_pattern_compile("base*", 0);
+    ck_assert(pattern->type == COMPS_PATTERN_PREFIX);
+    comps_pattern_destroy(pattern);
+    pattern = comps_pattern_compile("*-x*", 0);
+    ck_assert(pattern->type == COMPS_PATTERN_GLOB);
+    comps_pattern_destroy(pattern);
+    pattern = comps_pattern_compile("ba?e", 0);
+    ck_assert(pattern->type == COMPS_PATTERN_FNMATCH);
+    comps_pattern_destroy(pattern);
+
+    enc = (COMPS_Object*)comps_str("UTF-8");
+    doc = (COMPS_Doc*)comps_object_create(&COMPS_Doc_ObjInfo,
+                                          (COMPS_Object*[]){enc});
+    COMPS_OBJECT_DESTROY(enc);
+    for (i = 0; i < 20; i++) {
+        g = COMPS_OBJECT_CREATE(COMPS_DocGroup, NULL);
+        snprintf(buffer, 16, "g%d", i);
+        comps_docgroup_set_id(g, buffer, 0);
+        snprintf(buffer, 16, "name%d", i % 5);
+        comps_docgroup_set_name(g, buffer, 0);
+        comps_doc_add_group(doc, g);
+    }
+    g = COMPS_OBJECT_CREATE(COMPS_DocGroup, NULL);
+    comps_docgroup_set_id(g, "g3", 0);
+    comps_doc_add_group(doc, g);
+
+    matches[0] = comps_doc_match_create("g3", NULL, NULL, NULL, 0);
+    matches[1] = comps_doc_match_create(NULL, "name2", NULL, NULL, 0);
+    matches[2] = comps_doc_match_create("g1*", "name1", NULL, NULL, 0);
+    matches[3] = comps_doc_match_create("*", NULL, NULL, NULL, 0);
+    matches[4] = comps_doc_match_create("g3", "name1", NULL, NULL, 0);
+    results = comps_doc_match_groups(doc, matches, 5);
+    ck_assert(results->len == 5);
+    /* all objects with same id are found in document order */
+    list = (COMPS_ObjList*)results->first->comps_obj;
+    ck_assert(list->len == 2);
+    ck_assert(((COMPS_DocGroup*)list->first->comps_obj)->name != NULL);
+    ck_assert(((COMPS_DocGroup*)list->last->comps_obj)->name == NULL);
+    list = (COMPS_ObjList*)results->first->next->comps_obj;
+    ck_assert(list->len == 4);
+    for (it = list->first; it != NULL; it = it->next) {
+        ck_assert(strcmp(((COMPS_DocGroup*)it->comps_obj)->name->val,
+                         "name2") == 0);
+    }
+    list = (COMPS_ObjList*)results->first->next->next->comps_obj;
+    ck_assert(list->len == 3);
+    list = (COMPS_ObjList*)results->first->next->next->next->comps_obj;
+    ck_assert(list->len == 21);
+    list = (COMPS_ObjList*)results->last->comps_obj;
+    ck_assert(list->len == 0);
+    COMPS_OBJECT_DESTROY(results);
+
+    /* indexes follow changes of document */
+    g = comps_doc_group_by_id(doc, "g2");
+    comps_docgroup_set_name(g, "name1", 0);
+    results = comps_doc_match_groups(doc, matches, 5);
+    list = (COMPS_ObjList*)results->first->next->comps_obj;
+    ck_assert(list->len == 3);
+    list = (COMPS_ObjList*)results->last->comps_obj;
+    ck_assert(list->len == 0);
+    COMPS_OBJECT_DESTROY(results);
+    comps_docgroup_set_id(g, "g3", 0);
+    COMPS_OBJECT_DESTROY(g);
+    results = comps_doc_match_groups(doc, matches, 5);
+    list = (COMPS_ObjList*)results->first->comps_obj;
+    ck_assert(list->len == 3);
+    list = (COMPS_ObjList*)results->last->comps_obj;
+    ck_assert(list->len == 1);
+    COMPS_OBJECT_DESTROY(results);
+
+    list = comps_doc_get_groups(doc, NULL, "name1", NULL, NULL, 0);
+    ck_assert(list->len == 5);
+    COMPS_OBJECT_DESTROY(list);
+    for (i = 0; i < 5; i++)
+        comps_doc_match_destroy(matches[i]);
+    COMPS_OBJECT_DESTROY(doc);
+}END_TEST
+
 Suite* basic_suite (void)
 {
     Suite *s = suite_create ("Basic Tests");
@@ -621,6 +1483,18 @@ Suite* basic_suite (void)
     tcase_add_test (tc_core, test_comps_doc_setfeats);
     tcase_add_test (tc_core, test_comps_doc_union);
     tcase_add_test (tc_core, test_doc_defaults);
+    tcase_add_test (tc_core, test_comps_set_hashed);
+    tcase_add_test (tc_core, test_comps_doc_by_id);
+    tcase_add_test (tc_core, test_comps_doc_id_rev);
+    tcase_add_test (tc_core, test_comps_objlist);
+    tcase_add_test (tc_core, test_comps_doc_copy);
+    tcase_add_test (tc_core, test_comps_str_intern);
+    tcase_add_test (tc_core, test_comps_str_len);
+    tcase_add_test (tc_core, test_comps_group_fields);
+    tcase_add_test (tc_core, test_comps_group_share);
+    tcase_add_test (tc_core, test_comps_doc_by_package);
+    tcase_add_test (tc_core, test_comps_doc_closure);
+    tcase_add_test (tc_core, test_comps_doc_match);
     suite_add_tcase (s, tc_core);
     return s;
 }
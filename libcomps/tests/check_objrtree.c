@@ -18,6 +18,7 @@
  */
 
 #include "../src/comps_objradix.h"
+#include "../src/comps_objmradix.h"
 #include "../src/comps_obj.h"
 
 #include <stdio.h>
@@ -163,12 +164,119 @@ START_TEST(test_objrtree) {
     COMPS_OBJECT_DESTROY(tree);
 } END_TEST
 
+START_TEST(test_objrtree_fanout) {
+    char key[8] = "pkg-?";
+    char single[2] = "?";
+    char *prev_key;
+    COMPS_ObjRTree *tree, *copied;
+    COMPS_HSList *keys;
+    COMPS_HSListItem *it;
+    COMPS_Object *val;
+    int x, count;
+
+    tree = (COMPS_ObjRTree*)comps_object_create(&COMPS_ObjRTree_ObjInfo, NULL);
+    /* children of node are indexed when there's more of them */
+    for (x = 'z'; x >= 'A'; x--) {
+        key[4] = x;
+        comps_objrtree_set_x(tree, key, (COMPS_Object*)comps_num(x));
+        single[0] = x;
+        comps_objrtree_set_x(tree, single, (COMPS_Object*)comps_num(x));
+    }
+    comps_objrtree_set_x(tree, "pkg", (COMPS_Object*)comps_num(1));
+    comps_objrtree_set_x(tree, "p", (COMPS_Object*)comps_num(2));
+    ck_assert(tree->len == 2 * ('z' - 'A' + 1) + 1);
+
+    for (x = 'A'; x <= 'z'; x++) {
+        key[4] = x;
+        val = comps_objrtree_get_x(tree, key);
+        ck_assert_msg(val != NULL, "%s not found", key);
+        ck_assert(((COMPS_Num*)val)->val == x);
+    }
+    ck_assert(((COMPS_Num*)comps_objrtree_get_x(tree, "pkg"))->val == 1);
+    ck_assert(((COMPS_Num*)comps_objrtree_get_x(tree, "p"))->val == 2);
+    ck_assert(comps_objrtree_get_x(tree, "pk") == NULL);
+    ck_assert(comps_objrtree_get_x(tree, "pkg-") == NULL);
+    ck_assert(comps_objrtree_get_x(tree, "pkg-AA") == NULL);
+
+    keys = comps_objrtree_keys(tree);
+    prev_key = NULL;
+    count = 0;
+    for (it = keys->first; it != NULL; it = it->next, count++) {
+        if (prev_key)
+            ck_assert_msg(strcmp(prev_key, it->data) < 0, "%s >= %s",
+                          prev_key, (char*)it->data);
+        prev_key = it->data;
+    }
+    ck_assert(count == (int)tree->len);
+    comps_hslist_destroy(&keys);
+
+    copied = (COMPS_ObjRTree*)comps_object_copy((COMPS_Object*)tree);
+    ck_assert(comps_object_cmp((COMPS_Object*)tree, (COMPS_Object*)copied));
+
+    for (x = 'A'; x <= 'z'; x += 2) {
+        key[4] = x;
+        comps_objrtree_unset(tree, key);
+        single[0] = x;
+        comps_objrtree_unset(tree, single);
+    }
+    comps_objrtree_unset(tree, "pkg");
+    for (x = 'A'; x <= 'z'; x++) {
+        key[4] = x;
+        val = comps_objrtree_get_x(tree, key);
+        if ((x - 'A') % 2)
+            ck_assert(((COMPS_Num*)val)->val == x);
+        else
+            ck_assert(val == NULL);
+    }
+    ck_assert(!comps_object_cmp((COMPS_Object*)tree, (COMPS_Object*)copied));
+    ck_assert(((COMPS_Num*)comps_objrtree_get_x(copied, "pkg-A"))->val == 'A');
+
+    for (x = 'A'; x <= 'z'; x++) {
+        key[4] = x;
+        comps_objrtree_unset(tree, key);
+        single[0] = x;
+        comps_objrtree_unset(tree, single);
+    }
+    comps_objrtree_unset(tree, "p");
+    ck_assert(tree->len == 0);
+    ck_assert(tree->subnodes.len == 0);
+
+    comps_objrtree_unite(tree, copied);
+    ck_assert(comps_object_cmp((COMPS_Object*)tree, (COMPS_Object*)copied));
+    COMPS_OBJECT_DESTROY(tree);
+    COMPS_OBJECT_DESTROY(copied);
+} END_TEST
+
+START_TEST(test_objmrtree_cmp) {
+    COMPS_ObjMRTree *tree1, *tree2;
+
+    tree1 = (COMPS_ObjMRTree*)comps_object_create(&COMPS_ObjMRTree_ObjInfo,
+                                                  NULL);
+    tree2 = (COMPS_ObjMRTree*)comps_object_create(&COMPS_ObjMRTree_ObjInfo,
+                                                  NULL);
+    comps_objmrtree_set_x(tree1, "perl-DBD-MySQL",
+                          (COMPS_Object*)comps_str("mysql"));
+    comps_objmrtree_set_x(tree2, "perl-DBD-MySQL",
+                          (COMPS_Object*)comps_str("mysql"));
+    ck_assert(comps_object_cmp((COMPS_Object*)tree1, (COMPS_Object*)tree2));
+
+    /* same keys with different values */
+    comps_objmrtree_set_x(tree1, "dbus", (COMPS_Object*)comps_str("i386"));
+    comps_objmrtree_set_x(tree2, "dbus", (COMPS_Object*)comps_str("ppc64"));
+    ck_assert(!comps_object_cmp((COMPS_Object*)tree1, (COMPS_Object*)tree2));
+
+    COMPS_OBJECT_DESTROY(tree1);
+    COMPS_OBJECT_DESTROY(tree2);
+} END_TEST
+
 Suite* basic_suite (void)
 {
     Suite *s = suite_create ("Basic Tests");
     /* Core test case */
     TCase *tc_core = tcase_create ("Core");
     tcase_add_test (tc_core, test_objrtree);
+    tcase_add_test (tc_core, test_objrtree_fanout);
+    tcase_add_test (tc_core, test_objmrtree_cmp);
     suite_add_tcase (s, tc_core);
     return s;
 }
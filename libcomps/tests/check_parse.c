@@ -17,10 +17,16 @@
  * USA
  */
 
+/* popen */
+#define _POSIX_C_SOURCE 200112L
+
 #include <check.h>
 #include <stdio.h>
+#include <errno.h>
 
 #include "../src/comps_doc.h"
+#include "../src/comps_docdiff.h"
+#include "../src/comps_docbin.h"
 #include "../src/comps_parse.h"
 #include "../src/comps_docpackage.h"
 
@@ -644,6 +650,690 @@ START_TEST(test_arch)
 }
 END_TEST
 
+START_TEST(test_arch_multi)
+{
+    const char *sets[][4] = {{"x86", NULL}, {"x86_64", "s390", NULL},
+                             {"x86", "x86_64", "s390", NULL},
+                             {"unknown", NULL}, {NULL}};
+    COMPS_ObjList *arches[6], *docs, *big;
+    COMPS_ObjListIt *it;
+    COMPS_Parsed *parsed;
+    COMPS_Doc *doc;
+    char buffer[16];
+    int i, x;
+    FILE *fp;
+
+    fprintf(stderr, "## Running test_arch_multi\n");
+    parsed = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed, "UTF-8", 0);
+    fp = fopen("main_arches.xml", "r");
+    comps_parse_file(parsed, fp, NULL);
+    fail_if(parsed->fatal_error != 0, "Some fatal errors found after parsing");
+
+    for (i = 0; i < 5; i++) {
+        arches[i] = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+        for (x = 0; sets[i][x]; x++)
+            comps_objlist_append_x(arches[i],
+                                   (COMPS_Object*)comps_str(sets[i][x]));
+    }
+    /* set with more arches than fit into arch map is filtered by lists */
+    big = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+    for (x = 0; x < COMPS_ARCHMAP_SIZE + 6; x++) {
+        snprintf(buffer, 16, "arch%d", x);
+        comps_objlist_append_x(big, (COMPS_Object*)comps_str(buffer));
+    }
+    comps_objlist_append_x(big, (COMPS_Object*)comps_str("x86"));
+    arches[5] = big;
+
+    docs = comps_doc_arch_filter_multi(parsed->comps_doc, arches, 6);
+    fail_if(docs->len != 6);
+    for (i = 0, it = docs->first; it != NULL; it = it->next, i++) {
+        doc = comps_doc_arch_filter(parsed->comps_doc, arches[i]);
+        fail_if(!comps_object_cmp((COMPS_Object*)doc, it->comps_obj));
+        COMPS_OBJECT_DESTROY(doc);
+    }
+    fail_if(comps_object_cmp(docs->first->comps_obj,
+                             docs->first->next->comps_obj));
+    fail_if(!comps_object_cmp(docs->first->comps_obj,
+                              docs->last->comps_obj));
+    doc = (COMPS_Doc*)docs->first->next->next->next->comps_obj;
+    fail_if(doc->groups && doc->groups->len != 0);
+    COMPS_OBJECT_DESTROY(docs);
+
+    docs = comps_doc_arch_filter_multi(parsed->comps_doc, arches, 0);
+    fail_if(docs->len != 0);
+    COMPS_OBJECT_DESTROY(docs);
+    for (i = 0; i < 6; i++)
+        COMPS_OBJECT_DESTROY(arches[i]);
+    comps_parse_parsed_destroy(parsed);
+}
+END_TEST
+
+START_TEST(test_union_many)
+{
+    const char *sets[][3] = {{"x86", NULL}, {"x86_64", "s390", NULL}};
+    COMPS_ObjList *arches;
+    COMPS_Parsed *parsed;
+    COMPS_Doc *docs[4], *fold, *tmp, *res;
+    int i, x;
+    FILE *fp;
+
+    fprintf(stderr, "## Running test_union_many\n");
+    parsed = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed, "UTF-8", 0);
+    fp = fopen("main_arches.xml", "r");
+    comps_parse_file(parsed, fp, NULL);
+    fail_if(parsed->fatal_error != 0, "Some fatal errors found after parsing");
+
+    /* differently filtered documents share ids of most objects */
+    for (i = 0; i < 2; i++) {
+        arches = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+        for (x = 0; sets[i][x]; x++)
+            comps_objlist_append_x(arches, (COMPS_Object*)comps_str(sets[i][x]));
+        docs[i] = comps_doc_arch_filter(parsed->comps_doc, arches);
+        COMPS_OBJECT_DESTROY(arches);
+    }
+    docs[2] = parsed->comps_doc;
+    docs[3] = docs[0];
+
+    fold = (COMPS_Doc*)comps_object_copy((COMPS_Object*)docs[0]);
+    for (i = 1; i < 4; i++) {
+        tmp = comps_doc_union(fold, docs[i]);
+        COMPS_OBJECT_DESTROY(fold);
+        fold = tmp;
+        res = comps_doc_union_many(docs, i + 1);
+        fail_if(!comps_object_cmp((COMPS_Object*)fold, (COMPS_Object*)res));
+        COMPS_OBJECT_DESTROY(res);
+    }
+    fail_if(fold->groups->len != parsed->comps_doc->groups->len);
+    COMPS_OBJECT_DESTROY(fold);
+
+    res = comps_doc_union_many(docs + 2, 1);
+    fail_if(!comps_object_cmp((COMPS_Object*)res, (COMPS_Object*)docs[2]));
+    COMPS_OBJECT_DESTROY(res);
+    fail_if(comps_doc_union_many(docs, 0) != NULL);
+
+    COMPS_OBJECT_DESTROY(docs[0]);
+    COMPS_OBJECT_DESTROY(docs[1]);
+    comps_parse_parsed_destroy(parsed);
+}
+END_TEST
+
+START_TEST(test_merge_into)
+{
+    const char *sets[][3] = {{"x86", NULL}, {"x86_64", "s390", NULL}};
+    COMPS_ObjList *arches, *groups;
+    COMPS_Parsed *parsed;
+    COMPS_Doc *docs[2], *dst, *res;
+    COMPS_DocGroup *group;
+    COMPS_Object *untouched;
+    int i, x;
+    FILE *fp;
+
+    fprintf(stderr, "## Running test_merge_into\n");
+    parsed = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed, "UTF-8", 0);
+    fp = fopen("main_arches.xml", "r");
+    comps_parse_file(parsed, fp, NULL);
+    fail_if(parsed->fatal_error != 0, "Some fatal errors found after parsing");
+
+    for (i = 0; i < 2; i++) {
+        arches = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+        for (x = 0; sets[i][x]; x++)
+            comps_objlist_append_x(arches, (COMPS_Object*)comps_str(sets[i][x]));
+        docs[i] = comps_doc_arch_filter(parsed->comps_doc, arches);
+        COMPS_OBJECT_DESTROY(arches);
+    }
+
+    dst = (COMPS_Doc*)comps_object_copy((COMPS_Object*)docs[0]);
+    groups = dst->groups;
+    res = comps_doc_union(docs[0], docs[1]);
+    comps_doc_merge_into(dst, docs[1]);
+    fail_if(!comps_object_cmp((COMPS_Object*)dst, (COMPS_Object*)res));
+    fail_if(dst->groups != groups);
+    COMPS_OBJECT_DESTROY(res);
+
+    res = comps_doc_union(dst, parsed->comps_doc);
+    comps_doc_merge_into(dst, parsed->comps_doc);
+    fail_if(!comps_object_cmp((COMPS_Object*)dst, (COMPS_Object*)res));
+    COMPS_OBJECT_DESTROY(res);
+
+    res = comps_doc_union(dst, dst);
+    comps_doc_merge_into(dst, dst);
+    fail_if(!comps_object_cmp((COMPS_Object*)dst, (COMPS_Object*)res));
+    COMPS_OBJECT_DESTROY(res);
+    COMPS_OBJECT_DESTROY(dst);
+
+    /* objects not contained in src are kept */
+    dst = (COMPS_Doc*)comps_object_copy((COMPS_Object*)parsed->comps_doc);
+    untouched = dst->groups->first->comps_obj;
+    group = comps_doc_group_by_id(docs[1],
+                                  ((COMPS_DocGroup*)untouched)->id->val);
+    fail_if(group == NULL);
+    comps_objlist_remove(docs[1]->groups, (COMPS_Object*)group);
+    COMPS_OBJECT_DESTROY(group);
+    comps_doc_merge_into(dst, docs[1]);
+    fail_if(dst->groups->first->comps_obj != untouched);
+    fail_if(dst->groups->len != parsed->comps_doc->groups->len);
+    COMPS_OBJECT_DESTROY(dst);
+
+    COMPS_OBJECT_DESTROY(docs[0]);
+    COMPS_OBJECT_DESTROY(docs[1]);
+    comps_parse_parsed_destroy(parsed);
+}
+END_TEST
+
+START_TEST(test_doc_diff)
+{
+    const char *x86[] = {"x86", NULL};
+    COMPS_ObjList *arches;
+    COMPS_Parsed *parsed;
+    COMPS_Doc *old_doc, *new_doc, *doc;
+    COMPS_DocDiff *diff;
+    COMPS_Object *obj;
+    unsigned int i, expected;
+    int x;
+    FILE *fp;
+
+    fprintf(stderr, "## Running test_doc_diff\n");
+    parsed = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed, "UTF-8", 0);
+    fp = fopen("main_arches.xml", "r");
+    comps_parse_file(parsed, fp, NULL);
+    fail_if(parsed->fatal_error != 0, "Some fatal errors found after parsing");
+
+    diff = comps_doc_diff(parsed->comps_doc, parsed->comps_doc);
+    fail_if(diff == NULL);
+    fail_if(comps_doc_diff_len(diff) != 0);
+    comps_doc_diff_destroy(diff);
+
+    arches = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+    for (x = 0; x86[x]; x++)
+        comps_objlist_append_x(arches, (COMPS_Object*)comps_str(x86[x]));
+    old_doc = comps_doc_arch_filter(parsed->comps_doc, arches);
+    COMPS_OBJECT_DESTROY(arches);
+
+    /* reorder, rename and drop some objects */
+    new_doc = (COMPS_Doc*)comps_object_copy((COMPS_Object*)parsed->comps_doc);
+    obj = comps_object_incref(new_doc->groups->last->comps_obj);
+    comps_objlist_remove(new_doc->groups, obj);
+    comps_objlist_insert_at_x(new_doc->groups, 0, obj);
+    comps_docgroup_set_name((COMPS_DocGroup*)new_doc->groups->last->comps_obj,
+                            "renamed", 1);
+    comps_objlist_remove_at(new_doc->categories, 0);
+    obj = comps_object_incref(new_doc->environments->first->comps_obj);
+    comps_objlist_remove(new_doc->environments, obj);
+    comps_objlist_append_x(new_doc->environments, obj);
+
+    for (i = 0; i < 3; i++) {
+        COMPS_Doc *pair[][2] = {{old_doc, new_doc},
+                                {new_doc, old_doc},
+                                {parsed->comps_doc, new_doc}};
+        diff = comps_doc_diff(pair[i][0], pair[i][1]);
+        fail_if(comps_doc_diff_len(diff) == 0);
+        doc = (COMPS_Doc*)comps_object_copy((COMPS_Object*)pair[i][0]);
+        fail_if(comps_doc_patch(doc, diff) != 0);
+        fail_if(!comps_object_cmp((COMPS_Object*)doc,
+                                  (COMPS_Object*)pair[i][1]));
+
+        /* patching patched document again, added and removed objects
+         * conflict */
+        for (x = 0, expected = 0; x < (int)diff->groups_len; x++)
+            expected += (diff->groups[x].type == COMPS_DIFF_ADDED ||
+                         diff->groups[x].type == COMPS_DIFF_REMOVED);
+        for (x = 0; x < (int)diff->categories_len; x++)
+            expected += (diff->categories[x].type == COMPS_DIFF_ADDED ||
+                         diff->categories[x].type == COMPS_DIFF_REMOVED);
+        for (x = 0; x < (int)diff->envs_len; x++)
+            expected += (diff->envs[x].type == COMPS_DIFF_ADDED ||
+                         diff->envs[x].type == COMPS_DIFF_REMOVED);
+        fail_if(comps_doc_patch(doc, diff) != expected);
+        COMPS_OBJECT_DESTROY(doc);
+        comps_doc_diff_destroy(diff);
+    }
+
+    /* difference is independent on compared documents */
+    diff = comps_doc_diff(parsed->comps_doc, new_doc);
+    fail_if(diff->groups_len != 2);
+    fail_if(diff->categories_len != 1);
+    fail_if(diff->categories[0].type != COMPS_DIFF_REMOVED);
+    fail_if(diff->groups[0].type != COMPS_DIFF_MOVED);
+    fail_if(diff->groups[0].pos != 0);
+    fail_if(diff->groups[1].type != COMPS_DIFF_CHANGED);
+    fail_if(diff->groups[1].props != COMPS_DIFF_NAME);
+    fail_if(diff->groups[1].pos != -1);
+    doc = (COMPS_Doc*)comps_object_copy((COMPS_Object*)parsed->comps_doc);
+    COMPS_OBJECT_DESTROY(new_doc);
+    comps_doc_patch(doc, diff);
+    comps_doc_diff_destroy(diff);
+    diff = comps_doc_diff(parsed->comps_doc, doc);
+    fail_if(comps_doc_diff_len(diff) != 4);
+    comps_doc_diff_destroy(diff);
+    COMPS_OBJECT_DESTROY(doc);
+
+    /* only whiteout value and doctype differ */
+    new_doc = (COMPS_Doc*)comps_object_copy((COMPS_Object*)parsed->comps_doc);
+    comps_doc_add_whiteout(new_doc, "perl-DBD-MySQL", comps_str("mysql"));
+    COMPS_OBJECT_DESTROY(new_doc->doctype_sysid);
+    new_doc->doctype_sysid = comps_str("comps-new.dtd");
+    doc = (COMPS_Doc*)comps_object_copy((COMPS_Object*)parsed->comps_doc);
+    comps_doc_add_whiteout(doc, "perl-DBD-MySQL", comps_str("mariadb"));
+    diff = comps_doc_diff(doc, new_doc);
+    fail_if(comps_doc_diff_len(diff) != 2);
+    fail_if(diff->whiteout == NULL);
+    fail_if(!diff->doctype_changed);
+    fail_if(comps_doc_patch(doc, diff) != 0);
+    fail_if(!comps_object_cmp((COMPS_Object*)doc, (COMPS_Object*)new_doc));
+    comps_doc_diff_destroy(diff);
+    COMPS_OBJECT_DESTROY(doc);
+    COMPS_OBJECT_DESTROY(new_doc);
+
+    COMPS_OBJECT_DESTROY(old_doc);
+    comps_parse_parsed_destroy(parsed);
+}
+END_TEST
+
+START_TEST(test_doc_bin)
+{
+    const char *files[] = {"f21-rawhide-comps.xml", "main_arches.xml", NULL};
+    COMPS_Parsed *parsed;
+    COMPS_Doc *doc, *empty;
+    COMPS_DocGroup *group;
+    COMPS_ObjList *list;
+    FILE *fp;
+    int i;
+
+    fprintf(stderr, "## Running test_doc_bin\n");
+    for (i = 0; files[i]; i++) {
+        parsed = comps_parse_parsed_create();
+        comps_parse_parsed_init(parsed, "UTF-8", 0);
+        fp = fopen(files[i], "r");
+        comps_parse_file(parsed, fp, NULL);
+        fail_if(parsed->fatal_error != 0);
+
+        fail_if(comps_doc_save_bin(parsed->comps_doc, "testfile.bin") != 0);
+        doc = comps_doc_load_bin("testfile.bin");
+        fail_if(doc == NULL);
+        fail_if(!comps_object_cmp((COMPS_Object*)doc,
+                                  (COMPS_Object*)parsed->comps_doc));
+        fail_if(strcmp(doc->encoding->val, "UTF-8") != 0);
+        group = (COMPS_DocGroup*)doc->groups->first->comps_obj;
+        fail_if(!(group->id->flags & COMPS_OBJ_INTERNED));
+        if (i == 0) {
+            /* blacklisted package without arch keeps its empty value */
+            list = comps_objmdict_get(doc->blacklist, "dev");
+            fail_if(list == NULL || list->len != 1);
+            COMPS_OBJECT_DESTROY(list);
+        }
+        COMPS_OBJECT_DESTROY(doc);
+        comps_parse_parsed_destroy(parsed);
+    }
+
+    /* NULL lists differ from empty ones */
+    empty = COMPS_OBJECT_CREATE(COMPS_Doc, NULL);
+    empty->categories = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+    fail_if(comps_doc_save_bin(empty, "testfile.bin") != 0);
+    doc = comps_doc_load_bin("testfile.bin");
+    fail_if(doc == NULL);
+    fail_if(doc->groups != NULL);
+    fail_if(doc->categories == NULL || doc->categories->len != 0);
+    fail_if(doc->encoding != NULL);
+    COMPS_OBJECT_DESTROY(doc);
+
+    /* only strings and numbers are stored in dictionaries */
+    group = COMPS_OBJECT_CREATE(COMPS_DocGroup, NULL);
+    group->properties = COMPS_OBJECT_CREATE(COMPS_ObjDict, NULL);
+    comps_objdict_set_x(group->properties, "list",
+                        (COMPS_Object*)COMPS_OBJECT_CREATE(COMPS_ObjList,
+                                                           NULL));
+    comps_doc_add_group(empty, group);
+    fail_if(comps_doc_save_bin(empty, "testfile.bin") != -1);
+    fail_if(errno != EINVAL);
+    COMPS_OBJECT_DESTROY(empty);
+
+    /* file doesn't match its checksum */
+    fp = fopen("testfile.bin", "r+");
+    fseek(fp, -1, SEEK_END);
+    fputc(fgetc(fp) ^ 1, fp);
+    fclose(fp);
+    fail_if(comps_doc_load_bin("testfile.bin") != NULL);
+    fail_if(errno != EINVAL);
+    fail_if(comps_doc_load_bin("main_arches.xml") != NULL);
+    fail_if(errno != EINVAL);
+    remove("testfile.bin");
+    fail_if(comps_doc_load_bin("testfile.bin") != NULL);
+    fail_if(errno != ENOENT);
+}
+END_TEST
+
+START_TEST(test_parse_inputs)
+{
+    COMPS_Parsed *parsed, *parsed2, *parsed3;
+    FILE *fp;
+    char *buff;
+    long len;
+
+    fprintf(stderr, "## Running test_parse_inputs\n");
+    parsed = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed, "UTF-8", 0);
+    fp = fopen("main_comps2.xml", "r");
+    fail_if(comps_parse_file(parsed, fp, NULL) == -1);
+
+    /* pipe can't be mapped, it's read by chunks */
+    parsed2 = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed2, "UTF-8", 0);
+    fp = popen("cat main_comps2.xml", "r");
+    fail_if(comps_parse_file(parsed2, fp, NULL) == -1);
+    fail_if(!comps_object_cmp((COMPS_Object*)parsed->comps_doc,
+                              (COMPS_Object*)parsed2->comps_doc));
+
+    /* only first len bytes are parsed, buffer isn't NUL terminated */
+    fp = fopen("main_comps2.xml", "r");
+    fseek(fp, 0, SEEK_END);
+    len = ftell(fp);
+    fseek(fp, 0, SEEK_SET);
+    buff = malloc(len + 7);
+    fail_if(fread(buff, 1, len, fp) != (size_t)len);
+    memcpy(buff + len, "garbage", 7);
+    fclose(fp);
+    parsed3 = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed3, "UTF-8", 0);
+    fail_if(comps_parse_str_n(parsed3, buff, len, NULL) == -1);
+    fail_if(!comps_object_cmp((COMPS_Object*)parsed->comps_doc,
+                              (COMPS_Object*)parsed3->comps_doc));
+    free(buff);
+
+    comps_parse_parsed_destroy(parsed);
+    comps_parse_parsed_destroy(parsed2);
+    comps_parse_parsed_destroy(parsed3);
+}
+END_TEST
+
+START_TEST(test_parse_compressed)
+{
+    COMPS_Parsed *parsed, *parsed2, *parsed3;
+    FILE *fp, *gz;
+    char buff[4096];
+    size_t len;
+
+    fprintf(stderr, "## Running test_parse_compressed\n");
+    parsed = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed, "UTF-8", 0);
+    fp = fopen("main_comps2.xml", "r");
+    fail_if(comps_parse_file(parsed, fp, NULL) == -1);
+
+    /* compressed stream is decompressed by chunks */
+    parsed2 = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed2, "UTF-8", 0);
+    fp = popen("gzip -c main_comps2.xml", "r");
+    fail_if(comps_parse_file(parsed2, fp, NULL) == -1);
+    fail_if(!comps_object_cmp((COMPS_Object*)parsed->comps_doc,
+                              (COMPS_Object*)parsed2->comps_doc));
+
+    /* compressed regular file is mapped */
+    gz = tmpfile();
+    fp = popen("gzip -c main_comps2.xml", "r");
+    while ((len = fread(buff, 1, sizeof(buff), fp)) > 0)
+        fwrite(buff, 1, len, gz);
+    pclose(fp);
+    rewind(gz);
+    parsed3 = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed3, "UTF-8", 0);
+    fail_if(comps_parse_file(parsed3, gz, NULL) == -1);
+    fail_if(!comps_object_cmp((COMPS_Object*)parsed->comps_doc,
+                              (COMPS_Object*)parsed3->comps_doc));
+    comps_parse_parsed_destroy(parsed3);
+
+    /* decompressed size is multiple of parser buffer */
+    parsed3 = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed3, "UTF-8", 0);
+    fp = popen("{ printf '<comps>'; head -c 65521 /dev/zero | tr '\\0' ' ';"
+               " printf '</comps>'; } | gzip -c", "r");
+    fail_if(comps_parse_file(parsed3, fp, NULL) == -1);
+    comps_parse_parsed_destroy(parsed3);
+
+    /* truncated input */
+    parsed3 = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed3, "UTF-8", 0);
+    fp = popen("gzip -c main_comps2.xml | head -c 512", "r");
+    fail_if(comps_parse_file(parsed3, fp, NULL) != -1);
+
+    comps_parse_parsed_destroy(parsed);
+    comps_parse_parsed_destroy(parsed2);
+    comps_parse_parsed_destroy(parsed3);
+}
+END_TEST
+
+START_TEST(test_parse_feed)
+{
+    COMPS_Parsed *parsed, *parsed2;
+    FILE *fp;
+    char buff[333];
+    size_t len;
+
+    fprintf(stderr, "## Running test_parse_feed\n");
+    parsed = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed, "UTF-8", 0);
+    fp = fopen("main_comps2.xml", "r");
+    fail_if(comps_parse_file(parsed, fp, NULL) == -1);
+
+    parsed2 = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed2, "UTF-8", 0);
+    fp = fopen("main_comps2.xml", "r");
+    while ((len = fread(buff, 1, sizeof(buff), fp)) > 0) {
+        fail_if(comps_parse_feed(parsed2, buff, len) == -1);
+    }
+    fclose(fp);
+    fail_if(comps_parse_close(parsed2) == -1);
+    fail_if(!comps_object_cmp((COMPS_Object*)parsed->comps_doc,
+                              (COMPS_Object*)parsed2->comps_doc));
+    comps_parse_parsed_destroy(parsed2);
+
+    /* unfinished document */
+    parsed2 = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed2, "UTF-8", 0);
+    fail_if(comps_parse_feed(parsed2, "<comps><group>", 14) == -1);
+    fail_if(comps_parse_close(parsed2) != -1);
+    comps_parse_parsed_destroy(parsed2);
+
+    /* parser is stopped after fatal error */
+    parsed2 = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed2, "UTF-8", 0);
+    fail_if(comps_parse_feed(parsed2, "<comps></group>", 15) != -1);
+    fail_if(comps_parse_feed(parsed2, "</comps>", 8) != -1);
+    fail_if(comps_parse_close(parsed2) != -1);
+
+    comps_parse_parsed_destroy(parsed);
+    comps_parse_parsed_destroy(parsed2);
+}
+END_TEST
+
+static void __test_obj_handler(COMPS_Object *obj, void *data) {
+    comps_objlist_append((COMPS_ObjList*)data, obj);
+}
+
+START_TEST(test_parse_obj_handler)
+{
+    COMPS_Parsed *parsed, *parsed2;
+    COMPS_ObjList *objs, *list;
+    FILE *fp;
+    int i;
+
+    fprintf(stderr, "## Running test_parse_obj_handler\n");
+    parsed = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed, "UTF-8", 0);
+    fp = fopen("main_comps2.xml", "r");
+    fail_if(comps_parse_file(parsed, fp, NULL) == -1);
+
+    objs = COMPS_OBJECT_CREATE(COMPS_ObjList, NULL);
+    parsed2 = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed2, "UTF-8", 0);
+    parsed2->obj_handler = &__test_obj_handler;
+    parsed2->obj_handler_data = objs;
+    fp = fopen("main_comps2.xml", "r");
+    fail_if(comps_parse_file(parsed2, fp, NULL) == -1);
+
+    /* handled objects aren't kept in document */
+    list = comps_doc_groups(parsed2->comps_doc);
+    fail_if(list && list->len != 0);
+    COMPS_OBJECT_DESTROY(list);
+    list = comps_doc_groups(parsed->comps_doc);
+    for (i = 0; i < (int)list->len; i++) {
+        fail_if(!comps_object_cmp(comps_objlist_get_x(list, i),
+                                  comps_objlist_get_x(objs, i)));
+    }
+    fail_if(objs->len <= list->len);
+    COMPS_OBJECT_DESTROY(list);
+
+    COMPS_OBJECT_DESTROY(objs);
+    comps_parse_parsed_destroy(parsed);
+    comps_parse_parsed_destroy(parsed2);
+}
+END_TEST
+
+START_TEST(test_parse_sections)
+{
+    COMPS_Parsed *parsed, *parsed2;
+    COMPS_DefaultsOptions options = COMPS_DDefaultsOptions;
+    COMPS_ObjList *list, *list2;
+    FILE *fp;
+
+    fprintf(stderr, "## Running test_parse_sections\n");
+    parsed = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed, "UTF-8", 0);
+    fp = fopen("main_comps2.xml", "r");
+    fail_if(comps_parse_file(parsed, fp, NULL) == -1);
+
+    options.skip_sections = COMPS_SECTION_ALL & ~COMPS_SECTION_GROUPS;
+    parsed2 = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed2, "UTF-8", 0);
+    fp = fopen("main_comps2.xml", "r");
+    fail_if(comps_parse_file(parsed2, fp, &options) == -1);
+
+    list = comps_doc_groups(parsed->comps_doc);
+    list2 = comps_doc_groups(parsed2->comps_doc);
+    fail_if(!comps_object_cmp((COMPS_Object*)list, (COMPS_Object*)list2));
+    COMPS_OBJECT_DESTROY(list);
+    COMPS_OBJECT_DESTROY(list2);
+    list2 = comps_doc_categories(parsed2->comps_doc);
+    fail_if(list2 && list2->len != 0);
+    COMPS_OBJECT_DESTROY(list2);
+    list2 = comps_doc_environments(parsed2->comps_doc);
+    fail_if(list2 && list2->len != 0);
+    COMPS_OBJECT_DESTROY(list2);
+
+    /* skipped sections produce no log entries */
+    options.skip_sections = COMPS_SECTION_ALL;
+    fp = fopen("sample_comps_bad1.xml", "r");
+    fail_if(comps_parse_file(parsed2, fp, &options) != 0);
+    fail_if(parsed2->log->entries->first != NULL);
+
+    comps_parse_parsed_destroy(parsed);
+    comps_parse_parsed_destroy(parsed2);
+}
+END_TEST
+
+START_TEST(test_parse_arena)
+{
+    COMPS_Parsed *parsed, *parsed2;
+    COMPS_DefaultsOptions options = COMPS_DDefaultsOptions;
+    COMPS_ObjList *list;
+    COMPS_DocGroup *group, *group2, *copy;
+    COMPS_Str *enc;
+    FILE *fp;
+
+    fprintf(stderr, "## Running test_parse_arena\n");
+    parsed = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed, "UTF-8", 0);
+    fp = fopen("main_comps2.xml", "r");
+    fail_if(comps_parse_file(parsed, fp, NULL) == -1);
+
+    options.arena = true;
+    parsed2 = comps_parse_parsed_create();
+    comps_parse_parsed_init(parsed2, "UTF-8", 0);
+    fp = fopen("main_comps2.xml", "r");
+    fail_if(comps_parse_file(parsed2, fp, &options) == -1);
+    fail_if(parsed2->arena == NULL);
+    fail_if(comps_arena_current() != NULL);
+    fail_if(!comps_object_cmp((COMPS_Object*)parsed->comps_doc,
+                              (COMPS_Object*)parsed2->comps_doc));
+
+    list = comps_doc_groups(parsed2->comps_doc);
+    group2 = (COMPS_DocGroup*)comps_objlist_get(list, 0);
+    fail_if(comps_object_arena((COMPS_Object*)group2) != parsed2->arena);
+    COMPS_OBJECT_DESTROY(list);
+    /* copy is allocated outside of arena */
+    copy = (COMPS_DocGroup*)comps_object_copy((COMPS_Object*)group2);
+    fail_if(comps_object_arena((COMPS_Object*)copy) != NULL);
+
+    /* group outlives its document */
+    enc = (COMPS_Str*)comps_object_incref(
+                            (COMPS_Object*)parsed2->comps_doc->encoding);
+    fail_if(comps_object_arena((COMPS_Object*)enc) == NULL);
+    comps_parse_parsed_destroy(parsed2);
+    list = comps_doc_groups(parsed->comps_doc);
+    group = (COMPS_DocGroup*)comps_objlist_get_x(list, 0);
+    fail_if(!comps_object_cmp((COMPS_Object*)group, (COMPS_Object*)group2));
+    fail_if(!comps_object_cmp((COMPS_Object*)group, (COMPS_Object*)copy));
+    comps_str_set(enc, "changed");
+    fail_if(strcmp(enc->val, "changed") != 0);
+    COMPS_OBJECT_DESTROY(enc);
+    COMPS_OBJECT_DESTROY(list);
+    COMPS_OBJECT_DESTROY(group2);
+    COMPS_OBJECT_DESTROY(copy);
+    comps_parse_parsed_destroy(parsed);
+}
+END_TEST
+
+START_TEST(test_parse_many)
+{
+    const char *paths[] = {"main_comps2.xml", "sample_comps.xml",
+                           "not_existing.xml", "fedora_comps.xml",
+                           "sample-comps-lang.xml"};
+    signed char rets[5], ret;
+    COMPS_ObjList *docs;
+    COMPS_ObjListIt *it;
+    COMPS_HSListItem *hsit, *hsit2;
+    COMPS_Parsed *parsed;
+    COMPS_Doc *doc;
+    unsigned workers;
+    int i;
+    FILE *fp;
+
+    fprintf(stderr, "## Running test_parse_many\n");
+    for (workers = 0; workers < 4; workers++) {
+        docs = comps_parse_many(paths, 5, workers, NULL, rets);
+        fail_if(docs == NULL);
+        fail_if(docs->len != 5);
+        for (i = 0, it = docs->first; it != NULL; it = it->next, i++) {
+            doc = (COMPS_Doc*)it->comps_obj;
+            if (i == 2) {
+                fail_if(rets[i] != -1);
+                fail_if(doc->log->entries->first == NULL);
+                continue;
+            }
+            parsed = comps_parse_parsed_create();
+            comps_parse_parsed_init(parsed, "UTF-8", 0);
+            fp = fopen(paths[i], "r");
+            ret = comps_parse_file(parsed, fp, NULL);
+            fail_if(rets[i] != ret);
+            fail_if(!comps_object_cmp((COMPS_Object*)parsed->comps_doc,
+                                      (COMPS_Object*)doc));
+            for (hsit = parsed->log->entries->first,
+                 hsit2 = doc->log->entries->first;
+                 hsit != NULL && hsit2 != NULL;
+                 hsit = hsit->next, hsit2 = hsit2->next);
+            fail_if(hsit != hsit2);
+            comps_parse_parsed_destroy(parsed);
+        }
+        COMPS_OBJECT_DESTROY(docs);
+    }
+    docs = comps_parse_many(paths, 0, 2, NULL, NULL);
+    fail_if(docs == NULL || docs->len != 0);
+    COMPS_OBJECT_DESTROY(docs);
+}
+END_TEST
+
 Suite* basic_suite (void)
 {
     Suite *s = suite_create ("Basic Tests");
@@ -658,6 +1348,18 @@ Suite* basic_suite (void)
 
     tcase_add_test (tc_core, test_main2);
     tcase_add_test (tc_core, test_arch);
+    tcase_add_test (tc_core, test_arch_multi);
+    tcase_add_test (tc_core, test_union_many);
+    tcase_add_test (tc_core, test_merge_into);
+    tcase_add_test (tc_core, test_doc_diff);
+    tcase_add_test (tc_core, test_doc_bin);
+    tcase_add_test (tc_core, test_parse_inputs);
+    tcase_add_test (tc_core, test_parse_compressed);
+    tcase_add_test (tc_core, test_parse_feed);
+    tcase_add_test (tc_core, test_parse_obj_handler);
+    tcase_add_test (tc_core, test_parse_sections);
+    tcase_add_test (tc_core, test_parse_arena);
+    tcase_add_test (tc_core, test_parse_many);
 
     tcase_set_timeout(tc_core, 15);
     suite_add_tcase (s, tc_core);
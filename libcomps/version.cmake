@@ -1,5 +1,5 @@
 set (libcomps_VERSION_MAJOR 0)
-set (libcomps_VERSION_MINOR 1)
-set (libcomps_VERSION_PATCH 6)
+set (libcomps_VERSION_MINOR 2)
+set (libcomps_VERSION_PATCH 0)
 set (libcomps_RELEASE 9)
 